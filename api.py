@@ -1,17 +1,31 @@
 # api.py
-from fastapi import FastAPI, Depends, HTTPException
+import json
+import time
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
-from models.request import GrammarRequest
-from models.response import GrammarResponse
+from pydantic_core import to_jsonable_python
+from models.request import GrammarRequest, DocumentRequest, JobRequest
+from models.response import GrammarResponse, JobCreatedResponse, JobStatusResponse
 from grammar_checker.logger import get_logger
+from grammar_checker.tracing import request_context, stage, get_trace
 from grammar_checker.prompt_builder import PromptBuilder
 from grammar_checker.openai_client import OpenAIClient
 from grammar_checker.grammar_checker import GrammarChecker
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.document import DocumentChecker, segment_sentences
+from grammar_checker.jobs import JobStore, JobWorkerPool
+from grammar_checker.usage import UsageRollupJob
+from grammar_checker.persistence import RecordWriter
 from grammar_checker.db import MongoDBHandler
+from grammar_checker.mongo import pool_stats
 from grammar_checker.config import (
     MONGO_URI,
     MONGO_DB,
     MONGO_COLLECTION,
+    PREFILTER_ENABLED,
+    JOBS_DB_PATH,
+    JOB_WORKERS,
 )
 
 logger = get_logger(__name__)
@@ -19,46 +33,230 @@ logger = get_logger(__name__)
 # Create a global MongoDB handler
 mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
 
+# Optional local screen that answers obviously clean sentences without a model call
+prefilter = PreFilter() if PREFILTER_ENABLED else None
 
-def get_mongo_handler() -> MongoDBHandler:
-    return mongo_handler
+# API records are queued and written by a background thread, off the request path
+record_writer = RecordWriter(mongo_handler)
+
+# Persistent queue for bulk submissions, drained in the background by the worker pool
+job_store = JobStore(JOBS_DB_PATH)
+job_pool = JobWorkerPool(job_store, JOB_WORKERS, prefilter, record_writer)
+
+# Hourly/daily usage stats of the API log, computed before its records expire
+usage_job = UsageRollupJob(mongo_handler)
+
+
+def get_record_writer() -> RecordWriter:
+    return record_writer
+
+
+def get_job_store() -> JobStore:
+    return job_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
     mongo_handler.connect()
+    record_writer.start()
+    job_store.connect()
+    job_pool.start()
+    usage_job.start()
 
     yield  # ← This is where the app runs
 
     # Shutdown logic
+    usage_job.stop()
+    job_pool.stop()
+    job_store.disconnect()
+    record_writer.stop()
     mongo_handler.disconnect()
 
 
 # Create the app with lifespan handler
 app = FastAPI(lifespan=lifespan, title="Grammar Checker API")
 
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """
+    Give every request a correlation ID (taken from X-Request-ID if the client sent one).
+
+    The ID is attached to all log records and Mongo records of the request, returned in the
+    X-Request-ID header, and logged once with the request's stage durations when it completes.
+    """
+    with request_context(request.headers.get(REQUEST_ID_HEADER)) as trace:
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        response.headers[REQUEST_ID_HEADER] = trace.request_id
+        logger.info(
+            "%s %s -> %d in %.1f ms",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": duration_ms,
+                "stages": trace.stages,
+            },
+        )
+        return response
+
+
+def save_failed_check(record_writer: RecordWriter, request, endpoint: str, error: Exception):
+    """Keep failed checks in the API log for the error counts, without hiding the original error."""
+    try:
+        record_writer.save_api_record(request=request, error=str(error), endpoint=endpoint)
+    except Exception:
+        logger.exception("Could not save the failed check to the API log")
+
+
+def format_server_timing(stages: dict) -> str:
+    """Format stage durations as a `Server-Timing` header, e.g. 'model;dur=12.3, enqueue;dur=0.1'."""
+    return ", ".join(f"{name};dur={duration_ms:.1f}" for name, duration_ms in stages.items())
+
 
 @app.post("/check-grammar/")
-def check_grammar(request: GrammarRequest, mongo_handler: MongoDBHandler = Depends(get_mongo_handler)):
-    logger.info(f"Received input: {request.sentence} | Model: {request.model}")
+def check_grammar(
+    request: GrammarRequest, http_response: Response, record_writer: RecordWriter = Depends(get_record_writer)
+):
+    logger.info(
+        "Received input: '%.20s%s' | Model: %s",
+        request.sentence,
+        "..." if len(request.sentence) > 20 else "",
+        request.model,
+    )
     try:
         prompt_builder = PromptBuilder(request.prompt_version)
         client = OpenAIClient()
-        grammar_checker = GrammarChecker(prompt_builder, request.sentence, request.model, client)
-        response = grammar_checker.check_grammar()
+        grammar_checker = GrammarChecker(prompt_builder, request.sentence, request.model, client, prefilter)
+        with stage("model"):
+            response = grammar_checker.check_grammar()
 
-        mongo_handler.save_record(
-            request=request,
-            response=response
-        )
+        # the writer only queues the record; its Mongo insert latency is reported by GET /metrics
+        with stage("enqueue"):
+            record_writer.save_api_record(request=request, response=response, endpoint="/check-grammar/")
+
+        # expose stage durations to clients such as the load tester
+        trace = get_trace()
+        if trace is not None:
+            http_response.headers["Server-Timing"] = format_server_timing(trace.stages)
         return response.model_dump()
 
     except Exception as e:
         logger.exception("Error during grammar check processing")
+        save_failed_check(record_writer, request, "/check-grammar/", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def format_sse(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=to_jsonable_python)}\n\n"
+
+
+@app.post("/check-grammar/stream")
+def check_grammar_stream(request: GrammarRequest, record_writer: RecordWriter = Depends(get_record_writer)):
+    """
+    Stream the grammar check as Server-Sent Events: one `mistake` event per mistake and a
+    `corrected_sentence` event as soon as they are parsed, then `done` with the validated
+    response once it has been saved (or `error` if anything fails mid-stream).
+    """
+    logger.info(
+        "Received streaming input: '%.20s%s' | Model: %s",
+        request.sentence,
+        "..." if len(request.sentence) > 20 else "",
+        request.model,
+    )
+    try:
+        prompt_builder = PromptBuilder(request.prompt_version)
+        client = OpenAIClient()
+        grammar_checker = GrammarChecker(prompt_builder, request.sentence, request.model, client, prefilter)
+    except Exception as e:
+        logger.exception("Error during grammar check setup")
         raise HTTPException(status_code=500, detail=str(e))
 
+    def event_stream():
+        try:
+            for event, data in grammar_checker.stream_grammar():
+                if event == "response":
+                    record_writer.save_api_record(request=request, response=data, endpoint="/check-grammar/stream")
+                    yield format_sse("done", data.model_dump())
+                else:
+                    yield format_sse(event, data)
+        except Exception as e:
+            logger.exception("Error during streaming grammar check processing")
+            save_failed_check(record_writer, request, "/check-grammar/stream", e)
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/check-document/")
+def check_document(request: DocumentRequest, record_writer: RecordWriter = Depends(get_record_writer)):
+    logger.info("Received document with %d characters | Model: %s", len(request.text), request.model)
+    try:
+        prompt_builder = PromptBuilder(request.prompt_version)
+        client = OpenAIClient()
+        document_checker = DocumentChecker(prompt_builder, request.model, client, prefilter)
+        response = document_checker.check_document(request.text)
+
+        record_writer.save_api_record(request=request, response=response, endpoint="/check-document/")
+        return response.model_dump()
+
+    except Exception as e:
+        logger.exception("Error during document check processing")
+        save_failed_check(record_writer, request, "/check-document/", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/jobs", status_code=202, response_model=JobCreatedResponse)
+def create_job(request: JobRequest, job_store: JobStore = Depends(get_job_store)):
+    """Enqueue sentences (and/or a text split into sentences) for background checking."""
+    sentences = [sentence.strip() for sentence in request.sentences if sentence.strip()]
+    if request.text:
+        sentences.extend(segment.text for segment in segment_sentences(request.text))
+    logger.info("Received job with %d sentence(s) | Model: %s", len(sentences), request.model)
+    # an unknown template would fail every item in the worker pool, so it is rejected before queueing
+    try:
+        PromptBuilder(request.prompt_version)
+    except OSError:
+        raise HTTPException(status_code=422, detail=f"Unknown prompt template '{request.prompt_version}'.")
+    try:
+        job_id = job_store.create_job(sentences, request.model, request.prompt_version)
+        return job_store.get_job(job_id)
+
+    except Exception as e:
+        logger.exception("Error during job creation")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    job_store: JobStore = Depends(get_job_store),
+):
+    """Report job progress and one page of results in submission order."""
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+    return {**job, "offset": offset, "limit": limit, "results": job_store.get_results(job_id, offset, limit)}
+
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics(record_writer: RecordWriter = Depends(get_record_writer)):
+    """Mongo connection pool and record writer counters of this worker process."""
+    return {"mongo_pool": pool_stats(), "record_writer": record_writer.stats()}
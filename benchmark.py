@@ -1,16 +1,48 @@
 # This script runs the grammar checker tests using the OpenAI API.
 import os
+import sys
+import time
 import uuid
-from typing import List
+import subprocess
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Iterable, Iterator, List
 from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage, request_context
 from grammar_checker.prompt_builder import PromptBuilder
 from grammar_checker.openai_client import OpenAIClient
 from grammar_checker.grammar_checker import GrammarChecker
-from grammar_checker.evaluator import evaluate_response
-from grammar_checker.utils import load_test_cases, save_test_results
+from grammar_checker.prefilter import PreFilter, evaluate_prefilter
+from grammar_checker.evaluator import Evaluation, evaluate
+from grammar_checker.batch import build_batch_line, write_batch_file, parse_batch_output, wait_for_batch
+from grammar_checker.factory import BenchmarkMode, BatchBackendType, StorageBackendType
+from grammar_checker.utils import load_test_cases, iter_test_cases, validate_test_cases
 from grammar_checker.db import MongoDBHandler
-from grammar_checker.config import TEST_RESULTS_FILE, VALID_MODELS, PROMPTS_DIR
+from grammar_checker.storage import StorageBackend
+from grammar_checker.shards import ClaimLost, ShardStore, run_worker, wait_for_run
+from grammar_checker.experiment import Experiment
+from grammar_checker.runs import build_run_summary, count_result
+from grammar_checker.config import (
+    PROJECT_ROOT,
+    MONGO_URI,
+    MONGO_DB,
+    MONGO_COLLECTION,
+    MONGO_SHARDS_COLLECTION,
+    SHARD_SIZE,
+    EXPERIMENT_CONFIDENCE,
+    EXPERIMENT_MIN_SAMPLES,
+    EVALUATION_MODE,
+    EVALUATION_TOLERANCE,
+    VALID_MODELS,
+    PROMPTS_DIR,
+    BATCH_DIR,
+    BATCH_POLL_INTERVAL,
+    BATCH_TIMEOUT,
+    RESULTS_CHUNK_SIZE,
+)
 from models.request import GrammarRequest
+from models.response import GrammarResponse
+from models.benchmark_case import BenchmarkCase, benchmark_case_adapter
 
 
 # initialize logger
@@ -35,6 +67,11 @@ def validate_main_inputs(
 
     if not isinstance(output_destination, str) or not output_destination.strip():
         raise ValueError("output_destination must be non-empty string.")
+    try:
+        destination = StorageBackendType(output_destination)
+    except ValueError:
+        choices = ", ".join(backend.value for backend in StorageBackendType)
+        raise ValueError(f"Unknown output_destination '{output_destination}', expected one of: {choices}.") from None
 
     if not isinstance(prompt_templates, list) or not prompt_templates:
         raise ValueError("prompt_template must be a non-empty list of prompt templates.")
@@ -45,8 +82,17 @@ def validate_main_inputs(
         if not os.path.isfile(template_path):
             raise ValueError(f"Prompt template '{template}' does not exist.")
 
-    if output_destination == "save_to_db" and db_handler is None:
-        raise ValueError("db_handler is required when output_destination is 'save_to_db'.")
+    if destination == StorageBackendType.MONGO and db_handler is None:
+        raise ValueError("db_handler is required when output_destination is 'mongo'.")
+
+
+def get_storage(output_destination: str, mongo_handler: MongoDBHandler | None) -> StorageBackend | None:
+    """The backend results are saved to: `mongo_handler` for MongoDB, else one built from config; None if unknown."""
+    try:
+        destination = StorageBackendType(output_destination)
+    except ValueError:
+        return None
+    return mongo_handler if destination == StorageBackendType.MONGO else destination.build()
 
 
 def get_run_id():
@@ -54,72 +100,427 @@ def get_run_id():
     return str(uuid.uuid4())
 
 
+def build_benchmark_eval(
+    test_case: BenchmarkCase,
+    run_id: str,
+    evaluation: Evaluation,
+    prefiltered: bool,
+    latency_ms: float | None = None,
+    usage: dict | None = None,
+) -> dict:
+    """A fresh evaluation record per result; the shared test case itself is never modified."""
+    benchmark_eval = {
+        **test_case.to_dict(),
+        "match": evaluation.match,
+        "run_id": run_id,
+        "prefiltered": prefiltered,
+        "evaluation": evaluation.to_dict(),
+    }
+    if latency_ms is not None:
+        benchmark_eval["latency_ms"] = round(latency_ms, 3)
+    if usage:
+        benchmark_eval.update(usage)
+    return benchmark_eval
+
+
 # test cases
-def run_tests(test_cases: List[str], models: List[str], prompt_templates: List[str], client: OpenAIClient):
-    run_id = get_run_id()
-    logger.info(f"Starting benchmark tests {run_id}.")
+def iter_results(
+    test_cases: Iterable[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    client: OpenAIClient,
+    prefilter: PreFilter | None = None,
+    run_id: str | None = None,
+) -> Iterator[dict]:
+    """
+    Check every test case with each model x template combination, yielding one result at a time.
+
+    `test_cases` is iterated exactly once, so it can be a stream from `iter_test_cases`.
+    Shards of a sharded run pass the run's `run_id` so all their results land under it.
+    """
+    run_id = run_id or get_run_id()
+    logger.info("Starting benchmark tests %s.", run_id)
+    prompt_builders = {template: PromptBuilder(template) for template in prompt_templates}
+    for test_case in test_cases:
+        for model in models:
+            for template in prompt_templates:
+                yield run_test_case(test_case, model, template, prompt_builders[template], client, prefilter, run_id)
+    logger.info("Benchmark tests for %s completed.", run_id)
+
+
+def run_tests(
+    test_cases: Iterable[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    client: OpenAIClient,
+    prefilter: PreFilter | None = None,
+    run_id: str | None = None,
+):
+    """The results of `iter_results` as one list."""
+    return list(iter_results(test_cases, models, prompt_templates, client, prefilter=prefilter, run_id=run_id))
+
+
+def run_streamed_tests(
+    test_cases: Iterable[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    client: OpenAIClient,
+    storage: StorageBackend,
+    run_id: str | None = None,
+    chunk_size: int = RESULTS_CHUNK_SIZE,
+) -> dict:
+    """
+    Run the tests like `run_tests`, but save and count the results every `chunk_size` results
+    instead of collecting them, so memory stays bounded however large the corpus; returns the summary.
+    """
+    summary = {}
+    chunk = []
+
+    def flush(db):
+        for result in chunk:
+            count_result(summary, result["request"].prompt_version, result["request"].model, result["benchmark_eval"])
+        db.save_results(chunk)
+        chunk.clear()
+
+    with storage as db:
+        for result in iter_results(test_cases, models, prompt_templates, client, run_id=run_id):
+            chunk.append(result)
+            if len(chunk) >= chunk_size:
+                flush(db)
+        if chunk:
+            flush(db)
+    logger.info("Model Matches: %s", summary)
+    return summary
+
+
+def run_test_case(
+    test_case: BenchmarkCase,
+    model: str,
+    template: str,
+    prompt_builder: PromptBuilder,
+    client: OpenAIClient,
+    prefilter: PreFilter | None,
+    run_id: str,
+) -> dict:
+    """Check and evaluate one test case with one model and template."""
+    logger.debug("test_id %s | model: '%s' | prompt_version: '%s'", test_case.test_id, model, template)
+    try:
+        # traced per case, so the token usage of this call can be read back
+        with request_context() as trace:
+            start = time.perf_counter()
+            grammar_checker = GrammarChecker(prompt_builder, test_case.input, model, client, prefilter)
+            response = grammar_checker.check_grammar()
+            latency_ms = (time.perf_counter() - start) * 1000
+
+        with stage("evaluation"):
+            evaluation = evaluate(test_case, response)
+
+        # build GrammarRequest
+        request = GrammarRequest(
+            sentence=test_case.input,
+            prompt_version=template,
+            model=model,
+            mode="benchmark",
+        )
+
+        return {
+            "request": request,
+            "response": response,
+            "benchmark_eval": build_benchmark_eval(
+                test_case, run_id, evaluation, grammar_checker.prefiltered, latency_ms, trace.usage
+            ),
+        }
+    except Exception as e:
+        logger.critical("Unexpected error: %s", e, exc_info=True)
+        raise
+
+
+def run_experiment(
+    test_cases: List[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    client: OpenAIClient,
+    prefilter: PreFilter | None = None,
+    confidence: float = EXPERIMENT_CONFIDENCE,
+    min_samples: int = EXPERIMENT_MIN_SAMPLES,
+    run_id: str | None = None,
+):
+    """
+    Compare models x templates ("arms") on the test cases, stopping arms that are clearly worse.
+
+    Each test case is run by every arm still in the experiment before moving on to the next one,
+    and the experiment stops as soon as a single arm is left. Returns the results (saved like a
+    regular run) and the `Experiment` with the per-arm pass rates and intervals.
+    """
+    run_id = run_id or get_run_id()
+    experiment = Experiment(models, prompt_templates, confidence=confidence, min_samples=min_samples)
+    logger.info("Starting prompt experiment %s with %s arm(s).", run_id, len(experiment.arms))
+    prompt_builders = {template: PromptBuilder(template) for template in prompt_templates}
     results = []
+    for test_case in test_cases:
+        for arm in experiment.active_arms():
+            result = run_test_case(
+                test_case, arm.model, arm.template, prompt_builders[arm.template], client, prefilter, run_id
+            )
+            arm.record(result["benchmark_eval"]["match"])
+            results.append(result)
+        experiment.update()
+        if experiment.finished:
+            logger.info("Experiment %s: one arm left after %s test case(s), stopping.", run_id, experiment.cases_seen)
+            break
+
+    logger.info(
+        "Prompt experiment %s completed: %s call(s), %s saved over a full sweep.",
+        run_id,
+        len(results),
+        experiment.calls_saved(len(test_cases)),
+    )
+    return results, experiment
+
+
+def format_experiment(experiment: Experiment) -> str:
+    rows = experiment.summary()
+    lines = [f"{'arm':<45} {'passed':>7} {'total':>6} {'rate':>6}  {'interval':<16} status"]
+    for row in rows:
+        arm = f"{row['model']} | {row['prompt_version']}"
+        status = "active" if row["active"] else f"stopped after {row['stopped_after']}"
+        lines.append(
+            f"{arm:<45} {row['passed']:>7} {row['total']:>6} {row['pass_rate']:>6.3f}  "
+            f"[{row['ci_low']:.3f}, {row['ci_high']:.3f}] {status}"
+        )
+    return "\n".join(lines)
+
+
+def run_batch_tests(
+    test_cases: List[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    backend,
+    prefilter: PreFilter | None = None,
+    batch_dir: Path = BATCH_DIR,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    timeout: float = BATCH_TIMEOUT,
+    run_id: str | None = None,
+):
+    """
+    Run the benchmark through a batch backend instead of one call per test case.
+
+    All prompts for models x templates x cases are rendered into one JSONL batch file, submitted,
+    polled until the batch finishes and then evaluated under a single run_id. Cases whose batch
+    line failed are logged and left out of the results. Each result carries the token usage of
+    its batch line; batch lines have no latency of their own, so none is recorded.
+    """
+    run_id = run_id or get_run_id()
+    logger.info("Starting batch benchmark tests %s.", run_id)
+
+    lines = []
+    entries = []  # (model, template, test_case, custom_id or prefiltered response)
     for model in models:
         for template in prompt_templates:
+            prompt_builder = PromptBuilder(template)
             for test_case in test_cases:
-                logger.debug(f"test_id {test_case['test_id']} | model: '{model}' | prompt_version: '{template}'")
-                sentence = test_case["input"]
-                try:
-                    prompt_builder = PromptBuilder(template)
-                    grammar_checker = GrammarChecker(prompt_builder, sentence, model, client)
-                    response = grammar_checker.check_grammar()
-
-                    is_match = evaluate_response(test_case, response)
-                    test_case["match"] = is_match
-                    test_case["run_id"] = run_id
-
-                    # build GrammarRequest
-                    request = GrammarRequest(
-                        sentence=sentence,
-                        prompt_version=template,
-                        model=model,
-                        mode="benchmark",
-                    )
-
-                    results.append(
-                        {
-                            "request": request,
-                            "response": response,
-                            "benchmark_eval": test_case,
-                        }
-                    )
-                except Exception as e:
-                    logger.critical(f"Unexpected error: {str(e)}", exc_info=True)
-                    raise
-    logger.info(f"Benchmark tests for {run_id} completed.")
+                sentence = test_case.input
+                if prefilter and prefilter.is_clean(sentence):
+                    response = GrammarResponse(input=sentence, mistakes=[], corrected_sentence=sentence)
+                    entries.append((model, template, test_case, response))
+                    continue
+                custom_id = f"{run_id}-{len(lines)}"
+                lines.append(build_batch_line(custom_id, model, prompt_builder.build_prompt(sentence)))
+                entries.append((model, template, test_case, custom_id))
+
+    outputs, usage = {}, {}
+    if lines:
+        batch_file = write_batch_file(lines, Path(batch_dir) / f"batch_input_{run_id}.jsonl")
+        batch_id = backend.submit(batch_file)
+        logger.info("Submitted batch %s with %s request(s).", batch_id, len(lines))
+        with stage("batch_wait"):
+            status = wait_for_batch(backend, batch_id, poll_interval=poll_interval, timeout=timeout)
+        if status != "completed":
+            logger.error("Batch %s ended with status '%s'.", batch_id, status)
+            raise RuntimeError(f"Batch {batch_id} ended with status '{status}'.")
+        outputs, usage = parse_batch_output(backend.fetch_output(batch_id))
+
+    results = []
+    failed = 0
+    for model, template, test_case, entry in entries:
+        prefiltered = isinstance(entry, GrammarResponse)
+        try:
+            if prefiltered:
+                response = entry
+            else:
+                output = outputs.get(entry, {"error": "missing from batch output"})
+                if "error" in output:
+                    raise ValueError(output["error"])
+                with stage("validation"):
+                    response = GrammarResponse.model_validate(output)
+        except Exception as e:
+            failed += 1
+            logger.error(
+                "test_id %s | model: '%s' | prompt_version: '%s' failed: %s", test_case.test_id, model, template, e
+            )
+            continue
+
+        with stage("evaluation"):
+            evaluation = evaluate(test_case, response)
+        request = GrammarRequest(sentence=test_case.input, prompt_version=template, model=model, mode="benchmark")
+        results.append(
+            {
+                "request": request,
+                "response": response,
+                "benchmark_eval": build_benchmark_eval(
+                    test_case, run_id, evaluation, prefiltered, usage=None if prefiltered else usage.get(entry)
+                ),
+            }
+        )
+
+    logger.info("Batch benchmark tests for %s completed: %s evaluated, %s failed.", run_id, len(results), failed)
     return results
 
 
 def summary_results(results: list):
     # summarize the results
-
     summary = {}
     for result in results:
-        prompt_version = result["request"].prompt_version
-        if prompt_version not in summary:
-            summary[prompt_version] = {}
-        model = result["request"].model
-        if model not in summary[prompt_version]:
-            summary[prompt_version][model] = {"total": 0, "passed": 0}
-
-        summary[prompt_version][model]["total"] += 1
-        if result["benchmark_eval"]["match"]:
-            summary[prompt_version][model]["passed"] += 1
-    logger.info(f"Model Matches: {summary}")
+        count_result(summary, result["request"].prompt_version, result["request"].model, result["benchmark_eval"])
+    logger.info("Model Matches: %s", summary)
     return summary
 
 
+def save_results(storage: StorageBackend, results: list):
+    """Save the results of a run with one bulk write."""
+    with storage as db:
+        db.save_results(results)
+
+
+def save_run_summary(
+    storage: StorageBackend, run_id: str, summary: dict, mode: BenchmarkMode, config: dict, started_at: datetime
+):
+    """Store the run's summary document, so `cli.py runs` can list it without reading the records."""
+    run_summary = build_run_summary(run_id, summary, BenchmarkMode(mode).value, config, started_at, datetime.now(UTC))
+    with storage as db:
+        db.save_run_summary(run_summary)
+
+
+def shard_records(shard: dict) -> dict:
+    """Query for the records of a shard's test cases, of every attempt at it."""
+    return {
+        "benchmark_eval.run_id": shard["run_id"],
+        "benchmark_eval.test_id": {"$in": [case["test_id"] for case in shard["test_cases"]]},
+        "request.model": shard["model"],
+        "request.prompt_version": shard["prompt_version"],
+    }
+
+
+def run_shard(shard: dict, client: OpenAIClient, mongo_handler: MongoDBHandler, store: ShardStore | None = None) -> dict:
+    """
+    Run one claimed shard and save its records under the shard's run_id; returns its summary.
+
+    Records are tagged with the attempt (`benchmark_eval.shard_attempt`). Before saving, the claim is
+    checked with `store` (raising `ClaimLost` if another worker took the shard over) and records left
+    by earlier attempts at the same shard are deleted, so a reclaimed shard does not count its test
+    cases twice; `finalize_shard` cleans up after a stale attempt that saved anyway.
+    """
+    test_cases = [benchmark_case_adapter.validate_python(case) for case in shard["test_cases"]]
+    threshold = shard.get("prefilter_threshold")
+    prefilter = PreFilter(threshold) if threshold is not None else None
+    results = run_tests(
+        test_cases, [shard["model"]], [shard["prompt_version"]], client, prefilter=prefilter, run_id=shard["run_id"]
+    )
+    attempt = shard.get("attempts", 1)
+    for result in results:
+        result["benchmark_eval"]["shard_attempt"] = attempt
+
+    if store is not None and not store.renew_claim(shard):
+        raise ClaimLost(f"Shard {shard['_id']} was taken over before attempt {attempt} saved its records.")
+    with mongo_handler as db:
+        # never a later attempt's: this one may have lost its claim since the check above
+        db.collection.delete_many({**shard_records(shard), "benchmark_eval.shard_attempt": {"$not": {"$gte": attempt}}})
+    save_results(mongo_handler, results)
+    return summary_results(results)
+
+
+def finalize_shard(shard: dict, completed: bool, mongo_handler: MongoDBHandler):
+    """
+    Keep the records of one attempt per shard: the attempt that completed the shard deletes those of
+    other attempts, and one that lost its claim deletes its own (saved after the winner cleaned up).
+    """
+    attempt = shard.get("attempts", 1)
+    with mongo_handler as db:
+        result = db.collection.delete_many(
+            {**shard_records(shard), "benchmark_eval.shard_attempt": {"$ne": attempt} if completed else attempt}
+        )
+    if result.deleted_count:
+        logger.warning("Deleted %s record(s) of a stale attempt at shard %s.", result.deleted_count, shard["_id"])
+
+
+def run_benchmark_worker(run_id: str | None = None, worker_id: str | None = None) -> int:
+    """Process shards of `run_id` (or of any run) until none are left; returns the shards completed."""
+    client = OpenAIClient()
+    mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
+    with ShardStore(MONGO_URI, MONGO_DB, MONGO_SHARDS_COLLECTION) as store:
+        return run_worker(
+            store,
+            lambda shard: run_shard(shard, client, mongo_handler, store),
+            run_id=run_id,
+            worker_id=worker_id,
+            finalize_shard=lambda shard, completed: finalize_shard(shard, completed, mongo_handler),
+        )
+
+
+def spawn_workers(run_id: str, count: int) -> List[subprocess.Popen]:
+    """Start `count` local worker processes (`cli.py benchmark-worker`) for the run."""
+    command = [sys.executable, str(PROJECT_ROOT / "cli.py"), "benchmark-worker", "--run-id", run_id]
+    processes = [subprocess.Popen(command, cwd=PROJECT_ROOT) for _ in range(count)]
+    logger.info("Started %s local benchmark worker(s) for run %s.", count, run_id)
+    return processes
+
+
+def run_sharded(
+    test_cases: List[BenchmarkCase],
+    models: List[str],
+    prompt_templates: List[str],
+    prefilter: PreFilter | None = None,
+    shard_size: int = SHARD_SIZE,
+    workers: int = 1,
+) -> dict:
+    """
+    Coordinate a sharded run: write the shards, start `workers` local workers and report progress
+    until every shard is done or failed. Workers on other hosts join with `cli.py benchmark-worker`.
+    """
+    with ShardStore(MONGO_URI, MONGO_DB, MONGO_SHARDS_COLLECTION) as store:
+        run_id = store.create_run(
+            test_cases,
+            models,
+            prompt_templates,
+            shard_size=shard_size,
+            prefilter_threshold=prefilter.threshold if prefilter else None,
+        )
+        processes = spawn_workers(run_id, workers) if workers else []
+        try:
+            progress = wait_for_run(store, run_id, processes)
+        finally:
+            for process in processes:
+                process.wait()
+
+    if progress["shards"]["failed"]:
+        logger.error("Run %s finished with %s failed shard(s).", run_id, progress["shards"]["failed"])
+    logger.info("Sharded benchmark %s completed. Model Matches: %s", run_id, progress["summary"])
+    return progress
+
+
 def main(
     test_cases_file: str,
     models: List[str],
     output_destination: str,
     prompt_templates: List[str],
     mongo_handler: MongoDBHandler,
+    prefilter: PreFilter | None = None,
+    mode: BenchmarkMode = BenchmarkMode.SYNC,
+    batch_backend: BatchBackendType = BatchBackendType.OPENAI,
+    shard_size: int = SHARD_SIZE,
+    workers: int = 1,
+    confidence: float = EXPERIMENT_CONFIDENCE,
+    min_samples: int = EXPERIMENT_MIN_SAMPLES,
 ):
     logger.info("Starting Grammar Checker Tests.")
 
@@ -127,30 +528,77 @@ def main(
     validate_main_inputs(test_cases_file, models, output_destination, prompt_templates, mongo_handler)
     logger.info("Input validation passed.")
 
+    started_at = datetime.now(UTC)
+    config = {
+        "test_cases_file": str(test_cases_file),
+        "models": models,
+        "prompt_templates": prompt_templates,
+        "prefilter_threshold": prefilter.threshold if prefilter else None,
+        "evaluation_mode": EVALUATION_MODE,
+        "evaluation_tolerance": EVALUATION_TOLERANCE,
+    }
+
+    # sharded runs are saved by the workers, so only the summary is written here
+    if mode == BenchmarkMode.SHARDED:
+        if get_storage(output_destination, mongo_handler) is not mongo_handler:
+            raise ValueError("Sharded benchmarks save their results to MongoDB; use --save-to mongo.")
+        test_cases = load_test_cases(test_cases_file)
+        if prefilter:
+            logger.info("Prefilter evaluation on test cases: %s", evaluate_prefilter(test_cases, prefilter))
+        progress = run_sharded(test_cases, models, prompt_templates, prefilter, shard_size=shard_size, workers=workers)
+        config.update(shard_size=shard_size, workers=workers, failed_shards=progress["shards"]["failed"])
+        save_run_summary(mongo_handler, progress["run_id"], progress["summary"], mode, config, started_at)
+        return
+
+    storage = get_storage(output_destination, mongo_handler)
+    if storage is None:
+        logger.error("Invalid output option. Please refer to the help documentation for valid options.")
+        return
+
     # set up the OpenAI client and prompt builder
     client = OpenAIClient()
+    run_id = get_run_id()
+
+    # without a prefilter report, sync runs validate the whole file before the first model call, then
+    # stream it again and save the results in chunks, so neither cases nor results are all held in memory
+    if mode == BenchmarkMode.SYNC and not prefilter:
+        validate_test_cases(test_cases_file)
+        logger.info("Saving test results to %s", storage.label)
+        summary = run_streamed_tests(iter_test_cases(test_cases_file), models, prompt_templates, client, storage, run_id)
+        save_run_summary(storage, run_id, summary, mode, config, started_at)
+        return
 
-    # run the tests
     test_cases = load_test_cases(test_cases_file)
-    results = run_tests(test_cases, models, prompt_templates, client)
+    if prefilter:
+        logger.info("Prefilter evaluation on test cases: %s", evaluate_prefilter(test_cases, prefilter))
+    if mode == BenchmarkMode.BATCH:
+        config["batch_backend"] = batch_backend.value
+        results = run_batch_tests(
+            test_cases, models, prompt_templates, batch_backend.build(client), prefilter=prefilter, run_id=run_id
+        )
+    elif mode == BenchmarkMode.EXPERIMENT:
+        config.update(confidence=confidence, min_samples=min_samples)
+        results, experiment = run_experiment(
+            test_cases,
+            models,
+            prompt_templates,
+            client,
+            prefilter,
+            confidence=confidence,
+            min_samples=min_samples,
+            run_id=run_id,
+        )
+        logger.info("Prompt experiment results:\n%s", format_experiment(experiment))
+        config["stopped_arms"] = [arm.name for arm in experiment.arms if not arm.active]
+    else:
+        results = run_tests(test_cases, models, prompt_templates, client, prefilter=prefilter, run_id=run_id)
 
-    summary_results(results)
+    summary = summary_results(results)
 
     # save results
-    if output_destination == "save_to_db":
-        logger.info("Saving test results to MongoDB")
-        with mongo_handler as db:
-            for result in results:
-                db.save_record(
-                    request=result["request"],
-                    response=result["response"],
-                    benchmark_eval=result["benchmark_eval"],
-                )
-    # elif output_destination == "save_to_file":
-    #     logger.info(f"Saving test results to {TEST_RESULTS_FILE}")
-    #     save_test_results(TEST_RESULTS_FILE, results)
-    else:
-        logger.error("Invalid output option. Please refer to the help documentation for valid options.")
+    logger.info("Saving test results to %s", storage.label)
+    save_results(storage, results)
+    save_run_summary(storage, run_id, summary, mode, config, started_at)
 
 
 if __name__ == "__main__":
@@ -1,23 +1,47 @@
 import typer
-import uvicorn
 from dotenv import load_dotenv
 
 load_dotenv()
 from typing import List
 from pathlib import Path
+from datetime import datetime, UTC
 from grammar_checker.logger import get_logger
-from grammar_checker.db import MongoDBHandler
 from grammar_checker.config import MONGO_URI, MONGO_DB, MONGO_COLLECTION
-from interactive import main as interactive_main
-from benchmark import main as benchmark_main
 from grammar_checker.config import (
+    API_URL,
     DEFAULT_MODEL,
     TEST_CASES_FILE,
     TEST_CASES_FILE_DEV,
     DEFAULT_PROMPT_TEMPLATE,
+    MICROBENCH_BASELINE_FILE,
+    PREFILTER_ENABLED,
+    PREFILTER_THRESHOLD,
+    PROFILE_SAMPLE_INTERVAL,
+    SHARD_SIZE,
+    EXPERIMENT_CONFIDENCE,
+    EXPERIMENT_MIN_SAMPLES,
+    EVALUATION_MODE,
+    EVALUATION_TOLERANCE,
+    REEVALUATE_WORKERS,
+    REEVALUATE_BATCH_SIZE,
+    MIGRATE_BATCH_SIZE,
+    STORAGE_BACKEND,
+    EXPORT_DIR,
+    EXPORT_BATCH_SIZE,
+)
+from grammar_checker.factory import (
+    BenchmarkMode,
+    BatchBackendType,
+    NormalizationMode,
+    RecordSchema,
+    StorageBackendType,
+    UsageGranularity,
 )
-from reporting.report_runner import run_reports
 from reporting.factory import ReporterType, ReportType
+from mock_llm import LatencyDistribution
+
+# Command modules and their heavy dependencies (uvicorn, pandas, pymongo, the OpenAI SDK)
+# are imported inside each command, so `--help` and light commands start fast.
 
 
 app = typer.Typer(help="CLI for managing MongoDB and running the grammar checker.")
@@ -28,24 +52,115 @@ logger = get_logger(__name__)
 @app.command()
 def run_api(host: str = "127.0.0.1", port: int = 8000):
     """Run the FastAPI server."""
-    logger.info(f"Starting FastAPI server at {host}:{port}")
+    import uvicorn
+
+    logger.info("Starting FastAPI server at %s:%s", host, port)
     uvicorn.run("api:app", host=host, port=port, reload=True)
 
 
+@app.command()
+def mock_llm(
+    host: str = "127.0.0.1",
+    port: int = 8001,
+    latency: LatencyDistribution = typer.Option(
+        LatencyDistribution.FIXED, case_sensitive=False, help="Latency distribution of the responses"
+    ),
+    latency_ms: float = typer.Option(0.0, help="Mean response latency in milliseconds"),
+    latency_jitter_ms: float = typer.Option(0.0, help="Spread (uniform) or standard deviation (normal) in ms"),
+    error_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of requests failing with HTTP 500"),
+    rate_limit_rate: float = typer.Option(0.0, min=0.0, max=1.0, help="Share of requests failing with HTTP 429"),
+    max_rps: float = typer.Option(0.0, min=0.0, help="Throughput limit in requests per second (0 = unlimited)"),
+    seed: int = typer.Option(0, help="Random seed for latency and error injection"),
+):
+    """
+    Run a local OpenAI-compatible mock model server for offline load testing.
+
+    Responses are canned from the benchmark test case files. Point the grammar checker
+    at it with OPENAI_BASE_URL=http://<host>:<port>/v1.
+    """
+    import uvicorn
+    from mock_llm import create_app as create_mock_llm_app, MockLLMSettings
+
+    logger.info("Starting mock LLM server at %s:%s", host, port)
+    settings = MockLLMSettings(
+        latency=latency,
+        latency_ms=latency_ms,
+        latency_jitter_ms=latency_jitter_ms,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        max_rps=max_rps,
+        seed=seed,
+    )
+    uvicorn.run(create_mock_llm_app(settings), host=host, port=port)
+
+
 @app.command()
 def interactive():
     """Run the interactive mode."""
+    from interactive import main as interactive_main
+    from grammar_checker.db import MongoDBHandler
+
     logger.info("Starting interactive mode...")
     mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
     interactive_main(mongo_handler=mongo_handler)
 
 
+@app.command()
+def check_document(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Text file to check"),
+    model: str = typer.Option(DEFAULT_MODEL, help="OpenAI model name"),
+    prompt_version: str = typer.Option(DEFAULT_PROMPT_TEMPLATE, help="Prompt template file"),
+):
+    """
+    Check a text file sentence by sentence and stream one JSON result per paragraph.
+
+    Character offsets in the output refer to positions in the file.
+    """
+    from grammar_checker.prompt_builder import PromptBuilder
+    from grammar_checker.openai_client import OpenAIClient
+    from grammar_checker.document import DocumentChecker, iter_paragraphs
+
+    logger.info("Checking document '%s'...", file)
+    document_checker = DocumentChecker(PromptBuilder(prompt_version), model, OpenAIClient())
+    with open(file, "r", encoding="utf-8") as f:
+        for offset, paragraph in iter_paragraphs(f):
+            typer.echo(document_checker.check_document(paragraph, offset=offset).model_dump_json())
+
+
 @app.command()
 def benchmark(
     test_cases: Path = typer.Option(TEST_CASES_FILE, help="Path to the test cases JSON file"),
     models: List[str] = typer.Option([DEFAULT_MODEL], help="List of OpenAI model names"),
     prompt_version: List[str] = typer.Option([DEFAULT_PROMPT_TEMPLATE], help="List of prompt template files"),
-    save_to: str = typer.Option("save_to_db"),
+    save_to: StorageBackendType = typer.Option(
+        STORAGE_BACKEND, case_sensitive=False, help="Save records and the run summary to MongoDB, SQLite or files"
+    ),
+    prefilter: bool = typer.Option(
+        PREFILTER_ENABLED, "--prefilter/--no-prefilter", help="Skip model calls for sentences that look clean"
+    ),
+    prefilter_threshold: float = typer.Option(
+        PREFILTER_THRESHOLD, min=0.0, max=1.0, help="Minimum clean-confidence for the prefilter to skip a sentence"
+    ),
+    mode: BenchmarkMode = typer.Option(
+        BenchmarkMode.SYNC,
+        case_sensitive=False,
+        help="Per-test-case calls, one batch, shards across workers or a prompt experiment",
+    ),
+    batch_backend: BatchBackendType = typer.Option(
+        BatchBackendType.OPENAI, case_sensitive=False, help="Batch API or the local file-backed stand-in"
+    ),
+    shard_size: int = typer.Option(SHARD_SIZE, min=1, help="Test cases per shard with --mode sharded"),
+    workers: int = typer.Option(1, min=0, help="Local worker processes to start with --mode sharded"),
+    confidence: float = typer.Option(
+        EXPERIMENT_CONFIDENCE, min=0.5, max=0.999, help="Confidence for dropping arms with --mode experiment"
+    ),
+    min_samples: int = typer.Option(
+        EXPERIMENT_MIN_SAMPLES, min=1, help="Test cases per arm before any arm is dropped with --mode experiment"
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Time each pipeline stage and write a profile report"),
+    sample_interval: float = typer.Option(
+        PROFILE_SAMPLE_INTERVAL, min=0.0, help="Seconds between stack samples with --profile (0 = stages only)"
+    ),
 ):
     """
     Run grammar benchmarks on selected OpenAI models using test cases and a prompt template.
@@ -54,25 +169,95 @@ def benchmark(
         --test-cases-file: Path to test case file (default: dev test cases).
         --models: One or more OpenAI model names to benchmark.
         --prompt-template: Prompt template to use.
-        --output-destination: Where to send results ("save_to_db").
+        --save-to: Where results are saved: "mongo", "sqlite" (SQLITE_STORAGE_PATH) or
+            append-only "jsonl"/"parquet" files (FILE_STORAGE_DIR); the last three need no
+            database server. Sharded runs always use MongoDB.
+        --prefilter: Answer obviously clean sentences locally; the summary reports how many
+            were skipped and how many of those failed.
+        --mode: "sync" calls the model per test case, "batch" renders all prompts into one
+            JSONL file, submits it through the Batch API and polls until it completes.
+        --batch-backend: "openai" or "local" (a file-backed stand-in for offline runs).
+        --shard-size / --workers: With "--mode sharded" the run is split into shards stored in
+            MongoDB and processed by `--workers` local worker processes plus any started
+            elsewhere with `benchmark-worker`; progress is printed until all shards finish.
+        --confidence / --min-samples: With "--mode experiment" every model x template pair
+            ("arm") is run case by case, and arms whose pass-rate interval falls below the
+            best arm's are stopped once each has `--min-samples` results.
+        --profile: Record wall/CPU time per stage (network, JSON parsing, validation, evaluation,
+            Mongo) and sample stacks; writes a summary table and a collapsed-stack file
+            (for flamegraph.pl or speedscope) to the reports directory.
 
-    Benchmarks are logged and may be saved to MongoDB.
+    Benchmarks are logged and saved to the chosen storage backend.
     """
+    from benchmark import main as benchmark_main
+    from grammar_checker.db import MongoDBHandler
+    from grammar_checker.prefilter import PreFilter
+    from grammar_checker.profiling import profile_run
+
     logger.info("Run benchmark mode...")
-    logger.debug(f"Arguments received: {test_cases=}, {models=}, {prompt_version=}, {save_to=}")
+    logger.debug(
+        "Arguments received: test_cases=%r, models=%r, prompt_version=%r, save_to=%r, prefilter=%r, mode=%r",
+        test_cases,
+        models,
+        prompt_version,
+        save_to,
+        prefilter,
+        mode,
+    )
     mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
-    benchmark_main(test_cases, models, save_to, prompt_version, mongo_handler)
+    with profile_run("benchmark", enabled=profile, sample_interval=sample_interval):
+        benchmark_main(
+            test_cases,
+            models,
+            save_to,
+            prompt_version,
+            mongo_handler,
+            prefilter=PreFilter(prefilter_threshold) if prefilter else None,
+            mode=mode,
+            batch_backend=batch_backend,
+            shard_size=shard_size,
+            workers=workers,
+            confidence=confidence,
+            min_samples=min_samples,
+        )
+
+
+@app.command()
+def benchmark_worker(
+    run_id: str = typer.Option(None, help="Only process shards of this run (default: any run)"),
+    worker_id: str = typer.Option(None, help="Name shown in progress output (default: host:pid)"),
+):
+    """
+    Process shards of sharded benchmark runs until none are left to claim.
+
+    Start it on any host that can reach MongoDB to add capacity to a running
+    `benchmark --mode sharded`; results are saved under the coordinator's run ID.
+    """
+    from benchmark import run_benchmark_worker
+
+    completed = run_benchmark_worker(run_id=run_id, worker_id=worker_id)
+    typer.echo(f"Completed {completed} shard(s).")
 
 
 @app.command()
 def report(
-    run_ids: List[str] = typer.Argument(..., help="List of run UUIDs"),
+    run_ids: List[str] = typer.Argument(None, help="List of run UUIDs (with --input: only these runs of the file)"),
     reports: List[ReportType] = typer.Option(
         list(ReportType), "--reports", case_sensitive=False, help="Choose reports to run"
     ),
     reporter_type: ReporterType = typer.Option(
         ReporterType.CSV, "--reporter", case_sensitive=False, help="Choose reporter type"
     ),
+    storage: StorageBackendType = typer.Option(
+        STORAGE_BACKEND, case_sensitive=False, help="Backend the runs were saved to with --save-to"
+    ),
+    input_file: Path = typer.Option(
+        None, "--input", exists=True, dir_okay=False, help="Read the runs from a file written by `export`"
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Time each report stage and write a profile report"),
+    sample_interval: float = typer.Option(
+        PROFILE_SAMPLE_INTERVAL, min=0.0, help="Seconds between stack samples with --profile (0 = stages only)"
+    ),
 ):
     """
     Run benchmark reports for specified run IDs.
@@ -85,13 +270,329 @@ def report(
         reporter_type (ReporterType, optional): Output format for the report.
             Defaults to 'CSV'.
             Use --reporter-type to select the format.
+        storage (StorageBackendType, optional): Backend to read the runs from.
+            Defaults to STORAGE_BACKEND.
+        input_file (Path, optional): Columnar run file written by `export`, read instead of
+            the storage backend. Run IDs are optional then.
+        profile (bool, optional): Time the query and each report, sample stacks and write
+            a summary table and a collapsed-stack file next to the reports.
 
     Examples:
         python cli.py report RUN_ID1 --reports sentences --reports mistakes --reporter-type csv
+        python cli.py report --input outputs/exports/RUN_ID1.arrow
     """
+    from reporting.report_runner import run_reports
+    from grammar_checker.profiling import profile_run
+
+    if not run_ids and not input_file:
+        raise typer.BadParameter("Pass the run IDs to report, or a run file with --input.", param_hint="RUN_IDS")
+
+    run_ids = run_ids or []
     logger.info("Run benchmark report mode...")
-    logger.debug(f"Arguments received: {run_ids=}, {reports=}, {reporter_type=}")
-    run_reports(run_ids, reports, reporter_type)
+    logger.debug(
+        "Arguments received: run_ids=%r, reports=%r, reporter_type=%r, storage=%r, input_file=%r",
+        run_ids,
+        reports,
+        reporter_type,
+        storage,
+        input_file,
+    )
+    with profile_run("report", enabled=profile, sample_interval=sample_interval):
+        if input_file:
+            run_reports(run_ids, reports, reporter_type, input_file=input_file)
+        else:
+            run_reports(run_ids, reports, reporter_type, storage=storage)
+
+
+@app.command()
+def export(
+    run_ids: List[str] = typer.Argument(..., help="Run UUIDs to export"),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="File to write: .arrow (memory-mapped by reports) or .parquet"
+    ),
+    storage: StorageBackendType = typer.Option(
+        STORAGE_BACKEND, case_sensitive=False, help="Backend the runs were saved to with --save-to"
+    ),
+    batch_size: int = typer.Option(EXPORT_BATCH_SIZE, min=1, help="Records per record batch / row group"),
+):
+    """
+    Export runs to a columnar file for `report --input`.
+
+    The runs are read from the storage backend once; reports on the file then build their
+    tables from its columns, without a Python object per stored document. Arrow IPC files
+    (.arrow) are written uncompressed so reports can memory-map them; Parquet files (.parquet)
+    are zstd-compressed. Both need pyarrow.
+
+    Examples:
+        python cli.py export RUN_ID1 RUN_ID2 --output outputs/exports/runs.arrow
+        python cli.py report --input outputs/exports/runs.arrow
+    """
+    from reporting.columnar import export_runs, file_format_of
+
+    output = output or EXPORT_DIR / f"{run_ids[0]}.arrow"
+    try:
+        file_format_of(output)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--output")
+
+    exported = export_runs(run_ids, output, storage=storage, batch_size=batch_size)
+    if not exported:
+        typer.echo(f"No records found for {', '.join(run_ids)}.", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Exported {exported} record(s) to {output}.")
+
+
+runs_app = typer.Typer(help="Browse benchmark runs through their summary documents.")
+app.add_typer(runs_app, name="runs")
+
+
+@runs_app.command("list")
+def runs_list(
+    limit: int = typer.Option(20, min=1, help="Number of runs to show, newest first"),
+    model: str = typer.Option(None, help="Only runs that benchmarked this model"),
+    storage: StorageBackendType = typer.Option(STORAGE_BACKEND, case_sensitive=False, help="Backend to read from"),
+):
+    """
+    List benchmark runs with their pass rate, models and prompt templates.
+
+    Reads one summary document per run (written at the end of each benchmark), never the
+    individual records.
+    """
+    from reporting.data_access import query_run_summaries
+    from grammar_checker.runs import format_run_list
+
+    runs = query_run_summaries(limit=limit, model=model, storage=storage)
+    if not runs:
+        typer.echo("No runs found.")
+        return
+    typer.echo(format_run_list(runs))
+
+
+@runs_app.command("show")
+def runs_show(
+    run_id: str = typer.Argument(..., help="Run UUID"),
+    as_json: bool = typer.Option(False, "--json", help="Print the summary document as JSON"),
+    storage: StorageBackendType = typer.Option(STORAGE_BACKEND, case_sensitive=False, help="Backend to read from"),
+):
+    """Show the configuration and per model/prompt counts, latency and tokens of one run."""
+    import json
+    from reporting.data_access import query_run_summary
+    from grammar_checker.runs import format_run
+
+    run = query_run_summary(run_id, storage=storage)
+    if run is None:
+        typer.echo(f"No summary found for run {run_id}.", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(json.dumps(run, indent=2, default=str) if as_json else format_run(run))
+
+
+usage_app = typer.Typer(help="Hourly and daily usage stats of the API, rolled up from its request log.")
+app.add_typer(usage_app, name="usage")
+
+
+@usage_app.command("rollup")
+def usage_rollup(
+    since: datetime = typer.Option(
+        None, help="Roll up from this UTC time on, e.g. after API downtime (default: previous and current period)"
+    ),
+):
+    """
+    Aggregate the API request log into hourly and daily usage documents.
+
+    The API does this every USAGE_ROLLUP_INTERVAL seconds while it runs; use this command from
+    cron or to backfill. API log records expire after API_LOG_TTL_SECONDS, so only periods
+    within that window can be (re)computed.
+
+    Examples:
+        python cli.py usage rollup
+        python cli.py usage rollup --since 2024-05-01T00:00:00
+    """
+    from grammar_checker.db import MongoDBHandler
+    from grammar_checker.usage import rollup_periods
+
+    with MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION) as mongo_handler:
+        count = rollup_periods(mongo_handler.db, since=since.replace(tzinfo=UTC) if since else None)
+    typer.echo(f"Rolled up {count} usage period(s).")
+
+
+@usage_app.command("show")
+def usage_show(
+    granularity: UsageGranularity = typer.Option(UsageGranularity.HOUR, case_sensitive=False, help="Rollup period"),
+    model: str = typer.Option(None, help="Only this model"),
+    limit: int = typer.Option(24, min=1, help="Number of rollups to show, newest first"),
+):
+    """Show requests, errors, latency percentiles and tokens per period and model."""
+    from reporting.data_access import query_api_usage
+    from grammar_checker.usage import format_usage
+
+    documents = query_api_usage(granularity.value, model=model, limit=limit)
+    if not documents:
+        typer.echo("No usage rollups found.")
+        return
+    typer.echo(format_usage(documents))
+
+
+@app.command("replay-spill")
+def replay_spill():
+    """
+    Write API records that were spilled to disk (PERSIST_SPILL_DIR) while MongoDB was unavailable.
+
+    The API replays its spill files by itself once MongoDB takes writes again; run this after the
+    API has stopped, e.g. to also pick up files a crashed replay left behind.
+    """
+    from grammar_checker.db import MongoDBHandler
+    from grammar_checker.persistence import RecordWriter
+
+    with MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION) as mongo_handler:
+        replayed = RecordWriter(mongo_handler).replay(include_claimed=True)
+    typer.echo(f"Replayed {replayed} spilled record(s).")
+
+
+@app.command()
+def reevaluate(
+    run_id: str = typer.Argument(..., help="Run UUID to evaluate again"),
+    mode: NormalizationMode = typer.Option(
+        EVALUATION_MODE, case_sensitive=False, help="How sentences are normalized before comparing"
+    ),
+    tolerance: int = typer.Option(EVALUATION_TOLERANCE, min=0, help="Token edits still counted as a sentence match"),
+    new_run: bool = typer.Option(
+        False, "--new-run/--in-place", help="Save the results as a new derived run instead of updating the records"
+    ),
+    workers: int = typer.Option(REEVALUATE_WORKERS, min=1, help="Evaluator processes"),
+    batch_size: int = typer.Option(REEVALUATE_BATCH_SIZE, min=1, help="Records per read and bulk write"),
+):
+    """
+    Re-apply the current evaluator to a stored run without calling the model.
+
+    The run's responses are streamed from MongoDB, evaluated in parallel and written back with
+    bulk updates: `match` and `evaluation` of each record's `benchmark_eval` are replaced, or,
+    with --new-run, the records are copied under a new run ID (keeping the original run intact).
+
+    Examples:
+        python cli.py reevaluate RUN_ID --mode punctuation
+        python cli.py reevaluate RUN_ID --tolerance 1 --new-run
+        python cli.py report NEW_RUN_ID
+    """
+    from reevaluate import reevaluate_run
+    from grammar_checker.db import MongoDBHandler
+
+    logger.info("Re-evaluating run %s...", run_id)
+    mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
+    summary = reevaluate_run(
+        mongo_handler, run_id, mode=mode, tolerance=tolerance, new_run=new_run, workers=workers, batch_size=batch_size
+    )
+    typer.echo(
+        f"Run {summary['run_id']}: {summary['records']} record(s), {summary['matched_before']} -> "
+        f"{summary['matched_after']} matched, {summary['changed']} changed."
+    )
+
+
+@app.command("migrate-records")
+def migrate_records(
+    to: RecordSchema = typer.Option(..., "--to", case_sensitive=False, help="Target record schema"),
+    run_ids: List[str] = typer.Option([], "--run-id", help="Only records of these runs (default: all)"),
+    batch_size: int = typer.Option(MIGRATE_BATCH_SIZE, min=1, help="Records per read and bulk write"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report how many records and bytes would change"),
+):
+    """
+    Convert stored benchmark records between the full and the lean schema.
+
+    Lean records keep their test case in a separate collection, stored once, and reference it
+    by `test_id` and `case_id`; reports and re-evaluation read both schemas. Records already in
+    the target schema are skipped, so the migration can be resumed.
+
+    Examples:
+        python cli.py migrate-records --to lean --dry-run
+        python cli.py migrate-records --to lean --run-id RUN_ID
+        python cli.py migrate-records --to full
+    """
+    from migrate_records import migrate_records as run_migration
+    from grammar_checker.db import MongoDBHandler
+
+    logger.info("Migrating records to the %s schema...", to.value)
+    mongo_handler = MongoDBHandler(MONGO_URI, MONGO_DB, MONGO_COLLECTION)
+    summary = run_migration(mongo_handler, to, run_ids=run_ids or None, batch_size=batch_size, dry_run=dry_run)
+    saved = summary["bytes_before"] - summary["bytes_after"]
+    typer.echo(
+        f"{'Would migrate' if dry_run else 'Migrated'} {summary['records']} record(s) to the {to.value} schema: "
+        f"{summary['bytes_before']} -> {summary['bytes_after']} bytes ({saved:+d} saved)."
+    )
+
+
+@app.command()
+def loadtest(
+    url: str = typer.Option(API_URL, help="Base URL of the grammar checker API"),
+    test_cases: List[Path] = typer.Option([TEST_CASES_FILE], help="Benchmark files used as sentence corpus"),
+    requests: int = typer.Option(100, min=1, help="Total number of requests to send"),
+    concurrency: int = typer.Option(10, min=1, help="Maximum number of requests in flight"),
+    rate: float = typer.Option(0.0, min=0.0, help="Target request rate per second (0 = as fast as possible)"),
+    models: List[str] = typer.Option([DEFAULT_MODEL], help="Models to cycle through"),
+    prompt_version: str = typer.Option(DEFAULT_PROMPT_TEMPLATE, help="Prompt template to request"),
+    reporter_type: ReporterType = typer.Option(
+        ReporterType.JSON, "--reporter", case_sensitive=False, help="Choose reporter type"
+    ),
+):
+    """
+    Load-test the /check-grammar/ endpoint and report throughput, latency percentiles,
+    error rates and Mongo write latency.
+
+    Requests only queue their log record (the `enqueue` stage); the Mongo insert latency is
+    that of the API's record writer, read from GET /metrics before and after the test.
+
+    Start the API with `run-api` first; to avoid spending tokens, point it at the
+    mock model server (`mock-llm`) via OPENAI_BASE_URL.
+
+    Examples:
+        python cli.py loadtest --requests 500 --concurrency 20 --rate 50 --reporter csv
+    """
+    from loadtest import main as loadtest_main
+
+    logger.info("Run load test mode...")
+    logger.debug(
+        "Arguments received: url=%r, test_cases=%r, requests=%r, concurrency=%r, rate=%r, models=%r",
+        url,
+        test_cases,
+        requests,
+        concurrency,
+        rate,
+        models,
+    )
+    loadtest_main(url, test_cases, requests, concurrency, rate, models, prompt_version, reporter_type.build())
+
+
+@app.command()
+def microbench(
+    benchmarks: List[str] = typer.Option([], "--benchmark", help="Benchmarks to run (default: all)"),
+    scales: List[str] = typer.Option(["1k"], "--scale", help="Dataset sizes: 1k, 100k, 1M or a document count"),
+    repeat: int = typer.Option(3, min=1, help="Timed runs per benchmark and scale"),
+    baseline: Path = typer.Option(MICROBENCH_BASELINE_FILE, help="Baseline results file"),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Store the results as the new baseline"),
+    compare: bool = typer.Option(False, "--compare", help="Compare the results against the baseline"),
+    threshold: float = typer.Option(0.1, min=0.0, help="Allowed slowdown before flagging a regression (0.1 = 10%)"),
+):
+    """
+    Run microbenchmarks for the pure-Python hot paths on synthetic data.
+
+    Exits with code 1 when --compare finds a regression beyond the threshold.
+
+    Examples:
+        python cli.py microbench --scale 1k --scale 100k --save-baseline
+        python cli.py microbench --scale 1k --scale 100k --compare --threshold 0.15
+    """
+    from microbench import main as microbench_main, BENCHMARKS
+
+    benchmarks = benchmarks or list(BENCHMARKS)
+    logger.info("Run microbenchmark mode...")
+    logger.debug(
+        "Arguments received: benchmarks=%r, scales=%r, repeat=%r, baseline=%r, compare=%r",
+        benchmarks,
+        scales,
+        repeat,
+        baseline,
+        compare,
+    )
+    if not microbench_main(benchmarks, scales, repeat, baseline, save_baseline, compare, threshold):
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+import json
+import time
+import uuid
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+from grammar_checker.logger import get_logger, get_display_path
+from grammar_checker.openai_client import OpenAIClient
+from grammar_checker.config import BATCH_DIR, BATCH_POLL_INTERVAL, BATCH_TIMEOUT
+
+logger = get_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Batch statuses after which polling stops; only "completed" has usable output
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_line(custom_id: str, model: str, prompt: str) -> dict:
+    """One request line of a Batch API input file."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": OpenAIClient.build_chat_request(model, prompt),
+    }
+
+
+def write_batch_file(lines: List[dict], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        for line in lines:
+            file.write(json.dumps(line) + "\n")
+    logger.info("Wrote %s batch request(s) to '%s'", len(lines), get_display_path(path))
+    return path
+
+
+def parse_batch_output(text: str) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """
+    Map each custom_id of a Batch API output (or error) file to the parsed model JSON, and to
+    the token usage of its request.
+
+    Lines that failed, or whose content is not valid JSON, map to {"error": message}. Usage is
+    kept for every answered line, in the same shape a traced model call records it.
+    """
+    outputs = {}
+    usage = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record["custom_id"]
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            error = record.get("error") or response.get("body", {}).get("error") or "request failed"
+            outputs[custom_id] = {"error": error.get("message", str(error)) if isinstance(error, dict) else str(error)}
+            continue
+        body = response["body"]
+        if body.get("usage"):
+            usage[custom_id] = {
+                "prompt_tokens": body["usage"]["prompt_tokens"],
+                "completion_tokens": body["usage"]["completion_tokens"],
+            }
+        content = body["choices"][0]["message"]["content"]
+        try:
+            outputs[custom_id] = json.loads(content)
+        except json.JSONDecodeError:
+            outputs[custom_id] = {"error": "Response content is not valid JSON."}
+    return outputs, usage
+
+
+class OpenAIBatchBackend:
+    """Submits batch files through the OpenAI Batch API."""
+
+    def __init__(self, client: OpenAIClient):
+        self.client = client.client
+
+    def submit(self, input_file: Path) -> str:
+        with open(input_file, "rb") as file:
+            uploaded = self.client.files.create(file=file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window=COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def fetch_output(self, batch_id: str) -> str:
+        batch = self.client.batches.retrieve(batch_id)
+        file_ids = [file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id]
+        return "\n".join(self.client.files.content(file_id).text for file_id in file_ids)
+
+
+class LocalBatchBackend:
+    """
+    File-backed stand-in for the Batch API, for tests and offline runs (e.g. against the mock model server).
+
+    Each submitted file is copied to `batch_dir/<batch_id>/` and answered line by line with regular
+    chat completion calls in a background thread, writing an output file in the Batch API format.
+    """
+
+    def __init__(self, client: OpenAIClient, batch_dir: Path = BATCH_DIR):
+        self.client = client.client
+        self.batch_dir = Path(batch_dir)
+
+    def _write_status(self, batch_id: str, status: str):
+        status_file = self.batch_dir / batch_id / "status"
+        tmp_file = status_file.with_suffix(".tmp")
+        tmp_file.write_text(status, encoding="utf-8")
+        tmp_file.replace(status_file)
+
+    def submit(self, input_file: Path) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        (self.batch_dir / batch_id).mkdir(parents=True)
+        shutil.copyfile(input_file, self.batch_dir / batch_id / "input.jsonl")
+        self._write_status(batch_id, "in_progress")
+        threading.Thread(target=self._process, args=(batch_id,), daemon=True).start()
+        return batch_id
+
+    def _process(self, batch_id: str):
+        batch_path = self.batch_dir / batch_id
+        try:
+            with (
+                open(batch_path / "input.jsonl", "r", encoding="utf-8") as input_file,
+                open(batch_path / "output.jsonl", "w", encoding="utf-8") as output_file,
+            ):
+                for line in input_file:
+                    if not line.strip():
+                        continue
+                    request = json.loads(line)
+                    record = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": request["custom_id"]}
+                    try:
+                        completion = self.client.chat.completions.create(**request["body"])
+                        record.update(response={"status_code": 200, "body": completion.model_dump()}, error=None)
+                    except Exception as e:
+                        record.update(response=None, error={"message": str(e)})
+                    output_file.write(json.dumps(record) + "\n")
+            self._write_status(batch_id, "completed")
+        except Exception as e:
+            logger.error("Local batch %s failed: %s", batch_id, e)
+            self._write_status(batch_id, "failed")
+
+    def status(self, batch_id: str) -> str:
+        return (self.batch_dir / batch_id / "status").read_text(encoding="utf-8")
+
+    def fetch_output(self, batch_id: str) -> str:
+        return (self.batch_dir / batch_id / "output.jsonl").read_text(encoding="utf-8")
+
+
+def wait_for_batch(
+    backend, batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL, timeout: float = BATCH_TIMEOUT
+) -> str:
+    """Poll the batch until it reaches a terminal status and return that status."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = backend.status(batch_id)
+        if status in TERMINAL_STATUSES:
+            logger.info("Batch %s finished with status '%s'.", batch_id, status)
+            return status
+        if time.monotonic() >= deadline:
+            logger.error("Batch %s did not finish within %s seconds (status '%s').", batch_id, timeout, status)
+            raise TimeoutError(f"Batch {batch_id} did not finish within {timeout} seconds.")
+        logger.debug("Batch %s status '%s', polling again in %s seconds.", batch_id, status, poll_interval)
+        time.sleep(poll_interval)
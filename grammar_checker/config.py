@@ -15,6 +15,36 @@ from pathlib import Path
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB = os.getenv("MONGO_DB")
 MONGO_COLLECTION = os.getenv("MONGO_COLLECTION")
+MONGO_RUNS_COLLECTION = os.getenv("MONGO_RUNS_COLLECTION", "runs")  # one summary document per benchmark run
+MONGO_TEST_CASES_COLLECTION = os.getenv("MONGO_TEST_CASES_COLLECTION", "test_cases")  # test cases of lean records
+RECORD_SCHEMA = os.getenv("RECORD_SCHEMA", "full")  # full or lean (see RecordSchema)
+MONGO_API_LOG_COLLECTION = os.getenv("MONGO_API_LOG_COLLECTION", "api_requests")  # API checks, expired by a TTL index
+MONGO_API_USAGE_COLLECTION = os.getenv("MONGO_API_USAGE_COLLECTION", "api_usage")  # hourly/daily rollups of the API log
+API_LOG_TTL_SECONDS = int(os.getenv("API_LOG_TTL_SECONDS", str(7 * 24 * 60 * 60)))  # API log retention
+USAGE_ROLLUP_INTERVAL = float(os.getenv("USAGE_ROLLUP_INTERVAL", "600"))  # seconds between rollups in the API, 0 = off
+
+# Buffered persistence of API records (written off the request path by a background thread)
+PERSIST_QUEUE_SIZE = int(os.getenv("PERSIST_QUEUE_SIZE", "10000"))  # records buffered before the overflow policy applies
+PERSIST_OVERFLOW = os.getenv("PERSIST_OVERFLOW", "spill")  # drop, block or spill (see OverflowPolicy)
+PERSIST_BLOCK_TIMEOUT = float(os.getenv("PERSIST_BLOCK_TIMEOUT", "1.0"))  # seconds "block" waits before dropping
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "100"))  # records per insert_many
+PERSIST_REPLAY_INTERVAL = float(os.getenv("PERSIST_REPLAY_INTERVAL", "30"))  # seconds between replays of spilled records
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))  # connections per process and server
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))  # connections kept open while idle
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))  # close connections idle this long, 0 = never
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))  # opening one connection
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))  # fail fast when down
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))  # one operation, 0 = no limit
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")  # wire compression, e.g. "zstd,snappy"; "" = off
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")  # w: 0, 1, 2, ... or "majority"
+MONGO_BLOCK_COMPRESSOR = os.getenv("MONGO_BLOCK_COMPRESSOR", "")  # snappy, zlib or zstd for new collections, "" = server default
+MIGRATE_BATCH_SIZE = int(os.getenv("MIGRATE_BATCH_SIZE", "1000"))  # records per read/bulk-write batch of migrate-records
+
+# OpenAI configuration
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. the local mock server: http://127.0.0.1:8001/v1
+
+# Grammar checker API (target of the load tester)
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
 
 # Models
 VALID_MODELS = [
@@ -27,6 +57,47 @@ DEFAULT_MODEL = "gpt-3.5-turbo"  # default model to use if none is specified
 # Path config
 PROJECT_ROOT = Path(__file__).resolve().parent.parent # resolve converts into an absolute path
 
+# Prefilter config (skip the model call for sentences that look clean)
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "False").lower() == "true"
+PREFILTER_THRESHOLD = float(os.getenv("PREFILTER_THRESHOLD", "0.9"))
+
+# Document mode config
+DOCUMENT_MAX_WORKERS = int(os.getenv("DOCUMENT_MAX_WORKERS", "8"))  # concurrent sentence checks per document
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "1024"))  # cached sentence responses
+
+# Job queue config (POST /jobs)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # worker threads draining the queue
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))  # tries per sentence before it is marked failed
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))  # seconds an idle worker waits
+
+# Batch benchmark config (benchmark --mode batch)
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "30"))  # seconds between status checks
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", str(24 * 60 * 60)))  # give up waiting after this many seconds
+
+RESULTS_CHUNK_SIZE = int(os.getenv("RESULTS_CHUNK_SIZE", "500"))  # results saved per write by streamed sync benchmarks
+
+# Sharded benchmark config (benchmark --mode sharded, benchmark-worker)
+MONGO_SHARDS_COLLECTION = os.getenv("MONGO_SHARDS_COLLECTION", "benchmark_shards")  # work shards of sharded runs
+SHARD_SIZE = int(os.getenv("SHARD_SIZE", "25"))  # test cases per shard
+SHARD_LEASE_SECONDS = float(os.getenv("SHARD_LEASE_SECONDS", "600"))  # a claim older than this can be taken over
+SHARD_MAX_ATTEMPTS = int(os.getenv("SHARD_MAX_ATTEMPTS", "3"))  # tries per shard before it is marked failed
+SHARD_POLL_INTERVAL = float(os.getenv("SHARD_POLL_INTERVAL", "2"))  # seconds between progress/claim polls
+
+# Evaluation config
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "strict")  # strict, whitespace or punctuation (see NormalizationMode)
+EVALUATION_TOLERANCE = int(os.getenv("EVALUATION_TOLERANCE", "0"))  # token edits still counted as a sentence match
+EVALUATION_MAX_DISTANCE = int(os.getenv("EVALUATION_MAX_DISTANCE", "10"))  # edit distances above this are not computed
+EVALUATION_CACHE_SIZE = int(os.getenv("EVALUATION_CACHE_SIZE", "100000"))  # memoized (expected, actual) evaluations
+REEVALUATE_BATCH_SIZE = int(os.getenv("REEVALUATE_BATCH_SIZE", "1000"))  # records per read/evaluate/bulk-write batch
+REEVALUATE_WORKERS = int(os.getenv("REEVALUATE_WORKERS", str(os.cpu_count() or 1)))  # evaluator processes
+
+# Prompt experiment config (benchmark --mode experiment)
+EXPERIMENT_CONFIDENCE = float(os.getenv("EXPERIMENT_CONFIDENCE", "0.95"))  # confidence of never dropping the best arm, over all arms and looks
+EXPERIMENT_MIN_SAMPLES = int(os.getenv("EXPERIMENT_MIN_SAMPLES", "30"))  # results per arm before any arm is dropped
+
+# Profiling config (benchmark/report --profile)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))  # seconds between stack samples, 0 = off
+
 # Prompt version config
 PROMPTS_DIR = PROJECT_ROOT / "prompts"
 DEFAULT_PROMPT_TEMPLATE = "v1_original.txt"
@@ -39,6 +110,15 @@ TEST_CASES_FILE_DEV = BENCHMARKS_DIR / "test_cases_DEV_2.json"
 # Benchmark Results config
 REPORTS_DIR = PROJECT_ROOT / "outputs" #/ "reports"
 TEST_RESULTS_FILE = REPORTS_DIR / "test_results.json"
+MICROBENCH_BASELINE_FILE = REPORTS_DIR / "microbench_baseline.json"
+BATCH_DIR = REPORTS_DIR / "batches"  # batch input files and local batch stand-in state
+JOBS_DB_PATH = Path(os.getenv("JOBS_DB_PATH", PROJECT_ROOT / "outputs" / "jobs.sqlite3"))
+PERSIST_SPILL_DIR = Path(os.getenv("PERSIST_SPILL_DIR", PROJECT_ROOT / "outputs" / "spill"))  # records Mongo did not take
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo")  # mongo, sqlite, jsonl or parquet (--save-to/--storage)
+SQLITE_STORAGE_PATH = Path(os.getenv("SQLITE_STORAGE_PATH", PROJECT_ROOT / "outputs" / "benchmarks.sqlite3"))
+FILE_STORAGE_DIR = Path(os.getenv("FILE_STORAGE_DIR", PROJECT_ROOT / "outputs" / "storage"))  # jsonl/parquet records
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", PROJECT_ROOT / "outputs" / "exports"))  # columnar run files of `cli.py export`
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "10000"))  # records per Arrow record batch / Parquet row group
 
 # logging configuration
 LOG_DIR = PROJECT_ROOT / "outputs" #/ "logs"
@@ -46,3 +126,5 @@ LOG_FILE = LOG_DIR / "grammar_checker.log"
 
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # "text" or "json" (one object per line)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "50"))  # INFO records per second per logger, 0 = keep all
@@ -1,71 +1,224 @@
-from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import ObjectId
 from datetime import datetime, UTC
 from grammar_checker.logger import get_logger
+from grammar_checker.mongo import get_client
+from grammar_checker.tracing import stage, get_trace
+from grammar_checker.factory import RecordSchema
+from grammar_checker.records import build_record, split_record, hydrate_records
+from grammar_checker.storage import StorageBackend
+from grammar_checker.config import (
+    MONGO_RUNS_COLLECTION,
+    MONGO_TEST_CASES_COLLECTION,
+    MONGO_API_LOG_COLLECTION,
+    MONGO_BLOCK_COMPRESSOR,
+    API_LOG_TTL_SECONDS,
+    RECORD_SCHEMA,
+)
 from models.request import GrammarRequest
 from models.response import GrammarResponse
 
 
 logger = get_logger(__name__)
 
+DUPLICATE_KEY = 11000
 
-class MongoDBHandler:
-    def __init__(self, uri, database_name, collection_name):
+
+def ensure_collection(database, name: str, block_compressor: str = MONGO_BLOCK_COMPRESSOR):
+    """
+    Create `name` with the configured block compressor if it does not exist yet.
+
+    WiredTiger fixes the compressor when a collection is created, so existing collections keep theirs.
+    """
+    if block_compressor and name not in database.list_collection_names():
+        database.create_collection(
+            name, storageEngine={"wiredTiger": {"configString": f"block_compressor={block_compressor}"}}
+        )
+        logger.info("Created collection %s with %s block compression.", name, block_compressor)
+    return database[name]
+
+
+def ensure_ttl_index(collection, field: str, expire_after_seconds: int):
+    """Expire documents `expire_after_seconds` after their `field`; an existing TTL index is changed in place."""
+    try:
+        collection.create_index(field, expireAfterSeconds=expire_after_seconds)
+    except OperationFailure:
+        collection.database.command(
+            "collMod", collection.name, index={"keyPattern": {field: 1}, "expireAfterSeconds": expire_after_seconds}
+        )
+        logger.info("Changed the TTL of %s to %s s.", collection.name, expire_after_seconds)
+
+
+class MongoDBHandler(StorageBackend):
+    label = "MongoDB"
+
+    def __init__(self, uri, database_name, collection_name, record_schema: RecordSchema | str = RECORD_SCHEMA):
         self.client = None
         self.database = None
         self.collection = None
+        self.test_cases = None
+        self.api_log = None
         self.uri = uri
         self.database_name = database_name
         self.collection_name = collection_name
+        self.record_schema = RecordSchema(record_schema)
+        self._saved_cases = set()  # test cases known to be stored, so each is written once per handler
 
     def connect(self):
         if not self.client:
-            self.client = MongoClient(self.uri)
+            self.client = get_client(self.uri)
             self.db = self.client[self.database_name]
-            self.collection = self.db[self.collection_name]
-            logger.debug(f"Connected to MongoDB: {self.database_name}/{self.collection_name}")
+            self.collection = ensure_collection(self.db, self.collection_name)
+            self.test_cases = ensure_collection(self.db, MONGO_TEST_CASES_COLLECTION)
+            self.api_log = None  # created with its TTL index on first use
+            logger.debug("Connected to MongoDB: %s/%s", self.database_name, self.collection_name)
 
     def disconnect(self):
+        # the client is shared by the process, so only this handler's references are dropped
         if self.client:
-            self.client.close()
-            logger.debug(f"Disconnected from MongoDB: {self.database_name}/{self.collection_name}.")
+            logger.debug("Disconnected from MongoDB: %s/%s.", self.database_name, self.collection_name)
             self.client = None
             self.database = None
             self.collection = None
+            self.test_cases = None
+            self.api_log = None
         else:
-            logger.debug(f"No active MongoDB connection to close: {self.database_name}/{self.collection_name}")
+            logger.debug("No active MongoDB connection to close: %s/%s", self.database_name, self.collection_name)
 
     def save_record(self, request: GrammarRequest, response: GrammarResponse, benchmark_eval=None):
         try:
-            record = {
-                "request": request.model_dump(),
-                "response": response.model_dump(),
-                "timestamp": datetime.now(UTC),
-            }
-            if benchmark_eval:
-                record["benchmark_eval"] = benchmark_eval
-        
-            result = self.collection.insert_one(record)
-            logger.debug(f"Record inserted with ID: {result.inserted_id}")
+            record = build_record(request, response, benchmark_eval)
+            if self.record_schema == RecordSchema.LEAN:
+                record, case = split_record(record)
+                if case:
+                    self.save_test_case(case)
+
+            with stage("mongo_insert"):
+                result = self.collection.insert_one(record)
+            logger.debug("Record inserted with ID: %s", result.inserted_id)
             return result.inserted_id
         except Exception as e:
-            logger.error(f"Failed to save record: {e}")
+            logger.error("Failed to save record: %s", e)
             raise e
 
+    def save_records(self, records: list) -> int:
+        """Insert full records with one bulk write, split first when the handler saves the lean schema."""
+        if not records:
+            return 0
+        try:
+            if self.record_schema == RecordSchema.LEAN:
+                split = [split_record(record) for record in records]
+                for _, case in split:
+                    if case:
+                        self.save_test_case(case)
+                records = [record for record, _ in split]
+            with stage("mongo_insert"):
+                inserted = len(self.collection.insert_many(records).inserted_ids)
+            logger.debug("Inserted %d record(s).", inserted)
+            return inserted
+        except Exception as e:
+            logger.error("Failed to save records: %s", e)
+            raise e
+
+    def build_api_record(self, request, response=None, error: str | None = None, endpoint: str | None = None) -> dict:
+        """
+        API log document of one check, built in the request's thread: failed checks get `error`, and
+        latency and token usage are read from the current trace, so the hourly/daily usage rollups
+        can be computed from the API log alone. The `_id` is set here, so replaying it is idempotent.
+        """
+        record = {
+            "_id": ObjectId(),
+            "timestamp": datetime.now(UTC),
+            "endpoint": endpoint,
+            "model": request.model,
+            "prompt_version": request.prompt_version,
+            "status": "error" if error else "ok",
+            "request": request.model_dump(),
+        }
+        if response is not None:
+            record["response"] = response.model_dump()
+        if error:
+            record["error"] = error
+        trace = get_trace()
+        if trace is not None:
+            record["request_id"] = trace.request_id
+            record["latency_ms"] = round(trace.elapsed_ms, 3)
+            record.update(trace.usage)
+        return record
+
+    def insert_api_records(self, records: list) -> int:
+        """
+        Insert API log documents, which expire after API_LOG_TTL_SECONDS; documents that are already
+        stored (e.g. replayed after a partial write) are skipped. Returns the number inserted.
+        """
+        try:
+            if self.api_log is None:
+                self.api_log = ensure_collection(self.db, MONGO_API_LOG_COLLECTION)
+                ensure_ttl_index(self.api_log, "timestamp", API_LOG_TTL_SECONDS)
+            with stage("mongo_insert"):
+                try:
+                    inserted = len(self.api_log.insert_many(records, ordered=False).inserted_ids)
+                except BulkWriteError as e:
+                    if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                        raise
+                    inserted = e.details["nInserted"]
+            logger.debug("Inserted %d API record(s).", inserted)
+            return inserted
+        except Exception as e:
+            logger.error("Failed to save API records: %s", e)
+            raise e
+
+    def save_api_record(self, request, response=None, error: str | None = None, endpoint: str | None = None):
+        """Save one API check to the API log collection right away (see `RecordWriter` for the buffered path)."""
+        record = self.build_api_record(request, response, error, endpoint)
+        self.insert_api_records([record])
+        return record["_id"]
+
+    def save_test_case(self, case: dict):
+        """Store a test case of lean records unless it is already there."""
+        if case["_id"] in self._saved_cases:
+            return
+        fields = {key: value for key, value in case.items() if key != "_id"}
+        with stage("mongo_insert"):
+            self.test_cases.update_one({"_id": case["_id"]}, {"$setOnInsert": fields}, upsert=True)
+        self._saved_cases.add(case["_id"])
+
+    def hydrate(self, records: list) -> list:
+        """Full form of stored records, whichever schema they were saved with."""
+        return hydrate_records(records, self.test_cases)
+
+    def save_run_summary(self, summary: dict):
+        """Write (or replace) the summary document of a run in the runs collection."""
+        try:
+            runs = self.client[self.database_name][MONGO_RUNS_COLLECTION]
+            runs.create_index([("started_at", -1)])
+            runs.replace_one({"_id": summary["run_id"]}, summary, upsert=True)
+            logger.info("Saved summary of run %s.", summary["run_id"])
+        except Exception as e:
+            logger.error("Failed to save run summary: %s", e)
+            raise
+
+    def query_benchmark_data(self, run_ids: list) -> list:
+        query = {"benchmark_eval.run_id": {"$in": run_ids}}
+        projection = {"_id": 0, "request": 1, "response": 1, "benchmark_eval": 1, "timestamp": 1, "schema": 1}
+        return self.hydrate(list(self.collection.find(query, projection)))
+
+    def query_run_summaries(self, limit: int = 20, model: str | None = None) -> list:
+        query = {"config.models": model} if model else {}
+        runs = self.client[self.database_name][MONGO_RUNS_COLLECTION]
+        return list(runs.find(query, {"_id": 0, "arms": 0}).sort("started_at", -1).limit(limit))
+
+    def query_run_summary(self, run_id: str) -> dict | None:
+        return self.client[self.database_name][MONGO_RUNS_COLLECTION].find_one({"_id": run_id}, {"_id": 0})
+
     # delete record
     def delete_record(self, record_id):
         try:
             result = self.collection.delete_one({"_id": record_id})
             if result.deleted_count > 0:
-                logger.debug(f"Record with ID {record_id} deleted successfully.")
+                logger.debug("Record with ID %s deleted successfully.", record_id)
             else:
-                logger.warning(f"No record found with ID {record_id}.")
+                logger.warning("No record found with ID %s.", record_id)
         except Exception as e:
-            logger.error(f"Failed to delete record: {e}")
+            logger.error("Failed to delete record: %s", e)
             raise
-
-    def __enter__(self):
-        self.connect()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.disconnect()
@@ -0,0 +1,178 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, TextIO, Tuple
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import propagate_context
+from grammar_checker.prompt_builder import PromptBuilder
+from grammar_checker.openai_client import OpenAIClient
+from grammar_checker.grammar_checker import GrammarChecker
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.config import DOCUMENT_MAX_WORKERS, DOCUMENT_CACHE_SIZE
+from models.response import GrammarResponse, DocumentResponse, DocumentSegment, LocatedMistake
+
+logger = get_logger(__name__)
+
+# A sentence runs up to terminal punctuation (plus closing quotes/brackets) followed by whitespace,
+# up to a blank line, or up to the end of the text.
+SENTENCE_PATTERN = re.compile(r"\S.*?(?:[.!?]+[\"')\]]*(?=\s|$)|(?=\n[ \t]*\n)|$)", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Segment:
+    text: str
+    start: int
+    end: int
+
+
+def segment_sentences(text: str) -> List[Segment]:
+    """Split text into sentences, keeping their character offsets into `text`."""
+    segments = []
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().rstrip()
+        if sentence:
+            segments.append(Segment(sentence, match.start(), match.start() + len(sentence)))
+    return segments
+
+
+def iter_paragraphs(file: TextIO) -> Iterator[Tuple[int, str]]:
+    """Stream (character offset, paragraph) pairs from a file, splitting on blank lines."""
+    offset = 0
+    paragraph_start = 0
+    lines = []
+    for line in file:
+        if line.strip():
+            if not lines:
+                paragraph_start = offset
+            lines.append(line)
+        elif lines:
+            yield paragraph_start, "".join(lines).rstrip("\n")
+            lines = []
+        offset += len(line)
+    if lines:
+        yield paragraph_start, "".join(lines).rstrip("\n")
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of grammar responses keyed by (model, prompt template, sentence)."""
+
+    def __init__(self, max_size: int = DOCUMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> GrammarResponse | None:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, response: GrammarResponse) -> None:
+        with self._lock:
+            self._items[key] = response
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+# shared across requests so sentences repeated between documents are free as well
+response_cache = ResponseCache()
+
+
+def locate_mistakes(segment: Segment, response: GrammarResponse, offset: int = 0) -> List[LocatedMistake]:
+    """
+    Attach document offsets to a segment's mistakes.
+
+    Mistakes are searched left to right so repeated words map to successive occurrences;
+    mistakes whose `original` text cannot be found get `start`/`end` of None.
+    """
+    located = []
+    cursor = 0
+    for mistake in response.mistakes:
+        original = mistake.original
+        index = segment.text.find(original, cursor) if original else -1
+        if index == -1 and original:
+            index = segment.text.lower().find(original.lower(), cursor)
+        if index == -1:
+            located.append(LocatedMistake(mistake.type, mistake.original, mistake.corrected))
+            continue
+        cursor = index + len(original)
+        start = offset + segment.start + index
+        located.append(LocatedMistake(mistake.type, mistake.original, mistake.corrected, start, start + len(original)))
+    return located
+
+
+class DocumentChecker:
+    def __init__(
+        self,
+        prompt_builder: PromptBuilder,
+        model: str,
+        client: OpenAIClient,
+        prefilter: PreFilter | None = None,
+        max_workers: int = DOCUMENT_MAX_WORKERS,
+        cache: ResponseCache = response_cache,
+    ):
+        self.prompt_builder = prompt_builder
+        self.model = model
+        self.client = client
+        self.prefilter = prefilter
+        self.max_workers = max_workers
+        self.cache = cache
+
+    def _check_sentence(self, sentence: str) -> GrammarResponse:
+        key = (self.model, self.prompt_builder.prompt_template, sentence)
+        response = self.cache.get(key)
+        if response is None:
+            grammar_checker = GrammarChecker(self.prompt_builder, sentence, self.model, self.client, self.prefilter)
+            response = grammar_checker.check_grammar()
+            self.cache.put(key, response)
+        return response
+
+    def check_document(self, text: str, offset: int = 0) -> DocumentResponse:
+        """
+        Check every sentence of `text` concurrently and stitch the results into one response.
+
+        `offset` is added to all character positions, e.g. the position of a paragraph in a file.
+        """
+        segments = segment_sentences(text)
+        if not segments:
+            raise ValueError("Document contains no sentences.")
+
+        # check each distinct sentence once, even if it repeats within the document
+        unique_sentences = list(dict.fromkeys(segment.text for segment in segments))
+        logger.info("Checking document with %d sentence(s), %d unique.", len(segments), len(unique_sentences))
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(unique_sentences)))) as executor:
+            check_sentence = propagate_context(self._check_sentence)
+            responses = dict(zip(unique_sentences, executor.map(check_sentence, unique_sentences)))
+
+        mistakes = []
+        corrected_parts = [text[: segments[0].start]]
+        document_segments = []
+        for index, segment in enumerate(segments):
+            response = responses[segment.text]
+            mistakes.extend(locate_mistakes(segment, response, offset))
+            corrected_parts.append(response.corrected_sentence)
+            next_start = segments[index + 1].start if index + 1 < len(segments) else len(text)
+            corrected_parts.append(text[segment.end : next_start])
+            document_segments.append(
+                DocumentSegment(
+                    start=offset + segment.start,
+                    end=offset + segment.end,
+                    input=segment.text,
+                    corrected_sentence=response.corrected_sentence,
+                )
+            )
+
+        return DocumentResponse(
+            input=text,
+            mistakes=mistakes,
+            corrected_sentence="".join(corrected_parts),
+            segments=document_segments,
+        )
@@ -1,20 +1,170 @@
-from models.response import GrammarResponse
+import re
+from collections import Counter
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Sequence, Tuple
+from grammar_checker.factory import NormalizationMode
+from grammar_checker.config import (
+    EVALUATION_MODE,
+    EVALUATION_TOLERANCE,
+    EVALUATION_MAX_DISTANCE,
+    EVALUATION_CACHE_SIZE,
+)
+from models.response import GrammarResponse, Mistake
+from models.benchmark_case import BenchmarkCase
 
-# Simple evaluator
-def evaluate_response(expected: dict, actual: GrammarResponse):
-    def normalize(s):
-        return s.strip().lower()
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*|[^\w\s]")
+SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?;:])")
+WHITESPACE = re.compile(r"\s+")
 
-    correct_sentence = normalize(expected["corrected_sentence"])
-    actual_sentence = normalize(actual.corrected_sentence)
 
-    # Compare full sentence
-    sentence_match = correct_sentence == actual_sentence
+@dataclass(frozen=True, slots=True)
+class Evaluation:
+    """How one model response compares with the expected test case."""
+
+    match: bool  # sentence match and every expected mistake type reported
+    sentence_match: bool
+    edit_distance: int  # token edits between the sentences, EVALUATION_MAX_DISTANCE + 1 when above the cap
+    similarity: float  # 1 - edit_distance / longer sentence in tokens
+    mistake_precision: float  # reported mistakes that are expected (type, original and correction)
+    mistake_recall: float  # expected mistakes that were reported
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@lru_cache(maxsize=EVALUATION_CACHE_SIZE)
+def normalize(text: str, mode: NormalizationMode = NormalizationMode.STRICT) -> str:
+    text = text.strip().lower()
+    if mode == NormalizationMode.WHITESPACE:
+        text = SPACE_BEFORE_PUNCTUATION.sub(r"\1", WHITESPACE.sub(" ", text))
+    elif mode == NormalizationMode.PUNCTUATION:
+        text = " ".join(token for token in TOKEN_PATTERN.findall(text) if token[0].isalnum() or token[0] == "_")
+    return text
+
+
+@lru_cache(maxsize=EVALUATION_CACHE_SIZE)
+def tokenize(text: str, mode: NormalizationMode = NormalizationMode.STRICT) -> Tuple[str, ...]:
+    return tuple(TOKEN_PATTERN.findall(normalize(text, mode)))
+
+
+def token_edit_distance(a: Sequence[str], b: Sequence[str], max_distance: int | None = None) -> int:
+    """
+    Levenshtein distance between two token sequences.
+
+    With `max_distance` only the diagonal band that can stay within it is computed, and the
+    search stops as soon as a whole row exceeds it; `max_distance + 1` is returned in that case.
+    """
+    # common prefix and suffix never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        distance = len(a)
+        return distance if max_distance is None or distance <= max_distance else max_distance + 1
+
+    limit = max_distance if max_distance is not None else len(a)
+    if len(a) - len(b) > limit:
+        return limit + 1
+
+    beyond = limit + 1
+    previous = [j if j <= limit else beyond for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [beyond] * (len(b) + 1)
+        current[0] = i if i <= limit else beyond
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost, beyond)
+        if min(current[max(0, low - 1) : high + 1]) > limit:
+            return beyond
+        previous = current
+    return min(previous[len(b)], beyond)
+
+
+def _mistake_key(mistake: Mistake, mode: NormalizationMode) -> tuple:
+    return mistake.type, normalize(mistake.original, mode), normalize(mistake.corrected, mode)
+
+
+def mistake_scores(
+    expected: Sequence[Mistake], actual: Sequence[Mistake], mode: NormalizationMode = NormalizationMode.STRICT
+) -> Tuple[float, float]:
+    """Precision and recall of the reported mistakes; each expected mistake can be matched once."""
+    matched = sum(
+        (Counter(_mistake_key(m, mode) for m in expected) & Counter(_mistake_key(m, mode) for m in actual)).values()
+    )
+    precision = matched / len(actual) if actual else float(not expected)
+    recall = matched / len(expected) if expected else 1.0
+    return precision, recall
+
+
+@lru_cache(maxsize=EVALUATION_CACHE_SIZE)
+def _evaluate(
+    expected_sentence: str,
+    expected_mistakes: Tuple[Mistake, ...],
+    actual_sentence: str,
+    actual_mistakes: Tuple[Mistake, ...],
+    mode: NormalizationMode,
+    tolerance: int,
+    max_distance: int,
+) -> Evaluation:
+    expected_tokens, actual_tokens = tokenize(expected_sentence, mode), tokenize(actual_sentence, mode)
+    distance = token_edit_distance(expected_tokens, actual_tokens, max(max_distance, tolerance))
+    longest = max(len(expected_tokens), len(actual_tokens))
+    sentence_match = normalize(expected_sentence, mode) == normalize(actual_sentence, mode) or (
+        tolerance > 0 and distance <= tolerance
+    )
 
     # Compare mistakes (loosely – for demo purposes)
-    mistake_types_match = all(
-        any(m["type"] == e["type"] for m in actual.mistakes)
-        for e in expected["mistakes"]
+    mistake_types_match = all(any(m.type == e.type for m in actual_mistakes) for e in expected_mistakes)
+    precision, recall = mistake_scores(expected_mistakes, actual_mistakes, mode)
+
+    return Evaluation(
+        match=sentence_match and mistake_types_match,
+        sentence_match=sentence_match,
+        edit_distance=distance,
+        similarity=round(max(0.0, 1 - distance / longest), 4) if longest else 1.0,
+        mistake_precision=round(precision, 4),
+        mistake_recall=round(recall, 4),
     )
 
-    return sentence_match and mistake_types_match
+
+def evaluate(
+    expected: BenchmarkCase,
+    actual: GrammarResponse,
+    mode: NormalizationMode | str = EVALUATION_MODE,
+    tolerance: int = EVALUATION_TOLERANCE,
+    max_distance: int = EVALUATION_MAX_DISTANCE,
+) -> Evaluation:
+    """
+    Compare a response with its test case under a normalization `mode`.
+
+    Results are memoized on the (expected, actual) pair, so re-evaluating stored runs where
+    the same answers recur is mostly cache hits.
+    """
+    return _evaluate(
+        expected.corrected_sentence,
+        tuple(expected.mistakes),
+        actual.corrected_sentence,
+        tuple(actual.mistakes),
+        NormalizationMode(mode),
+        tolerance,
+        max_distance,
+    )
+
+
+def evaluate_response(expected: BenchmarkCase, actual: GrammarResponse, mode=NormalizationMode.STRICT) -> bool:
+    """Sentence match (exact after normalization) and every expected mistake type reported."""
+    return evaluate(expected, actual, mode=mode, tolerance=0).match
+
+
+def clear_evaluation_cache():
+    for cached in (_evaluate, normalize, tokenize):
+        cached.cache_clear()
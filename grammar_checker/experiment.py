@@ -0,0 +1,143 @@
+import math
+from statistics import NormalDist
+from typing import Dict, List, Tuple
+from grammar_checker.logger import get_logger
+from grammar_checker.config import EXPERIMENT_CONFIDENCE, EXPERIMENT_MIN_SAMPLES
+
+logger = get_logger(__name__)
+
+
+def wilson_interval(passed: int, total: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval of a pass rate; stays inside [0, 1] and is usable for small samples."""
+    if total == 0:
+        return 0.0, 1.0
+    rate = passed / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class Arm:
+    """One (model, prompt template) combination of an experiment and its running pass rate."""
+
+    def __init__(self, model: str, template: str):
+        self.model = model
+        self.template = template
+        self.passed = 0
+        self.total = 0
+        self.active = True
+        self.stopped_after: int | None = None  # test cases seen when the arm was dropped
+
+    @property
+    def name(self) -> str:
+        return f"{self.model} | {self.template}"
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.total if self.total else 0.0
+
+    def record(self, match: bool):
+        self.total += 1
+        self.passed += int(match)
+
+
+class Experiment:
+    """
+    Sequential comparison of arms on the same stream of test cases.
+
+    Every active arm is run on each test case, so all arms are compared on the same cases. Once
+    each arm has `min_samples` results, an arm whose interval upper bound falls below the best
+    lower bound is dominated and stops getting calls.
+
+    Dominance is tested after every test case, so the error rate is spent over looks: look k (the
+    k-th test case from `min_samples` on) uses alpha / (arms * k * (k + 1)), which sums to alpha
+    over all looks and arms. With probability at least `confidence` every interval then covers its
+    arm's pass rate at every look (up to the normal approximation of the Wilson interval), so the
+    best arm is never dropped, however long the experiment runs. The price is intervals that widen
+    slowly with the number of looks; `min_samples` skips the first, noisiest looks.
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        prompt_templates: List[str],
+        confidence: float = EXPERIMENT_CONFIDENCE,
+        min_samples: int = EXPERIMENT_MIN_SAMPLES,
+    ):
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("Experiment confidence must be between 0 and 1.")
+        self.arms = [Arm(model, template) for model in models for template in prompt_templates]
+        if not self.arms:
+            raise ValueError("An experiment needs at least one model and prompt template.")
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.alpha = (1 - confidence) / len(self.arms)
+        self.cases_seen = 0
+        self._z: Dict[int, float] = {}
+
+    def active_arms(self) -> List[Arm]:
+        return [arm for arm in self.arms if arm.active]
+
+    def z(self, total: int) -> float:
+        """Two-sided z of an arm with `total` results, from the share of alpha spent on its look."""
+        look = max(1, total - self.min_samples + 1)
+        if look not in self._z:
+            self._z[look] = NormalDist().inv_cdf(1 - self.alpha / (look * (look + 1)) / 2)
+        return self._z[look]
+
+    def interval(self, arm: Arm) -> Tuple[float, float]:
+        return wilson_interval(arm.passed, arm.total, self.z(arm.total))
+
+    def update(self) -> List[Arm]:
+        """Count one more test case and drop dominated arms; returns the arms dropped now."""
+        self.cases_seen += 1
+        active = self.active_arms()
+        if len(active) < 2 or any(arm.total < self.min_samples for arm in active):
+            return []
+
+        best_lower = max(self.interval(arm)[0] for arm in active)
+        dropped = [arm for arm in active if self.interval(arm)[1] < best_lower]
+        for arm in dropped:
+            arm.active = False
+            arm.stopped_after = self.cases_seen
+            low, high = self.interval(arm)
+            logger.info(
+                "Dropped %s after %s case(s): pass rate %.3f [%.3f, %.3f] is below the best lower bound %.3f.",
+                arm.name,
+                arm.total,
+                arm.pass_rate,
+                low,
+                high,
+                best_lower,
+            )
+        return dropped
+
+    @property
+    def finished(self) -> bool:
+        """True once a single arm is left, i.e. the remaining cases cannot change the winner."""
+        return len(self.arms) > 1 and len(self.active_arms()) == 1
+
+    def summary(self) -> List[Dict]:
+        """One row per arm, best pass rate first."""
+        rows = []
+        for arm in sorted(self.arms, key=lambda arm: arm.pass_rate, reverse=True):
+            low, high = self.interval(arm)
+            rows.append(
+                {
+                    "model": arm.model,
+                    "prompt_version": arm.template,
+                    "total": arm.total,
+                    "passed": arm.passed,
+                    "pass_rate": round(arm.pass_rate, 4),
+                    "ci_low": round(low, 4),
+                    "ci_high": round(high, 4),
+                    "active": arm.active,
+                    "stopped_after": arm.stopped_after,
+                }
+            )
+        return rows
+
+    def calls_saved(self, total_cases: int) -> int:
+        """Model calls a full sweep of `total_cases` over every arm would have made on top of this experiment."""
+        return total_cases * len(self.arms) - sum(arm.total for arm in self.arms)
@@ -0,0 +1,77 @@
+# grammar_checker/factory.py
+# Enums behind CLI options. Implementations are imported inside the mapping methods so that
+# building the CLI does not load the OpenAI SDK.
+from enum import Enum
+
+
+class BenchmarkMode(str, Enum):
+    SYNC = "sync"  # one chat completion call per test case
+    BATCH = "batch"  # all prompts submitted as one provider batch
+    SHARDED = "sharded"  # split into Mongo-backed shards run by several worker processes
+    EXPERIMENT = "experiment"  # interleave arms per test case and stop dominated ones early
+
+
+class NormalizationMode(str, Enum):
+    STRICT = "strict"  # case and surrounding whitespace ignored
+    WHITESPACE = "whitespace"  # also runs of whitespace and spaces before punctuation
+    PUNCTUATION = "punctuation"  # words only, punctuation ignored
+
+
+class RecordSchema(str, Enum):
+    FULL = "full"  # request, response and the whole test case in every record
+    LEAN = "lean"  # test cases stored once, records reference them by test_id and case_id
+
+
+class UsageGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class OverflowPolicy(str, Enum):
+    DROP = "drop"  # discard the record and count it
+    BLOCK = "block"  # make the request wait for room, up to PERSIST_BLOCK_TIMEOUT, then drop
+    SPILL = "spill"  # append it to a local file that is replayed once Mongo takes writes again
+
+
+class StorageBackendType(str, Enum):
+    MONGO = "mongo"
+    SQLITE = "sqlite"  # one local database file, no server needed
+    JSONL = "jsonl"  # append-only JSON lines, one file per run
+    PARQUET = "parquet"  # append-only Parquet part files per run (needs pyarrow)
+
+    @classmethod
+    def _missing_(cls, value):
+        # output destinations of earlier versions
+        return {"save_to_db": cls.MONGO, "save_to_file": cls.JSONL}.get(value)
+
+    def build(self):
+        from grammar_checker import config
+        from grammar_checker.db import MongoDBHandler
+        from grammar_checker.storage import SQLiteStorage, FileStorage
+
+        # paths and names are read when the backend is built, so tests can point them elsewhere
+        mapping = {
+            StorageBackendType.MONGO: lambda: MongoDBHandler(
+                config.MONGO_URI, config.MONGO_DB, config.MONGO_COLLECTION
+            ),
+            StorageBackendType.SQLITE: lambda: SQLiteStorage(config.SQLITE_STORAGE_PATH),
+            StorageBackendType.JSONL: lambda: FileStorage(config.FILE_STORAGE_DIR, "jsonl"),
+            StorageBackendType.PARQUET: lambda: FileStorage(config.FILE_STORAGE_DIR, "parquet"),
+        }
+
+        return mapping[self]()
+
+
+class BatchBackendType(str, Enum):
+    OPENAI = "openai"
+    LOCAL = "local"
+
+    def build(self, client):
+        from grammar_checker.batch import OpenAIBatchBackend, LocalBatchBackend
+
+        mapping = {
+            BatchBackendType.OPENAI: OpenAIBatchBackend,
+            BatchBackendType.LOCAL: LocalBatchBackend,
+        }
+
+        return mapping[self](client)
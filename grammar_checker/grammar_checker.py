@@ -1,7 +1,11 @@
+from typing import Any, Iterator, Tuple
 from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage
 from grammar_checker.prompt_builder import PromptBuilder
 from grammar_checker.openai_client import OpenAIClient
-from models.response import GrammarResponse
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.stream_parser import StreamingResponseParser
+from models.response import GrammarResponse, grammar_response_adapter
 
 logger = get_logger(__name__)
 
@@ -13,26 +17,77 @@ class GrammarChecker:
         sentence: str,
         model: str,
         client: OpenAIClient,
+        prefilter: PreFilter | None = None,
     ):
         self.prompt_builder = prompt_builder
         self.sentence = sentence
         self.model = model
         self.client = client
+        self.prefilter = prefilter
+        self.prefiltered = False  # True when the prefilter answered without calling the model
 
-        logger.info(f"GrammarChecker initialized with model: {self.model}, sentence: {self.sentence}")
+        logger.info(
+            "GrammarChecker initialized with model: %s, sentence: '%.20s%s'",
+            self.model,
+            self.sentence,
+            "..." if len(self.sentence) > 20 else "",
+        )
 
     def check_grammar(self) -> GrammarResponse:
-        prompt = self.prompt_builder.build_prompt(self.sentence)
+        if self.prefilter and self.prefilter.is_clean(self.sentence):
+            logger.debug("Prefilter classified sentence as clean, skipping model call: '%s'", self.sentence)
+            self.prefiltered = True
+            return GrammarResponse(input=self.sentence, mistakes=[], corrected_sentence=self.sentence)
+
+        with stage("prompt_build"):
+            prompt = self.prompt_builder.build_prompt(self.sentence)
         try:
-            response = self.client.get_model_response(self.model, prompt)
+            content = self.client.get_model_content(self.model, prompt)
             logger.debug(
-                f"GrammarChecker request: '{self.model}' with template '{self.prompt_builder.prompt_template}' and sentence '{self.sentence}'"
+                "GrammarChecker request: '%s' with template '%s' and sentence '%s'",
+                self.model,
+                self.prompt_builder.prompt_template,
+                self.sentence,
             )
-            if response:
-                return GrammarResponse(**response)
+            if content:
+                # parse and validate the raw JSON in one pass
+                with stage("validation"):
+                    return grammar_response_adapter.validate_json(content)
             else:
                 logger.error("Received empty response from the model.")
                 raise ValueError
         except Exception as e:
-            logger.error(f"An error occurred while checking grammar: {e}")
+            logger.error("An error occurred while checking grammar: %s", e)
+            raise
+
+    def stream_grammar(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the grammar check as events while the model response arrives.
+
+        Yields ("mistake", dict) and ("corrected_sentence", str) events as soon as they are
+        complete, and finally ("response", GrammarResponse) with the validated full response.
+        """
+        if self.prefilter and self.prefilter.is_clean(self.sentence):
+            logger.debug("Prefilter classified sentence as clean, skipping model call: '%s'", self.sentence)
+            self.prefiltered = True
+            yield "corrected_sentence", self.sentence
+            yield "response", GrammarResponse(input=self.sentence, mistakes=[], corrected_sentence=self.sentence)
+            return
+
+        with stage("prompt_build"):
+            prompt = self.prompt_builder.build_prompt(self.sentence)
+        parser = StreamingResponseParser()
+        try:
+            for chunk in self.client.stream_model_response(self.model, prompt):
+                yield from parser.feed(chunk)
+
+            response = parser.result()
+            if not response:
+                logger.error("Received empty response from the model.")
+                raise ValueError
+            with stage("validation"):
+                validated = GrammarResponse.model_validate(response)
+            yield "response", validated
+        except Exception as e:
+            logger.error("An error occurred while streaming grammar check: %s", e)
             raise
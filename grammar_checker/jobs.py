@@ -0,0 +1,306 @@
+import json
+import uuid
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List
+from datetime import datetime, UTC
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import request_context, get_request_id
+from grammar_checker.prompt_builder import PromptBuilder
+from grammar_checker.openai_client import OpenAIClient
+from grammar_checker.grammar_checker import GrammarChecker
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.config import JOBS_DB_PATH, JOB_WORKERS, JOB_MAX_ATTEMPTS, JOB_POLL_INTERVAL
+from models.request import GrammarRequest
+from models.response import GrammarResponse, grammar_response_adapter
+
+logger = get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class ItemStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    request_id TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(job_id),
+    position INTEGER NOT NULL,
+    sentence TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    response TEXT,
+    error TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (status, item_id);
+CREATE INDEX IF NOT EXISTS idx_job_items_job ON job_items (job_id, position);
+"""
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class JobStore:
+    """
+    Persistent SQLite queue of grammar-check jobs.
+
+    A job is a list of sentences stored as one row per sentence ("item"). Workers claim
+    pending items one at a time, so the queue survives restarts: items that were running
+    when the process stopped are put back to pending on `connect()`.
+    """
+
+    def __init__(self, db_path: Path | str = JOBS_DB_PATH):
+        self.db_path = db_path
+        self.connection = None
+        # one connection shared by the API and the worker threads, serialized by this lock
+        self._lock = threading.Lock()
+
+    def connect(self):
+        if not self.connection:
+            if str(self.db_path) != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+            requeued = self.connection.execute(
+                "UPDATE job_items SET status = ? WHERE status = ?", (ItemStatus.PENDING, ItemStatus.RUNNING)
+            ).rowcount
+            if requeued:
+                logger.info("Requeued %s job item(s) interrupted by the last shutdown.", requeued)
+            logger.debug("Connected to job store: %s", self.db_path)
+
+    def disconnect(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.debug("Disconnected from job store: %s", self.db_path)
+
+    def create_job(self, sentences: List[str], model: str, prompt_version: str) -> str:
+        if not sentences:
+            raise ValueError("A job needs at least one sentence.")
+
+        job_id = str(uuid.uuid4())
+        now = _now()
+        # the connection commits on success and rolls back if an insert fails, so a failed job
+        # never leaves the shared connection inside an open transaction
+        with self._lock, self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.execute(
+                """
+                INSERT INTO jobs (job_id, model, prompt_version, total, request_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, model, prompt_version, len(sentences), get_request_id(), now),
+            )
+            self.connection.executemany(
+                "INSERT INTO job_items (job_id, position, sentence, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, position, sentence, ItemStatus.PENDING, now) for position, sentence in enumerate(sentences)],
+            )
+        logger.info("Created job %s with %d sentence(s).", job_id, len(sentences))
+        return job_id
+
+    def claim_item(self) -> dict | None:
+        """Mark the oldest pending item as running and return it, or None if the queue is empty."""
+        with self._lock:
+            row = self.connection.execute(
+                """
+                UPDATE job_items SET status = ?, attempts = attempts + 1, updated_at = ?
+                WHERE item_id = (SELECT item_id FROM job_items WHERE status = ? ORDER BY item_id LIMIT 1)
+                RETURNING item_id, job_id, position, sentence, attempts,
+                    (SELECT model FROM jobs WHERE jobs.job_id = job_items.job_id) AS model,
+                    (SELECT prompt_version FROM jobs WHERE jobs.job_id = job_items.job_id) AS prompt_version,
+                    (SELECT request_id FROM jobs WHERE jobs.job_id = job_items.job_id) AS request_id
+                """,
+                (ItemStatus.RUNNING, _now(), ItemStatus.PENDING),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def complete_item(self, item_id: int, response: GrammarResponse):
+        with self._lock:
+            self.connection.execute(
+                "UPDATE job_items SET status = ?, response = ?, error = NULL, updated_at = ? WHERE item_id = ?",
+                (ItemStatus.DONE, response.model_dump_json(), _now(), item_id),
+            )
+
+    def fail_item(self, item_id: int, error: str, retry: bool):
+        """Record a failed attempt; the item goes back to the queue if `retry` is set."""
+        status = ItemStatus.PENDING if retry else ItemStatus.FAILED
+        with self._lock:
+            self.connection.execute(
+                "UPDATE job_items SET status = ?, error = ?, updated_at = ? WHERE item_id = ?",
+                (status, error, _now(), item_id),
+            )
+
+    def get_job(self, job_id: str) -> dict | None:
+        """Return the job with its item counts per status, or None if it does not exist."""
+        with self._lock:
+            job = self.connection.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if not job:
+                return None
+            counts = dict(
+                self.connection.execute(
+                    "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+                ).fetchall()
+            )
+
+        job = dict(job)
+        job["counts"] = {status.value: counts.get(status.value, 0) for status in ItemStatus}
+        finished = job["counts"][ItemStatus.DONE] + job["counts"][ItemStatus.FAILED]
+        if finished == job["total"]:
+            job["status"] = JobStatus.COMPLETED
+        elif finished or job["counts"][ItemStatus.RUNNING]:
+            job["status"] = JobStatus.RUNNING
+        else:
+            job["status"] = JobStatus.QUEUED
+        return job
+
+    def get_results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[dict]:
+        """Return a page of the job's items in submission order."""
+        with self._lock:
+            rows = self.connection.execute(
+                """
+                SELECT position, sentence, status, attempts, response, error FROM job_items
+                WHERE job_id = ? ORDER BY position LIMIT ? OFFSET ?
+                """,
+                (job_id, limit, offset),
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["response"] = grammar_response_adapter.validate_json(result["response"]) if result["response"] else None
+            results.append(result)
+        return results
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+
+
+class JobWorkerPool:
+    """
+    Threads that drain a `JobStore` with `GrammarChecker`, independent of the HTTP request rate.
+
+    Failed items are retried up to `max_attempts` times before they are marked as failed.
+    When a Mongo handler (or the API's `RecordWriter`) is given, every checked sentence is also
+    saved to the API log.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = JOB_WORKERS,
+        prefilter: PreFilter | None = None,
+        mongo_handler=None,
+        client: OpenAIClient | None = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+    ):
+        self.store = store
+        self.workers = workers
+        self.prefilter = prefilter
+        self.mongo_handler = mongo_handler
+        self.client = client
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._prompt_builders: Dict[str, PromptBuilder] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _get_client(self) -> OpenAIClient:
+        with self._lock:
+            if self.client is None:
+                self.client = OpenAIClient()
+            return self.client
+
+    def _get_prompt_builder(self, prompt_version: str) -> PromptBuilder:
+        with self._lock:
+            if prompt_version not in self._prompt_builders:
+                self._prompt_builders[prompt_version] = PromptBuilder(prompt_version)
+            return self._prompt_builders[prompt_version]
+
+    def run_once(self) -> bool:
+        """Claim and process one item. Returns False when the queue was empty."""
+        item = self.store.claim_item()
+        if item is None:
+            return False
+
+        # items are traced under the ID of the request that submitted the job
+        try:
+            with request_context(item["request_id"] or item["job_id"]):
+                grammar_checker = GrammarChecker(
+                    self._get_prompt_builder(item["prompt_version"]),
+                    item["sentence"],
+                    item["model"],
+                    self._get_client(),
+                    self.prefilter,
+                )
+                response = grammar_checker.check_grammar()
+                if self.mongo_handler:
+                    request = GrammarRequest(
+                        sentence=item["sentence"], prompt_version=item["prompt_version"], model=item["model"]
+                    )
+                    self.mongo_handler.save_api_record(request=request, response=response, endpoint="/jobs")
+            self.store.complete_item(item["item_id"], response)
+        except Exception as e:
+            retry = item["attempts"] < self.max_attempts
+            logger.error(
+                "Job %s item %d failed (attempt %d/%d): %s",
+                item["job_id"],
+                item["position"],
+                item["attempts"],
+                self.max_attempts,
+                e,
+            )
+            self.store.fail_item(item["item_id"], str(e), retry=retry)
+        return True
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                if not self.run_once():
+                    self._stop.wait(self.poll_interval)
+            except Exception:
+                logger.exception("Job worker error")
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %s job worker(s).", self.workers)
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("Stopped job workers.")
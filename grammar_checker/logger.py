@@ -1,41 +1,158 @@
 # grammar_checker/logger.py
 
 import os
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from grammar_checker.config import LOG_FILE, MAX_LOG_SIZE, BACKUP_COUNT
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from grammar_checker.config import LOG_FILE, MAX_LOG_SIZE, BACKUP_COUNT, LOG_SAMPLE_RATE, LOG_FORMAT
 from grammar_checker.config import PROJECT_ROOT
 
+TEXT_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 
-def get_logger(name: str) -> logging.Logger:
-    """Returns a configured logger with rotating file and console handlers."""
-    logger = logging.getLogger(name)
+# correlation ID of the request being handled in the current context (see grammar_checker.tracing)
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
 
-    # Set the logging level based on the DEBUG environment variable
-    if logger.level == logging.NOTSET:
-        debug_mode = os.getenv("DEBUG", "False").lower() == "true"
-        level = logging.DEBUG if debug_mode else logging.INFO
-        logger.setLevel(level)
+# LogRecord attributes that are not user-supplied `extra` fields
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_setup_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Caps INFO (and lower) records at `rate` per second per logger; warnings and errors always pass.
+
+    Under normal traffic nothing is dropped. Under high load the per-request chatter is thinned out
+    and the number of dropped records is appended to the next record that gets through.
+    """
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE, clock=time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.clock = clock
+        self._buckets = {}  # logger name -> (tokens, updated_at, dropped)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno > logging.INFO:
+            return True
+
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at, dropped = self._buckets.get(record.name, (self.rate, now, 0))
+            tokens = min(self.rate, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now, dropped + 1)
+                return False
+            self._buckets[record.name] = (tokens - 1, now, 0)
+
+        if dropped:
+            record.msg = f"{record.msg} [{dropped} similar record(s) dropped by sampling]"
+        return True
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request ID; runs in the calling thread, before queueing."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including the request ID and any `extra` fields such as stage durations."""
 
-    # Prevent duplicate handlers if get_logger is called multiple times
-    if not logger.handlers:
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES and value is not None
+        )
+        return json.dumps(entry, default=str)
 
-        # Formatter
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 
-        # Rotating file handler
-        file_handler = RotatingFileHandler(LOG_FILE, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
+def build_formatter(log_format: str = LOG_FORMAT) -> logging.Formatter:
+    if log_format == "json":
+        return JSONFormatter()
+    return logging.Formatter(TEXT_LOG_FORMAT)
+
+
+def setup_logging() -> QueueListener:
+    """
+    Attach a single `QueueHandler` to the root logger, once per process.
+
+    Records are put on a queue by the logging thread and written to the rotating log file and
+    the console by a `QueueListener` thread, so request threads never wait on log I/O.
+    """
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = build_formatter()
+
+        # Rotating file handler; the file is only opened on the first record, not at import
+        file_handler = RotatingFileHandler(LOG_FILE, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT, delay=True)
         file_handler.setFormatter(formatter)
 
         # Stream (console) handler
         stream_handler = logging.StreamHandler()
         stream_handler.setFormatter(formatter)
 
-        # Attach handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(stream_handler)
+        log_queue = queue.SimpleQueue()
+        _queue_handler = QueueHandler(log_queue)
+        _queue_handler.addFilter(SamplingFilter())
+        _queue_handler.addFilter(RequestIdFilter())
+        logging.getLogger().addHandler(_queue_handler)
+
+        _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush the queue, stop the listener thread and detach the root handler."""
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a logger whose records go through the shared, non-blocking root handler."""
+    logger = logging.getLogger(name)
+
+    # Set the logging level based on the DEBUG environment variable
+    if logger.level == logging.NOTSET:
+        debug_mode = os.getenv("DEBUG", "False").lower() == "true"
+        level = logging.DEBUG if debug_mode else logging.INFO
+        logger.setLevel(level)
 
+    setup_logging()
     return logger
 
 
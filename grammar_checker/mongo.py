@@ -0,0 +1,158 @@
+import os
+import atexit
+import threading
+from typing import Dict, Tuple
+from pymongo import MongoClient, monitoring
+from grammar_checker.logger import get_logger
+from grammar_checker.config import (
+    MONGO_URI,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_COMPRESSORS,
+    MONGO_WRITE_CONCERN,
+)
+
+logger = get_logger(__name__)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters of every shared client, fed by pymongo's pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {
+                "connections_created": 0,
+                "connections_closed": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "pool_clears": 0,
+            }
+            self._checkout_ms = 0.0
+            self._max_checkout_ms = 0.0
+
+    def _add(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def connection_created(self, event):
+        self._add("connections_created")
+
+    def connection_closed(self, event):
+        self._add("connections_closed")
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self._counts["checkouts"] += 1
+            self._counts["checked_out"] += 1
+            self._counts["max_checked_out"] = max(self._counts["max_checked_out"], self._counts["checked_out"])
+            # time spent waiting for a connection (and opening it, if the pool had none idle)
+            wait_ms = (event.duration or 0.0) * 1000
+            self._checkout_ms += wait_ms
+            self._max_checkout_ms = max(self._max_checkout_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures")
+
+    def pool_cleared(self, event):
+        self._add("pool_clears")
+
+    # the remaining pool events are not counted
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            checkouts = self._counts["checkouts"]
+            return {
+                **self._counts,
+                "open_connections": self._counts["connections_created"] - self._counts["connections_closed"],
+                "mean_checkout_ms": round(self._checkout_ms / checkouts, 3) if checkouts else 0.0,
+                "max_checkout_ms": round(self._max_checkout_ms, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+_clients: Dict[Tuple[str, int], MongoClient] = {}
+_clients_lock = threading.Lock()
+
+
+def client_options() -> dict:
+    """MongoClient keyword arguments from config; unset (0 or "") settings keep pymongo's defaults."""
+    write_concern = MONGO_WRITE_CONCERN.strip()
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "w": int(write_concern) if write_concern.isdigit() else write_concern,
+        "appname": "grammar-checker",
+        "event_listeners": [pool_metrics],
+    }
+    if MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+    if MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = MONGO_SOCKET_TIMEOUT_MS
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+
+def get_client(uri: str | None = MONGO_URI) -> MongoClient:
+    """
+    The process-wide client of `uri`, created on first use.
+
+    A MongoClient is thread-safe and pools its connections, so one per process is shared by the
+    handlers, shard stores and report queries; repeated connect/disconnect cycles reuse it. Clients
+    are not fork-safe, so a forked child gets its own.
+    """
+    key = (uri, os.getpid())
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = MongoClient(uri, **client_options())
+            logger.debug("Created shared MongoDB client (pool size %s).", MONGO_MAX_POOL_SIZE)
+        return client
+
+
+def close_clients():
+    """Close every shared client, e.g. at exit; the next `get_client` call creates a new one."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+    if clients:
+        logger.debug("Closed %s MongoDB client(s); pool metrics: %s", len(clients), pool_metrics.snapshot())
+
+
+def pool_stats() -> Dict[str, float]:
+    return {"clients": len(_clients), **pool_metrics.snapshot()}
+
+
+atexit.register(close_clients)
@@ -1,15 +1,20 @@
 import os
 import json
+import time
+from typing import Iterator
 from openai import OpenAI
 from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage, record_stage, get_trace
+from grammar_checker.config import OPENAI_BASE_URL
 
 logger = get_logger(__name__)
 
 
 class OpenAIClient:
-    def __init__(self):
+    def __init__(self, base_url: str | None = OPENAI_BASE_URL):
         self.api_key = self._get_api_key()
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
         logger.info("OpenAI client initialized successfully.")
 
     def _get_api_key(self):
@@ -22,22 +27,64 @@ class OpenAIClient:
 
         return api_key
 
+    @staticmethod
+    def build_chat_request(model: str, prompt: str) -> dict:
+        """Chat completion parameters shared by direct calls and Batch API request lines."""
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": f"Sentence: {prompt}"}],
+            "temperature": 0,
+        }
+
+    def get_model_content(self, model: str, prompt: str) -> str:
+        """Return the raw message content, so callers can validate the JSON without parsing it twice."""
+        try:
+            with stage("openai_request"):
+                response = self.client.chat.completions.create(**self.build_chat_request(model, prompt))
+            logger.info("Received response from the model.")
+            trace = get_trace()
+            if trace is not None and response.usage is not None:
+                trace.add_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+            return response.choices[0].message.content
+        except Exception as e:
+            logger.error("An error occurred while getting the model response: %s", e)
+            raise
+
     # get model reponse / error handling
     def get_model_response(self, model: str, prompt: str) -> dict:
+        content = self.get_model_content(model, prompt)
+        try:
+            with stage("json_parse"):
+                return json.loads(content)
+        except json.JSONDecodeError:
+            logger.error("Response content is not valid JSON.")
+            raise
 
+    def stream_model_response(self, model: str, prompt: str) -> Iterator[str]:
+        """
+        Yield the model's response content piece by piece as it is generated.
+
+        Only the time spent waiting for chunks counts towards the "openai_request" stage, not the
+        time the consumer takes between them; the final chunk carries the token usage.
+        """
+        trace = get_trace()
+        wall_ms = cpu_ms = 0.0
+        start, cpu_start = time.perf_counter(), time.thread_time()
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": f"Sentence: {prompt}"}],
-                temperature=0,
+            stream = self.client.chat.completions.create(
+                **self.build_chat_request(model, prompt), stream=True, stream_options={"include_usage": True}
             )
-            logger.info("Received response from the model.")
-            content = response.choices[0].message.content
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                logger.error("Response content is not valid JSON.")
-                raise
+            logger.info("Streaming response from the model.")
+            for chunk in stream:
+                wall_ms += (time.perf_counter() - start) * 1000
+                cpu_ms += (time.thread_time() - cpu_start) * 1000
+                if trace is not None and chunk.usage is not None:
+                    trace.add_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                start, cpu_start = time.perf_counter(), time.thread_time()
         except Exception as e:
-            logger.error(f"An error occurred while getting the model response: {e}")
+            logger.error("An error occurred while streaming the model response: %s", e)
             raise
+        finally:
+            record_stage("openai_request", wall_ms, cpu_ms)
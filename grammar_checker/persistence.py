@@ -0,0 +1,259 @@
+import os
+import re
+import time
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List
+from bson import json_util
+from grammar_checker.logger import get_logger
+from grammar_checker.factory import OverflowPolicy
+from grammar_checker.config import (
+    PERSIST_QUEUE_SIZE,
+    PERSIST_OVERFLOW,
+    PERSIST_BLOCK_TIMEOUT,
+    PERSIST_BATCH_SIZE,
+    PERSIST_REPLAY_INTERVAL,
+    PERSIST_SPILL_DIR,
+)
+
+logger = get_logger(__name__)
+
+INSERT_LATENCY_WINDOW = 1000  # latest insert durations kept for the percentiles of `stats()`
+
+
+def spill_owner(path: Path) -> int | None:
+    """PID of the process that wrote (spill-<pid>.jsonl) or is replaying (spill-<pid>-*.replaying) a file."""
+    match = re.match(r"spill-(\d+)", path.name)
+    return int(match.group(1)) if match else None
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+class RecordWriter:
+    """
+    Buffers API records in a bounded queue and inserts them in batches from a background thread,
+    so Mongo latency spikes and outages stay off the request path.
+
+    When the queue is full, `overflow` decides: drop the record, block the caller for up to
+    `block_timeout` seconds (then drop), or spill it to a JSONL file under `spill_dir`. Batches
+    whose insert fails are spilled too, unless the policy is drop. Spilled records are replayed
+    every `replay_interval` seconds while the writer is idle and by `cli.py replay-spill`; their
+    `_id` is set before they are queued, so replaying a partly written file stores nothing twice.
+    """
+
+    def __init__(
+        self,
+        mongo_handler,
+        queue_size: int = PERSIST_QUEUE_SIZE,
+        overflow: OverflowPolicy | str = PERSIST_OVERFLOW,
+        block_timeout: float = PERSIST_BLOCK_TIMEOUT,
+        batch_size: int = PERSIST_BATCH_SIZE,
+        replay_interval: float = PERSIST_REPLAY_INTERVAL,
+        spill_dir: Path = PERSIST_SPILL_DIR,
+    ):
+        self.mongo_handler = mongo_handler
+        self.overflow = OverflowPolicy(overflow)
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.replay_interval = replay_interval
+        self.spill_dir = Path(spill_dir)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._counts = {"queued": 0, "written": 0, "dropped": 0, "spilled": 0, "replayed": 0, "insert_batches": 0}
+        # durations of the latest inserts; requests only wait for the queue, this is the Mongo write itself
+        self._insert_ms: deque = deque(maxlen=INSERT_LATENCY_WINDOW)
+        self._insert_ms_total = 0.0
+
+    @property
+    def spill_file(self) -> Path:
+        # one file per process, so API workers never append to the same file
+        return self.spill_dir / f"spill-{os.getpid()}.jsonl"
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Record counts, plus the latency of the writer's `insert_api_records` calls: the total over
+        all batches, and mean/p95/max of the latest INSERT_LATENCY_WINDOW batches.
+        """
+        with self._lock:
+            recent = sorted(self._insert_ms)
+            return {
+                **self._counts,
+                "pending": self._queue.qsize(),
+                "insert_ms_total": round(self._insert_ms_total, 3),
+                "mean_insert_ms": round(sum(recent) / len(recent), 3) if recent else 0.0,
+                "p95_insert_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 3) if recent else 0.0,
+                "max_insert_ms": round(recent[-1], 3) if recent else 0.0,
+            }
+
+    def save_api_record(self, request, response=None, error: str | None = None, endpoint: str | None = None) -> bool:
+        """Build the API log record now (it reads the request's trace) and queue it; False if it was dropped."""
+        return self.submit(self.mongo_handler.build_api_record(request, response, error, endpoint))
+
+    def submit(self, record: dict) -> bool:
+        try:
+            if self.overflow == OverflowPolicy.BLOCK:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            self._count("queued")
+            return True
+        except queue.Full:
+            if self.overflow == OverflowPolicy.SPILL:
+                return self._spill([record])
+            self._count("dropped")
+            logger.warning("Persistence queue is full, dropped a record.")
+            return False
+
+    def _spill(self, records: List[dict], count: bool = True) -> bool:
+        try:
+            with self._lock:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_file, "a", encoding="utf-8") as file:
+                    file.writelines(json_util.dumps(record) + "\n" for record in records)
+                if count:
+                    self._counts["spilled"] += len(records)
+            return True
+        except OSError as e:
+            self._count("dropped", len(records))
+            logger.error("Could not spill %s record(s) to %s: %s", len(records), self.spill_file, e)
+            return False
+
+    def _insert(self, records: List[dict]):
+        start = time.perf_counter()
+        self.mongo_handler.insert_api_records(records)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._counts["insert_batches"] += 1
+            self._insert_ms.append(elapsed_ms)
+            self._insert_ms_total += elapsed_ms
+
+    def _write(self, records: List[dict]):
+        try:
+            self._insert(records)
+            self._count("written", len(records))
+        except Exception as e:
+            if self.overflow == OverflowPolicy.DROP:
+                self._count("dropped", len(records))
+                logger.error("Dropped %s record(s) Mongo did not take: %s", len(records), e)
+            else:
+                logger.warning("Spilling %s record(s) Mongo did not take: %s", len(records), e)
+                self._spill(records)
+
+    def _take_batch(self, timeout: float) -> List[dict]:
+        batch = [self._queue.get(timeout=timeout)]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        while True:
+            try:
+                self._write(self._take_batch(timeout=0))
+            except queue.Empty:
+                return
+
+    def _replayable(self, path: Path) -> bool:
+        """
+        Spill files of this process, or of processes that are gone. Another live worker may still be
+        appending to (or replaying) its own file, and `_lock` only guards this process.
+        """
+        pid = spill_owner(path)
+        return pid is None or pid == os.getpid() or not pid_alive(pid)
+
+    def _read_spill(self, path: Path) -> List[dict]:
+        records = []
+        for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json_util.loads(line))
+            except ValueError as e:
+                # e.g. the last line of a process that died mid-write
+                self._count("dropped")
+                logger.warning("Skipping unreadable line %s of spill file %s: %s", number, path.name, e)
+        return records
+
+    def replay(self, include_claimed: bool = False) -> int:
+        """
+        Insert spilled records again; a file is removed once all of its records are stored.
+
+        Only this process's spill file and those of processes that no longer run are replayed. A
+        file is renamed while it is replayed so that new spills go to a fresh one. Files left in
+        that state by a crashed replay are only picked up with `include_claimed`, e.g. by the CLI
+        while the API is stopped.
+        """
+        paths = sorted(self.spill_dir.glob("spill-*.jsonl"))
+        if include_claimed:
+            paths += sorted(self.spill_dir.glob("spill-*.replaying"))
+        replayed = 0
+        for path in filter(self._replayable, paths):
+            # the claimed name carries this process's PID, so other replays leave it alone while it runs
+            claimed = self.spill_dir / f"spill-{os.getpid()}-{time.time_ns()}.replaying"
+            try:
+                with self._lock:
+                    path.rename(claimed)
+            except FileNotFoundError:
+                continue  # taken by another process
+            records = self._read_spill(claimed)
+            for start in range(0, len(records), self.batch_size):
+                try:
+                    self._insert(records[start : start + self.batch_size])
+                except Exception as e:
+                    logger.warning("Replay of %s stopped, keeping the rest for later: %s", path.name, e)
+                    self._spill(records[start:], count=False)
+                    break
+                replayed += len(records[start : start + self.batch_size])
+            claimed.unlink()
+        if replayed:
+            self._count("replayed", replayed)
+            logger.info("Replayed %s spilled record(s).", replayed)
+        return replayed
+
+    def _work(self):
+        last_replay = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._write(self._take_batch(timeout=0.5))
+            except queue.Empty:
+                # replay spilled records only while idle, so they never hold up new ones
+                if self.replay_interval > 0 and time.monotonic() - last_replay >= self.replay_interval:
+                    try:
+                        self.replay()
+                    except Exception:
+                        logger.exception("Spill replay error")
+                    last_replay = time.monotonic()
+        self.flush()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._work, name="record-writer", daemon=True)
+        self._thread.start()
+        logger.info("Started record writer (%s on overflow).", self.overflow.value)
+
+    def stop(self, timeout: float | None = None):
+        """Stop the writer after it has written (or spilled) everything still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Stopped record writer: %s", self.stats())
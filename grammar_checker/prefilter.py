@@ -0,0 +1,136 @@
+import re
+from typing import Dict, List
+from grammar_checker.logger import get_logger
+from grammar_checker.config import PREFILTER_THRESHOLD
+from models.benchmark_case import BenchmarkCase
+
+logger = get_logger(__name__)
+
+
+# verbs that take an adjective rather than an adverb ("looks good", "was quick")
+LINKING_VERBS = (
+    r"am|is|are|was|were|be|been|being|become|becomes|became|seem|seems|seemed|look|looks|looked|feel|feels|felt"
+    r"|sound|sounds|sounded|smell|smells|smelled|taste|tastes|tasted|appear|appears|appeared|remain|remains"
+    r"|remained|stay|stays|stayed|get|gets|got|grow|grows|grew|turn|turns|turned|keep|keeps|kept"
+)
+
+# (rule name, pattern, penalty) - a match multiplies the clean-confidence by (1 - penalty)
+RULES = [
+    ("lowercase_start", re.compile(r"^\s*[a-z]"), 0.5),
+    ("missing_end_punctuation", re.compile(r"[^.!?\"')\]]\s*$"), 0.5),
+    ("spacing", re.compile(r"\s{2,}|\s[,.!?;:]"), 0.4),
+    ("lowercase_pronoun_i", re.compile(r"\bi\b"), 0.6),
+    ("repeated_word", re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE), 0.6),
+    ("double_comparative", re.compile(r"\b(more|most)\s+\w+(er|est)\b", re.IGNORECASE), 0.8),
+    ("comparative_then", re.compile(r"\b\w+er\s+then\b", re.IGNORECASE), 0.7),
+    ("article_before_vowel", re.compile(r"\ba\s+[aeiou]", re.IGNORECASE), 0.5),
+    ("article_before_consonant", re.compile(r"\ban\s+[b-df-hj-np-tv-z]", re.IGNORECASE), 0.5),
+    (
+        "third_person_base_verb",
+        re.compile(r"\b(he|she|it)\s+(go|do|have|don't|like|want|need|make|take|say|come|see|know|get)\b", re.I),
+        0.8,
+    ),
+    ("plural_subject_singular_verb", re.compile(r"\b(they|we|you)\s+(is|was|has|does|doesn't)\b", re.I), 0.8),
+    ("first_person_verb", re.compile(r"\bI\s+(is|are|has|does|doesn't)\b"), 0.8),
+    (
+        "perfect_with_simple_past",
+        re.compile(r"\b(have|has|had)\s+(went|ate|ran|saw|did|came|took|gave|wrote|began|drank|spoke)\b", re.I),
+        0.8,
+    ),
+    (
+        "missing_apostrophe",
+        re.compile(r"\b(dont|doesnt|didnt|cant|wont|isnt|arent|wasnt|werent|shouldnt|couldnt|wouldnt|im|ive)\b", re.I),
+        0.8,
+    ),
+    (
+        "uncountable_plural",
+        re.compile(r"\b(informations|advices|furnitures|equipments|knowledges|luggages|homeworks|researches)\b", re.I),
+        0.8,
+    ),
+    (
+        "question_word_order",
+        re.compile(r"^\s*(where|what|when|why|how|who)\s+(you|he|she|it|we|they|i)\s+(are|is|am|was|were|can|will)\b", re.I),
+        0.8,
+    ),
+    # transitive verbs learners commonly follow with a preposition ("discuss about", "enter to")
+    (
+        "superfluous_preposition",
+        re.compile(
+            r"\b(?:(?:discuss|mention|describ)\w*\s+about|emphasi[sz]\w*\s+on|compris\w*\s+of|enter(?:s|ed|ing)?\s+to"
+            r"|resembl\w*\s+(?:to|with))\b",
+            re.I,
+        ),
+        0.8,
+    ),
+    # a common adjective ending a clause right after a verb (or a verb and a short object) instead of
+    # its -ly adverb: "drives careful", "speaks English good"; linking verbs take adjectives
+    (
+        "adjective_as_adverb",
+        re.compile(
+            rf"\b(?!(?:{LINKING_VERBS}|this|his|its|hers|ours|yours|theirs|as|us|yes|less|unless)\b)"
+            r"(?:\w+(?:ed|s)|did|went|ran|spoke|wrote|sang|drove|ate|came|do|go|run|speak|write|sing|drive|play|work)"
+            rf"\s+(?:(?!(?:{LINKING_VERBS})\b)\w+\s+){{0,2}}"
+            r"(?:good|bad|quick|slow|careful|careless|easy|quiet|loud|soft|real|beautiful|perfect|terrible|awful"
+            r"|proper|correct|clear|smooth|sudden|polite|rude|patient|calm|nice)\s*(?:[.,!?;]|$)",
+            re.I,
+        ),
+        0.8,
+    ),
+    # lists such as "eggs milk and bread" usually need commas; only lowers the confidence a little
+    ("list_without_commas", re.compile(r"^[^,]*\b\w+\s+\w+\s+and\s+\w+[^,]*$"), 0.3),
+]
+
+# sentences longer than this lose confidence per extra word
+LENGTH_FREE_WORDS = 10
+LENGTH_DECAY = 0.97
+
+
+class PreFilter:
+    """
+    Cheap local screen that recognizes obviously clean sentences so the model call can be skipped.
+
+    Every rule that matches a common mistake pattern lowers the confidence that the sentence is
+    clean; sentences whose confidence reaches `threshold` are treated as having no mistakes.
+    """
+
+    def __init__(self, threshold: float = PREFILTER_THRESHOLD):
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("Prefilter threshold must be between 0 and 1.")
+        self.threshold = threshold
+
+    def matched_rules(self, sentence: str) -> List[str]:
+        return [name for name, pattern, _ in RULES if pattern.search(sentence)]
+
+    def score(self, sentence: str) -> float:
+        """Confidence in [0, 1] that the sentence contains no mistakes."""
+        confidence = 1.0
+        for _, pattern, penalty in RULES:
+            if pattern.search(sentence):
+                confidence *= 1 - penalty
+
+        extra_words = max(0, len(sentence.split()) - LENGTH_FREE_WORDS)
+        return confidence * LENGTH_DECAY**extra_words
+
+    def is_clean(self, sentence: str) -> bool:
+        return self.score(sentence) >= self.threshold
+
+
+def evaluate_prefilter(test_cases: List[BenchmarkCase], prefilter: PreFilter) -> Dict[str, float]:
+    """
+    Measure the prefilter against labelled test cases without calling a model.
+
+    Returns the number and share of cases it would skip, and how many of those skipped
+    cases actually contain mistakes (each one is a guaranteed benchmark failure).
+    """
+    total = len(test_cases)
+    skipped = [test_case for test_case in test_cases if prefilter.is_clean(test_case.input)]
+    missed = [test_case for test_case in skipped if test_case.mistakes]
+
+    return {
+        "threshold": prefilter.threshold,
+        "total": total,
+        "skipped": len(skipped),
+        "skip_rate": len(skipped) / total if total else 0.0,
+        "missed_mistakes": len(missed),
+        "miss_rate": len(missed) / len(skipped) if skipped else 0.0,
+    }
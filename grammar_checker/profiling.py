@@ -0,0 +1,172 @@
+import sys
+import time
+import threading
+from pathlib import Path
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime as dt
+from typing import Dict, Iterator, List
+from grammar_checker.logger import get_logger, get_display_path
+from grammar_checker.tracing import add_stage_hook, remove_stage_hook
+from grammar_checker.config import REPORTS_DIR, PROFILE_SAMPLE_INTERVAL
+
+logger = get_logger(__name__)
+
+
+class StackSampler:
+    """
+    Minimal sampling profiler: a daemon thread that snapshots the stack of every other thread
+    each `interval` seconds and counts them in collapsed-stack form ("thread;outer;...;inner").
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        # no line numbers, so all samples of a function collapse into one frame
+        return f"{frame.f_code.co_name} ({Path(frame.f_code.co_filename).name})"
+
+    def sample(self) -> None:
+        sampler_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == sampler_id:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed format read by flamegraph.pl, inferno and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """
+    Collects wall and CPU time per pipeline stage (see `grammar_checker.tracing.stage`) while active,
+    and optionally runs a `StackSampler` for a flamegraph of everything in between.
+    """
+
+    def __init__(self, name: str, sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.name = name
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.sampler = StackSampler(sample_interval) if sample_interval > 0 else None
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self._started = (0.0, 0.0)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, wall_ms: float, cpu_ms: float) -> None:
+        with self._lock:
+            stats = self.stages.setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            stats["calls"] += 1
+            stats["wall_ms"] += wall_ms
+            stats["cpu_ms"] += cpu_ms
+
+    def start(self) -> None:
+        self._started = (time.perf_counter(), time.process_time())
+        add_stage_hook(self.record)
+        if self.sampler:
+            self.sampler.start()
+
+    def stop(self) -> None:
+        if self.sampler:
+            self.sampler.stop()
+        remove_stage_hook(self.record)
+        wall_start, cpu_start = self._started
+        self.wall_ms = (time.perf_counter() - wall_start) * 1000
+        self.cpu_ms = (time.process_time() - cpu_start) * 1000
+
+    def summary(self) -> List[dict]:
+        """One row per stage, slowest first, followed by the whole run."""
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1]["wall_ms"], reverse=True)
+        rows = [
+            {
+                "stage": name,
+                "calls": stats["calls"],
+                "wall_ms": round(stats["wall_ms"], 3),
+                "cpu_ms": round(stats["cpu_ms"], 3),
+                "mean_wall_ms": round(stats["wall_ms"] / stats["calls"], 3),
+                "share": round(stats["wall_ms"] / self.wall_ms, 3) if self.wall_ms else 0.0,
+            }
+            for name, stats in stages
+        ]
+        rows.append(
+            {
+                "stage": "total",
+                "calls": 1,
+                "wall_ms": round(self.wall_ms, 3),
+                "cpu_ms": round(self.cpu_ms, 3),
+                "mean_wall_ms": round(self.wall_ms, 3),
+                "share": 1.0,
+            }
+        )
+        return rows
+
+    def format_summary(self) -> str:
+        columns = ["stage", "calls", "wall_ms", "cpu_ms", "mean_wall_ms", "share"]
+        rows = [columns] + [[str(row[column]) for column in columns] for row in self.summary()]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+        lines = []
+        for row in rows:
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            lines.append("  ".join(cells))
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: Path = REPORTS_DIR) -> List[Path]:
+        """Write the summary table (and collapsed stacks when sampling) next to the regular reports."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = f"{dt.now().strftime('%Y%m%d%H%M%S')}_profile_{self.name}"
+
+        files = [output_dir / f"{prefix}.txt"]
+        files[0].write_text(self.format_summary(), encoding="utf-8")
+        if self.sampler:
+            files.append(output_dir / f"{prefix}.collapsed")
+            files[1].write_text(self.sampler.collapsed(), encoding="utf-8")
+
+        for file_path in files:
+            logger.info("Profile %s saved in '%s'.", file_path.name, get_display_path(file_path.parent))
+        return files
+
+
+@contextmanager
+def profile_run(
+    name: str, enabled: bool = True, sample_interval: float = PROFILE_SAMPLE_INTERVAL, output_dir: Path = REPORTS_DIR
+) -> Iterator[Profiler | None]:
+    """Profile the block when `enabled`, then log the summary table and write the profile files."""
+    if not enabled:
+        yield None
+        return
+
+    profiler = Profiler(name, sample_interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        logger.info("Profile of %s:\n%s", name, profiler.format_summary())
+        profiler.write(output_dir)
@@ -39,13 +39,13 @@ class PromptBuilder:
         try:
             with open(self.template_path, "r", encoding="utf-8") as file:
                 template = file.read().strip()
-            logger.info(f"Loaded prompt template from '{get_display_path(self.template_path)}'")
+            logger.info("Loaded prompt template from '%s'", get_display_path(self.template_path))
             return template
         except FileNotFoundError:
-            logger.error(f"Prompt template file not found: '{get_display_path(self.template_path)}'")
+            logger.error("Prompt template file not found: '%s'", get_display_path(self.template_path))
             raise
         except Exception as e:
-            logger.error(f"Error loading prompt template: {e}")
+            logger.error("Error loading prompt template: %s", e)
             raise
 
     def build_prompt(self, sentence: str):
@@ -62,9 +62,11 @@ class PromptBuilder:
             raise ValueError("Sentence cannot be empty")
         prompt = self.template.replace("{sentence}", sentence)
 
-        truncated_sentence = sentence[:20] + "..." if len(sentence) > 20 else sentence
         logger.info(
-            f"Building prompt using template '{get_display_path(self.template_path)}' with sentence: '{truncated_sentence}'"
+            "Building prompt using template '%s' with sentence: '%.20s%s'",
+            self.prompt_template,
+            sentence,
+            "..." if len(sentence) > 20 else "",
         )
 
         return prompt
@@ -0,0 +1,94 @@
+import json
+import hashlib
+from datetime import datetime, UTC
+from typing import List, Tuple
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import get_request_id
+from grammar_checker.factory import RecordSchema
+
+logger = get_logger(__name__)
+
+# test case fields a full record repeats in `benchmark_eval`; lean records keep them in the test cases collection
+CASE_FIELDS = ("input", "corrected_sentence", "mistakes", "test_desc")
+
+
+def build_record(request, response, benchmark_eval: dict | None = None) -> dict:
+    """Full stored form of one check, whichever backend it is saved to."""
+    record = {
+        "request": request.model_dump(),
+        "response": response.model_dump(),
+        "timestamp": datetime.now(UTC),
+    }
+    if benchmark_eval:
+        record["benchmark_eval"] = benchmark_eval
+    request_id = get_request_id()
+    if request_id:
+        record["request_id"] = request_id
+    return record
+
+
+def case_id(case: dict) -> str:
+    """Content hash of a test case, so the same case is stored once however many runs and corpora use it."""
+    content = {field: case.get(field) for field in ("test_id", *CASE_FIELDS)}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def is_lean(record: dict) -> bool:
+    return record.get("schema") == RecordSchema.LEAN.value
+
+
+def split_record(record: dict) -> Tuple[dict, dict | None]:
+    """
+    Lean form of a full benchmark record and its test case document.
+
+    Records without `benchmark_eval` (API and interactive checks) and lean records are returned as they are.
+    """
+    benchmark_eval = record.get("benchmark_eval")
+    if not benchmark_eval or is_lean(record):
+        return record, None
+
+    case = {"test_id": benchmark_eval["test_id"], **{f: benchmark_eval[f] for f in CASE_FIELDS if f in benchmark_eval}}
+    case = {"_id": case_id(case), **case}
+    request = dict(record.get("request", {}))
+    if request.get("sentence") == case.get("input"):
+        request.pop("sentence")
+    lean = {
+        **record,
+        "schema": RecordSchema.LEAN.value,
+        "request": request,
+        "benchmark_eval": {
+            **{key: value for key, value in benchmark_eval.items() if key not in CASE_FIELDS},
+            "case_id": case["_id"],
+        },
+    }
+    return lean, case
+
+
+def hydrate_record(record: dict, cases: dict) -> dict:
+    """Full form of a lean record, given its test case; other records are returned as they are."""
+    if not is_lean(record):
+        return record
+    benchmark_eval = dict(record["benchmark_eval"])
+    case = cases.get(benchmark_eval.get("case_id"))
+    if case is None:
+        logger.warning("Test case %s of a lean record is missing.", benchmark_eval.get('case_id'))
+        return record
+
+    benchmark_eval.pop("case_id")
+    full = {key: value for key, value in record.items() if key != "schema"}
+    full["request"] = {"sentence": case["input"], **record.get("request", {})}
+    full["benchmark_eval"] = {
+        "test_id": case["test_id"],
+        **{field: case[field] for field in CASE_FIELDS if field in case},
+        **benchmark_eval,
+    }
+    return full
+
+
+def hydrate_records(records: List[dict], test_cases) -> List[dict]:
+    """Full form of every record; the test cases of lean ones are read from `test_cases` in one query."""
+    ids = {record["benchmark_eval"]["case_id"] for record in records if is_lean(record)}
+    if not ids:
+        return records
+    cases = {case["_id"]: case for case in test_cases.find({"_id": {"$in": list(ids)}})}
+    return [hydrate_record(record, cases) for record in records]
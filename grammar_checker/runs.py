@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+# additive per (prompt_version, model) counters of `benchmark.summary_results`
+COUNTERS = ("total", "passed", "prefiltered", "prefiltered_failed", "latency_ms", "prompt_tokens", "completion_tokens")
+
+
+def count_result(summary: dict, prompt_version: str, model: str, benchmark_eval: dict):
+    """Add one evaluated test case to a {prompt_version: {model: counts}} summary."""
+    counts = summary.setdefault(prompt_version, {}).setdefault(model, {**dict.fromkeys(COUNTERS, 0), "latency_ms": 0.0})
+    counts["total"] += 1
+    for counter in ("latency_ms", "prompt_tokens", "completion_tokens"):
+        counts[counter] += benchmark_eval.get(counter) or 0
+    if benchmark_eval["match"]:
+        counts["passed"] += 1
+    if benchmark_eval.get("prefiltered"):
+        counts["prefiltered"] += 1
+        if not benchmark_eval["match"]:
+            counts["prefiltered_failed"] += 1
+
+
+def summary_rows(summary: dict) -> List[dict]:
+    """Flatten a `summary_results` dict; prompt file names contain dots, which Mongo field names should not."""
+    return [
+        {"prompt_version": prompt_version, "model": model, **counts}
+        for prompt_version, models in summary.items()
+        for model, counts in models.items()
+    ]
+
+
+def merge_summaries(rows: Iterable[dict]) -> dict:
+    """Add up `summary_rows` of several shards into one {prompt_version: {model: counts}} summary."""
+    merged = {}
+    for row in rows:
+        row = dict(row)
+        totals = merged.setdefault(row.pop("prompt_version"), {}).setdefault(row.pop("model"), {})
+        for key, value in row.items():
+            totals[key] = totals.get(key, 0) + value
+    return merged
+
+
+def _with_rates(counts: dict) -> dict:
+    total = counts.get("total", 0)
+    called = total - counts.get("prefiltered", 0)
+    return {
+        **counts,
+        "pass_rate": round(counts.get("passed", 0) / total, 4) if total else 0.0,
+        # prefiltered cases never reach the model, so they are left out of the mean latency
+        "mean_latency_ms": round(counts.get("latency_ms", 0) / called, 3) if called else 0.0,
+    }
+
+
+def build_run_summary(
+    run_id: str,
+    summary: dict,
+    mode: str,
+    config: dict,
+    started_at: datetime,
+    finished_at: datetime,
+) -> dict:
+    """
+    Compact summary document of one benchmark run: counts, latency and token totals per
+    (model, prompt_version) "arm", the same for the whole run, and the configuration used.
+    """
+    arms = [_with_rates(row) for row in summary_rows(summary)]
+    totals = {counter: sum(arm.get(counter, 0) for arm in arms) for counter in COUNTERS}
+    return {
+        "_id": run_id,
+        "run_id": run_id,
+        "mode": mode,
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "duration_s": round((finished_at - started_at).total_seconds(), 3),
+        "config": config,
+        "totals": _with_rates(totals),
+        "arms": sorted(arms, key=lambda arm: arm["pass_rate"], reverse=True),
+    }
+
+
+def format_run_list(runs: List[Dict]) -> str:
+    lines = [f"{'run_id':<36}  {'started_at':<19}  {'mode':<10}  {'cases':>6}  {'pass_rate':>9}  models / prompts"]
+    for run in runs:
+        config = run.get("config", {})
+        totals = run.get("totals", {})
+        lines.append(
+            f"{run['run_id']:<36}  {run['started_at']:%Y-%m-%d %H:%M:%S}  {run.get('mode', ''):<10}  "
+            f"{totals.get('total', 0):>6}  {totals.get('pass_rate', 0.0):>9.3f}  "
+            f"{', '.join(config.get('models', []))} / {', '.join(config.get('prompt_templates', []))}"
+        )
+    return "\n".join(lines)
+
+
+def format_run(run: Dict) -> str:
+    totals = run["totals"]
+    lines = [
+        f"Run {run['run_id']} ({run.get('mode', '')})",
+        f"  started {run['started_at']:%Y-%m-%d %H:%M:%S}, took {run['duration_s']:.1f} s",
+        f"  config: {', '.join(f'{key}={value}' for key, value in run.get('config', {}).items())}",
+        f"  {totals['passed']}/{totals['total']} passed ({totals['pass_rate']:.3f}), "
+        f"{totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens",
+        "",
+        f"  {'model':<20} {'prompt_version':<32} {'passed':>7} {'total':>6} {'rate':>6} {'mean_ms':>9} {'tokens':>8}",
+    ]
+    for arm in run["arms"]:
+        tokens = arm.get("prompt_tokens", 0) + arm.get("completion_tokens", 0)
+        lines.append(
+            f"  {arm['model']:<20} {arm['prompt_version']:<32} {arm['passed']:>7} {arm['total']:>6} "
+            f"{arm['pass_rate']:>6.3f} {arm['mean_latency_ms']:>9.1f} {tokens:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,325 @@
+import os
+import time
+import uuid
+import socket
+import threading
+from enum import Enum
+from typing import Callable, Dict, Iterable, List
+from datetime import datetime, timedelta, UTC
+from pymongo import ReturnDocument
+from grammar_checker.logger import get_logger
+from grammar_checker.mongo import get_client
+from grammar_checker.runs import summary_rows, merge_summaries
+from grammar_checker.config import SHARD_SIZE, SHARD_LEASE_SECONDS, SHARD_MAX_ATTEMPTS, SHARD_POLL_INTERVAL
+from models.benchmark_case import BenchmarkCase
+
+logger = get_logger(__name__)
+
+
+class ShardStatus(str, Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ClaimLost(Exception):
+    """The worker's claim on a shard expired and another worker took the shard over."""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ShardStore:
+    """
+    Benchmark work split into shards in a Mongo collection, shared by a coordinator and any number of workers.
+
+    A shard is a slice of test cases for one (model, prompt template) pair. Workers claim shards with a
+    single `find_one_and_update`, so two workers never get the same shard; a claim older than the lease is
+    treated as abandoned (crashed worker) and can be claimed again.
+    """
+
+    def __init__(self, uri, database_name, collection_name, lease_seconds: float = SHARD_LEASE_SECONDS):
+        self.uri = uri
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.lease_seconds = lease_seconds
+        self.client = None
+        self.collection = None
+
+    def connect(self):
+        if not self.client:
+            self.client = get_client(self.uri)
+            self.collection = self.client[self.database_name][self.collection_name]
+            self.collection.create_index([("run_id", 1), ("status", 1), ("index", 1)])
+            logger.debug("Connected to shard store: %s/%s", self.database_name, self.collection_name)
+
+    def disconnect(self):
+        if self.client:
+            self.client = None
+            self.collection = None
+            logger.debug("Disconnected from shard store: %s/%s", self.database_name, self.collection_name)
+
+    def create_run(
+        self,
+        test_cases: Iterable[BenchmarkCase],
+        models: List[str],
+        prompt_templates: List[str],
+        shard_size: int = SHARD_SIZE,
+        prefilter_threshold: float | None = None,
+    ) -> str:
+        """Partition models x templates x test cases into shards under a new run_id."""
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1.")
+
+        run_id = str(uuid.uuid4())
+        cases = [test_case.to_dict() for test_case in test_cases]
+        now = datetime.now(UTC)
+        shards = []
+        for model in models:
+            for template in prompt_templates:
+                for start in range(0, len(cases), shard_size):
+                    shards.append(
+                        {
+                            "_id": f"{run_id}:{len(shards)}",
+                            "run_id": run_id,
+                            "index": len(shards),
+                            "model": model,
+                            "prompt_version": template,
+                            "prefilter_threshold": prefilter_threshold,
+                            "test_cases": cases[start : start + shard_size],
+                            "case_count": len(cases[start : start + shard_size]),
+                            "status": ShardStatus.PENDING.value,
+                            "attempts": 0,
+                            "created_at": now,
+                        }
+                    )
+        if not shards:
+            raise ValueError("A sharded run needs at least one model, prompt template and test case.")
+
+        self.collection.insert_many(shards)
+        logger.info("Created run %s with %s shard(s) of up to %s test case(s).", run_id, len(shards), shard_size)
+        return run_id
+
+    def claim_shard(self, worker_id: str, run_id: str | None = None) -> dict | None:
+        """Atomically claim the next pending (or abandoned) shard, oldest first; None if there is none."""
+        now = datetime.now(UTC)
+        query = {
+            "$or": [
+                {"status": ShardStatus.PENDING.value},
+                {
+                    "status": ShardStatus.CLAIMED.value,
+                    "claimed_at": {"$lt": now - timedelta(seconds=self.lease_seconds)},
+                },
+            ]
+        }
+        if run_id:
+            query["run_id"] = run_id
+        shard = self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {"status": ShardStatus.CLAIMED.value, "worker": worker_id, "claimed_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1), ("index", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if shard and shard["attempts"] > 1:
+            logger.warning("Shard %s reclaimed by %s (attempt %s).", shard["_id"], worker_id, shard["attempts"])
+        return shard
+
+    def renew_claim(self, shard: dict) -> bool:
+        """Extend the lease of a claimed shard; False if this attempt no longer holds the claim."""
+        result = self.collection.update_one(
+            {
+                "_id": shard["_id"],
+                "worker": shard["worker"],
+                "attempts": shard["attempts"],
+                "status": ShardStatus.CLAIMED.value,
+            },
+            {"$set": {"claimed_at": datetime.now(UTC)}},
+        )
+        return result.matched_count == 1
+
+    def complete_shard(self, shard_id: str, worker_id: str, summary: dict) -> bool:
+        """Mark a shard done; returns False if the claim was lost to another worker in the meantime."""
+        result = self.collection.update_one(
+            {"_id": shard_id, "worker": worker_id, "status": ShardStatus.CLAIMED.value},
+            {
+                "$set": {
+                    "status": ShardStatus.DONE.value,
+                    "summary": summary_rows(summary),
+                    "completed_at": datetime.now(UTC),
+                }
+            },
+        )
+        return result.modified_count == 1
+
+    def fail_shard(self, shard_id: str, worker_id: str, error: str, retry: bool):
+        """Record a failed attempt; the shard goes back to pending if `retry` is set."""
+        status = ShardStatus.PENDING if retry else ShardStatus.FAILED
+        self.collection.update_one(
+            {"_id": shard_id, "worker": worker_id},
+            {"$set": {"status": status.value, "error": error}, "$unset": {"claimed_at": ""}},
+        )
+
+    def progress(self, run_id: str) -> dict:
+        """Shard and test case counts per status, the workers seen so far and the merged summary."""
+        shard_counts = {status.value: 0 for status in ShardStatus}
+        case_counts = {status.value: 0 for status in ShardStatus}
+        workers = set()
+        rows = []
+        projection = {"status": 1, "worker": 1, "summary": 1, "case_count": 1}
+        for shard in self.collection.find({"run_id": run_id}, projection):
+            shard_counts[shard["status"]] += 1
+            case_counts[shard["status"]] += shard["case_count"]
+            if shard.get("worker"):
+                workers.add(shard["worker"])
+            rows.extend(shard.get("summary", []))
+
+        total = sum(shard_counts.values())
+        finished = shard_counts[ShardStatus.DONE.value] + shard_counts[ShardStatus.FAILED.value]
+        return {
+            "run_id": run_id,
+            "shards": shard_counts,
+            "cases": case_counts,
+            "total_shards": total,
+            "finished": bool(total) and finished == total,
+            "workers": sorted(workers),
+            "summary": merge_summaries(rows),
+        }
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+
+
+class LeaseHeartbeat:
+    """Renews the lease of a claimed shard every `interval` seconds while the shard runs."""
+
+    def __init__(self, store: ShardStore, shard: dict, interval: float):
+        self.store = store
+        self.shard = shard
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.store.renew_claim(self.shard):
+                    self.lost = True
+                    logger.warning("Lost the claim on shard %s; another worker took it over.", self.shard["_id"])
+                    return
+            except Exception as e:
+                logger.warning("Could not renew the lease of shard %s: %s", self.shard["_id"], e)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._beat, name="shard-lease", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+
+def format_progress(progress: dict) -> str:
+    shards, cases = progress["shards"], progress["cases"]
+    total_cases = sum(cases.values())
+    return (
+        f"run {progress['run_id']}: {shards['done']}/{progress['total_shards']} shard(s) done, "
+        f"{shards['claimed']} running, {shards['pending']} pending, {shards['failed']} failed | "
+        f"{cases['done']}/{total_cases} case(s) | {len(progress['workers'])} worker(s)"
+    )
+
+
+def run_worker(
+    store: ShardStore,
+    process_shard: Callable[[dict], dict],
+    run_id: str | None = None,
+    worker_id: str | None = None,
+    max_attempts: int = SHARD_MAX_ATTEMPTS,
+    poll_interval: float = SHARD_POLL_INTERVAL,
+    finalize_shard: Callable[[dict, bool], None] | None = None,
+) -> int:
+    """
+    Claim shards and pass each to `process_shard` (which returns the shard's summary) until none are
+    left to claim, then return the number of shards completed.
+
+    The lease of a running shard is renewed every third of SHARD_LEASE_SECONDS, so only a stalled
+    or crashed worker loses its claim. `process_shard` raises `ClaimLost` if it finds the claim gone
+    before saving. `finalize_shard(shard, completed)` is called after each attempt that got as far as
+    completing (or losing) the shard, e.g. to drop the records of the attempt that did not win.
+
+    While other workers still hold claims the worker keeps polling, so it can take over shards whose
+    lease expired. Without a `run_id` it serves every run in the collection.
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+    logger.info("Benchmark worker %s started.", worker_id)
+    while True:
+        shard = store.claim_shard(worker_id, run_id)
+        if shard is None:
+            outstanding = {"status": ShardStatus.CLAIMED.value, **({"run_id": run_id} if run_id else {})}
+            if store.collection.count_documents(outstanding) == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info("Worker %s running shard %s (%s case(s)).", worker_id, shard["_id"], len(shard["test_cases"]))
+        try:
+            with LeaseHeartbeat(store, shard, store.lease_seconds / 3):
+                summary = process_shard(shard)
+        except ClaimLost:
+            logger.warning("Shard %s was reclaimed by another worker before %s saved it.", shard["_id"], worker_id)
+            if finalize_shard:
+                finalize_shard(shard, False)
+            continue
+        except Exception as e:
+            retry = shard["attempts"] < max_attempts
+            logger.error("Shard %s failed (attempt %s/%s): %s", shard["_id"], shard["attempts"], max_attempts, e)
+            store.fail_shard(shard["_id"], worker_id, str(e), retry=retry)
+            continue
+
+        done = store.complete_shard(shard["_id"], worker_id, summary)
+        if done:
+            completed += 1
+        else:
+            logger.warning("Shard %s was reclaimed by another worker before %s finished it.", shard["_id"], worker_id)
+        if finalize_shard:
+            finalize_shard(shard, done)
+
+    logger.info("Benchmark worker %s finished after %s shard(s).", worker_id, completed)
+    return completed
+
+
+def wait_for_run(
+    store: ShardStore, run_id: str, processes: List = (), poll_interval: float = SHARD_POLL_INTERVAL, echo=print
+) -> Dict:
+    """
+    Print a progress line whenever it changes until every shard is done or failed.
+
+    Raises RuntimeError if all local worker `processes` exited while work is left and no other
+    worker holds a claim.
+    """
+    last_line = None
+    while True:
+        progress = store.progress(run_id)
+        line = format_progress(progress)
+        if line != last_line:
+            echo(line)
+            last_line = line
+        if progress["finished"]:
+            return progress
+        workers_gone = processes and all(process.poll() is not None for process in processes)
+        if workers_gone and progress["shards"]["claimed"] == 0:
+            pending = progress["shards"]["pending"]
+            logger.error("All local workers exited with %s shard(s) of run %s left.", pending, run_id)
+            raise RuntimeError(f"All local workers exited before run {run_id} finished.")
+        time.sleep(poll_interval)
@@ -0,0 +1,293 @@
+import re
+import time
+import uuid
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+from bson import json_util
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage
+from grammar_checker.records import build_record
+from grammar_checker.config import SQLITE_STORAGE_PATH, FILE_STORAGE_DIR
+
+logger = get_logger(__name__)
+
+
+class StorageBackend(ABC):
+    """
+    Where benchmark records and run summaries are saved and read back by reports and `cli.py runs`.
+
+    Implemented by `MongoDBHandler` and by the server-less backends below; `--save-to` picks one
+    (see `StorageBackendType`). Records are read back in the full form of `build_record`, whatever
+    the backend stores, so reports work the same on all of them.
+    """
+
+    label = "storage"
+
+    @abstractmethod
+    def connect(self):
+        pass
+
+    @abstractmethod
+    def disconnect(self):
+        pass
+
+    def save_results(self, results: List[dict]) -> int:
+        """Save benchmark results (request, response and benchmark_eval) in one bulk write."""
+        records = [build_record(result["request"], result["response"], result["benchmark_eval"]) for result in results]
+        return self.save_records(records)
+
+    @abstractmethod
+    def save_records(self, records: List[dict]) -> int:
+        """Store records in their full form; returns how many were written."""
+
+    @abstractmethod
+    def save_run_summary(self, summary: dict):
+        """Write (or replace) the summary document of a run."""
+
+    @abstractmethod
+    def query_benchmark_data(self, run_ids: List[str]) -> List[Dict]:
+        """Records of the runs in `run_ids`, in full form."""
+
+    @abstractmethod
+    def query_run_summaries(self, limit: int = 20, model: str | None = None) -> List[Dict]:
+        """Run summaries without their per-arm rows, newest first; only runs of `model` if given."""
+
+    @abstractmethod
+    def query_run_summary(self, run_id: str) -> Dict | None:
+        """The full summary document of one run, or None."""
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+
+
+# JSON with dates kept as dates (`{"$date": ...}`), the same encoding the spill files use
+def dumps(document: dict) -> str:
+    return json_util.dumps(document)
+
+
+def loads(text: str) -> dict:
+    return json_util.loads(text)
+
+
+def run_id_of(record: dict) -> str | None:
+    return (record.get("benchmark_eval") or {}).get("run_id")
+
+
+def started_at_key(summary: dict) -> str:
+    started_at = summary.get("started_at")
+    return started_at.isoformat() if isinstance(started_at, datetime) else str(started_at or "")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    record_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    model TEXT,
+    prompt_version TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_run ON records (run_id, record_id);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Records and run summaries in one SQLite file, for small deployments and CI runs without MongoDB.
+
+    Each record is stored as a JSON document next to the columns queries filter on.
+    """
+
+    def __init__(self, db_path: Path | str = SQLITE_STORAGE_PATH):
+        self.db_path = db_path
+        self.label = f"SQLite ({db_path})"
+        self.connection = None
+
+    def connect(self):
+        if not self.connection:
+            if str(self.db_path) != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+            logger.debug("Connected to SQLite storage: %s", self.db_path)
+
+    def disconnect(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.debug("Disconnected from SQLite storage: %s", self.db_path)
+
+    def save_records(self, records: List[dict]) -> int:
+        rows = [
+            (
+                run_id_of(record),
+                record.get("request", {}).get("model"),
+                record.get("request", {}).get("prompt_version"),
+                dumps(record),
+            )
+            for record in records
+        ]
+        # committed on success, rolled back if an insert fails so the connection is left usable
+        with stage("storage_insert"), self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT INTO records (run_id, model, prompt_version, document) VALUES (?, ?, ?, ?)", rows
+            )
+        logger.debug("Inserted %d record(s).", len(rows))
+        return len(rows)
+
+    def save_run_summary(self, summary: dict):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO runs (run_id, started_at, document) VALUES (?, ?, ?)",
+            (summary["run_id"], started_at_key(summary), dumps(summary)),
+        )
+        logger.info("Saved summary of run %s.", summary["run_id"])
+
+    def query_benchmark_data(self, run_ids: List[str]) -> List[Dict]:
+        if not run_ids:
+            return []
+        placeholders = ", ".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT document FROM records WHERE run_id IN ({placeholders}) ORDER BY record_id", list(run_ids)
+        )
+        return [loads(document) for (document,) in rows]
+
+    def query_run_summaries(self, limit: int = 20, model: str | None = None) -> List[Dict]:
+        query = "SELECT document FROM runs"
+        params = []
+        if model:
+            query += " WHERE EXISTS (SELECT 1 FROM json_each(runs.document, '$.config.models') WHERE value = ?)"
+            params.append(model)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        summaries = [loads(document) for (document,) in self.connection.execute(query, params)]
+        for summary in summaries:
+            summary.pop("arms", None)
+        return summaries
+
+    def query_run_summary(self, run_id: str) -> Dict | None:
+        row = self.connection.execute("SELECT document FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return loads(row[0]) if row else None
+
+
+class FileStorage(StorageBackend):
+    """
+    Append-only files under `directory`: records go to `records/<run_id>.jsonl`, or with
+    `file_format="parquet"` to one Parquet part file per bulk write in `records/<run_id>/`,
+    so reading a run only opens that run's files. Run summaries are appended to `runs.jsonl`;
+    the last line of a run wins.
+
+    Parquet parts keep each record as a JSON document next to run_id, model and prompt_version
+    columns, and need pyarrow.
+    """
+
+    FORMATS = ("jsonl", "parquet")
+
+    def __init__(self, directory: Path | str = FILE_STORAGE_DIR, file_format: str = "jsonl"):
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unknown file format '{file_format}', expected one of {self.FORMATS}.")
+        self.directory = Path(directory)
+        self.file_format = file_format
+        self.label = f"{file_format} files in {self.directory}"
+
+    @property
+    def runs_file(self) -> Path:
+        return self.directory / "runs.jsonl"
+
+    def run_path(self, run_id: str | None) -> Path:
+        name = re.sub(r"[^\w.-]", "_", run_id or "no-run")
+        return self.directory / "records" / (f"{name}.jsonl" if self.file_format == "jsonl" else name)
+
+    def connect(self):
+        (self.directory / "records").mkdir(parents=True, exist_ok=True)
+
+    def disconnect(self):
+        pass
+
+    def save_records(self, records: List[dict]) -> int:
+        by_run: Dict[str | None, List[dict]] = {}
+        for record in records:
+            by_run.setdefault(run_id_of(record), []).append(record)
+        with stage("storage_insert"):
+            for run_id, run_records in by_run.items():
+                if self.file_format == "jsonl":
+                    with open(self.run_path(run_id), "a", encoding="utf-8") as file:
+                        file.writelines(dumps(record) + "\n" for record in run_records)
+                else:
+                    self._write_parquet(self.run_path(run_id), run_records)
+        logger.debug("Appended %d record(s) to %s.", len(records), self.label)
+        return len(records)
+
+    def _write_parquet(self, path: Path, records: List[dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(
+            {
+                "run_id": [run_id_of(record) for record in records],
+                "model": [record.get("request", {}).get("model") for record in records],
+                "prompt_version": [record.get("request", {}).get("prompt_version") for record in records],
+                "document": [dumps(record) for record in records],
+            }
+        )
+        path.mkdir(parents=True, exist_ok=True)
+        # names sort in write order, so runs read back in the order they were saved
+        pq.write_table(table, path / f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet", compression="zstd")
+
+    def _read_run(self, run_id: str) -> List[str]:
+        path = self.run_path(run_id)
+        if self.file_format == "jsonl":
+            if not path.exists():
+                return []
+            with open(path, encoding="utf-8") as file:
+                return [line for line in file if line.strip()]
+
+        import pyarrow.parquet as pq
+
+        documents = []
+        for part in sorted(path.glob("part-*.parquet")):
+            documents += pq.read_table(part, columns=["document"]).column("document").to_pylist()
+        return documents
+
+    def save_run_summary(self, summary: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.runs_file, "a", encoding="utf-8") as file:
+            file.write(dumps(summary) + "\n")
+        logger.info("Saved summary of run %s.", summary["run_id"])
+
+    def query_benchmark_data(self, run_ids: List[str]) -> List[Dict]:
+        records = []
+        for run_id in dict.fromkeys(run_ids):
+            # file names are sanitized run IDs, so check the stored one
+            records += [record for record in map(loads, self._read_run(run_id)) if run_id_of(record) == run_id]
+        return records
+
+    def _summaries(self) -> Dict[str, dict]:
+        if not self.runs_file.exists():
+            return {}
+        with open(self.runs_file, encoding="utf-8") as file:
+            return {summary["run_id"]: summary for summary in map(loads, filter(str.strip, file))}
+
+    def query_run_summaries(self, limit: int = 20, model: str | None = None) -> List[Dict]:
+        summaries = [
+            {key: value for key, value in summary.items() if key != "arms"}
+            for summary in self._summaries().values()
+            if not model or model in summary.get("config", {}).get("models", [])
+        ]
+        return sorted(summaries, key=started_at_key, reverse=True)[:limit]
+
+    def query_run_summary(self, run_id: str) -> Dict | None:
+        return self._summaries().get(run_id)
@@ -0,0 +1,91 @@
+import json
+from typing import Any, List, Tuple
+from grammar_checker.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamingResponseParser:
+    """
+    Incrementally scans a streamed grammar response and emits its parts as soon as they are complete.
+
+    Feeding text chunks returns events:
+        ("mistake", dict)            each object of the top-level "mistakes" array, once it closes
+        ("corrected_sentence", str)  the top-level "corrected_sentence" value, once its string closes
+    The complete document is parsed with `result()` after the stream ends.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack = []  # open containers: "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._expect_key = False
+        self._last_key = None
+        self._mistakes_open = False
+        self._mistake_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.buffer += chunk
+        events = []
+
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+            if self._in_string:
+                self._scan_string_char(char, events)
+            else:
+                self._scan_structure_char(char, events)
+            self._pos += 1
+
+        return events
+
+    def _scan_string_char(self, char: str, events: List[Tuple[str, Any]]) -> None:
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if len(self._stack) == 1:
+                value = json.loads(self.buffer[self._string_start : self._pos + 1])
+                if self._expect_key:
+                    self._last_key = value
+                elif self._last_key == "corrected_sentence":
+                    events.append(("corrected_sentence", value))
+
+    def _scan_structure_char(self, char: str, events: List[Tuple[str, Any]]) -> None:
+        depth = len(self._stack)
+        if char == '"':
+            self._in_string = True
+            self._string_start = self._pos
+        elif char == "{":
+            if self._mistakes_open and depth == 2:
+                self._mistake_start = self._pos
+            self._stack.append(char)
+            self._expect_key = len(self._stack) == 1
+        elif char == "[":
+            if depth == 1 and self._last_key == "mistakes":
+                self._mistakes_open = True
+            self._stack.append(char)
+        elif char in "}]":
+            if self._stack:
+                self._stack.pop()
+            if char == "}" and self._mistakes_open and len(self._stack) == 2 and self._mistake_start is not None:
+                events.append(("mistake", json.loads(self.buffer[self._mistake_start : self._pos + 1])))
+                self._mistake_start = None
+            elif char == "]" and len(self._stack) == 1:
+                self._mistakes_open = False
+        elif depth == 1 and char == ",":
+            self._expect_key = True
+        elif depth == 1 and char == ":":
+            self._expect_key = False
+
+    def result(self) -> dict:
+        """Parse the complete streamed document."""
+        try:
+            return json.loads(self.buffer)
+        except json.JSONDecodeError:
+            logger.error("Streamed response content is not valid JSON.")
+            raise
@@ -0,0 +1,122 @@
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+from grammar_checker.logger import get_logger, request_id_var
+
+logger = get_logger(__name__)
+
+
+class Trace:
+    """
+    Correlation ID, elapsed time, accumulated stage durations (ms) and model token usage of
+    one request, safe to share across threads.
+    """
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._usage: Dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0}
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + duration_ms
+
+    def add_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self._usage["prompt_tokens"] += prompt_tokens
+            self._usage["completion_tokens"] += completion_tokens
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._usage)
+
+    @property
+    def stages(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(duration_ms, 3) for name, duration_ms in self._stages.items()}
+
+
+_trace_var: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("trace", default=None)
+
+# callables notified with (name, wall_ms, cpu_ms) after every stage, e.g. a running profiler
+_stage_hooks: List[Callable[[str, float, float], None]] = []
+
+
+def add_stage_hook(hook: Callable[[str, float, float], None]) -> None:
+    _stage_hooks.append(hook)
+
+
+def remove_stage_hook(hook: Callable[[str, float, float], None]) -> None:
+    if hook in _stage_hooks:
+        _stage_hooks.remove(hook)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> str | None:
+    return request_id_var.get()
+
+
+def get_trace() -> Trace | None:
+    return _trace_var.get()
+
+
+@contextmanager
+def request_context(request_id: str | None = None) -> Iterator[Trace]:
+    """Run the block as one traced request; log records and Mongo records inside carry its ID."""
+    trace = Trace(request_id or new_request_id())
+    trace_token = _trace_var.set(trace)
+    request_id_token = request_id_var.set(trace.request_id)
+    try:
+        yield trace
+    finally:
+        request_id_var.reset(request_id_token)
+        _trace_var.reset(trace_token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block, add it to the current trace and log the duration as a structured field."""
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        record_stage(name, (time.perf_counter() - start) * 1000, (time.thread_time() - cpu_start) * 1000)
+
+
+def record_stage(name: str, duration_ms: float, cpu_ms: float) -> None:
+    """Report a stage timed by the caller, e.g. one spread over the chunks of a stream."""
+    trace = _trace_var.get()
+    if trace is not None:
+        trace.add_stage(name, duration_ms)
+    for hook in _stage_hooks:
+        hook(name, duration_ms, cpu_ms)
+    logger.debug("Stage %s took %.1f ms", name, duration_ms, extra={"stage": name, "duration_ms": duration_ms})
+
+
+def propagate_context(fn: Callable) -> Callable:
+    """
+    Wrap `fn` so it runs with the caller's context (request ID, trace) in another thread.
+
+    Thread pools do not copy contextvars; each call gets its own copy of the captured context
+    because one context cannot be entered by several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,170 @@
+import math
+import threading
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Sequence
+from grammar_checker.logger import get_logger
+from grammar_checker.factory import UsageGranularity
+from grammar_checker.config import MONGO_API_LOG_COLLECTION, MONGO_API_USAGE_COLLECTION, USAGE_ROLLUP_INTERVAL
+
+logger = get_logger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+PERIODS = {UsageGranularity.HOUR: timedelta(hours=1), UsageGranularity.DAY: timedelta(days=1)}
+MEASURES = ("latency_ms", "prompt_tokens", "completion_tokens")
+
+
+def period_start(timestamp: datetime, granularity: UsageGranularity) -> datetime:
+    """Start (UTC) of the hour or day `timestamp` falls in; Mongo returns naive UTC datetimes."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    start = timestamp.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return start.replace(hour=0) if granularity == UsageGranularity.DAY else start
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def describe(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        "sum": round(sum(values), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": values[-1],
+        **{f"p{percent}": percentile(values, percent) for percent in PERCENTILES},
+    }
+
+
+def rollup_usage(database, granularity: UsageGranularity | str, since: datetime, until: datetime) -> List[dict]:
+    """
+    Aggregate API log records with `since` <= timestamp < `until` into one usage document per
+    (period, model): request and error counts plus latency and token percentiles.
+
+    Documents are replaced by period and model, so rolling a period up again (e.g. while it is
+    still in progress) is safe. Percentiles are computed here rather than in an aggregation
+    pipeline, since `$percentile` needs MongoDB 7; only the measured fields are read.
+    """
+    granularity = UsageGranularity(granularity)
+    projection = {"_id": 0, "timestamp": 1, "model": 1, "status": 1, **{measure: 1 for measure in MEASURES}}
+    cursor = database[MONGO_API_LOG_COLLECTION].find({"timestamp": {"$gte": since, "$lt": until}}, projection)
+
+    buckets = {}
+    for record in cursor:
+        key = (period_start(record["timestamp"], granularity), record.get("model"))
+        bucket = buckets.setdefault(key, {"requests": 0, "errors": 0, **{measure: [] for measure in MEASURES}})
+        bucket["requests"] += 1
+        bucket["errors"] += record.get("status") == "error"
+        for measure in MEASURES:
+            if record.get(measure) is not None:
+                bucket[measure].append(record[measure])
+
+    usage = database[MONGO_API_USAGE_COLLECTION]
+    updated_at = datetime.now(UTC)
+    documents = []
+    for (start, model), bucket in sorted(buckets.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        document = {
+            "_id": f"{granularity.value}:{start.isoformat()}:{model}",
+            "granularity": granularity.value,
+            "period_start": start,
+            "model": model,
+            "requests": bucket["requests"],
+            "errors": bucket["errors"],
+            "error_rate": round(bucket["errors"] / bucket["requests"], 4),
+            **{measure: describe(bucket[measure]) for measure in MEASURES},
+            "updated_at": updated_at,
+        }
+        usage.replace_one({"_id": document["_id"]}, document, upsert=True)
+        documents.append(document)
+    logger.debug("Rolled up %s %s usage period(s) from %s to %s.", len(documents), granularity.value, since, until)
+    return documents
+
+
+def rollup_periods(
+    database,
+    since: datetime | None = None,
+    now: datetime | None = None,
+    granularities: Sequence[UsageGranularity] = tuple(PERIODS),
+) -> int:
+    """
+    Refresh the rollups of `granularities` from the period containing `since` through the current one.
+
+    Without `since` the previous and the current period are refreshed, so late records are counted.
+    """
+    now = now or datetime.now(UTC)
+    count = 0
+    for granularity in granularities:
+        period = PERIODS[granularity]
+        current = period_start(now, granularity)
+        start = period_start(since, granularity) if since else current - period
+        count += len(rollup_usage(database, granularity, start, current + period))
+    return count
+
+
+class UsageRollupJob:
+    """
+    Thread that refreshes the recent usage rollups every `interval` seconds while the API runs.
+
+    Each run refreshes the previous and current hour. The daily rollups read up to a day of log
+    records, so they are only refreshed on the first run after an hour closes: the current day, and
+    the previous one right after midnight. It has to run at least once per hour for the rollups to
+    be complete; gaps (e.g. while the API was down) can be filled with `cli.py usage rollup --since`
+    as long as the API log records have not expired yet.
+    """
+
+    def __init__(self, mongo_handler, interval: float = USAGE_ROLLUP_INTERVAL):
+        self.mongo_handler = mongo_handler
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._hour: datetime | None = None  # hour of the last daily refresh
+
+    def run_once(self, now: datetime | None = None) -> int:
+        now = now or datetime.now(UTC)
+        hour = period_start(now, UsageGranularity.HOUR)
+        if hour == self._hour:
+            return rollup_periods(self.mongo_handler.db, now=now, granularities=(UsageGranularity.HOUR,))
+        # an hour closed: count it in its day, which is the previous day right after midnight
+        count = rollup_periods(self.mongo_handler.db, since=hour - PERIODS[UsageGranularity.HOUR], now=now)
+        self._hour = hour
+        return count
+
+    def _work(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Usage rollup error")
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._work, name="usage-rollup", daemon=True)
+        self._thread.start()
+        logger.info("Started usage rollups every %.0f s.", self.interval)
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            logger.info("Stopped usage rollups.")
+
+
+def format_usage(documents: List[dict]) -> str:
+    lines = [
+        f"{'period_start':<16}  {'model':<16} {'requests':>8} {'errors':>6} {'p50_ms':>8} {'p95_ms':>8} "
+        f"{'p99_ms':>8} {'tokens':>9}"
+    ]
+    for document in documents:
+        latency = document.get("latency_ms") or {}
+        tokens = sum((document.get(measure) or {}).get("sum", 0) for measure in ("prompt_tokens", "completion_tokens"))
+        lines.append(
+            f"{document['period_start']:%Y-%m-%d %H:%M}  {str(document['model']):<16} {document['requests']:>8} "
+            f"{document['errors']:>6} {latency.get('p50', 0):>8.1f} {latency.get('p95', 0):>8.1f} "
+            f"{latency.get('p99', 0):>8.1f} {tokens:>9.0f}"
+        )
+    return "\n".join(lines)
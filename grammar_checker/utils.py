@@ -1,24 +1,61 @@
 import json
-from typing import List, Dict, Any, Callable
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator
+from pydantic import ValidationError
 from grammar_checker.logger import get_logger
+from models.benchmark_case import BenchmarkCase, benchmark_case_adapter
 
 logger = get_logger(__name__)
 
 
-# load test cases from a json file
-def load_test_cases(file_path):
+def _read_raw_cases(file_path) -> Iterator[tuple[int, dict]]:
+    """Yield (line or position, raw case); JSONL files are read line by line, JSON arrays at once."""
+    with open(file_path, "r", encoding="utf-8") as file:
+        if Path(file_path).suffix == ".jsonl":
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+        else:
+            yield from enumerate(json.load(file), start=1)
+
+
+# stream validated test cases from a .json array or a .jsonl file (one case per line)
+def iter_test_cases(file_path) -> Iterator[BenchmarkCase]:
+    logger.info("Loading test cases from '%s'", file_path)
+    seen_ids = set()
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            logger.info(f"Loading test cases from '{file_path}'")
-            return json.load(file)
+        for position, raw_case in _read_raw_cases(file_path):
+            # older corpora have no test_id; fall back to the case's position in the file
+            if isinstance(raw_case, dict) and raw_case.get("test_id") is None:
+                raw_case = {**raw_case, "test_id": position}
+            try:
+                test_case = benchmark_case_adapter.validate_python(raw_case)
+            except ValidationError as e:
+                logger.error("Invalid test case #%s in '%s': %s", position, file_path, e)
+                raise ValueError(f"Invalid test case #{position} in '{file_path}': {e}") from e
+            if test_case.test_id in seen_ids:
+                logger.error("Duplicate test_id %r in '%s'", test_case.test_id, file_path)
+                raise ValueError(f"Duplicate test_id {test_case.test_id!r} in '{file_path}'")
+            seen_ids.add(test_case.test_id)
+            yield test_case
     except FileNotFoundError as e:
-        logger.error(f"Test cases file not found: '{file_path}': {e}")
+        logger.error("Test cases file not found: '%s': %s", file_path, e)
         raise FileNotFoundError(f"Test cases file not found: '{file_path}'") from e
     except json.JSONDecodeError as e:
-        logger.error(f"Error decoding JSON from file '{file_path}': {e}")
+        logger.error("Error decoding JSON from file '%s': %s", file_path, e)
         raise ValueError(f"Invalid JSON format in file '{file_path}'") from e
 
 
+# validate every test case of a file without keeping them; returns the number of cases
+def validate_test_cases(file_path) -> int:
+    return sum(1 for _ in iter_test_cases(file_path))
+
+
+# load test cases from a json or jsonl file
+def load_test_cases(file_path) -> List[BenchmarkCase]:
+    return list(iter_test_cases(file_path))
+
+
 def transform_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     transformed = []
 
@@ -28,7 +65,7 @@ def transform_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             response = result["response"].model_dump()
             benchmark_eval = result["benchmark_eval"]
         except (KeyError, AttributeError) as e:
-            logger.error(f"Invalid result structure {result}: {e}")
+            logger.error("Invalid result structure %s: %s", result, e)
             raise
 
         transformed.append({"request": request, "response": response, "benchmark_eval": benchmark_eval})
@@ -39,9 +76,9 @@ def save_to_file(file_path: str, data: Any, writer: Callable = json.dump) -> Non
     try:
         with open(file_path, "w", encoding="utf-8") as f:
             writer(data, f, indent=4)
-        logger.info(f"Test results saved to '{file_path}'")
+        logger.info("Test results saved to '%s'", file_path)
     except Exception as e:
-        logger.error(f"Error saving test results to file '{file_path}': {e}")
+        logger.error("Error saving test results to file '%s': %s", file_path, e)
         raise
 
 
@@ -0,0 +1,208 @@
+# This script drives the /check-grammar/ endpoint with concurrent requests and reports throughput.
+import time
+import uuid
+import asyncio
+from pathlib import Path
+from typing import List, Dict
+import httpx
+import pandas as pd
+from grammar_checker.logger import get_logger
+from grammar_checker.utils import load_test_cases
+from reporting.base_reporter import BenchmarkReporter
+
+
+logger = get_logger(__name__)
+
+LATENCY_PERCENTILES = [0.5, 0.9, 0.95, 0.99]
+
+
+def load_corpus(files: List[Path]) -> List[str]:
+    """Collect the input sentences of one or more benchmark test case files."""
+    sentences = [test_case.input for file_path in files for test_case in load_test_cases(file_path)]
+    if not sentences:
+        raise ValueError("The load test corpus is empty.")
+    return sentences
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse a `Server-Timing` header such as 'model;dur=12.3, enqueue;dur=0.1' into {stage: ms}."""
+    timings = {}
+    for metric in filter(None, (part.strip() for part in header.split(","))):
+        name, *params = metric.split(";")
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                try:
+                    timings[name.strip()] = float(value)
+                except ValueError:
+                    logger.debug("Ignoring malformed Server-Timing metric: %r", metric)
+    return timings
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    payloads: List[dict],
+    concurrency: int,
+    rate: float = 0.0,
+) -> List[dict]:
+    """
+    Send every payload to /check-grammar/ and record one result per request.
+
+    With `rate` > 0 requests are started on a fixed schedule (open loop) and `concurrency`
+    caps the number in flight; otherwise `concurrency` requests are kept busy back to back.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def send(index: int, payload: dict) -> dict:
+        if rate > 0:
+            await asyncio.sleep(max(0.0, start + index / rate - loop.time()))
+
+        async with semaphore:
+            result = {"request_index": index, "model": payload["model"], "status_code": None, "error": None}
+            request_start = time.perf_counter()
+            try:
+                response = await client.post("/check-grammar/", json=payload)
+                result["status_code"] = response.status_code
+                if response.is_error:
+                    result["error"] = f"HTTP {response.status_code}"
+                timings = parse_server_timing(response.headers.get("server-timing", ""))
+            except httpx.HTTPError as e:
+                result["error"] = type(e).__name__
+                timings = {}
+            result["latency_ms"] = (time.perf_counter() - request_start) * 1000
+            result["model_ms"] = timings.get("model")
+            # the API only queues its log record; the Mongo insert is measured by summarize_writer
+            result["enqueue_ms"] = timings.get("enqueue")
+            return result
+
+    return list(await asyncio.gather(*(send(index, payload) for index, payload in enumerate(payloads))))
+
+
+async def fetch_writer_stats(client: httpx.AsyncClient) -> Dict[str, float]:
+    """The record writer counters of GET /metrics, or {} if the API does not answer with them."""
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        return response.json().get("record_writer") or {}
+    except (httpx.HTTPError, ValueError, AttributeError) as e:
+        logger.debug("Could not read the API's record writer metrics: %s", e)
+        return {}
+
+
+async def wait_for_writer(client: httpx.AsyncClient, timeout: float, poll_interval: float = 0.2) -> Dict[str, float]:
+    """Poll GET /metrics until the record writer has no records pending (or `timeout` passes)."""
+    deadline = time.monotonic() + timeout
+    stats = await fetch_writer_stats(client)
+    while stats.get("pending") and time.monotonic() < deadline:
+        await asyncio.sleep(poll_interval)
+        stats = await fetch_writer_stats(client)
+    return stats
+
+
+def summarize_writer(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+    """
+    Mongo write latency of the API's record writer during the test, from two GET /metrics snapshots.
+
+    The mean covers exactly the batches inserted in between; p95 and max are over the writer's latest
+    batches. With several API worker processes, only the worker that answered /metrics is counted.
+    """
+    if not after:
+        return {}
+    batches = after.get("insert_batches", 0) - before.get("insert_batches", 0)
+    insert_ms = after.get("insert_ms_total", 0.0) - before.get("insert_ms_total", 0.0)
+    return {
+        "mongo_records_written": after.get("written", 0) - before.get("written", 0),
+        "mongo_insert_batches": batches,
+        "mongo_insert_ms_mean": insert_ms / batches if batches else None,
+        "mongo_insert_ms_p95": after.get("p95_insert_ms"),
+        "mongo_insert_ms_max": after.get("max_insert_ms"),
+    }
+
+
+def summarize(results: List[dict], duration_s: float, writer_stats: Dict[str, float] | None = None) -> pd.DataFrame:
+    """Aggregate per-request results (and the writer's Mongo write stats) into a one-row summary."""
+    df = pd.DataFrame(results)
+    total = len(df)
+    errors = int(df["error"].notna().sum()) if total else 0
+
+    summary = {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "duration_s": duration_s,
+        "throughput_rps": (total - errors) / duration_s if duration_s else 0.0,
+    }
+
+    for column in ["latency_ms", "model_ms", "enqueue_ms"]:
+        values = df[column].dropna().astype(float) if total else pd.Series(dtype=float)
+        summary[f"{column}_mean"] = values.mean() if not values.empty else None
+        for quantile in LATENCY_PERCENTILES:
+            summary[f"{column}_p{int(quantile * 100)}"] = values.quantile(quantile) if not values.empty else None
+        summary[f"{column}_max"] = values.max() if not values.empty else None
+
+    if total:
+        for status_code, count in df["status_code"].value_counts(dropna=False).items():
+            label = "failed" if pd.isna(status_code) else int(status_code)
+            summary[f"status_{label}"] = int(count)
+
+    summary.update(writer_stats or {})
+    return pd.DataFrame([summary])
+
+
+def main(
+    url: str,
+    corpus_files: List[Path],
+    total_requests: int,
+    concurrency: int,
+    rate: float,
+    models: List[str],
+    prompt_version: str,
+    reporter: BenchmarkReporter,
+    timeout: float = 60.0,
+    drain_timeout: float = 10.0,
+):
+    if total_requests < 1 or concurrency < 1:
+        raise ValueError("requests and concurrency must be positive integers.")
+
+    sentences = load_corpus(corpus_files)
+    payloads = [
+        {
+            "sentence": sentences[index % len(sentences)],
+            "model": models[index % len(models)],
+            "prompt_version": prompt_version,
+            "mode": "api",
+        }
+        for index in range(total_requests)
+    ]
+
+    loadtest_id = str(uuid.uuid4())
+    logger.info(
+        "Starting load test %s against %s: %s requests, concurrency %s, rate %s req/s.",
+        loadtest_id,
+        url,
+        total_requests,
+        concurrency,
+        rate or "unlimited",
+    )
+
+    async def _run():
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            before = await fetch_writer_stats(client)
+            start = time.perf_counter()
+            results = await run_load_test(client, payloads, concurrency, rate)
+            duration_s = time.perf_counter() - start
+            # let the writer insert what the requests queued before reading its latency
+            after = await wait_for_writer(client, drain_timeout)
+            return results, duration_s, summarize_writer(before, after)
+
+    results, duration_s, writer_stats = asyncio.run(_run())
+
+    summary = summarize(results, duration_s, writer_stats)
+    logger.info("Load test %s completed: %s", loadtest_id, summary.iloc[0].dropna().to_dict())
+
+    reporter.report(f"loadtest_details_{loadtest_id}", pd.DataFrame(results))
+    reporter.report(f"loadtest_summary_{loadtest_id}", summary)
+    return summary
@@ -0,0 +1,253 @@
+# This script times the pure-Python hot paths on synthetic data and compares against a stored baseline.
+import json
+import time
+import random
+import logging
+import statistics
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+import pandas as pd
+from grammar_checker.logger import get_logger
+from grammar_checker.prompt_builder import PromptBuilder
+from grammar_checker.evaluator import evaluate, clear_evaluation_cache
+from grammar_checker.utils import transform_results
+from grammar_checker.config import DEFAULT_PROMPT_TEMPLATE
+from models.request import GrammarRequest
+from models.response import GrammarResponse, grammar_response_adapter
+from models.benchmark_case import benchmark_case_adapter
+from reporting import mistakes_report, sentences_report
+
+
+logger = get_logger(__name__)
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+WORDS = ["she", "go", "to", "school", "every", "day", "the", "cat", "is", "more", "faster", "than", "dog", "bought"]
+MISTAKE_TYPES = ["VerbTenseMistake", "PunctuationMistake", "WordOrderMistake", "WrongArticleMistake"]
+
+
+def parse_scale(value: str) -> int:
+    """Translate a scale label ('1k', '100k', '1M') or a plain integer into a document count."""
+    if value in SCALES:
+        return SCALES[value]
+    try:
+        size = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid scale '{value}'. Use one of {list(SCALES)} or a positive integer.")
+    if size < 1:
+        raise ValueError(f"Invalid scale '{value}'. Use one of {list(SCALES)} or a positive integer.")
+    return size
+
+
+# synthetic data
+def make_sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(4, 12))).capitalize() + "."
+
+
+def make_mistakes(rng: random.Random) -> List[dict]:
+    return [
+        {"type": rng.choice(MISTAKE_TYPES), "original": rng.choice(WORDS), "corrected": rng.choice(WORDS)}
+        for _ in range(rng.randint(0, 3))
+    ]
+
+
+def make_documents(size: int, seed: int = 0, runs: int = 2) -> List[dict]:
+    """Create stored-record-shaped documents, as returned by `query_benchmark_data`."""
+    rng = random.Random(seed)
+    documents = []
+    for index in range(size):
+        sentence = make_sentence(rng)
+        expected = make_sentence(rng)
+        actual = expected if rng.random() < 0.7 else make_sentence(rng)
+        documents.append(
+            {
+                "request": {"sentence": sentence, "prompt_version": f"v{index % 3}.txt", "model": f"model-{index % 2}"},
+                "response": {"input": sentence, "mistakes": make_mistakes(rng), "corrected_sentence": actual},
+                "benchmark_eval": {
+                    "run_id": f"run_{index % runs}",
+                    "test_id": index,
+                    "input": sentence,
+                    "mistakes": make_mistakes(rng),
+                    "corrected_sentence": expected,
+                },
+            }
+        )
+    return documents
+
+
+def make_results(size: int, seed: int = 0) -> List[dict]:
+    """Create in-memory benchmark results, as produced by `benchmark.run_tests`."""
+    return [
+        {
+            "request": GrammarRequest(sentence=doc["request"]["sentence"], mode="benchmark"),
+            "response": GrammarResponse(**doc["response"]),
+            "benchmark_eval": doc["benchmark_eval"],
+        }
+        for doc in make_documents(size, seed)
+    ]
+
+
+# benchmark definitions
+@dataclass
+class MicroBenchmark:
+    name: str
+    setup: Callable[[int], object]  # builds the input for a given size (not timed)
+    run: Callable[[object], object]  # the timed call
+
+
+def _build_prompts(data):
+    builder, sentences = data
+    for sentence in sentences:
+        builder.build_prompt(sentence)
+
+
+def _evaluate_responses(pairs):
+    # cold cache, so every repeat measures the comparison itself rather than memoized lookups
+    clear_evaluation_cache()
+    for expected, actual in pairs:
+        evaluate(expected, actual)
+
+
+def _evaluate_mistakes(pairs):
+    for actual, expected in pairs:
+        mistakes_report.evaluate_mistakes(actual, expected, 0.8)
+
+
+def _setup_evaluate_responses(size):
+    return [
+        (benchmark_case_adapter.validate_python(doc["benchmark_eval"]), GrammarResponse(**doc["response"]))
+        for doc in make_documents(size)
+    ]
+
+
+def _setup_validate_responses(size):
+    return [json.dumps(doc["response"]).encode() for doc in make_documents(size)]
+
+
+def _validate_responses(contents):
+    for content in contents:
+        grammar_response_adapter.validate_json(content)
+
+
+def _setup_sentences_summary(size):
+    df = sentences_report.transform_data(make_documents(size))
+    return sentences_report.add_sentence_match_column(df)
+
+
+BENCHMARKS: Dict[str, MicroBenchmark] = {
+    bench.name: bench
+    for bench in [
+        MicroBenchmark(
+            "prompt_builder.build_prompt",
+            lambda size: (PromptBuilder(DEFAULT_PROMPT_TEMPLATE), [make_sentence(random.Random(i)) for i in range(size)]),
+            _build_prompts,
+        ),
+        MicroBenchmark("evaluator.evaluate", _setup_evaluate_responses, _evaluate_responses),
+        MicroBenchmark("response.validate_json", _setup_validate_responses, _validate_responses),
+        MicroBenchmark("mistakes_report.transform_data", make_documents, mistakes_report.transform_data),
+        MicroBenchmark(
+            "mistakes_report.evaluate_mistakes",
+            lambda size: [(d["response"]["mistakes"], d["benchmark_eval"]["mistakes"]) for d in make_documents(size)],
+            _evaluate_mistakes,
+        ),
+        MicroBenchmark("sentences_report.generate_summary", _setup_sentences_summary, sentences_report.generate_summary),
+        MicroBenchmark("utils.transform_results", make_results, transform_results),
+    ]
+}
+
+
+def time_benchmark(bench: MicroBenchmark, size: int, repeat: int) -> dict:
+    """Time `repeat` runs of a benchmark on freshly built data of the given size."""
+    data = bench.setup(size)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bench.run(data)
+        timings.append(time.perf_counter() - start)
+    return {"size": size, "repeat": repeat, "min_s": min(timings), "median_s": statistics.median(timings)}
+
+
+def run_benchmarks(names: List[str], scales: List[str], repeat: int) -> Dict[str, dict]:
+    """Run the selected benchmarks at every scale, keyed by '<name>[<scale>]'."""
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {sorted(unknown)}. Available: {list(BENCHMARKS)}")
+
+    results = {}
+    # per-call INFO logging would dominate the timings and flood the console
+    logging.disable(logging.INFO)
+    try:
+        for scale in scales:
+            size = parse_scale(scale)
+            for name in names:
+                results[f"{name}[{scale}]"] = time_benchmark(BENCHMARKS[name], size, repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    for key, result in results.items():
+        logger.info("%s: median %.4fs, min %.4fs", key, result["median_s"], result["min_s"])
+    return results
+
+
+def load_baseline(file_path: Path) -> Dict[str, dict]:
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(file_path: Path, results: Dict[str, dict]) -> None:
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+    logger.info("Microbenchmark baseline saved to '%s'", file_path)
+
+
+def compare_results(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> pd.DataFrame:
+    """
+    Compare median timings against a baseline.
+
+    A benchmark regresses when its median is more than `threshold` (e.g. 0.1 = 10%) slower
+    than the baseline median. Benchmarks missing from the baseline are reported but never flagged.
+    """
+    rows = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        ratio = result["median_s"] / base["median_s"] if base and base["median_s"] else None
+        rows.append(
+            {
+                "benchmark": key,
+                "baseline_median_s": base["median_s"] if base else None,
+                "median_s": result["median_s"],
+                "ratio": ratio,
+                "regression": ratio is not None and ratio > 1 + threshold,
+            }
+        )
+    return pd.DataFrame(rows, columns=["benchmark", "baseline_median_s", "median_s", "ratio", "regression"])
+
+
+def main(
+    names: List[str],
+    scales: List[str],
+    repeat: int,
+    baseline_file: Path,
+    save: bool = False,
+    compare: bool = False,
+    threshold: float = 0.1,
+) -> bool:
+    """Run the microbenchmarks; returns False when a regression against the baseline was found."""
+    results = run_benchmarks(names, scales, repeat)
+
+    if save:
+        save_baseline(baseline_file, results)
+
+    if compare:
+        comparison = compare_results(results, load_baseline(baseline_file), threshold)
+        logger.info("Comparison against '%s':\n%s", baseline_file, comparison.to_string(index=False))
+        regressions = comparison[comparison["regression"]]
+        if not regressions.empty:
+            logger.error(
+                "Performance regressions beyond %.0f%%: %s", threshold * 100, list(regressions["benchmark"])
+            )
+            return False
+
+    return True
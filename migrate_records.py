@@ -0,0 +1,82 @@
+# This script converts stored benchmark records between the full and the lean record schema.
+import bson
+from typing import List
+from pymongo import ReplaceOne, UpdateOne
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage
+from grammar_checker.factory import RecordSchema
+from grammar_checker.records import split_record, is_lean
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.config import MIGRATE_BATCH_SIZE
+from reevaluate import iter_batches
+
+
+logger = get_logger(__name__)
+
+
+def migrate_batch(db: MongoDBHandler, records: List[dict], schema: RecordSchema, dry_run: bool = False) -> List[dict]:
+    """Records of one batch in `schema`; for the lean schema their test cases are stored first."""
+    if schema == RecordSchema.FULL:
+        return db.hydrate(records)
+
+    migrated, cases = [], {}
+    for record in records:
+        lean, case = split_record(record)
+        migrated.append(lean)
+        if case:
+            cases[case["_id"]] = case
+    if cases and not dry_run:
+        operations = [
+            UpdateOne(
+                {"_id": case_id},
+                {"$setOnInsert": {key: value for key, value in case.items() if key != "_id"}},
+                upsert=True,
+            )
+            for case_id, case in cases.items()
+        ]
+        with stage("mongo_bulk_write"):
+            db.test_cases.bulk_write(operations, ordered=False)
+    return migrated
+
+
+def migrate_records(
+    mongo_handler: MongoDBHandler,
+    schema: RecordSchema | str,
+    run_ids: List[str] | None = None,
+    batch_size: int = MIGRATE_BATCH_SIZE,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Rewrite benchmark records (of `run_ids`, or all of them) in `schema`.
+
+    Records are streamed in batches of `batch_size` and replaced with one bulk write per batch.
+    Records already in the target schema are skipped, so an interrupted migration can be run again.
+    `dry_run` only counts the records and their encoded size before and after.
+    """
+    schema = RecordSchema(schema)
+    query = {"benchmark_eval": {"$exists": True}}
+    if run_ids:
+        query["benchmark_eval.run_id"] = {"$in": run_ids}
+    # records to convert are those not yet in the target schema
+    query["schema"] = RecordSchema.LEAN.value if schema == RecordSchema.FULL else {"$ne": RecordSchema.LEAN.value}
+    totals = {"records": 0, "bytes_before": 0, "bytes_after": 0}
+
+    with mongo_handler as db:
+        cursor = db.collection.find(query, batch_size=batch_size)
+        for records in iter_batches(cursor, batch_size):
+            operations = []
+            for before, after in zip(records, migrate_batch(db, records, schema, dry_run)):
+                if is_lean(after) != (schema == RecordSchema.LEAN):
+                    continue  # its test case is missing, so it is left as it is
+                totals["records"] += 1
+                totals["bytes_before"] += len(bson.encode(before))
+                totals["bytes_after"] += len(bson.encode(after))
+                operations.append(ReplaceOne({"_id": before["_id"]}, after))
+            if operations and not dry_run:
+                with stage("mongo_bulk_write"):
+                    db.collection.bulk_write(operations, ordered=False)
+            logger.debug("Migrated %s record(s) to the %s schema.", totals["records"], schema.value)
+
+    summary = {"schema": schema.value, "dry_run": dry_run, **totals}
+    logger.info("Record migration completed: %s", summary)
+    return summary
@@ -0,0 +1,230 @@
+# mock_llm.py
+"""
+Deterministic stand-in for the OpenAI chat completions API.
+
+Returns canned `GrammarResponse`-shaped JSON built from the benchmark test case files,
+so the API and the benchmark pipeline can be load-tested offline without spending tokens.
+Point `OpenAIClient` at it by setting `OPENAI_BASE_URL=http://127.0.0.1:8001/v1`.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List
+from dataclasses import dataclass, field
+from grammar_checker.logger import get_logger
+from grammar_checker.config import BENCHMARKS_DIR
+
+logger = get_logger(__name__)
+
+
+class LatencyDistribution(str, Enum):
+    FIXED = "fixed"
+    UNIFORM = "uniform"
+    NORMAL = "normal"
+    EXPONENTIAL = "exponential"
+
+    def sample(self, rng: random.Random, mean_ms: float, jitter_ms: float) -> float:
+        """Draw one latency value in milliseconds (never negative)."""
+        mapping = {
+            LatencyDistribution.FIXED: lambda: mean_ms,
+            LatencyDistribution.UNIFORM: lambda: rng.uniform(mean_ms - jitter_ms, mean_ms + jitter_ms),
+            LatencyDistribution.NORMAL: lambda: rng.gauss(mean_ms, jitter_ms),
+            LatencyDistribution.EXPONENTIAL: lambda: rng.expovariate(1 / mean_ms) if mean_ms > 0 else 0.0,
+        }
+
+        return max(0.0, mapping[self]())
+
+
+@dataclass
+class MockLLMSettings:
+    latency: LatencyDistribution = LatencyDistribution.FIXED
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0  # share of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # share of requests answered with HTTP 429
+    max_rps: float = 0.0  # requests per second before returning 429, 0 disables the limit
+    seed: int = 0
+    test_cases_files: List[Path] = field(default_factory=lambda: sorted(BENCHMARKS_DIR.glob("*.json")))
+
+
+class RateLimiter:
+    """Token bucket allowing `max_rps` requests per second with a burst of the same size."""
+
+    def __init__(self, max_rps: float, clock=time.monotonic):
+        self.max_rps = max_rps
+        self.clock = clock
+        self.tokens = max_rps
+        self.updated_at = clock()
+
+    def acquire(self) -> bool:
+        if self.max_rps <= 0:
+            return True
+
+        now = self.clock()
+        self.tokens = min(self.max_rps, self.tokens + (now - self.updated_at) * self.max_rps)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def load_canned_responses(files: List[Path]) -> Dict[str, dict]:
+    """Map each benchmark input sentence to its expected grammar response."""
+    canned = {}
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as file:
+            for test_case in json.load(file):
+                canned[test_case["input"]] = {
+                    "input": test_case["input"],
+                    "mistakes": test_case.get("mistakes", []),
+                    "corrected_sentence": test_case["corrected_sentence"],
+                }
+    logger.info("Loaded %s canned responses from %s file(s).", len(canned), len(files))
+    return canned
+
+
+def extract_sentence(content: str) -> str:
+    """
+    Return the sentence from a rendered prompt: the text after the last 'Sentence:' marker, up to
+    the first blank line, since some templates (e.g. v2.1_with_example.txt) continue after it.
+    """
+    _, marker, sentence = content.rpartition("Sentence:")
+    if not marker:
+        return content.strip()
+    return re.split(r"\n\s*\n", sentence.strip(), maxsplit=1)[0].strip()
+
+
+def build_grammar_response(sentence: str, canned: Dict[str, dict]) -> dict:
+    """Look up the canned response for a sentence, echoing it back unchanged when unknown."""
+    return canned.get(sentence) or {"input": sentence, "mistakes": [], "corrected_sentence": sentence}
+
+
+def count_tokens(text: str) -> int:
+    """Rough whitespace token count used for the mocked `usage` block."""
+    return len(text.split())
+
+
+STREAM_CHUNK_SIZE = 16  # characters of content per streamed chunk
+
+
+def stream_chunks(completion_id: str, model: str, content: str, usage: dict | None = None):
+    """
+    Yield the content as OpenAI `chat.completion.chunk` Server-Sent Events, followed by a chunk
+    with no choices that carries `usage` when the client asked for it.
+    """
+    created = int(time.time())
+    pieces = [content[i : i + STREAM_CHUNK_SIZE] for i in range(0, len(content), STREAM_CHUNK_SIZE)]
+    for index, piece in enumerate(pieces):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                    "finish_reason": "stop" if index == len(pieces) - 1 else None,
+                }
+            ],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    if usage is not None:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [],
+            "usage": usage,
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def error_response(status_code: int, message: str, error_type: str):
+    from fastapi.responses import JSONResponse
+
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "code": error_type}},
+    )
+
+
+def create_app(settings: MockLLMSettings | None = None):
+    # FastAPI is only needed to serve, not to parse the mock-llm CLI options
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    settings = settings or MockLLMSettings()
+    canned = load_canned_responses(settings.test_cases_files)
+    rng = random.Random(settings.seed)
+    limiter = RateLimiter(settings.max_rps)
+    state = {"requests": 0}
+
+    app = FastAPI(title="Mock LLM")
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        state["requests"] += 1
+        request_number = state["requests"]
+
+        if not limiter.acquire():
+            return error_response(429, "Mock throughput limit exceeded.", "rate_limit_exceeded")
+
+        # draw every random value up front so the sequence only depends on the request order
+        latency_ms = settings.latency.sample(rng, settings.latency_ms, settings.latency_jitter_ms)
+        roll = rng.random()
+        await asyncio.sleep(latency_ms / 1000)
+
+        if roll < settings.rate_limit_rate:
+            return error_response(429, "Injected rate limit error.", "rate_limit_exceeded")
+        if roll < settings.rate_limit_rate + settings.error_rate:
+            return error_response(500, "Injected server error.", "server_error")
+
+        prompt = body["messages"][-1]["content"]
+        content = json.dumps(build_grammar_response(extract_sentence(prompt), canned))
+        completion_id = f"chatcmpl-mock-{request_number}"
+        model = body.get("model", "mock")
+
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            chunks = stream_chunks(completion_id, model, content, usage if include_usage else None)
+            return StreamingResponse(chunks, media_type="text/event-stream")
+
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    @app.get("/health")
+    def health_check():
+        return {"status": "ok", "requests": state["requests"]}
+
+    return app
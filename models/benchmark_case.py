@@ -0,0 +1,21 @@
+from typing import Tuple
+from pydantic import Field, TypeAdapter
+from pydantic.dataclasses import dataclass
+from models.response import Mistake
+
+
+# One benchmark test case, validated once at load; immutable so it can be shared by every model x template run
+@dataclass(frozen=True, slots=True)
+class BenchmarkCase:
+    test_id: int | str
+    input: str = Field(..., min_length=1)
+    corrected_sentence: str = Field(..., min_length=1)
+    mistakes: Tuple[Mistake, ...] = ()
+    test_desc: str | None = None
+
+    def to_dict(self) -> dict:
+        """Plain-dict form stored (with the evaluation fields) as a record's `benchmark_eval`."""
+        return benchmark_case_adapter.dump_python(self, mode="json", exclude_none=True)
+
+
+benchmark_case_adapter = TypeAdapter(BenchmarkCase)
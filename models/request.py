@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Literal
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal
 from grammar_checker.config import (
     DEFAULT_MODEL,
     DEFAULT_PROMPT_TEMPLATE,
@@ -10,3 +10,23 @@ class GrammarRequest(BaseModel):
     prompt_version: str = DEFAULT_PROMPT_TEMPLATE
     model: str = DEFAULT_MODEL
     mode: Literal["api", "benchmark", "interactive"] = Field("api", description="The mode of operation, e.g., 'benchmark', 'interactive', 'api'.")
+
+
+class DocumentRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="A paragraph or document; it is checked sentence by sentence.")
+    prompt_version: str = DEFAULT_PROMPT_TEMPLATE
+    model: str = DEFAULT_MODEL
+    mode: Literal["api", "interactive"] = Field("api", description="The mode of operation, e.g., 'api', 'interactive'.")
+
+
+class JobRequest(BaseModel):
+    sentences: List[str] = Field(default_factory=list, description="Sentences to check, one per item.")
+    text: str | None = Field(None, description="File contents or a document; it is split into sentences.")
+    prompt_version: str = DEFAULT_PROMPT_TEMPLATE
+    model: str = DEFAULT_MODEL
+
+    @model_validator(mode="after")
+    def check_input(self):
+        if not any(sentence.strip() for sentence in self.sentences) and not (self.text and self.text.strip()):
+            raise ValueError("Provide 'sentences' or 'text'.")
+        return self
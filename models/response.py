@@ -1,23 +1,98 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal
-
-# Represents one individual mistake entry in the response
-# class Mistake(BaseModel):
-#     type: Literal[
-#         "PunctuationMistake",
-#         "WordOrderMistake",
-#         "WrongArticleMistake",
-#         "VerbTenseMistake",
-#         "ComparativeFormMistake",
-#         "SpellingMistake",
-#         "CapitalizationMistake",
-#         "OtherMistake"
-#     ]
-#     original: str
-#     corrected: str
-    
+from enum import Enum
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic.dataclasses import dataclass
+from typing import Annotated, List, Dict
+
+
+# Mistake categories named in the prompts and the benchmark files
+class MistakeType(str, Enum):
+    PUNCTUATION = "PunctuationMistake"
+    WORD_ORDER = "WordOrderMistake"
+    WRONG_ARTICLE = "WrongArticleMistake"
+    ARTICLE = "ArticleMistake"
+    VERB_TENSE = "VerbTenseMistake"
+    COMPARATIVE_FORM = "ComparativeFormMistake"
+    SPELLING = "SpellingMistake"
+    CAPITALIZATION = "CapitalizationMistake"
+    WRONG_WORD = "WrongWordMistake"
+    WORD_FORM = "WordFormMistake"
+    NOUN_FORM = "NounFormMistake"
+    WRONG_PREPOSITION = "WrongPrepositionMistake"
+    PREPOSITION = "PrepositionMistake"
+    ADVERB = "AdverbMistake"
+    OTHER = "OtherMistake"
+
+
+# The prompts end their type lists with "etc.", so a label outside MistakeType is kept as the model
+# wrote it (for the mistakes report) instead of failing the response or being folded into OTHER
+MistakeLabel = Annotated[MistakeType | str, Field(union_mode="left_to_right")]
+
+
+# Represents one individual mistake entry in the response; slotted and immutable to stay small
+@dataclass(frozen=True, slots=True)
+class Mistake:
+    type: MistakeLabel
+    original: str
+    corrected: str
+
+
+# Document mode mistake: start/end are character offsets into the document, None when not found
+@dataclass(frozen=True, slots=True)
+class LocatedMistake(Mistake):
+    start: int | None = None
+    end: int | None = None
+
+
 # Base schema used by API and interactive responses
 class GrammarResponse(BaseModel):
     input: str = Field(..., min_length=1)
-    mistakes: List[dict]
-    corrected_sentence: str =  Field(..., min_length=1)
+    mistakes: List[Mistake]
+    corrected_sentence: str = Field(..., min_length=1)
+
+
+# Validates the raw model output (JSON text or bytes) in one pass, without json.loads + **kwargs
+grammar_response_adapter = TypeAdapter(GrammarResponse)
+
+
+# One checked sentence of a document; start/end are character offsets into the document
+class DocumentSegment(BaseModel):
+    start: int
+    end: int
+    input: str
+    corrected_sentence: str
+
+
+# Document mode response: mistakes carry "start"/"end" offsets into the original text
+class DocumentResponse(GrammarResponse):
+    mistakes: List[LocatedMistake]
+    segments: List[DocumentSegment]
+
+
+# Returned when a job is enqueued
+class JobCreatedResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+
+
+# One sentence of a job; `response` is set once it has been checked
+class JobResult(BaseModel):
+    position: int
+    sentence: str
+    status: str
+    attempts: int
+    response: GrammarResponse | None = None
+    error: str | None = None
+
+
+# Job progress plus one page of results
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    model: str
+    prompt_version: str
+    total: int
+    counts: Dict[str, int]
+    offset: int
+    limit: int
+    results: List[JobResult]
@@ -0,0 +1,198 @@
+# This script re-applies the evaluator to stored benchmark runs without calling the model again.
+import uuid
+import multiprocessing
+from datetime import datetime, UTC
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List
+from pymongo import InsertOne, UpdateOne
+from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage
+from grammar_checker.evaluator import evaluate
+from grammar_checker.factory import NormalizationMode
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.runs import build_run_summary, count_result
+from grammar_checker.config import EVALUATION_MODE, EVALUATION_TOLERANCE, REEVALUATE_BATCH_SIZE, REEVALUATE_WORKERS
+from models.response import grammar_response_adapter
+from models.benchmark_case import benchmark_case_adapter
+
+
+logger = get_logger(__name__)
+
+
+def iter_batches(records: Iterable[dict], batch_size: int) -> Iterator[List[dict]]:
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        yield batch
+
+
+def reevaluate_batch(records: List[dict], mode: NormalizationMode, tolerance: int) -> List[dict]:
+    """
+    Evaluate stored records again; returns one {"_id", "arm", "match_before", "benchmark_eval"} per record,
+    `arm` being the record's (prompt_version, model).
+
+    Runs in worker processes, so it only takes and returns plain data.
+    """
+    results = []
+    for record in records:
+        benchmark_eval = record["benchmark_eval"]
+        test_case = benchmark_case_adapter.validate_python(benchmark_eval)
+        response = grammar_response_adapter.validate_python(record["response"])
+        evaluation = evaluate(test_case, response, mode=mode, tolerance=tolerance)
+        request = record.get("request", {})
+        results.append(
+            {
+                "_id": record["_id"],
+                "arm": (request.get("prompt_version"), request.get("model")),
+                "match_before": benchmark_eval.get("match"),
+                "benchmark_eval": {**benchmark_eval, "match": evaluation.match, "evaluation": evaluation.to_dict()},
+            }
+        )
+    return results
+
+
+def _evaluated_batches(batches: Iterator[List[dict]], mode, tolerance, workers: int) -> Iterator[List[dict]]:
+    if workers <= 1:
+        for batch in batches:
+            yield reevaluate_batch(batch, mode, tolerance)
+        return
+
+    # keep a bounded number of batches in flight so the cursor is not read ahead into memory;
+    # spawned rather than forked, since the logging listener thread is already running
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending = []
+        for batch in batches:
+            pending.append(executor.submit(reevaluate_batch, batch, mode, tolerance))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def _track(cursor: Iterable[dict], records: dict | None) -> Iterator[dict]:
+    """Yield the evaluator's fields of each record, keeping full records aside when they are copied."""
+    for record in cursor:
+        if records is not None:
+            records[record["_id"]] = record
+        yield {key: record[key] for key in ("_id", "request", "response", "benchmark_eval", "schema") if key in record}
+
+
+def save_reevaluated_summary(
+    db: MongoDBHandler,
+    run_id: str,
+    target_run_id: str,
+    arm_counts: dict,
+    mode: NormalizationMode,
+    tolerance: int,
+    reevaluated_at: datetime,
+):
+    """Write the run summary of a re-evaluated run, keeping what the source run's summary recorded."""
+    source = db.query_run_summary(run_id) or {}
+    config = {
+        **source.get("config", {}),
+        "evaluation_mode": mode.value,
+        "evaluation_tolerance": tolerance,
+        "reevaluated_at": reevaluated_at,
+    }
+    if target_run_id != run_id:
+        config["source_run_id"] = run_id
+        started_at, finished_at = reevaluated_at, datetime.now(UTC)
+    else:
+        started_at = source.get("started_at", reevaluated_at)
+        finished_at = source.get("finished_at", started_at)
+    db.save_run_summary(
+        build_run_summary(
+            target_run_id, arm_counts, source.get("mode", "reevaluate"), config, started_at, finished_at
+        )
+    )
+
+
+def reevaluate_run(
+    mongo_handler: MongoDBHandler,
+    run_id: str,
+    mode: NormalizationMode | str = EVALUATION_MODE,
+    tolerance: int = EVALUATION_TOLERANCE,
+    new_run: bool = False,
+    workers: int = REEVALUATE_WORKERS,
+    batch_size: int = REEVALUATE_BATCH_SIZE,
+) -> dict:
+    """
+    Re-evaluate every record of `run_id` with the current evaluator.
+
+    Records are streamed from Mongo in batches of `batch_size`, evaluated by `workers` processes
+    and written back with one bulk write per batch: in place (updating `benchmark_eval`) or, with
+    `new_run`, as copies under a new run ID that point back to the source run.
+
+    The run summary is rebuilt from the new evaluations: replaced in place, or written for the new
+    run with `source_run_id` in its config. Latency and tokens are kept from the original records.
+    """
+    mode = NormalizationMode(mode)
+    target_run_id = str(uuid.uuid4()) if new_run else run_id
+    totals = {"records": 0, "matched_before": 0, "matched_after": 0, "changed": 0}
+    reevaluated_at = datetime.now(UTC)
+    arm_counts = {}
+
+    with mongo_handler as db:
+        projection = None
+        if not new_run:
+            projection = {
+                "_id": 1,
+                "request.model": 1,
+                "request.prompt_version": 1,
+                "response": 1,
+                "benchmark_eval": 1,
+                "schema": 1,
+            }
+        cursor = db.collection.find({"benchmark_eval.run_id": run_id}, projection, batch_size=batch_size)
+        records = {} if new_run else None
+        # lean records get their test cases back before they are evaluated
+        batches = map(db.hydrate, iter_batches(_track(cursor, records), batch_size))
+
+        for results in _evaluated_batches(batches, mode, tolerance, workers):
+            operations = []
+            for result in results:
+                benchmark_eval = result["benchmark_eval"]
+                totals["records"] += 1
+                totals["matched_before"] += bool(result["match_before"])
+                totals["matched_after"] += benchmark_eval["match"]
+                totals["changed"] += bool(result["match_before"]) != benchmark_eval["match"]
+                count_result(arm_counts, *result["arm"], benchmark_eval)
+                if new_run:
+                    record = records.pop(result["_id"])
+                    record.pop("_id")
+                    record["benchmark_eval"] = {
+                        **record["benchmark_eval"],
+                        "match": benchmark_eval["match"],
+                        "evaluation": benchmark_eval["evaluation"],
+                        "run_id": target_run_id,
+                        "source_run_id": run_id,
+                        "reevaluated_at": reevaluated_at,
+                    }
+                    operations.append(InsertOne(record))
+                else:
+                    operations.append(
+                        UpdateOne(
+                            {"_id": result["_id"]},
+                            {
+                                "$set": {
+                                    "benchmark_eval.match": benchmark_eval["match"],
+                                    "benchmark_eval.evaluation": benchmark_eval["evaluation"],
+                                    "benchmark_eval.reevaluated_at": reevaluated_at,
+                                }
+                            },
+                        )
+                    )
+            if operations:
+                with stage("mongo_bulk_write"):
+                    db.collection.bulk_write(operations, ordered=False)
+            logger.debug("Re-evaluated %s record(s) of run %s.", totals["records"], run_id)
+
+        if totals["records"]:
+            save_reevaluated_summary(db, run_id, target_run_id, arm_counts, mode, tolerance, reevaluated_at)
+
+    if not totals["records"]:
+        logger.warning("No benchmark records found for run %s.", run_id)
+    summary = {"run_id": target_run_id, "source_run_id": run_id, "mode": mode.value, **totals}
+    logger.info("Re-evaluation of %s completed: %s", run_id, summary)
+    return summary
+
@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import Dict, List
+import pandas as pd
+from grammar_checker.logger import get_logger, get_display_path
+from grammar_checker.config import EXPORT_BATCH_SIZE
+from reporting.data_access import query_benchmark_data
+
+logger = get_logger(__name__)
+
+# One row per record: the fields the reports read, flattened out of request/response/benchmark_eval.
+# pyarrow is optional, so the schema is built on first use.
+COLUMNS = [
+    "run_id",
+    "test_id",
+    "model",
+    "prompt_version",
+    "actual_sentence",
+    "expected_sentence",
+    "actual_mistakes",
+    "expected_mistakes",
+]
+MISTAKE_FIELDS = ["type", "original", "corrected"]
+SENTENCE_COLUMNS = COLUMNS[:6]
+MISTAKE_COLUMNS = ["run_id", "test_id", "prompt_version", "model", "actual_mistakes", "expected_mistakes"]
+
+# Arrow IPC files are written uncompressed, so they can be memory-mapped and read without a copy
+FILE_FORMATS = {".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow", ".parquet": "parquet"}
+
+
+def file_format_of(path: Path | str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in FILE_FORMATS:
+        raise ValueError(f"Unknown export file type '{suffix}', expected one of {tuple(FILE_FORMATS)}.")
+    return FILE_FORMATS[suffix]
+
+
+def run_schema(numeric_ids: bool = False):
+    import pyarrow as pa
+
+    mistake = pa.struct([(field, pa.string()) for field in MISTAKE_FIELDS])
+    return pa.schema(
+        [(name, pa.int64() if name == "test_id" and numeric_ids else pa.string()) for name in SENTENCE_COLUMNS]
+        + [("actual_mistakes", pa.list_(mistake)), ("expected_mistakes", pa.list_(mistake))]
+    )
+
+
+def has_numeric_ids(records: List[Dict]) -> bool:
+    """True if every record's test ID is an integer, as in the benchmark files."""
+    return all(
+        isinstance(test_id, int) and not isinstance(test_id, bool)
+        for test_id in (doc.get("benchmark_eval", {}).get("test_id") for doc in records)
+    )
+
+
+def mistake_structs(mistakes: List[Dict] | None) -> List[Dict]:
+    return [{field: mistake.get(field) for field in MISTAKE_FIELDS} for mistake in mistakes or []]
+
+
+def record_columns(records: List[Dict], numeric_ids: bool = False) -> Dict[str, list]:
+    """
+    The columns of `records` (documents in the full form of `build_record`), one list per column.
+    Test IDs are kept as integers with `numeric_ids`, otherwise stored as strings.
+    """
+    columns = {name: [] for name in COLUMNS}
+    for doc in records:
+        request = doc.get("request", {})
+        response = doc.get("response", {})
+        benchmark_eval = doc.get("benchmark_eval", {})
+        test_id = benchmark_eval.get("test_id")
+
+        columns["run_id"].append(benchmark_eval.get("run_id"))
+        columns["test_id"].append(test_id if numeric_ids or test_id is None else str(test_id))
+        columns["model"].append(request.get("model"))
+        columns["prompt_version"].append(request.get("prompt_version"))
+        columns["actual_sentence"].append(response.get("corrected_sentence"))
+        columns["expected_sentence"].append(benchmark_eval.get("corrected_sentence"))
+        columns["actual_mistakes"].append(mistake_structs(response.get("mistakes")))
+        columns["expected_mistakes"].append(mistake_structs(benchmark_eval.get("mistakes")))
+    return columns
+
+
+def export_runs(run_ids: List[str], path: Path | str, storage=None, batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Write the records of `run_ids` to a columnar file that reports can read with `RunFile`.
+
+    Args:
+        run_ids (List[str]): Runs to export.
+        path (Path | str): File to write; `.arrow` (also `.feather`, `.ipc`) for an uncompressed Arrow
+            IPC file, `.parquet` for a zstd-compressed Parquet file.
+        storage (StorageBackend | str, optional): Backend the runs were saved to. Defaults to STORAGE_BACKEND.
+        batch_size (int): Records per Arrow record batch or Parquet row group.
+    Returns:
+        int: The number of records written; nothing is written if the runs have no records.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    file_format = file_format_of(path)
+    records = query_benchmark_data(run_ids, storage=storage)
+    if not records:
+        logger.warning("No benchmark data found for %s. Nothing exported.", run_ids)
+        return 0
+
+    # test IDs are integers in the benchmark files, so reports keep their values and order; any other
+    # ID in the export makes the column a string one
+    numeric_ids = has_numeric_ids(records)
+    schema = run_schema(numeric_ids)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if file_format == "arrow":
+        writer = pa.ipc.new_file(str(path), schema)
+    else:
+        writer = pq.ParquetWriter(str(path), schema, compression="zstd")
+    with writer:
+        for start in range(0, len(records), batch_size):
+            columns = record_columns(records[start : start + batch_size], numeric_ids)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+    logger.info("Exported %s record(s) of %s run(s) to '%s'.", len(records), len(run_ids), get_display_path(path))
+    return len(records)
+
+
+class RunFile:
+    """
+    A run file written by `export_runs`, as input to the reports in place of queried documents.
+
+    Arrow IPC files are memory-mapped, so their columns are read straight from the page cache;
+    Parquet files are memory-mapped too but decompressed on read. The reports build their frames
+    from whole columns, without a Python dictionary per record.
+    """
+
+    def __init__(self, path: Path | str, run_ids: List[str] | None = None):
+        self.path = Path(path)
+        self.file_format = file_format_of(self.path)
+        self.run_ids = list(run_ids or [])
+        self.table = self._open()
+
+    def _open(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        if self.file_format == "arrow":
+            table = pa.ipc.open_file(pa.memory_map(str(self.path), "r")).read_all()
+        else:
+            table = pq.read_table(str(self.path), memory_map=True)
+        if self.run_ids:
+            table = table.filter(pc.is_in(table["run_id"], value_set=pa.array(self.run_ids, pa.string())))
+        logger.debug("Opened %s record(s) from '%s'.", table.num_rows, get_display_path(self.path))
+        return table
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def sentences_frame(self) -> pd.DataFrame:
+        """The frame of `sentences_report.transform_data`."""
+        return self.table.select(SENTENCE_COLUMNS).to_pandas()
+
+    def mistake_pairs(self) -> pd.DataFrame:
+        """
+        One row per (actual, expected) mistake pair of a record, the pairs `mistakes_report` compares:
+        the record's position and (run_id, test_id, prompt_version, model), `source_index` and
+        `target_index` of the pair, and the mistake fields as `actual_<field>` and `expected_<field>`.
+
+        The mistake lists are flattened column-wise and paired with a join on the record, without
+        a Python dictionary per mistake.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        def flatten(column: str, side: str, index: str) -> pd.DataFrame:
+            mistakes = pc.list_flatten(self.table[column])
+            frame = pa.table(
+                {
+                    "record": pc.list_parent_indices(self.table[column]),
+                    **{f"{side}_{field}": pc.struct_field(mistakes, field) for field in MISTAKE_FIELDS},
+                }
+            ).to_pandas()
+            frame.insert(1, index, frame.groupby("record").cumcount())
+            return frame
+
+        pairs = flatten("actual_mistakes", "actual", "source_index").merge(
+            flatten("expected_mistakes", "expected", "target_index"), on="record"
+        )
+        records = self.table.select(MISTAKE_COLUMNS[:4]).to_pandas().take(pairs["record"]).reset_index(drop=True)
+        return pd.concat([pairs[["record"]], records, pairs.drop(columns="record")], axis=1)
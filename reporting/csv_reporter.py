@@ -19,7 +19,7 @@ class CSVReporter(BenchmarkReporter):
 
         if isinstance(data, pd.DataFrame):
             data.to_csv(file_path, index=False)
-            logger.info(f"Report {file_path.name} saved in '{get_display_path(file_path.parent)}'.")
+            logger.info("Report %s saved in '%s'.", file_path.name, get_display_path(file_path.parent))
         else:
             error_msg = f"CSVReporter cannot handle data type: {type(data)}"
             logger.error(error_msg)
@@ -1,26 +1,80 @@
 from typing import List, Dict
-from pymongo import MongoClient
 from grammar_checker.logger import get_logger
-from grammar_checker.config import MONGO_URI, MONGO_DB, MONGO_COLLECTION
+from grammar_checker.mongo import get_client
+from grammar_checker.factory import StorageBackendType
+from grammar_checker.storage import StorageBackend
+from grammar_checker.config import (
+    MONGO_URI,
+    MONGO_DB,
+    MONGO_API_USAGE_COLLECTION,
+    STORAGE_BACKEND,
+)
 
 logger = get_logger(__name__)
 
 
-def query_benchmark_data(run_ids: List[str]) -> List[Dict]:
+def get_storage(storage: StorageBackend | StorageBackendType | str | None = None) -> StorageBackend:
+    """The backend to read from: a given backend, one built for a backend type, or STORAGE_BACKEND."""
+    if isinstance(storage, StorageBackend):
+        return storage
+    return StorageBackendType(storage or STORAGE_BACKEND).build()
+
+
+def query_benchmark_data(run_ids: List[str], storage: StorageBackend | str | None = None) -> List[Dict]:
     """
-    Queries the database for documents matching the provided list of run IDs.
-    
+    Queries the storage backend for documents matching the provided list of run IDs.
+
     Args:
         run_ids (List[str]): A list of run IDs to query in the database.
+        storage (StorageBackend | str, optional): Backend (or backend type) the runs were saved to.
+            Defaults to STORAGE_BACKEND.
     Returns:
         List[Dict]: A list of documents containing the fields for each matching run ID.
+            Lean records are returned in full form, with their test case filled back in.
+    """
+    with get_storage(storage) as backend:
+        return backend.query_benchmark_data(run_ids)
+
+
+def query_run_summaries(
+    limit: int = 20, model: str | None = None, storage: StorageBackend | str | None = None
+) -> List[Dict]:
     """
-    query = {"benchmark_eval.run_id": {"$in": run_ids}}
-    projection = {"_id": 0, "request": 1, "response": 1, "benchmark_eval": 1, "timestamp": 1}
-    
-    with MongoClient(MONGO_URI) as client:
-        db = client[MONGO_DB]
-        collection = db[MONGO_COLLECTION]
-        raw_data = list(collection.find(query, projection))
-
-    return raw_data
+    Lists run summary documents, newest first, without touching the benchmark records.
+
+    Args:
+        limit (int): Maximum number of runs to return.
+        model (str, optional): Only runs that benchmarked this model.
+        storage (StorageBackend | str, optional): Backend to read from. Defaults to STORAGE_BACKEND.
+    Returns:
+        List[Dict]: Run summaries without their per-arm rows.
+    """
+    with get_storage(storage) as backend:
+        return backend.query_run_summaries(limit=limit, model=model)
+
+
+def query_run_summary(run_id: str, storage: StorageBackend | str | None = None) -> Dict | None:
+    """Returns the full summary document of one run, or None if there is none."""
+    with get_storage(storage) as backend:
+        return backend.query_run_summary(run_id)
+
+
+def query_api_usage(granularity: str = "hour", model: str | None = None, limit: int = 24) -> List[Dict]:
+    """
+    Lists hourly or daily API usage rollups, newest period first.
+
+    The API logs its checks to MongoDB only, so the rollups are always read from there.
+
+    Args:
+        granularity (str): "hour" or "day".
+        model (str, optional): Only rollups of this model.
+        limit (int): Maximum number of rollup documents to return.
+    Returns:
+        List[Dict]: Usage documents with request/error counts and latency and token percentiles.
+    """
+    query = {"granularity": granularity}
+    if model:
+        query["model"] = model
+
+    collection = get_client(MONGO_URI)[MONGO_DB][MONGO_API_USAGE_COLLECTION]
+    return list(collection.find(query, {"_id": 0}).sort([("period_start", -1), ("model", 1)]).limit(limit))
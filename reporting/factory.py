@@ -2,9 +2,6 @@
 from enum import Enum
 from pathlib import Path
 from grammar_checker.logger import get_logger
-from reporting.sentences_report import generate_sentence_report
-from reporting.mistakes_report import generate_mistakes_report
-from reporting.csv_reporter import CSVReporter
 
 
 logger = get_logger(__name__)
@@ -15,6 +12,10 @@ class ReportType(str, Enum):
     MISTAKES = "mistakes"
 
     def run(self, data, reporter):
+        # report and reporter modules pull in pandas, so they are imported on use
+        from reporting.sentences_report import generate_sentence_report
+        from reporting.mistakes_report import generate_mistakes_report
+
         mapping = {
             ReportType.SENTENCES: generate_sentence_report,
             ReportType.MISTAKES: generate_mistakes_report,
@@ -26,10 +27,15 @@ class ReportType(str, Enum):
 
 class ReporterType(str, Enum):
     CSV = "csv"
+    JSON = "json"
 
     def build(self, output_dir: Path | None = None):
+        from reporting.csv_reporter import CSVReporter
+        from reporting.json_reporter import JSONReporter
+
         mapping = {
             ReporterType.CSV: CSVReporter,
+            ReporterType.JSON: JSONReporter,
         }
 
         cls = mapping.get(self)
@@ -1,13 +1,11 @@
-from dotenv import load_dotenv
-
-load_dotenv()
-from typing import List, Dict
+from typing import Iterable, List, Dict
 import pandas as pd
 from difflib import SequenceMatcher
 from grammar_checker.logger import get_logger
 from reporting.data_access import query_benchmark_data
 from reporting.base_reporter import BenchmarkReporter
 from reporting.csv_reporter import CSVReporter
+from reporting.columnar import MISTAKE_FIELDS, RunFile
 
 
 logger = get_logger(__name__)
@@ -72,52 +70,92 @@ def evaluate_mistakes(actual: List[Dict], expected: List[Dict], threshold: float
     return detailed_results
 
 
-def transform_data(raw_data: List[Dict], treshhold: float = 0.8) -> pd.DataFrame:
+COLUMNS = [
+    "run_id",
+    "test_id",
+    "prompt_version",
+    "model",
+    "source_index",
+    "target_index",
+    "key",
+    "source_value",
+    "target_value",
+    "fuzzy_score",
+    "is_match",
+]
+
+
+def transform_rows(rows: Iterable[tuple], treshhold: float = 0.8) -> pd.DataFrame:
     """
-    Generates a DataFrame comparing actual and expected mistakes from evaluation data.
+    Generates the DataFrame of `transform_data` from per-record tuples.
     Args:
-        raw_data (List[Dict]): List of documents containing actual and expected mistakes, along with metadata.
+        rows (Iterable[tuple]): (run_id, test_id, prompt_version, model, actual_mistakes, expected_mistakes)
+            of each record.
         treshhold (float, optional): Fuzzy matching threshold for mistake comparison. Defaults to 0.8.
     Returns:
         pd.DataFrame: DataFrame with comparison results and associated metadata for each mistake.
     """
+    result = []
 
-    rows = []
-
-    for doc in raw_data:
-        actual_mistakes = doc.get("response", {}).get("mistakes", [])
-        expected_mistakes = doc.get("benchmark_eval", {}).get("mistakes", [])
-
-        mistakes = evaluate_mistakes(actual_mistakes, expected_mistakes, treshhold)
+    for run_id, test_id, prompt_version, model, actual_mistakes, expected_mistakes in rows:
+        for mistake in evaluate_mistakes(actual_mistakes, expected_mistakes, treshhold):
+            result.append((run_id, test_id, prompt_version, model, *mistake))
 
-        if not mistakes:
-            continue
+    return pd.DataFrame(result, columns=COLUMNS)
 
-        # run_metadata
-        run_id = doc.get("benchmark_eval", {}).get("run_id")
-        test_id = doc.get("benchmark_eval", {}).get("test_id")
-        prompt_version = doc.get("request", {}).get("prompt_version")
-        model = doc.get("request", {}).get("model")
 
-        for mistake in mistakes:
-            row = (run_id, test_id, prompt_version, model, *mistake)
-            rows.append(row)
+def transform_pairs(pairs: pd.DataFrame, treshhold: float = 0.8) -> pd.DataFrame:
+    """
+    Generates the DataFrame of `transform_data` from the mistake pairs of `RunFile.mistake_pairs`.
+    Args:
+        pairs (pd.DataFrame): One row per (actual, expected) mistake pair of a record.
+        treshhold (float, optional): Fuzzy matching threshold for mistake comparison. Defaults to 0.8.
+    Returns:
+        pd.DataFrame: DataFrame with comparison results and associated metadata for each mistake.
+    """
+    if pairs.empty:
+        return pd.DataFrame([], columns=COLUMNS)
+
+    frames = []
+    for position, key in enumerate(MISTAKE_FIELDS):
+        source, target = pairs[f"actual_{key}"], pairs[f"expected_{key}"]
+        scores = pd.Series([score_string_similarity(a, b) for a, b in zip(source, target)], dtype=float)
+        frames.append(
+            pairs[["record", *COLUMNS[:6]]].assign(
+                key=key,
+                key_position=position,
+                source_value=source,
+                target_value=target,
+                fuzzy_score=scores,
+                is_match=scores >= treshhold,
+            )
+        )
+    # the row order of transform_data: record, source mistake, target mistake, then key
+    df = pd.concat(frames).sort_values(["record", "source_index", "target_index", "key_position"], kind="stable")
+    return df[COLUMNS].reset_index(drop=True)
 
-    cols = [
-        "run_id",
-        "test_id",
-        "prompt_version",
-        "model",
-        "source_index",
-        "target_index",
-        "key",
-        "source_value",
-        "target_value",
-        "fuzzy_score",
-        "is_match",
-    ]
 
-    return pd.DataFrame(rows, columns=cols)
+def transform_data(raw_data: List[Dict], treshhold: float = 0.8) -> pd.DataFrame:
+    """
+    Generates a DataFrame comparing actual and expected mistakes from evaluation data.
+    Args:
+        raw_data (List[Dict]): List of documents containing actual and expected mistakes, along with metadata.
+        treshhold (float, optional): Fuzzy matching threshold for mistake comparison. Defaults to 0.8.
+    Returns:
+        pd.DataFrame: DataFrame with comparison results and associated metadata for each mistake.
+    """
+    rows = (
+        (
+            doc.get("benchmark_eval", {}).get("run_id"),
+            doc.get("benchmark_eval", {}).get("test_id"),
+            doc.get("request", {}).get("prompt_version"),
+            doc.get("request", {}).get("model"),
+            doc.get("response", {}).get("mistakes", []),
+            doc.get("benchmark_eval", {}).get("mistakes", []),
+        )
+        for doc in raw_data
+    )
+    return transform_rows(rows, treshhold)
 
 
 def generate_summary(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
@@ -165,19 +203,20 @@ def generate_summary(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     return summaries
 
 
-def generate_mistakes_report(raw_data: List[Dict], reporter: BenchmarkReporter) -> None:
+def generate_mistakes_report(raw_data: List[Dict] | RunFile, reporter: BenchmarkReporter) -> None:
     """
     Generates detailed and summary reports of mistakes from raw benchmark data.
     This function processes the provided raw data to create a detailed comparison DataFrame,
     then generates and saves a detailed report for each unique run ID. It also creates a summary
     of mistakes and saves a summary report for each run ID.
     Args:
-        raw_data (List[Dict]): The raw benchmark data containing information about mistakes.
+        raw_data (List[Dict] | RunFile): The raw benchmark data containing information about mistakes,
+            or an exported run file.
         reporter (BenchmarkReporter): An object responsible for saving the generated reports.
     Returns:
         None
     """
-    df = transform_data(raw_data)
+    df = transform_pairs(raw_data.mistake_pairs()) if isinstance(raw_data, RunFile) else transform_data(raw_data)
     # detailed report
     for run_id in df["run_id"].unique():
         # save detailed view as a CSV file
@@ -1,13 +1,17 @@
 from typing import List
 from grammar_checker.logger import get_logger
+from grammar_checker.tracing import stage
 from reporting.data_access import query_benchmark_data
+from reporting.columnar import RunFile
 from reporting.factory import ReportType, ReporterType
 
 
 logger = get_logger(__name__)
 
 
-def run_reports(run_ids: List[str], reports: List[ReportType], reporter_type: ReporterType) -> None:
+def run_reports(
+    run_ids: List[str], reports: List[ReportType], reporter_type: ReporterType, storage=None, input_file=None
+) -> None:
     """
     Query benchmark data for given run IDs and run specified reports using the given reporter.
 
@@ -15,16 +19,24 @@ def run_reports(run_ids: List[str], reports: List[ReportType], reporter_type: Re
         run_ids: List of benchmark run IDs to query data for.
         reports: List of report types to generate.
         reporter: Reporter instance to handle report output.
+        storage: Storage backend (or backend type) the runs were saved to; defaults to STORAGE_BACKEND.
+        input_file: Run file written by `export_runs` to read instead of the storage backend;
+            `run_ids` then only narrows it down (all runs in the file if empty).
     """
     reporter = reporter_type.build()
-    raw_data = query_benchmark_data(run_ids)
+    with stage("query"):
+        if input_file:
+            raw_data = RunFile(input_file, run_ids)
+        else:
+            raw_data = query_benchmark_data(run_ids, storage=storage)
 
     if not raw_data:
-        logger.warning(f"No benchmark data found for {run_ids}. Skipping report generation.")
+        logger.warning("No benchmark data found for %s. Skipping report generation.", run_ids)
         return
 
     for report in reports:
         try:
-            report.run(raw_data, reporter)
+            with stage(f"report_{report.value}"):
+                report.run(raw_data, reporter)
         except Exception as e:
-            logger.error(f"Failed to run report {report.value}: {e}")
+            logger.error("Failed to run report %s: %s", report.value, e)
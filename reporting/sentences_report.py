@@ -3,6 +3,7 @@ from grammar_checker.logger import get_logger
 from reporting.data_access import query_benchmark_data
 from reporting.base_reporter import BenchmarkReporter
 from reporting.csv_reporter import CSVReporter
+from reporting.columnar import RunFile
 
 logger = get_logger(__name__)
 
@@ -36,8 +37,15 @@ def generate_summary(df):
         df_run = df[df["run_id"] == run_id]
         cols = ["run_id", "model", "prompt_version"]
 
+        # reindex so runs with only matches (or only mismatches) still get both columns
         df_summary = (
-            df_run.groupby(cols)["is_match"].value_counts().unstack("is_match").fillna(0).astype(int).reset_index()
+            df_run.groupby(cols)["is_match"]
+            .value_counts()
+            .unstack("is_match")
+            .reindex(columns=[True, False])
+            .fillna(0)
+            .astype(int)
+            .reset_index()
         )
         df_summary = df_summary.rename(columns={True: "match", False: "not_match"})
         df_summary = df_summary[cols + ["match", "not_match"]].sort_values(by=cols)
@@ -48,7 +56,8 @@ def generate_summary(df):
 
 
 def generate_sentence_report(raw_data, reporter: BenchmarkReporter):
-    df = transform_data(raw_data)
+    # an exported run file already holds the rows of transform_data as columns
+    df = raw_data.sentences_frame() if isinstance(raw_data, RunFile) else transform_data(raw_data)
     df = add_sentence_match_column(df)
 
     # save detailed view as a CSV file
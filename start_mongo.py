@@ -36,9 +36,9 @@ def start_mongo():
         return False
 
     try:
-        logger.info(f"Starting MongoDB...")
-        logger.info(f"MongoDB Binary: '{exe}'")
-        logger.info(f"MongoDB Config: '{cfg}'")
+        logger.info("Starting MongoDB...")
+        logger.info("MongoDB Binary: '%s'", exe)
+        logger.info("MongoDB Config: '%s'", cfg)
 
         # Start MongoDB as a non-blocking subprocess
         subprocess.Popen(
@@ -62,7 +62,7 @@ def start_mongo():
     except FileNotFoundError:
         logger.error("mongod.exe not found. Check MONGO_BIN_PATH.")
     except subprocess.CalledProcessError as e:
-        logger.error(f"MongoDB failed to start: {e}")
+        logger.error("MongoDB failed to start: %s", e)
 
     return False
 
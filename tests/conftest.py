@@ -0,0 +1,19 @@
+import shutil
+import tempfile
+from pathlib import Path
+import grammar_checker.logger as logger_module
+
+_log_dir = None
+
+
+def pytest_configure(config):
+    # keep the suite's log records out of outputs/grammar_checker.log
+    global _log_dir
+    _log_dir = Path(tempfile.mkdtemp(prefix="grammar_checker_logs_"))
+    logger_module.shutdown_logging()
+    logger_module.LOG_FILE = _log_dir / "grammar_checker.log"
+
+
+def pytest_unconfigure(config):
+    logger_module.shutdown_logging()
+    shutil.rmtree(_log_dir, ignore_errors=True)
@@ -0,0 +1,136 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from grammar_checker.factory import BatchBackendType
+from grammar_checker.batch import (
+    build_batch_line,
+    write_batch_file,
+    parse_batch_output,
+    wait_for_batch,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
+
+
+def make_completion(content):
+    completion = MagicMock()
+    completion.model_dump.return_value = {
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 4, "total_tokens": 14},
+    }
+    return completion
+
+
+def output_line(custom_id, content=None, error=None, usage=None):
+    if error:
+        return json.dumps({"custom_id": custom_id, "response": None, "error": {"message": error}})
+    body = {"choices": [{"message": {"content": content}}], "usage": usage}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None})
+
+
+def test_build_batch_line_matches_chat_request():
+    line = build_batch_line("req-1", "gpt-4", "prompt")
+
+    assert line["custom_id"] == "req-1"
+    assert line["url"] == "/v1/chat/completions"
+    assert line["body"]["model"] == "gpt-4"
+    assert line["body"]["messages"] == [{"role": "user", "content": "Sentence: prompt"}]
+
+
+def test_write_batch_file(tmp_path):
+    lines = [build_batch_line("a", "gpt-4", "x"), build_batch_line("b", "gpt-4", "y")]
+
+    path = write_batch_file(lines, tmp_path / "in.jsonl")
+
+    assert [json.loads(line)["custom_id"] for line in path.read_text().splitlines()] == ["a", "b"]
+
+
+def test_parse_batch_output_handles_errors():
+    text = "\n".join(
+        [
+            output_line("ok", json.dumps({"input": "x", "mistakes": [], "corrected_sentence": "x"})),
+            output_line("failed", error="rate limited"),
+            output_line("bad_json", "not json"),
+            "",
+        ]
+    )
+
+    outputs, usage = parse_batch_output(text)
+
+    assert outputs["ok"]["corrected_sentence"] == "x"
+    assert outputs["failed"] == {"error": "rate limited"}
+    assert outputs["bad_json"] == {"error": "Response content is not valid JSON."}
+    assert usage == {}
+
+
+def test_parse_batch_output_keeps_usage_of_answered_lines():
+    line_usage = {"prompt_tokens": 30, "completion_tokens": 12, "total_tokens": 42}
+    text = "\n".join(
+        [
+            output_line("ok", json.dumps({"input": "x", "mistakes": [], "corrected_sentence": "x"}), usage=line_usage),
+            output_line("bad_json", "not json", usage=line_usage),
+            output_line("failed", error="rate limited"),
+        ]
+    )
+
+    _, usage = parse_batch_output(text)
+
+    assert usage == {
+        "ok": {"prompt_tokens": 30, "completion_tokens": 12},
+        "bad_json": {"prompt_tokens": 30, "completion_tokens": 12},
+    }
+
+
+def test_local_backend_answers_each_line(tmp_path):
+    client = MagicMock()
+    client.client.chat.completions.create.side_effect = [make_completion('{"a": 1}'), RuntimeError("boom")]
+    backend = LocalBatchBackend(client, batch_dir=tmp_path)
+    lines = [build_batch_line("a", "gpt-4", "x"), build_batch_line("b", "gpt-4", "y")]
+    input_file = write_batch_file(lines, tmp_path / "in.jsonl")
+
+    batch_id = backend.submit(input_file)
+
+    assert wait_for_batch(backend, batch_id, poll_interval=0.01, timeout=5) == "completed"
+    outputs, usage = parse_batch_output(backend.fetch_output(batch_id))
+    assert outputs == {"a": {"a": 1}, "b": {"error": "boom"}}
+    assert usage == {"a": {"prompt_tokens": 10, "completion_tokens": 4}}
+
+
+def test_openai_backend_submits_and_fetches(tmp_path):
+    client = MagicMock()
+    openai = client.client
+    openai.files.create.return_value = SimpleNamespace(id="file-in")
+    openai.batches.create.return_value = SimpleNamespace(id="batch-1")
+    openai.batches.retrieve.return_value = SimpleNamespace(
+        status="completed", output_file_id="file-out", error_file_id="file-err"
+    )
+    openai.files.content.side_effect = lambda file_id: SimpleNamespace(text=f"{file_id}-content")
+    input_file = tmp_path / "in.jsonl"
+    input_file.write_text("{}\n")
+    backend = BatchBackendType.OPENAI.build(client)
+
+    assert isinstance(backend, OpenAIBatchBackend)
+    assert backend.submit(input_file) == "batch-1"
+    openai.batches.create.assert_called_once_with(
+        input_file_id="file-in", endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    assert backend.status("batch-1") == "completed"
+    assert backend.fetch_output("batch-1") == "file-out-content\nfile-err-content"
+
+
+def test_wait_for_batch_polls_until_terminal(monkeypatch):
+    monkeypatch.setattr("grammar_checker.batch.time.sleep", lambda seconds: None)
+    backend = MagicMock()
+    backend.status.side_effect = ["validating", "in_progress", "completed"]
+
+    assert wait_for_batch(backend, "batch-1", poll_interval=1, timeout=60) == "completed"
+    assert backend.status.call_count == 3
+
+
+def test_wait_for_batch_times_out():
+    backend = MagicMock()
+    backend.status.return_value = "in_progress"
+
+    with pytest.raises(TimeoutError):
+        wait_for_batch(backend, "batch-1", poll_interval=0, timeout=0)
@@ -3,16 +3,19 @@ import mongomock
 from unittest.mock import MagicMock
 import logging
 from bson import ObjectId
-from grammar_checker.db import MongoDBHandler
+from pymongo.errors import OperationFailure
+from grammar_checker.db import MongoDBHandler, ensure_collection, ensure_ttl_index
+from grammar_checker.factory import RecordSchema
+from grammar_checker.tracing import request_context
 from models.request import GrammarRequest
 from models.response import GrammarResponse
 
 
 @pytest.fixture
 def mock_mongo_handler(monkeypatch):
-    # Create a mongomock client and patch MongoClient
+    # Create a mongomock client and patch the shared client factory
     mock_client = mongomock.MongoClient()
-    monkeypatch.setattr("grammar_checker.db.MongoClient", lambda uri: mock_client)
+    monkeypatch.setattr("grammar_checker.db.get_client", lambda uri: mock_client)
 
     # Create handler using mock
     handler = MongoDBHandler("mock_uri", "test_db", "test_collection")
@@ -58,7 +61,7 @@ def test_save_record_success(mock_mongo_handler):
 
     response = GrammarResponse(
         input="He go to school.",
-        mistakes=[{"error": "subject-verb agreement"}],  # Optional or []
+        mistakes=[{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}],
         corrected_sentence="He goes to school."
     )
 
@@ -171,3 +174,106 @@ def test_delete_record_failure(monkeypatch, caplog, mock_mongo_handler):
 
         assert "Delete error" in str(excinfo.value)
         assert "Failed to delete record" in caplog.text
+
+
+def test_save_record_stores_request_id(mock_mongo_handler):
+    request = GrammarRequest(sentence="They is playing.", prompt_version="v1_original.txt", model="gpt-4")
+    response = GrammarResponse(input="They is playing.", mistakes=[], corrected_sentence="They are playing.")
+
+    with mock_mongo_handler as db, request_context("req-42"):
+        record_id = db.save_record(request=request, response=response)
+        record = db.collection.find_one({"_id": record_id})
+
+    assert record["request_id"] == "req-42"
+
+
+def test_save_run_summary_upserts_by_run_id(mock_mongo_handler):
+    mock_mongo_handler.connect()
+    runs = mock_mongo_handler.client["test_db"]["runs"]
+
+    mock_mongo_handler.save_run_summary({"_id": "run-1", "run_id": "run-1", "totals": {"total": 1}})
+    mock_mongo_handler.save_run_summary({"_id": "run-1", "run_id": "run-1", "totals": {"total": 2}})
+
+    assert runs.count_documents({}) == 1
+    assert runs.find_one({"_id": "run-1"})["totals"] == {"total": 2}
+
+
+def test_lean_records_store_each_test_case_once(mock_mongo_handler):
+    mock_mongo_handler.record_schema = RecordSchema.LEAN
+    mock_mongo_handler.connect()
+    benchmark_eval = {"test_id": 1, "input": "Hello world", "corrected_sentence": "Hello world", "mistakes": []}
+    request = GrammarRequest(sentence="Hello world", model="gpt-4", mode="benchmark")
+    response = GrammarResponse(input="Hello world", mistakes=[], corrected_sentence="Hello world")
+
+    for run_id in ("run-1", "run-2"):
+        mock_mongo_handler.save_record(request, response, {**benchmark_eval, "match": True, "run_id": run_id})
+
+    records = list(mock_mongo_handler.collection.find())
+    assert mock_mongo_handler.test_cases.count_documents({}) == 1
+    assert all(record["schema"] == "lean" and "input" not in record["benchmark_eval"] for record in records)
+    assert mock_mongo_handler.hydrate(records)[1]["benchmark_eval"] == {**benchmark_eval, "match": True, "run_id": "run-2"}
+
+
+def test_ensure_collection_sets_block_compressor_on_new_collections():
+    database = MagicMock()
+    database.list_collection_names.return_value = ["existing"]
+
+    ensure_collection(database, "existing", "zstd")
+    ensure_collection(database, "records", "zstd")
+    ensure_collection(database, "other", "")
+
+    database.create_collection.assert_called_once_with(
+        "records", storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}}
+    )
+
+
+def test_save_api_record_writes_to_ttl_collection(mock_mongo_handler, monkeypatch):
+    monkeypatch.setattr("grammar_checker.db.MONGO_API_LOG_COLLECTION", "api_requests")
+    monkeypatch.setattr("grammar_checker.db.API_LOG_TTL_SECONDS", 3600)
+    mock_mongo_handler.connect()
+    request = GrammarRequest(sentence="Hello world", model="gpt-4")
+    response = GrammarResponse(input="Hello world", mistakes=[], corrected_sentence="Hello world")
+
+    with request_context("req-1") as trace:
+        trace.add_usage(12, 5)
+        mock_mongo_handler.save_api_record(request, response, endpoint="/check-grammar/")
+        mock_mongo_handler.save_api_record(request, error="model unavailable", endpoint="/check-grammar/")
+
+    api_log = mock_mongo_handler.client["test_db"]["api_requests"]
+    ok, failed = api_log.find().sort("status", -1)
+    assert ok["status"] == "ok" and ok["model"] == "gpt-4" and ok["request_id"] == "req-1"
+    assert ok["prompt_tokens"] == 12 and ok["completion_tokens"] == 5 and ok["latency_ms"] >= 0
+    assert failed["status"] == "error" and failed["error"] == "model unavailable" and "response" not in failed
+    assert api_log.index_information()["timestamp_1"]["expireAfterSeconds"] == 3600
+    # API checks are kept out of the benchmark records collection
+    assert mock_mongo_handler.collection.count_documents({}) == 0
+
+
+def test_ensure_ttl_index_changes_existing_ttl():
+    collection = MagicMock()
+    collection.name = "api_requests"
+    collection.create_index.side_effect = OperationFailure("Index already exists with different options")
+
+    ensure_ttl_index(collection, "timestamp", 60)
+
+    collection.database.command.assert_called_once_with(
+        "collMod", "api_requests", index={"keyPattern": {"timestamp": 1}, "expireAfterSeconds": 60}
+    )
+
+
+def test_save_records_inserts_in_bulk(mock_mongo_handler):
+    mock_mongo_handler.record_schema = RecordSchema.LEAN
+    mock_mongo_handler.connect()
+    benchmark_eval = {"test_id": 1, "input": "Hello world", "corrected_sentence": "Hello world", "mistakes": []}
+    records = [
+        {"request": {"sentence": "Hello world", "model": "gpt-4"}, "benchmark_eval": {**benchmark_eval, "run_id": run_id}}
+        for run_id in ("run-1", "run-1", "run-2")
+    ]
+
+    assert mock_mongo_handler.save_records(records) == 3
+    assert mock_mongo_handler.save_records([]) == 0
+
+    assert mock_mongo_handler.test_cases.count_documents({}) == 1
+    saved = mock_mongo_handler.query_benchmark_data(["run-1"])
+    assert [record["benchmark_eval"]["run_id"] for record in saved] == ["run-1", "run-1"]
+    assert saved[0]["request"]["sentence"] == "Hello world"
@@ -0,0 +1,158 @@
+import io
+import json
+import pytest
+from unittest.mock import MagicMock
+from grammar_checker.document import (
+    segment_sentences,
+    iter_paragraphs,
+    locate_mistakes,
+    DocumentChecker,
+    ResponseCache,
+    Segment,
+)
+from models.response import GrammarResponse, DocumentResponse
+
+
+CORRECTIONS = {
+    "She go to school.": ("She goes to school.", [{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}]),
+    "He is taller then his brother!": (
+        "He is taller than his brother!",
+        [{"type": "WrongWordMistake", "original": "then", "corrected": "than"}],
+    ),
+}
+
+
+@pytest.fixture
+def mock_prompt_builder():
+    prompt_builder = MagicMock()
+    prompt_builder.prompt_template = "template.txt"
+    prompt_builder.build_prompt.side_effect = lambda sentence: sentence
+    return prompt_builder
+
+
+@pytest.fixture
+def mock_client():
+    def get_model_content(model, sentence):
+        corrected, mistakes = CORRECTIONS.get(sentence, (sentence, []))
+        return json.dumps({"input": sentence, "mistakes": mistakes, "corrected_sentence": corrected})
+
+    client = MagicMock()
+    client.get_model_content.side_effect = get_model_content
+    return client
+
+
+def test_segment_sentences_keeps_offsets():
+    text = 'She go to school.  Where are you?\n"Quoted."  no end punctuation\n\nNew paragraph\ncontinues.'
+
+    segments = segment_sentences(text)
+
+    assert [s.text for s in segments] == [
+        "She go to school.",
+        "Where are you?",
+        '"Quoted."',
+        "no end punctuation",
+        "New paragraph\ncontinues.",
+    ]
+    assert all(text[s.start : s.end] == s.text for s in segments)
+
+
+def test_segment_sentences_empty():
+    assert segment_sentences("   \n ") == []
+
+
+def test_iter_paragraphs_streams_with_offsets():
+    content = "First line.\nSecond line.\n\n\nNext paragraph.\n"
+
+    paragraphs = list(iter_paragraphs(io.StringIO(content)))
+
+    assert paragraphs == [(0, "First line.\nSecond line."), (27, "Next paragraph.")]
+    assert content[27:42] == "Next paragraph."
+
+
+def test_locate_mistakes_handles_repeats_and_missing():
+    segment = Segment("I go and go home.", 10, 27)
+    response = GrammarResponse(
+        input=segment.text,
+        mistakes=[
+            {"type": "A", "original": "go", "corrected": "went"},
+            {"type": "A", "original": "go", "corrected": "went"},
+            {"type": "B", "original": "missing", "corrected": "x"},
+        ],
+        corrected_sentence="I went and went home.",
+    )
+
+    located = locate_mistakes(segment, response, offset=100)
+
+    assert [(m.start, m.end) for m in located] == [(112, 114), (119, 121), (None, None)]
+
+
+def test_locate_mistakes_case_insensitive_match_follows_the_cursor():
+    segment = Segment("Go home and then Go home.", 0, 25)
+    response = GrammarResponse(
+        input=segment.text,
+        mistakes=[
+            {"type": "A", "original": "go home", "corrected": "went home"},
+            {"type": "A", "original": "go home", "corrected": "went home"},
+        ],
+        corrected_sentence="Went home and then went home.",
+    )
+
+    located = locate_mistakes(segment, response)
+
+    assert [(m.start, m.end) for m in located] == [(0, 7), (17, 24)]
+
+
+def test_check_document_stitches_results(mock_prompt_builder, mock_client):
+    text = "She go to school.  He is taller then his brother!\nShe go to school."
+    checker = DocumentChecker(mock_prompt_builder, "gpt-4", mock_client, cache=ResponseCache())
+
+    response = checker.check_document(text)
+
+    assert isinstance(response, DocumentResponse)
+    assert response.corrected_sentence == "She goes to school.  He is taller than his brother!\nShe goes to school."
+    assert [(m.original, text[m.start : m.end]) for m in response.mistakes] == [
+        ("go", "go"),
+        ("then", "then"),
+        ("go", "go"),
+    ]
+    assert len(response.segments) == 3
+    # the repeated sentence is only checked once
+    assert mock_client.get_model_content.call_count == 2
+
+
+def test_check_document_uses_cache_across_documents(mock_prompt_builder, mock_client):
+    cache = ResponseCache()
+    checker = DocumentChecker(mock_prompt_builder, "gpt-4", mock_client, cache=cache)
+
+    checker.check_document("She go to school.")
+    checker.check_document("She go to school. Fine.")
+
+    assert mock_client.get_model_content.call_count == 2
+    assert cache.hits == 1
+
+
+def test_check_document_applies_offset(mock_prompt_builder, mock_client):
+    checker = DocumentChecker(mock_prompt_builder, "gpt-4", mock_client, cache=ResponseCache())
+
+    response = checker.check_document("She go to school.", offset=50)
+
+    assert response.mistakes[0].start == 54
+    assert response.segments[0].start == 50
+
+
+def test_check_document_empty_raises(mock_prompt_builder, mock_client):
+    checker = DocumentChecker(mock_prompt_builder, "gpt-4", mock_client, cache=ResponseCache())
+    with pytest.raises(ValueError, match="no sentences"):
+        checker.check_document("   ")
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_size=2)
+    response = GrammarResponse(input="a", mistakes=[], corrected_sentence="a")
+    cache.put(("m", "t", "a"), response)
+    cache.put(("m", "t", "b"), response)
+    cache.get(("m", "t", "a"))
+    cache.put(("m", "t", "c"), response)
+
+    assert cache.get(("m", "t", "b")) is None
+    assert cache.get(("m", "t", "a")) is response
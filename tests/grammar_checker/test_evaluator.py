@@ -0,0 +1,119 @@
+import pytest
+from grammar_checker.evaluator import (
+    evaluate,
+    evaluate_response,
+    mistake_scores,
+    normalize,
+    token_edit_distance,
+    tokenize,
+    clear_evaluation_cache,
+    _evaluate,
+)
+from grammar_checker.factory import NormalizationMode
+from models.benchmark_case import BenchmarkCase
+from models.response import GrammarResponse, Mistake
+
+GO = Mistake("VerbTenseMistake", "go", "goes")
+HOME = Mistake("PrepositionMistake", "to home", "home")
+
+
+def make_pair(expected_sentence, actual_sentence, expected_mistakes=(GO,), actual_mistakes=(GO,)):
+    expected = BenchmarkCase(1, "She go to home.", expected_sentence, tuple(expected_mistakes))
+    actual = GrammarResponse(input="She go to home.", mistakes=list(actual_mistakes), corrected_sentence=actual_sentence)
+    return expected, actual
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        (NormalizationMode.STRICT, "she goes  home , now!"),
+        (NormalizationMode.WHITESPACE, "she goes home, now!"),
+        (NormalizationMode.PUNCTUATION, "she goes home now"),
+    ],
+)
+def test_normalize_modes(mode, expected):
+    assert normalize("  She goes  home , now! ", mode) == expected
+
+
+def test_tokenize_keeps_contractions_and_punctuation():
+    assert tokenize("She doesn't go.") == ("she", "doesn't", "go", ".")
+
+
+@pytest.mark.parametrize(
+    "a, b, distance",
+    [
+        ("", "", 0),
+        ("a b c", "a b c", 0),
+        ("a b c", "a x c", 1),
+        ("a b c", "a c", 1),
+        ("a b", "b a", 2),
+        ("", "a b c", 3),
+    ],
+)
+def test_token_edit_distance(a, b, distance):
+    assert token_edit_distance(a.split(), b.split()) == distance
+
+
+def test_token_edit_distance_stops_early_above_max_distance():
+    a = [str(i) for i in range(100)]
+    b = [str(i) for i in range(100, 200)]
+    assert token_edit_distance(a, b, max_distance=3) == 4
+    assert token_edit_distance(a, a[:50], max_distance=3) == 4
+    assert token_edit_distance(a, a[:98], max_distance=3) == 2
+
+
+def test_mistake_scores():
+    assert mistake_scores([GO, HOME], [GO]) == (1.0, 0.5)
+    assert mistake_scores([GO], [GO, Mistake("SpellingMistake", "x", "y")]) == (0.5, 1.0)
+    assert mistake_scores([], []) == (1.0, 1.0)
+    assert mistake_scores([GO], []) == (0.0, 0.0)
+    # the same expected mistake is only matched once
+    assert mistake_scores([GO], [GO, GO]) == (0.5, 1.0)
+
+
+def test_evaluate_exact_match():
+    evaluation = evaluate(*make_pair("She goes home.", " she goes home. "), mode="strict")
+
+    assert evaluation.match and evaluation.sentence_match
+    assert (evaluation.edit_distance, evaluation.similarity) == (0, 1.0)
+    assert (evaluation.mistake_precision, evaluation.mistake_recall) == (1.0, 1.0)
+
+
+def test_evaluate_punctuation_mode_accepts_equivalent_corrections():
+    expected, actual = make_pair("She goes home, today.", "She goes home today .")
+
+    assert not evaluate(expected, actual, mode=NormalizationMode.STRICT).match
+    assert not evaluate(expected, actual, mode=NormalizationMode.WHITESPACE).match
+    assert evaluate(expected, actual, mode=NormalizationMode.PUNCTUATION).match
+
+
+def test_evaluate_tolerance_and_similarity():
+    expected, actual = make_pair("She goes home today.", "She goes to home today.")
+
+    strict = evaluate(expected, actual, mode="strict")
+    tolerant = evaluate(expected, actual, mode="strict", tolerance=1)
+
+    assert strict.edit_distance == 1
+    assert strict.similarity == pytest.approx(1 - 1 / 6, abs=1e-4)
+    assert not strict.sentence_match
+    assert tolerant.match
+
+
+def test_evaluate_requires_expected_mistake_types():
+    evaluation = evaluate(*make_pair("She goes home.", "She goes home.", [GO, HOME], [GO]), mode="strict")
+
+    assert evaluation.sentence_match
+    assert not evaluation.match
+    assert evaluation.mistake_recall == 0.5
+    assert evaluate_response(*make_pair("She goes home.", "She goes home.", [GO, HOME], [GO])) is False
+
+
+def test_evaluate_is_memoized_per_pair():
+    clear_evaluation_cache()
+    expected, actual = make_pair("She goes home.", "She goes home.")
+
+    first = evaluate(expected, actual, mode="strict")
+    second = evaluate(*make_pair("She goes home.", "She goes home."), mode="strict")
+
+    assert first is second
+    assert _evaluate.cache_info().hits == 1
@@ -0,0 +1,96 @@
+import random
+import pytest
+from grammar_checker.experiment import Experiment, wilson_interval
+
+
+def record(experiment, arm_index, passed, failed):
+    arm = experiment.arms[arm_index]
+    for _ in range(passed):
+        arm.record(True)
+    for _ in range(failed):
+        arm.record(False)
+
+
+def test_wilson_interval_contains_rate_and_stays_in_bounds():
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+    low, high = wilson_interval(8, 10, 1.96)
+    assert 0.0 < low < 0.8 < high < 1.0
+    assert wilson_interval(10, 10, 1.96)[1] == 1.0
+    assert wilson_interval(0, 10, 1.96)[0] == 0.0
+
+
+def test_wilson_interval_narrows_with_more_samples():
+    small = wilson_interval(5, 10, 1.96)
+    large = wilson_interval(500, 1000, 1.96)
+    assert large[1] - large[0] < small[1] - small[0]
+
+
+def test_experiment_arms_cover_models_and_templates():
+    experiment = Experiment(["gpt-4", "gpt-4.1"], ["t1.txt", "t2.txt", "t3.txt"])
+    assert [arm.name for arm in experiment.arms][:2] == ["gpt-4 | t1.txt", "gpt-4 | t2.txt"]
+    assert len(experiment.arms) == 6
+
+
+@pytest.mark.parametrize("models, templates, confidence", [([], ["t1.txt"], 0.95), (["gpt-4"], ["t1.txt"], 1.0)])
+def test_experiment_rejects_invalid_setup(models, templates, confidence):
+    with pytest.raises(ValueError):
+        Experiment(models, templates, confidence=confidence)
+
+
+def test_dominated_arm_is_dropped_once_min_samples_reached():
+    experiment = Experiment(["gpt-4"], ["good.txt", "bad.txt", "close.txt"], min_samples=40)
+    record(experiment, 0, 38, 2)
+    record(experiment, 1, 8, 32)
+    record(experiment, 2, 35, 5)
+
+    dropped = experiment.update()
+
+    assert [arm.template for arm in dropped] == ["bad.txt"]
+    assert [arm.template for arm in experiment.active_arms()] == ["good.txt", "close.txt"]
+    assert experiment.arms[1].stopped_after == 1
+    assert not experiment.finished
+
+
+def test_no_arm_is_dropped_before_min_samples():
+    experiment = Experiment(["gpt-4"], ["good.txt", "bad.txt"], min_samples=30)
+    record(experiment, 0, 20, 0)
+    record(experiment, 1, 0, 20)
+
+    assert experiment.update() == []
+    assert len(experiment.active_arms()) == 2
+
+
+def test_summary_is_sorted_and_counts_saved_calls():
+    experiment = Experiment(["gpt-4"], ["good.txt", "bad.txt"], min_samples=10)
+    record(experiment, 0, 10, 0)
+    record(experiment, 1, 0, 10)
+    experiment.update()
+
+    rows = experiment.summary()
+
+    assert experiment.finished
+    assert [row["prompt_version"] for row in rows] == ["good.txt", "bad.txt"]
+    assert rows[1]["active"] is False
+    assert rows[0]["pass_rate"] == 1.0
+    assert experiment.calls_saved(100) == 180
+
+
+def test_intervals_widen_with_the_number_of_looks():
+    experiment = Experiment(["gpt-4"], ["t1.txt", "t2.txt"], min_samples=30)
+
+    assert experiment.z(10) == experiment.z(30) < experiment.z(31) < experiment.z(300)
+
+
+def test_equal_arms_are_rarely_dropped_over_many_looks():
+    rng = random.Random(0)
+    runs, wrong_drops = 200, 0
+    for _ in range(runs):
+        experiment = Experiment(["gpt-4"], ["t1.txt", "t2.txt"], confidence=0.9, min_samples=10)
+        for _ in range(300):
+            for arm in experiment.active_arms():
+                arm.record(rng.random() < 0.7)
+            if experiment.update():
+                wrong_drops += 1
+                break
+
+    assert wrong_drops / runs <= 0.1
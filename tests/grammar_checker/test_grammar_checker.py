@@ -1,7 +1,11 @@
+import json
+import logging
 import pytest
 from unittest.mock import MagicMock
 from grammar_checker.grammar_checker import GrammarChecker
-from models.response import GrammarResponse
+from grammar_checker.tracing import request_context
+from pydantic import ValidationError
+from models.response import GrammarResponse, Mistake, MistakeType
 
 
 @pytest.fixture
@@ -16,11 +20,13 @@ def mock_prompt_builder():
 @pytest.fixture
 def mock_client():
     mock_client = MagicMock()
-    mock_client.get_model_response.return_value = {
-        "input": "This is an test sentence.",
-        "mistakes": [{"type": "OtherMistake", "original": "an", "corrected": "a"}],
-        "corrected_sentence": "This is a test sentence.",
-    }
+    mock_client.get_model_content.return_value = json.dumps(
+        {
+            "input": "This is an test sentence.",
+            "mistakes": [{"type": "OtherMistake", "original": "an", "corrected": "a"}],
+            "corrected_sentence": "This is a test sentence.",
+        }
+    )
     return mock_client
 
 
@@ -33,6 +39,14 @@ def test_grammar_checker_initialization(mock_prompt_builder, mock_client):
     assert checker.client == mock_client
 
 
+def test_grammar_checker_logs_only_the_start_of_the_sentence(mock_prompt_builder, mock_client, caplog):
+    with caplog.at_level(logging.INFO):
+        GrammarChecker(mock_prompt_builder, "My private note says the password is hunter2.", "gpt-3", mock_client)
+
+    assert "'My private note says...'" in caplog.text
+    assert "hunter2" not in caplog.text
+
+
 def test_check_grammar_success(mock_prompt_builder, mock_client):
     test_sentence = "This is an test sentence."
     test_checker = GrammarChecker(mock_prompt_builder, test_sentence, "gpt-3", mock_client)
@@ -40,12 +54,48 @@ def test_check_grammar_success(mock_prompt_builder, mock_client):
     response = test_checker.check_grammar()
 
     mock_prompt_builder.build_prompt.assert_called_once_with(test_sentence)
-    mock_client.get_model_response.assert_called_once_with("gpt-3", f"Correct this sentence: {test_sentence}")
+    mock_client.get_model_content.assert_called_once_with("gpt-3", f"Correct this sentence: {test_sentence}")
     assert isinstance(response, GrammarResponse)
 
 
+def test_check_grammar_returns_typed_mistakes(mock_prompt_builder, mock_client):
+    mock_client.get_model_content.return_value = json.dumps(
+        {
+            "input": "She go home.",
+            "mistakes": [
+                {"type": "VerbTenseMistake", "original": "go", "corrected": "goes"},
+                {"type": "UnlistedMistake", "original": "home", "corrected": "home"},
+            ],
+            "corrected_sentence": "She goes home.",
+        }
+    )
+
+    response = GrammarChecker(mock_prompt_builder, "She go home.", "gpt-4", mock_client).check_grammar()
+
+    assert response.mistakes == [
+        Mistake(MistakeType.VERB_TENSE, "go", "goes"),
+        Mistake("UnlistedMistake", "home", "home"),
+    ]
+    # known labels become MistakeType, labels the prompts do not list are kept as written
+    assert response.mistakes[0].type is MistakeType.VERB_TENSE
+    assert response.model_dump()["mistakes"][1]["type"] == "UnlistedMistake"
+    assert not hasattr(response.mistakes[0], "__dict__")
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json", '{"input": "x", "mistakes": [{"type": "VerbTenseMistake"}], "corrected_sentence": "x"}'],
+    ids=["invalid_json", "incomplete_mistake"],
+)
+def test_check_grammar_invalid_content_raises(mock_prompt_builder, mock_client, content):
+    mock_client.get_model_content.return_value = content
+
+    with pytest.raises(ValidationError):
+        GrammarChecker(mock_prompt_builder, "x", "gpt-4", mock_client).check_grammar()
+
+
 def test_check_grammar_empty_response_raises(mock_prompt_builder, mock_client):
-    mock_client.get_model_response.return_value = ""
+    mock_client.get_model_content.return_value = ""
     checker = GrammarChecker(mock_prompt_builder, "test", "gpt-3", mock_client)
     
     with pytest.raises(ValueError):
@@ -53,9 +103,80 @@ def test_check_grammar_empty_response_raises(mock_prompt_builder, mock_client):
 
 
 def test_check_grammar_exception_propagates(mock_prompt_builder, mock_client):
-    mock_client.get_model_response.side_effect = Exception("API error")
+    mock_client.get_model_content.side_effect = Exception("API error")
     checker = GrammarChecker(mock_prompt_builder, "test", "gpt-3", mock_client)
     
     with pytest.raises(Exception) as excinfo:
         checker.check_grammar()
     assert "API error" in str(excinfo.value)
+
+
+def test_check_grammar_prefilter_skips_model_call(mock_prompt_builder, mock_client):
+    prefilter = MagicMock()
+    prefilter.is_clean.return_value = True
+    checker = GrammarChecker(mock_prompt_builder, "Clean sentence.", "gpt-3", mock_client, prefilter)
+
+    response = checker.check_grammar()
+
+    assert checker.prefiltered
+    assert response == GrammarResponse(input="Clean sentence.", mistakes=[], corrected_sentence="Clean sentence.")
+    mock_client.get_model_content.assert_not_called()
+
+
+def test_check_grammar_prefilter_passes_suspicious_sentence(mock_prompt_builder, mock_client):
+    prefilter = MagicMock()
+    prefilter.is_clean.return_value = False
+    checker = GrammarChecker(mock_prompt_builder, "This is an test sentence.", "gpt-3", mock_client, prefilter)
+
+    checker.check_grammar()
+
+    assert not checker.prefiltered
+    mock_client.get_model_content.assert_called_once()
+
+
+def test_stream_grammar_yields_events_and_response(mock_prompt_builder, mock_client):
+    content = (
+        '{"input": "This is an test sentence.", '
+        '"mistakes": [{"type": "OtherMistake", "original": "an", "corrected": "a"}], '
+        '"corrected_sentence": "This is a test sentence."}'
+    )
+    mock_client.stream_model_response.return_value = iter([content[:40], content[40:90], content[90:]])
+    checker = GrammarChecker(mock_prompt_builder, "This is an test sentence.", "gpt-3", mock_client)
+
+    events = list(checker.stream_grammar())
+
+    assert [event for event, _ in events] == ["mistake", "corrected_sentence", "response"]
+    assert isinstance(events[-1][1], GrammarResponse)
+    assert events[-1][1].corrected_sentence == "This is a test sentence."
+
+
+def test_stream_grammar_times_prompt_build_and_validation(mock_prompt_builder, mock_client):
+    mock_client.stream_model_response.return_value = iter(
+        ['{"input": "test", "mistakes": [], "corrected_sentence": "test"}']
+    )
+    checker = GrammarChecker(mock_prompt_builder, "test", "gpt-3", mock_client)
+
+    with request_context() as trace:
+        list(checker.stream_grammar())
+
+    assert {"prompt_build", "validation"} <= set(trace.stages)
+
+
+def test_stream_grammar_invalid_json_raises(mock_prompt_builder, mock_client):
+    mock_client.stream_model_response.return_value = iter(['{"input": '])
+    checker = GrammarChecker(mock_prompt_builder, "test", "gpt-3", mock_client)
+
+    with pytest.raises(ValueError):
+        list(checker.stream_grammar())
+
+
+def test_stream_grammar_prefilter(mock_prompt_builder, mock_client):
+    prefilter = MagicMock()
+    prefilter.is_clean.return_value = True
+    checker = GrammarChecker(mock_prompt_builder, "Clean.", "gpt-3", mock_client, prefilter)
+
+    events = list(checker.stream_grammar())
+
+    assert events[0] == ("corrected_sentence", "Clean.")
+    assert events[-1][0] == "response"
+    mock_client.stream_model_response.assert_not_called()
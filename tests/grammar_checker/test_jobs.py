@@ -0,0 +1,151 @@
+import sqlite3
+import json
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from grammar_checker.jobs import JobStore, JobWorkerPool, JobStatus, ItemStatus
+from grammar_checker.tracing import request_context, get_request_id
+from models.response import GrammarResponse
+
+
+@pytest.fixture
+def store(tmp_path):
+    with JobStore(tmp_path / "jobs.sqlite3") as store:
+        yield store
+
+
+@pytest.fixture
+def mock_client():
+    def get_model_content(model, prompt):
+        return json.dumps({"input": prompt, "mistakes": [], "corrected_sentence": prompt})
+
+    client = MagicMock()
+    client.get_model_content.side_effect = get_model_content
+    return client
+
+
+def make_pool(store, client, **kwargs):
+    pool = JobWorkerPool(store, workers=2, client=client, poll_interval=0.01, **kwargs)
+    pool._prompt_builders["template.txt"] = MagicMock(build_prompt=lambda sentence: sentence)
+    return pool
+
+
+def test_create_job_and_claim_in_order(store):
+    job_id = store.create_job(["First.", "Second."], "gpt-4", "template.txt")
+
+    first = store.claim_item()
+    second = store.claim_item()
+
+    assert (first["sentence"], first["model"], first["prompt_version"], first["attempts"]) == (
+        "First.",
+        "gpt-4",
+        "template.txt",
+        1,
+    )
+    assert second["position"] == 1
+    assert store.claim_item() is None
+    assert store.get_job(job_id)["status"] == JobStatus.RUNNING
+
+
+def test_create_job_requires_sentences(store):
+    with pytest.raises(ValueError):
+        store.create_job([], "gpt-4", "template.txt")
+
+
+def test_failed_job_insert_is_rolled_back(store):
+    with pytest.raises(sqlite3.Error):
+        store.create_job(["Fine.", {"not": "a sentence"}], "gpt-4", "template.txt")
+
+    assert not store.connection.in_transaction
+    job_id = store.create_job(["Next."], "gpt-4", "template.txt")
+    assert [row[0] for row in store.connection.execute("SELECT job_id FROM jobs")] == [job_id]
+    assert store.connection.execute("SELECT COUNT(*) FROM job_items").fetchone()[0] == 1
+
+
+def test_job_status_and_paged_results(store):
+    job_id = store.create_job(["One.", "Two.", "Three."], "gpt-4", "template.txt")
+    assert store.get_job(job_id)["status"] == JobStatus.QUEUED
+
+    for _ in range(3):
+        item = store.claim_item()
+        response = GrammarResponse(input=item["sentence"], mistakes=[], corrected_sentence=item["sentence"])
+        store.complete_item(item["item_id"], response)
+
+    job = store.get_job(job_id)
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["counts"] == {"pending": 0, "running": 0, "done": 3, "failed": 0}
+    page = store.get_results(job_id, offset=1, limit=1)
+    assert [result["sentence"] for result in page] == ["Two."]
+    assert page[0]["response"].corrected_sentence == "Two."
+
+
+def test_unknown_job_returns_none(store):
+    assert store.get_job("missing") is None
+
+
+def test_running_items_are_requeued_on_reconnect(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    with JobStore(path) as store:
+        job_id = store.create_job(["Interrupted."], "gpt-4", "template.txt")
+        store.claim_item()
+
+    with JobStore(path) as store:
+        assert store.get_job(job_id)["counts"][ItemStatus.PENDING] == 1
+        assert store.claim_item()["attempts"] == 2
+
+
+def test_worker_processes_items_and_saves_records(store, mock_client):
+    mongo_handler = MagicMock()
+    pool = make_pool(store, mock_client, mongo_handler=mongo_handler)
+    job_id = store.create_job(["She goes home.", "It works."], "gpt-4", "template.txt")
+
+    while pool.run_once():
+        pass
+
+    results = store.get_results(job_id)
+    assert [result["status"] for result in results] == ["done", "done"]
+    assert results[1]["response"].corrected_sentence == "It works."
+    assert mongo_handler.save_api_record.call_count == 2
+
+
+def test_worker_runs_items_under_the_submitting_request_id(store, mock_client):
+    seen = []
+    mongo_handler = MagicMock()
+    mongo_handler.save_api_record.side_effect = lambda **kwargs: seen.append(get_request_id())
+    pool = make_pool(store, mock_client, mongo_handler=mongo_handler)
+    with request_context("submit-1"):
+        store.create_job(["One.", "Two."], "gpt-4", "template.txt")
+
+    while pool.run_once():
+        pass
+
+    assert seen == ["submit-1", "submit-1"]
+
+
+@patch("grammar_checker.jobs.GrammarChecker")
+def test_worker_retries_then_marks_failed(mock_checker_class, store, mock_client):
+    mock_checker_class.return_value.check_grammar.side_effect = RuntimeError("model unavailable")
+    pool = make_pool(store, mock_client, max_attempts=2)
+    job_id = store.create_job(["Broken."], "gpt-4", "template.txt")
+
+    while pool.run_once():
+        pass
+
+    result = store.get_results(job_id)[0]
+    assert (result["status"], result["attempts"], result["error"]) == ("failed", 2, "model unavailable")
+    assert store.get_job(job_id)["status"] == JobStatus.COMPLETED
+
+
+def test_worker_threads_drain_the_queue(store, mock_client):
+    pool = make_pool(store, mock_client)
+    job_id = store.create_job([f"Sentence {i}." for i in range(20)], "gpt-4", "template.txt")
+
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while store.get_job(job_id)["status"] != JobStatus.COMPLETED and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.stop()
+
+    assert store.get_job(job_id)["counts"]["done"] == 20
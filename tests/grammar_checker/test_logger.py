@@ -1,8 +1,17 @@
 import logging
 from unittest.mock import patch
 import pytest
-from grammar_checker.logger import get_logger
-from logging.handlers import RotatingFileHandler
+import json
+from grammar_checker.logger import (
+    get_logger,
+    setup_logging,
+    shutdown_logging,
+    SamplingFilter,
+    RequestIdFilter,
+    JSONFormatter,
+    request_id_var,
+)
+from logging.handlers import RotatingFileHandler, QueueHandler
 
 
 @pytest.fixture(autouse=True)
@@ -39,16 +48,25 @@ def test_logger_level_set_by_debug_env(monkeypatch, debug_value, expected_level)
     assert logger.getEffectiveLevel() == expected_level
 
 
-def test_logger_has_rotating_file_and_stream_handlers():
+def root_queue_handlers():
+    return [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+
+
+def test_logger_uses_single_root_queue_handler():
     logger = get_logger("handler_logger")
-    handler_types = {type(h) for h in logger.handlers}
+    assert logger.handlers == []
+    assert len(root_queue_handlers()) == 1
+
+
+def test_listener_has_rotating_file_and_stream_handlers():
+    listener = setup_logging()
+    handler_types = {type(h) for h in listener.handlers}
     assert RotatingFileHandler in handler_types
     assert logging.StreamHandler in handler_types
 
 
 def test_logger_formatter_is_set():
-    logger = get_logger("formatter_logger")
-    for handler in logger.handlers:
+    for handler in setup_logging().handlers:
         assert handler.formatter is not None
         fmt = handler.formatter._fmt
         assert "%(asctime)s" in fmt
@@ -58,25 +76,88 @@ def test_logger_formatter_is_set():
 
 
 def test_logger_no_duplicate_handlers():
-    logger = get_logger("dup_logger")
-    initial_handlers = list(logger.handlers)
-    logger2 = get_logger("dup_logger")
+    get_logger("dup_logger")
+    initial_handlers = root_queue_handlers()
+    get_logger("dup_logger")
+    get_logger("other_logger")
     # Should not add more handlers
-    assert logger.handlers == initial_handlers
+    assert root_queue_handlers() == initial_handlers
 
 
-def test_logger_file_handler_uses_config(monkeypatch):
+def test_logger_file_handler_uses_config(tmp_path, monkeypatch):
     # Patch config values to test
-    log_path = "test.log"
+    log_path = tmp_path / "test.log"
     monkeypatch.setattr("grammar_checker.logger.LOG_FILE", log_path)
     monkeypatch.setattr("grammar_checker.logger.MAX_LOG_SIZE", 12345)
     monkeypatch.setattr("grammar_checker.logger.BACKUP_COUNT", 7)
 
+    shutdown_logging()
     with patch("grammar_checker.logger.RotatingFileHandler") as mock_handler_cls:
         # call get_logger to trigger the file handler creation
         get_logger("config_logger")
 
         # Assert that RotatingFileHandler was called with the correct parameters
         mock_handler_cls.assert_called_once_with(
-            log_path, maxBytes=12345, backupCount=7
+            log_path, maxBytes=12345, backupCount=7, delay=True
         )
+    shutdown_logging()
+
+
+def test_records_are_written_by_listener_thread(tmp_path, monkeypatch):
+    log_file = tmp_path / "test.log"
+    monkeypatch.setattr("grammar_checker.logger.LOG_FILE", log_file)
+    shutdown_logging()
+
+    logger = get_logger("queued_logger")
+    logger.info("checked %s sentence(s)", 3)
+    shutdown_logging()  # stopping the listener flushes the queue
+
+    assert "checked 3 sentence(s)" in log_file.read_text()
+
+
+def make_record(name="hot_logger", level=logging.INFO, msg="request handled"):
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+def test_sampling_filter_caps_info_records_per_logger():
+    now = [0.0]
+    sampling_filter = SamplingFilter(rate=2, clock=lambda: now[0])
+
+    assert [sampling_filter.filter(make_record()) for _ in range(4)] == [True, True, False, False]
+    assert sampling_filter.filter(make_record(name="other_logger"))
+    assert sampling_filter.filter(make_record(level=logging.WARNING))
+
+    now[0] = 1.0
+    record = make_record()
+    assert sampling_filter.filter(record)
+    assert "2 similar record(s) dropped" in record.msg
+
+
+def test_sampling_filter_disabled():
+    sampling_filter = SamplingFilter(rate=0)
+    assert all(sampling_filter.filter(make_record()) for _ in range(100))
+
+
+def test_json_formatter_includes_request_id_and_extra_fields():
+    record = make_record(msg="stage %s done")
+    record.args = ("model",)
+    record.stage = "model"
+    record.duration_ms = 12.5
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["message"] == "stage model done"
+    assert (entry["level"], entry["logger"]) == ("INFO", "hot_logger")
+    assert (entry["request_id"], entry["stage"], entry["duration_ms"]) == ("req-1", "model", 12.5)
+
+
+def test_json_formatter_omits_missing_request_id():
+    record = make_record()
+    RequestIdFilter().filter(record)
+
+    assert "request_id" not in json.loads(JSONFormatter().format(record))
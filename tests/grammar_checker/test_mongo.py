@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from pymongo import monitoring
+from grammar_checker import mongo
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.mongo import PoolMetrics, client_options, close_clients, get_client, pool_stats
+
+ADDRESS = ("localhost", 27017)
+
+
+@pytest.fixture
+def mock_mongo_client():
+    close_clients()
+    with patch("grammar_checker.mongo.MongoClient", side_effect=lambda uri, **options: MagicMock(uri=uri)) as mock:
+        yield mock
+    close_clients()
+
+
+def test_client_options_defaults():
+    options = client_options()
+
+    assert options["maxPoolSize"] == 100
+    assert options["w"] == 1
+    assert options["event_listeners"] == [mongo.pool_metrics]
+    # unset settings are left to pymongo
+    assert "compressors" not in options
+    assert "socketTimeoutMS" not in options
+
+
+def test_client_options_from_config():
+    with patch("grammar_checker.mongo.MONGO_COMPRESSORS", "zstd,snappy"), patch(
+        "grammar_checker.mongo.MONGO_WRITE_CONCERN", "majority"
+    ), patch("grammar_checker.mongo.MONGO_SOCKET_TIMEOUT_MS", 20000), patch(
+        "grammar_checker.mongo.MONGO_MAX_POOL_SIZE", 10
+    ):
+        options = client_options()
+
+    assert options["compressors"] == "zstd,snappy"
+    assert options["w"] == "majority"
+    assert options["socketTimeoutMS"] == 20000
+    assert options["maxPoolSize"] == 10
+
+
+def test_get_client_is_shared_per_uri(mock_mongo_client):
+    client = get_client("mongodb://a")
+
+    assert get_client("mongodb://a") is client
+    assert get_client("mongodb://b") is not client
+    assert mock_mongo_client.call_count == 2
+    assert pool_stats()["clients"] == 2
+
+
+def test_close_clients_closes_and_forgets_them(mock_mongo_client):
+    client = get_client("mongodb://a")
+
+    close_clients()
+
+    client.close.assert_called_once()
+    assert get_client("mongodb://a") is not client
+
+
+def test_handlers_share_one_client(mock_mongo_client):
+    with patch("grammar_checker.db.ensure_collection"):
+        with MongoDBHandler("mongodb://a", "test_db", "records") as first:
+            client = first.client
+            with MongoDBHandler("mongodb://a", "test_db", "records") as second:
+                assert second.client is client
+
+    # disconnecting only drops the handlers' references
+    client.close.assert_not_called()
+    assert first.client is None
+    assert mock_mongo_client.call_count == 1
+
+
+def test_pool_metrics_count_pool_events():
+    metrics = PoolMetrics()
+
+    metrics.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    metrics.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 2))
+    metrics.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.002))
+    metrics.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 2, 0.004))
+    metrics.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    metrics.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 1.0))
+    metrics.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 1, "idle"))
+
+    stats = metrics.snapshot()
+    assert stats["connections_created"] == 2
+    assert stats["open_connections"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 1
+    assert stats["max_checked_out"] == 2
+    assert stats["checkout_failures"] == 1
+    assert stats["mean_checkout_ms"] == 3.0
+    assert stats["max_checkout_ms"] == 4.0
+
+    metrics.reset()
+    assert metrics.snapshot()["checkouts"] == 0
@@ -1,7 +1,9 @@
 import pytest
 import json
+import time
 from unittest.mock import patch, MagicMock
 from grammar_checker.openai_client import OpenAIClient
+from grammar_checker.tracing import request_context
 
 
 @pytest.fixture(autouse=True)
@@ -14,7 +16,14 @@ def test_init_sets_api_key(monkeypatch):
     with patch("grammar_checker.openai_client.OpenAI") as mock_openai:
         client = OpenAIClient()
         assert client.api_key == "abc123"
-        mock_openai.assert_called_once_with(api_key="abc123")
+        mock_openai.assert_called_once_with(api_key="abc123", base_url=None)
+
+
+def test_init_uses_base_url(monkeypatch):
+    with patch("grammar_checker.openai_client.OpenAI") as mock_openai:
+        client = OpenAIClient(base_url="http://127.0.0.1:8001/v1")
+        assert client.base_url == "http://127.0.0.1:8001/v1"
+        mock_openai.assert_called_once_with(api_key="test-key", base_url="http://127.0.0.1:8001/v1")
 
 
 def test_init_raises_if_no_api_key(monkeypatch):
@@ -40,6 +49,33 @@ def test_get_model_response_returns_json(monkeypatch):
         mock_client.chat.completions.create.assert_called_once()
 
 
+def test_get_model_content_returns_raw_text(monkeypatch):
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = '{"result": "ok"}'
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_response
+
+    with patch("grammar_checker.openai_client.OpenAI", return_value=mock_client):
+        assert OpenAIClient().get_model_content("gpt-3", "test prompt") == '{"result": "ok"}'
+
+
+def test_get_model_content_records_token_usage_in_trace(monkeypatch):
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "{}"
+    mock_response.usage.prompt_tokens = 12
+    mock_response.usage.completion_tokens = 5
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = mock_response
+
+    with patch("grammar_checker.openai_client.OpenAI", return_value=mock_client):
+        with request_context() as trace:
+            OpenAIClient().get_model_content("gpt-3", "test prompt")
+            OpenAIClient().get_model_content("gpt-3", "test prompt")
+
+    assert trace.usage == {"prompt_tokens": 24, "completion_tokens": 10}
+
 def test_get_model_response_invalid_json(monkeypatch):
     mock_response = MagicMock()
     mock_response.choices = [MagicMock()]
@@ -67,3 +103,57 @@ def test_get_model_response_raises(monkeypatch):
             client.get_model_response(
                 "gpt-3", "test prompt", "template.txt", "sentence"
             )
+
+
+def test_stream_model_response_yields_content():
+    def make_chunk(content):
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = content
+        return chunk
+
+    empty_chunk = MagicMock()
+    empty_chunk.choices = []
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = iter([make_chunk('{"a"'), make_chunk(None), empty_chunk, make_chunk(": 1}")])
+
+    with patch("grammar_checker.openai_client.OpenAI", return_value=mock_client):
+        client = OpenAIClient()
+        chunks = list(client.stream_model_response("gpt-3", "test prompt"))
+
+    assert chunks == ['{"a"', ": 1}"]
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+def test_stream_model_response_records_usage_and_model_wait_in_trace():
+    def make_chunk(content, usage=None):
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()] if content else []
+        if content:
+            chunk.choices[0].delta.content = content
+        chunk.usage = usage
+        return chunk
+
+    usage = MagicMock(prompt_tokens=12, completion_tokens=5)
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = iter([make_chunk("{}"), make_chunk(None, usage)])
+
+    with patch("grammar_checker.openai_client.OpenAI", return_value=mock_client):
+        with request_context() as trace:
+            for _ in OpenAIClient().stream_model_response("gpt-3", "test prompt"):
+                # time spent by the consumer between chunks is not model time
+                time.sleep(0.05)
+
+    assert mock_client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert trace.usage == {"prompt_tokens": 12, "completion_tokens": 5}
+    assert 0 <= trace.stages["openai_request"] < 50
+
+
+def test_stream_model_response_raises():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = Exception("fail")
+
+    with patch("grammar_checker.openai_client.OpenAI", return_value=mock_client):
+        client = OpenAIClient()
+        with pytest.raises(Exception, match="fail"):
+            list(client.stream_model_response("gpt-3", "test prompt"))
@@ -0,0 +1,159 @@
+import os
+import sys
+import subprocess
+import threading
+import mongomock
+import pytest
+from unittest.mock import MagicMock, patch
+from bson import ObjectId, json_util
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.factory import OverflowPolicy
+from grammar_checker.persistence import RecordWriter
+from models.request import GrammarRequest
+from models.response import GrammarResponse
+
+
+@pytest.fixture
+def mongo_handler():
+    client = mongomock.MongoClient()
+    with patch("grammar_checker.db.get_client", lambda uri: client), patch(
+        "grammar_checker.db.MONGO_API_LOG_COLLECTION", "api_requests"
+    ):
+        with MongoDBHandler("mock_uri", "test_db", "records") as handler:
+            yield handler
+
+
+def make_record(index=0):
+    return {"_id": ObjectId(), "model": "gpt-4", "index": index}
+
+
+def make_writer(mongo_handler, tmp_path, **kwargs):
+    return RecordWriter(mongo_handler, spill_dir=tmp_path, replay_interval=0, **kwargs)
+
+
+def test_records_are_written_by_the_background_thread(mongo_handler, tmp_path):
+    writer = make_writer(mongo_handler, tmp_path)
+    request = GrammarRequest(sentence="Hello world", model="gpt-4")
+    response = GrammarResponse(input="Hello world", mistakes=[], corrected_sentence="Hello world")
+
+    writer.start()
+    for _ in range(5):
+        assert writer.save_api_record(request, response, endpoint="/check-grammar/") is True
+    writer.stop()
+
+    assert mongo_handler.api_log.count_documents({"endpoint": "/check-grammar/"}) == 5
+    stats = writer.stats()
+    assert {key: stats[key] for key in ["queued", "written", "dropped", "spilled", "replayed", "pending"]} == {
+        "queued": 5,
+        "written": 5,
+        "dropped": 0,
+        "spilled": 0,
+        "replayed": 0,
+        "pending": 0,
+    }
+    assert stats["insert_batches"] >= 1
+    assert stats["max_insert_ms"] >= stats["mean_insert_ms"] > 0
+
+
+@pytest.mark.parametrize("overflow", [OverflowPolicy.DROP, OverflowPolicy.BLOCK])
+def test_full_queue_drops(overflow, tmp_path):
+    writer = make_writer(MagicMock(), tmp_path, queue_size=1, overflow=overflow, block_timeout=0.01)
+
+    assert writer.submit(make_record()) is True
+    assert writer.submit(make_record()) is False
+    assert writer.stats()["dropped"] == 1
+
+
+def test_block_waits_for_room(mongo_handler, tmp_path):
+    writer = make_writer(mongo_handler, tmp_path, queue_size=1, overflow=OverflowPolicy.BLOCK, block_timeout=5)
+    writer.submit(make_record())
+    threading.Timer(0.05, writer.flush).start()
+
+    assert writer.submit(make_record()) is True
+    writer.flush()
+    assert mongo_handler.api_log.count_documents({}) == 2
+
+
+def test_full_queue_spills_to_disk(tmp_path):
+    writer = make_writer(MagicMock(), tmp_path, queue_size=1, overflow=OverflowPolicy.SPILL)
+
+    writer.submit(make_record(0))
+    assert writer.submit(make_record(1)) is True
+
+    assert writer.stats()["spilled"] == 1
+    assert writer.spill_file.read_text().count("\n") == 1
+
+
+def test_failed_writes_are_spilled_and_replayed_when_mongo_is_back(mongo_handler, tmp_path):
+    writer = make_writer(mongo_handler, tmp_path)
+    insert_api_records = mongo_handler.insert_api_records
+    records = [make_record(index) for index in range(3)]
+
+    with patch.object(mongo_handler, "insert_api_records", side_effect=ConnectionError("mongo down")):
+        for record in records:
+            writer.submit(record)
+        writer.flush()
+        assert writer.replay() == 0  # still down: the records stay on disk
+
+    assert writer.stats()["spilled"] == 3
+    assert mongo_handler.api_log is None or mongo_handler.api_log.count_documents({}) == 0
+
+    # one record made it before the outage; replaying it again must not duplicate it
+    insert_api_records([records[0]])
+    assert writer.replay() == 3
+
+    assert mongo_handler.api_log.count_documents({}) == 3
+    assert sorted(doc["index"] for doc in mongo_handler.api_log.find()) == [0, 1, 2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def write_spill_file(path, records, tail=""):
+    path.write_text("".join(json_util.dumps(record) + "\n" for record in records) + tail)
+
+
+def test_replay_leaves_spill_files_of_live_processes_alone(mongo_handler, tmp_path):
+    writer = make_writer(mongo_handler, tmp_path)
+    # the parent process is alive and may still be appending to its file
+    live = tmp_path / f"spill-{os.getppid()}.jsonl"
+    write_spill_file(live, [make_record()])
+    dead_process = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead_process.wait()
+    write_spill_file(tmp_path / f"spill-{dead_process.pid}.jsonl", [make_record(1), make_record(2)])
+
+    assert writer.replay(include_claimed=True) == 2
+    assert list(tmp_path.iterdir()) == [live]
+
+
+def test_replay_skips_unreadable_lines(mongo_handler, tmp_path):
+    writer = make_writer(mongo_handler, tmp_path)
+    # a crash mid-write leaves a truncated last line
+    write_spill_file(writer.spill_file, [make_record(0), make_record(1)], tail='{"_id": {"$oid": "65')
+
+    assert writer.replay() == 2
+    assert writer.stats()["dropped"] == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_writes_are_dropped_with_drop_policy(tmp_path):
+    mongo_handler = MagicMock()
+    mongo_handler.insert_api_records.side_effect = ConnectionError("mongo down")
+    writer = make_writer(mongo_handler, tmp_path, overflow=OverflowPolicy.DROP)
+
+    writer.submit(make_record())
+    writer.flush()
+
+    assert writer.stats()["dropped"] == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stop_flushes_queued_records(tmp_path):
+    mongo_handler = MagicMock()
+    writer = make_writer(mongo_handler, tmp_path, batch_size=2)
+    for index in range(5):
+        writer.submit(make_record(index))
+
+    writer.start()
+    writer.stop()
+
+    assert writer.stats()["written"] == 5
+    assert all(len(call.args[0]) <= 2 for call in mongo_handler.insert_api_records.call_args_list)
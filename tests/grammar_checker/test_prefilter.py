@@ -0,0 +1,99 @@
+import pytest
+from grammar_checker.prefilter import PreFilter, evaluate_prefilter
+from models.response import Mistake
+from models.benchmark_case import BenchmarkCase
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "She quickly ran to the store.",
+        "Where are you going?",
+        "He has gone to the market.",
+    ],
+)
+def test_clean_sentences_pass(sentence):
+    prefilter = PreFilter(0.9)
+    assert prefilter.score(sentence) == 1.0
+    assert prefilter.is_clean(sentence)
+
+
+@pytest.mark.parametrize(
+    "sentence, rule",
+    [
+        ("She go to school every day.", "third_person_base_verb"),
+        ("I have went to the store.", "perfect_with_simple_past"),
+        ("The cat is more faster than the dog.", "double_comparative"),
+        ("He is taller then his brother.", "comparative_then"),
+        ("The informations are accurate.", "uncountable_plural"),
+        ("I have an dog.", "article_before_consonant"),
+        ("Where you are going?", "question_word_order"),
+        ("They was playing, but they dont care.", "missing_apostrophe"),
+        ("the dog barked.", "lowercase_start"),
+        ("The dog barked", "missing_end_punctuation"),
+        ("I bought eggs milk and bread.", "list_without_commas"),
+        ("We discussed about the budget.", "superfluous_preposition"),
+        ("The report mentions about three risks.", "superfluous_preposition"),
+        ("The team comprises of five engineers.", "superfluous_preposition"),
+        ("Please enter to the building quietly.", "superfluous_preposition"),
+        ("My uncle drives careless.", "adjective_as_adverb"),
+        ("They finished the test quick.", "adjective_as_adverb"),
+        ("The children played nice, so we stayed.", "adjective_as_adverb"),
+    ],
+)
+def test_mistake_patterns_are_not_clean(sentence, rule):
+    prefilter = PreFilter(0.9)
+    assert rule in prefilter.matched_rules(sentence)
+    assert not prefilter.is_clean(sentence)
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "We discussed the budget.",
+        "They entered into an agreement.",
+        "The soup tastes good.",
+        "The results are good.",
+        "The movie was really good.",
+        "Was this good?",
+        "He has been patient.",
+        "My uncle drives carefully.",
+    ],
+)
+def test_correct_uses_do_not_match_the_preposition_and_adverb_rules(sentence):
+    matched = PreFilter().matched_rules(sentence)
+    assert "superfluous_preposition" not in matched
+    assert "adjective_as_adverb" not in matched
+
+
+def test_long_sentences_lose_confidence():
+    prefilter = PreFilter(0.9)
+    sentence = "She walked " + "very " * 20 + "slowly."
+    assert prefilter.score(sentence) < 0.9
+
+
+def test_threshold_zero_accepts_everything():
+    assert PreFilter(0.0).is_clean("she go to school")
+
+
+@pytest.mark.parametrize("threshold", [-0.1, 1.5])
+def test_invalid_threshold(threshold):
+    with pytest.raises(ValueError):
+        PreFilter(threshold)
+
+
+def test_evaluate_prefilter():
+    test_cases = [
+        BenchmarkCase(1, "She quickly ran to the store.", "She quickly ran to the store."),
+        BenchmarkCase(
+            2, "She is good in math.", "She is good at math.", (Mistake("WrongPrepositionMistake", "in", "at"),)
+        ),
+        BenchmarkCase(3, "She go to school.", "She goes to school.", (Mistake("VerbTenseMistake", "go", "goes"),)),
+    ]
+
+    stats = evaluate_prefilter(test_cases, PreFilter(0.9))
+
+    assert stats["skipped"] == 2
+    assert stats["missed_mistakes"] == 1
+    assert stats["miss_rate"] == 0.5
+
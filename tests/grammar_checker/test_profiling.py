@@ -0,0 +1,72 @@
+import time
+import threading
+from grammar_checker.tracing import stage
+from grammar_checker.profiling import Profiler, StackSampler, profile_run
+
+
+def test_profiler_records_stages_while_active():
+    profiler = Profiler("test", sample_interval=0)
+    with stage("ignored"):
+        pass
+
+    profiler.start()
+    for _ in range(3):
+        with stage("evaluation"):
+            pass
+    with stage("openai_request"):
+        time.sleep(0.01)
+    profiler.stop()
+
+    with stage("ignored"):
+        pass
+
+    rows = {row["stage"]: row for row in profiler.summary()}
+    assert set(rows) == {"evaluation", "openai_request", "total"}
+    assert rows["evaluation"]["calls"] == 3
+    assert rows["openai_request"]["wall_ms"] >= 10
+    assert rows["openai_request"]["cpu_ms"] < rows["openai_request"]["wall_ms"]
+    assert profiler.summary()[0]["stage"] == "openai_request"
+    assert profiler.summary()[-1]["stage"] == "total"
+
+
+def test_stack_sampler_collapses_stacks_of_other_threads():
+    started = threading.Event()
+    done = threading.Event()
+
+    def busy_worker():
+        started.set()
+        done.wait()
+
+    thread = threading.Thread(target=busy_worker, name="busy")
+    thread.start()
+    started.wait()
+    sampler = StackSampler()
+    sampler.sample()
+    sampler.sample()
+    done.set()
+    thread.join()
+
+    busy_stacks = [stack for stack in sampler.stacks if stack.startswith("busy;")]
+    assert busy_stacks
+    assert "busy_worker (test_profiling.py)" in busy_stacks[0]
+    assert sampler.stacks[busy_stacks[0]] == 2
+    assert sampler.collapsed().splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+def test_profile_run_writes_summary_and_collapsed_stacks(tmp_path):
+    with profile_run("benchmark", sample_interval=0.001, output_dir=tmp_path) as profiler:
+        with stage("mongo_insert"):
+            time.sleep(0.02)
+
+    assert profiler.stages["mongo_insert"]["calls"] == 1
+    summary_file = next(tmp_path.glob("*_profile_benchmark.txt"))
+    assert "mongo_insert" in summary_file.read_text()
+    assert next(tmp_path.glob("*_profile_benchmark.collapsed")).read_text()
+
+
+def test_profile_run_disabled(tmp_path):
+    with profile_run("benchmark", enabled=False, output_dir=tmp_path) as profiler:
+        pass
+
+    assert profiler is None
+    assert not list(tmp_path.iterdir())
@@ -8,11 +8,12 @@ class DummyLogger:
     def __init__(self):
         self.messages = []
 
-    def info(self, msg):
-        self.messages.append(("info", msg))
+    # messages are formatted lazily, like logging.Logger does with %-style arguments
+    def info(self, msg, *args):
+        self.messages.append(("info", msg % args if args else msg))
 
-    def error(self, msg):
-        self.messages.append(("error", msg))
+    def error(self, msg, *args):
+        self.messages.append(("error", msg % args if args else msg))
 
 
 def test_load_template_success(monkeypatch):
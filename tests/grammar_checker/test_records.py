@@ -0,0 +1,73 @@
+import mongomock
+from grammar_checker.records import case_id, split_record, hydrate_record, hydrate_records, is_lean
+
+
+def make_record(test_id=1, run_id="run-1"):
+    return {
+        "request": {"sentence": "She go home.", "prompt_version": "v1.txt", "model": "gpt-4", "mode": "benchmark"},
+        "response": {"input": "She go home.", "mistakes": [], "corrected_sentence": "She goes home."},
+        "benchmark_eval": {
+            "test_id": test_id,
+            "input": "She go home.",
+            "corrected_sentence": "She goes home.",
+            "mistakes": [{"type": "verb", "original": "go", "corrected": "goes"}],
+            "match": True,
+            "run_id": run_id,
+            "prefiltered": False,
+        },
+    }
+
+
+def test_split_record_moves_test_case_out():
+    lean, case = split_record(make_record())
+
+    assert is_lean(lean)
+    assert "sentence" not in lean["request"]
+    assert lean["benchmark_eval"] == {
+        "test_id": 1,
+        "match": True,
+        "run_id": "run-1",
+        "prefiltered": False,
+        "case_id": case["_id"],
+    }
+    assert case["input"] == "She go home."
+    assert case["mistakes"][0]["type"] == "verb"
+
+
+def test_split_then_hydrate_restores_the_full_record():
+    record = make_record()
+    lean, case = split_record(record)
+
+    assert hydrate_record(lean, {case["_id"]: case}) == record
+
+
+def test_case_id_depends_on_content_only():
+    first = split_record(make_record(run_id="run-1"))[1]
+    second = split_record(make_record(run_id="run-2"))[1]
+    other = split_record(make_record(test_id=2))[1]
+
+    assert first["_id"] == second["_id"] == case_id(first)
+    assert other["_id"] != first["_id"]
+
+
+def test_records_without_benchmark_eval_are_left_alone():
+    record = {"request": {"sentence": "Hi."}, "response": {}}
+
+    assert split_record(record) == (record, None)
+    assert hydrate_record(record, {}) is record
+
+
+def test_hydrate_record_keeps_lean_record_when_case_is_missing(caplog):
+    lean, _ = split_record(make_record())
+
+    assert hydrate_record(lean, {}) is lean
+    assert "is missing" in caplog.text
+
+
+def test_hydrate_records_reads_cases_once():
+    test_cases = mongomock.MongoClient()["test_db"]["test_cases"]
+    full = make_record(test_id=2)
+    lean, case = split_record(make_record())
+    test_cases.insert_one(case)
+
+    assert hydrate_records([lean, full], test_cases) == [make_record(), full]
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, UTC
+from grammar_checker.runs import build_run_summary, format_run, format_run_list, merge_summaries, summary_rows
+
+STARTED_AT = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def make_summary():
+    return {
+        "t1.txt": {"gpt-4": {"total": 4, "passed": 3, "prefiltered": 2, "latency_ms": 100.0, "prompt_tokens": 40}},
+        "t2.txt": {"gpt-4": {"total": 4, "passed": 1, "prefiltered": 0, "latency_ms": 400.0, "prompt_tokens": 80}},
+    }
+
+
+def test_summary_rows_round_trip_through_merge():
+    summary = {
+        "v1.txt": {"gpt-4": {"total": 2, "passed": 1}, "gpt-3.5-turbo": {"total": 2, "passed": 2}},
+        "v2.txt": {"gpt-4": {"total": 2, "passed": 0}},
+    }
+
+    rows = summary_rows(summary)
+
+    assert {"prompt_version": "v1.txt", "model": "gpt-4", "total": 2, "passed": 1} in rows
+    assert merge_summaries(rows + rows) == {
+        "v1.txt": {"gpt-4": {"total": 4, "passed": 2}, "gpt-3.5-turbo": {"total": 4, "passed": 4}},
+        "v2.txt": {"gpt-4": {"total": 4, "passed": 0}},
+    }
+
+
+def test_build_run_summary_totals_and_rates():
+    run = build_run_summary(
+        "run-1", make_summary(), "batch", {"models": ["gpt-4"]}, STARTED_AT, STARTED_AT + timedelta(seconds=90)
+    )
+
+    assert run["_id"] == run["run_id"] == "run-1"
+    assert run["duration_s"] == 90.0
+    assert run["config"] == {"models": ["gpt-4"]}
+    assert run["totals"]["total"] == 8
+    assert run["totals"]["passed"] == 4
+    assert run["totals"]["pass_rate"] == 0.5
+    assert run["totals"]["prompt_tokens"] == 120
+    assert run["totals"]["completion_tokens"] == 0
+    # prefiltered cases are not part of the mean latency
+    assert run["totals"]["mean_latency_ms"] == round(500.0 / 6, 3)
+    assert [arm["prompt_version"] for arm in run["arms"]] == ["t1.txt", "t2.txt"]
+    assert run["arms"][0]["mean_latency_ms"] == 50.0
+
+
+def test_build_run_summary_of_empty_run():
+    run = build_run_summary("run-1", {}, "batch", {}, STARTED_AT, STARTED_AT)
+
+    assert run["arms"] == []
+    assert run["totals"]["pass_rate"] == 0.0
+    assert run["totals"]["mean_latency_ms"] == 0.0
+
+
+def test_format_run_list_and_run():
+    run = build_run_summary(
+        "run-1",
+        make_summary(),
+        "batch",
+        {"models": ["gpt-4"], "prompt_templates": ["t1.txt", "t2.txt"]},
+        STARTED_AT,
+        STARTED_AT + timedelta(seconds=90),
+    )
+
+    listing = format_run_list([run])
+    details = format_run(run)
+
+    assert "run-1" in listing.splitlines()[1]
+    assert "gpt-4 / t1.txt, t2.txt" in listing
+    assert "4/8 passed (0.500)" in details
+    assert "120 prompt + 0 completion tokens" in details
+    assert details.index("t1.txt  ") < details.index("t2.txt  ")
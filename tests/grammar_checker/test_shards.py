@@ -0,0 +1,237 @@
+import threading
+from datetime import datetime, timedelta, UTC
+from unittest.mock import MagicMock, patch
+import mongomock
+import pytest
+from grammar_checker.shards import (
+    ClaimLost,
+    ShardStore,
+    ShardStatus,
+    format_progress,
+    run_worker,
+    wait_for_run,
+)
+from models.benchmark_case import BenchmarkCase
+
+
+def make_cases(count):
+    return [BenchmarkCase(index, f"Sentence {index}.", f"Sentence {index}.") for index in range(count)]
+
+
+@pytest.fixture
+def store():
+    client = mongomock.MongoClient()
+    with patch("grammar_checker.shards.get_client", lambda uri: client):
+        with ShardStore("mock_uri", "test_db", "shards") as store:
+            # find_one_and_update is atomic on a real server but not in mongomock
+            lock = threading.Lock()
+            find_one_and_update = store.collection.find_one_and_update
+
+            def atomic_find_one_and_update(*args, **kwargs):
+                with lock:
+                    return find_one_and_update(*args, **kwargs)
+
+            store.collection.find_one_and_update = atomic_find_one_and_update
+            yield store
+
+
+def test_create_run_partitions_models_templates_and_cases(store):
+    run_id = store.create_run(make_cases(5), ["gpt-4", "gpt-3.5-turbo"], ["t1.txt"], shard_size=2)
+
+    shards = list(store.collection.find({"run_id": run_id}).sort("index", 1))
+    assert len(shards) == 6
+    assert [shard["case_count"] for shard in shards] == [2, 2, 1, 2, 2, 1]
+    assert {(shard["model"], shard["prompt_version"]) for shard in shards} == {
+        ("gpt-4", "t1.txt"),
+        ("gpt-3.5-turbo", "t1.txt"),
+    }
+    assert shards[0]["test_cases"][0] == {
+        "test_id": 0,
+        "input": "Sentence 0.",
+        "corrected_sentence": "Sentence 0.",
+        "mistakes": [],
+    }
+    assert all(shard["status"] == ShardStatus.PENDING for shard in shards)
+
+
+@pytest.mark.parametrize("shard_size, cases", [(0, 3), (2, 0)])
+def test_create_run_rejects_empty_runs(store, shard_size, cases):
+    with pytest.raises(ValueError):
+        store.create_run(make_cases(cases), ["gpt-4"], ["t1.txt"], shard_size=shard_size)
+
+
+def test_claims_are_unique_across_threads(store):
+    run_id = store.create_run(make_cases(20), ["gpt-4"], ["t1.txt"], shard_size=1)
+    claimed = []
+    lock = threading.Lock()
+
+    def claim(worker_id):
+        while shard := store.claim_shard(worker_id, run_id):
+            with lock:
+                claimed.append(shard["_id"])
+
+    threads = [threading.Thread(target=claim, args=(f"w{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 20
+    assert len(set(claimed)) == 20
+
+
+def test_expired_claim_is_reclaimed_and_old_worker_cannot_complete(store):
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    shard = store.claim_shard("crashed", run_id)
+    assert store.claim_shard("w2", run_id) is None
+
+    stale = datetime.now(UTC) - timedelta(seconds=store.lease_seconds + 1)
+    store.collection.update_one({"_id": shard["_id"]}, {"$set": {"claimed_at": stale}})
+    reclaimed = store.claim_shard("w2", run_id)
+
+    assert reclaimed["_id"] == shard["_id"]
+    assert reclaimed["attempts"] == 2
+    assert store.complete_shard(shard["_id"], "crashed", {}) is False
+    assert store.complete_shard(shard["_id"], "w2", {}) is True
+
+
+def expire_claim(store, shard_id):
+    stale = datetime.now(UTC) - timedelta(seconds=store.lease_seconds + 1)
+    store.collection.update_one({"_id": shard_id}, {"$set": {"claimed_at": stale}})
+
+
+def test_renew_claim_only_extends_the_current_attempt(store):
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    shard = store.claim_shard("w1", run_id)
+    assert store.renew_claim(shard) is True
+
+    expire_claim(store, shard["_id"])
+    reclaimed = store.claim_shard("w2", run_id)
+
+    assert store.renew_claim(shard) is False
+    assert store.renew_claim(reclaimed) is True
+
+
+def test_lease_is_renewed_while_a_shard_runs(store):
+    store.lease_seconds = 0.3
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    takeovers = []
+
+    def process_shard(shard):
+        # a shard that runs for several leases stays with its worker
+        for _ in range(5):
+            threading.Event().wait(0.15)
+            takeovers.append(store.claim_shard("w2", run_id))
+        return {}
+
+    assert run_worker(store, process_shard, run_id, "w1", poll_interval=0.01) == 1
+    assert takeovers == [None] * 5
+
+
+def test_lost_claim_is_left_to_the_new_owner(store):
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    finalized = []
+
+    def process_shard(shard):
+        expire_claim(store, shard["_id"])
+        reclaimed = store.claim_shard("w2", run_id)
+        store.complete_shard(reclaimed["_id"], "w2", {})
+        raise ClaimLost(shard["_id"])
+
+    completed = run_worker(
+        store,
+        process_shard,
+        run_id,
+        "w1",
+        poll_interval=0.01,
+        finalize_shard=lambda shard, done: finalized.append((shard["attempts"], done)),
+    )
+
+    shard = store.collection.find_one({"run_id": run_id})
+    assert completed == 0
+    assert shard["status"] == ShardStatus.DONE
+    assert shard["worker"] == "w2"
+    assert finalized == [(1, False)]
+
+
+def test_progress_merges_shard_summaries(store):
+    run_id = store.create_run(make_cases(4), ["gpt-4"], ["t1.txt"], shard_size=2)
+    for worker_id in ("w1", "w2"):
+        shard = store.claim_shard(worker_id, run_id)
+        store.complete_shard(shard["_id"], worker_id, {"t1.txt": {"gpt-4": {"total": 2, "passed": 1}}})
+
+    progress = store.progress(run_id)
+
+    assert progress["finished"] is True
+    assert progress["shards"]["done"] == 2
+    assert progress["cases"]["done"] == 4
+    assert progress["workers"] == ["w1", "w2"]
+    assert progress["summary"] == {"t1.txt": {"gpt-4": {"total": 4, "passed": 2}}}
+    assert "2/2 shard(s) done" in format_progress(progress)
+
+
+def test_workers_share_a_run(store):
+    run_id = store.create_run(make_cases(12), ["gpt-4"], ["t1.txt", "t2.txt"], shard_size=3)
+    processed = []
+    lock = threading.Lock()
+
+    def process_shard(shard):
+        with lock:
+            processed.extend((shard["prompt_version"], case["test_id"]) for case in shard["test_cases"])
+        return {shard["prompt_version"]: {shard["model"]: {"total": shard["case_count"], "passed": 0}}}
+
+    threads = [
+        threading.Thread(target=run_worker, args=(store, process_shard, run_id, f"w{index}", 3, 0.01))
+        for index in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    progress = store.progress(run_id)
+    assert progress["finished"] is True
+    assert len(processed) == len(set(processed)) == 24
+    assert progress["summary"] == {
+        "t1.txt": {"gpt-4": {"total": 12, "passed": 0}},
+        "t2.txt": {"gpt-4": {"total": 12, "passed": 0}},
+    }
+
+
+def test_failing_shard_is_retried_then_marked_failed(store):
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    process_shard = MagicMock(side_effect=RuntimeError("model unavailable"))
+
+    completed = run_worker(store, process_shard, run_id, "w1", max_attempts=2, poll_interval=0.01)
+
+    shard = store.collection.find_one({"run_id": run_id})
+    assert completed == 0
+    assert process_shard.call_count == 2
+    assert shard["status"] == ShardStatus.FAILED
+    assert shard["error"] == "model unavailable"
+
+
+def test_wait_for_run_echoes_progress_until_finished(store):
+    run_id = store.create_run(make_cases(2), ["gpt-4"], ["t1.txt"], shard_size=1)
+    lines = []
+
+    def echo(line):
+        lines.append(line)
+        shard = store.claim_shard("w1", run_id)
+        if shard:
+            store.complete_shard(shard["_id"], "w1", {})
+
+    progress = wait_for_run(store, run_id, poll_interval=0, echo=echo)
+
+    assert progress["finished"] is True
+    assert "0/2 shard(s) done" in lines[0]
+    assert "2/2 shard(s) done" in lines[-1]
+
+
+def test_wait_for_run_raises_when_local_workers_exited(store):
+    run_id = store.create_run(make_cases(1), ["gpt-4"], ["t1.txt"])
+    exited = MagicMock()
+    exited.poll.return_value = 1
+
+    with pytest.raises(RuntimeError, match="exited"):
+        wait_for_run(store, run_id, [exited], poll_interval=0, echo=lambda line: None)
@@ -0,0 +1,126 @@
+import sqlite3
+from datetime import datetime
+from unittest.mock import patch
+import pytest
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.factory import StorageBackendType
+from grammar_checker.storage import SQLiteStorage, FileStorage
+from models.request import GrammarRequest
+from models.response import GrammarResponse
+
+
+def make_result(run_id, sentence="She go home.", model="gpt-4"):
+    return {
+        "request": GrammarRequest(sentence=sentence, model=model, mode="benchmark"),
+        "response": GrammarResponse(input=sentence, mistakes=[], corrected_sentence="She goes home."),
+        "benchmark_eval": {"test_id": 1, "input": sentence, "run_id": run_id, "match": True},
+    }
+
+
+def make_summary(run_id, day, models):
+    return {
+        "run_id": run_id,
+        "started_at": datetime(2024, 1, day),
+        "config": {"models": models},
+        "totals": {"total": 1},
+        "arms": [{"model": models[0]}],
+    }
+
+
+@pytest.fixture(params=["sqlite", "jsonl", "parquet"])
+def storage(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteStorage(tmp_path / "benchmarks.sqlite3")
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return FileStorage(tmp_path / "storage", request.param)
+
+
+def test_results_read_back_per_run_in_full_form(storage):
+    with storage:
+        assert storage.save_results([make_result("run-1"), make_result("run-2"), make_result("run-1", "A.")]) == 3
+        storage.save_results([make_result("run-1", "B.")])
+
+        records = storage.query_benchmark_data(["run-1"])
+        assert storage.query_benchmark_data([]) == []
+
+    assert [record["request"]["sentence"] for record in records] == ["She go home.", "A.", "B."]
+    assert records[0]["response"]["corrected_sentence"] == "She goes home."
+    assert isinstance(records[0]["timestamp"], datetime)
+
+
+def test_failed_sqlite_insert_is_rolled_back(tmp_path):
+    bad_result = make_result("run-1")
+    bad_result["benchmark_eval"]["run_id"] = ["not", "a", "run id"]
+
+    with SQLiteStorage(tmp_path / "benchmarks.sqlite3") as storage:
+        with pytest.raises(sqlite3.Error):
+            storage.save_results([make_result("run-1"), bad_result])
+
+        assert not storage.connection.in_transaction
+        storage.save_results([make_result("run-1", "A.")])
+        records = storage.query_benchmark_data(["run-1"])
+
+    assert [record["request"]["sentence"] for record in records] == ["A."]
+
+
+def test_unknown_runs_return_nothing(storage):
+    with storage:
+        storage.save_results([make_result("run-1")])
+
+        assert storage.query_benchmark_data(["missing"]) == []
+
+
+def test_run_summaries_newest_first_by_model(storage):
+    with storage:
+        for run_id, day, models in [("run-1", 1, ["gpt-4"]), ("run-2", 2, ["gpt-3.5-turbo"]), ("run-3", 3, ["gpt-4"])]:
+            storage.save_run_summary(make_summary(run_id, day, models))
+        # saving a run again replaces its summary
+        storage.save_run_summary({**make_summary("run-1", 1, ["gpt-4"]), "totals": {"total": 2}})
+
+        runs = storage.query_run_summaries()
+        gpt4_runs = storage.query_run_summaries(limit=1, model="gpt-4")
+        run = storage.query_run_summary("run-1")
+
+        assert storage.query_run_summary("missing") is None
+
+    assert [summary["run_id"] for summary in runs] == ["run-3", "run-2", "run-1"]
+    assert "arms" not in runs[0]
+    assert [summary["run_id"] for summary in gpt4_runs] == ["run-3"]
+    assert run["totals"] == {"total": 2}
+    assert run["arms"] == [{"model": "gpt-4"}]
+    assert run["started_at"] == datetime(2024, 1, 1)
+
+
+def test_jsonl_files_are_per_run_and_append_only(tmp_path):
+    storage = FileStorage(tmp_path, "jsonl")
+    with storage:
+        storage.save_results([make_result("run-1")])
+        storage.save_results([make_result("run-1")])
+
+    assert sorted(path.name for path in (tmp_path / "records").iterdir()) == ["run-1.jsonl"]
+    assert (tmp_path / "records" / "run-1.jsonl").read_text().count("\n") == 2
+
+
+def test_file_storage_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unknown file format"):
+        FileStorage(tmp_path, "csv")
+
+
+def test_storage_backend_types_build_their_backend(tmp_path):
+    with patch("grammar_checker.config.SQLITE_STORAGE_PATH", tmp_path / "b.sqlite3"), patch(
+        "grammar_checker.config.FILE_STORAGE_DIR", tmp_path
+    ):
+        sqlite = StorageBackendType.SQLITE.build()
+        parquet = StorageBackendType.PARQUET.build()
+
+    assert isinstance(StorageBackendType.MONGO.build(), MongoDBHandler)
+    assert sqlite.db_path == tmp_path / "b.sqlite3"
+    assert (parquet.directory, parquet.file_format) == (tmp_path, "parquet")
+
+
+def test_storage_backend_type_accepts_earlier_destinations():
+    assert StorageBackendType("save_to_db") is StorageBackendType.MONGO
+    assert StorageBackendType("save_to_file") is StorageBackendType.JSONL
+    with pytest.raises(ValueError):
+        StorageBackendType("print")
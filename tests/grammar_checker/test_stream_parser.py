@@ -0,0 +1,59 @@
+import json
+import pytest
+from grammar_checker.stream_parser import StreamingResponseParser
+
+
+DOCUMENT = {
+    "input": 'He said "go" {now}',
+    "mistakes": [
+        {"type": "VerbTenseMistake", "original": "go}", "corrected": "goes"},
+        {"type": "PunctuationMistake", "original": "[x]", "corrected": "y"},
+    ],
+    "corrected_sentence": 'He said "goes" now.',
+}
+
+
+def feed_in_chunks(text, size):
+    parser = StreamingResponseParser()
+    events = []
+    for index in range(0, len(text), size):
+        events.extend(parser.feed(text[index : index + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 17, 10_000])
+def test_events_independent_of_chunking(chunk_size):
+    text = json.dumps(DOCUMENT, indent=2)
+
+    parser, events = feed_in_chunks(text, chunk_size)
+
+    assert events == [
+        ("mistake", DOCUMENT["mistakes"][0]),
+        ("mistake", DOCUMENT["mistakes"][1]),
+        ("corrected_sentence", DOCUMENT["corrected_sentence"]),
+    ]
+    assert parser.result() == DOCUMENT
+
+
+def test_mistake_emitted_before_stream_ends():
+    text = json.dumps(DOCUMENT)
+    cut = text.index("goes") + len('goes"}')  # right after the first mistake object
+
+    parser = StreamingResponseParser()
+
+    assert parser.feed(text[:cut]) == [("mistake", DOCUMENT["mistakes"][0])]
+
+
+def test_key_order_and_nested_values_ignored():
+    text = json.dumps({"corrected_sentence": "Done.", "meta": {"corrected_sentence": "nested"}, "mistakes": []})
+
+    _, events = feed_in_chunks(text, 3)
+
+    assert events == [("corrected_sentence", "Done.")]
+
+
+def test_result_invalid_json_raises():
+    parser = StreamingResponseParser()
+    parser.feed('{"input": "unterminated')
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from grammar_checker.tracing import request_context, stage, get_request_id, get_trace, propagate_context
+
+
+def test_request_context_sets_and_resets_request_id():
+    assert get_request_id() is None
+
+    with request_context("abc123") as trace:
+        assert get_request_id() == "abc123"
+        assert get_trace() is trace
+
+    assert get_request_id() is None
+    assert get_trace() is None
+
+
+def test_request_context_generates_request_id():
+    with request_context() as trace:
+        assert trace.request_id
+        assert get_request_id() == trace.request_id
+
+
+def test_stages_accumulate_into_trace():
+    with request_context() as trace:
+        with stage("model"):
+            pass
+        with stage("model"):
+            pass
+        with stage("db"):
+            pass
+
+    assert set(trace.stages) == {"model", "db"}
+    assert all(duration >= 0 for duration in trace.stages.values())
+
+
+def test_trace_measures_elapsed_time():
+    with request_context() as trace:
+        first = trace.elapsed_ms
+        second = trace.elapsed_ms
+
+    assert 0 <= first <= second
+
+
+def test_stage_outside_request_context_is_a_no_op():
+    with stage("model"):
+        pass
+    assert get_trace() is None
+
+
+def test_propagate_context_carries_request_id_to_worker_threads():
+    def check(_):
+        with stage("sentence"):
+            return get_request_id()
+
+    with request_context("doc-1") as trace:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            request_ids = list(executor.map(propagate_context(check), range(4)))
+
+    assert request_ids == ["doc-1"] * 4
+    assert "sentence" in trace.stages
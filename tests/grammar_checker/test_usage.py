@@ -0,0 +1,144 @@
+import time
+from datetime import datetime, timedelta, UTC
+from unittest.mock import MagicMock, patch
+import mongomock
+import pytest
+from grammar_checker.factory import UsageGranularity
+from grammar_checker.usage import (
+    UsageRollupJob,
+    format_usage,
+    percentile,
+    period_start,
+    rollup_periods,
+    rollup_usage,
+)
+
+NOW = datetime(2024, 5, 1, 10, 30, tzinfo=UTC)
+
+
+@pytest.fixture
+def database():
+    database = mongomock.MongoClient()["test_db"]
+    log = database["api_requests"]
+    for minute in range(10):
+        log.insert_one(
+            {
+                "timestamp": NOW - timedelta(minutes=minute),
+                "model": "gpt-4",
+                "status": "error" if minute == 0 else "ok",
+                "latency_ms": 100.0 * (minute + 1),
+                "prompt_tokens": 10,
+                "completion_tokens": 5,
+            }
+        )
+    log.insert_one({"timestamp": NOW - timedelta(hours=1), "model": "gpt-3.5-turbo", "status": "ok", "latency_ms": 50.0})
+    log.insert_one({"timestamp": NOW - timedelta(days=1), "model": "gpt-4", "status": "ok", "latency_ms": 70.0})
+    with patch("grammar_checker.usage.MONGO_API_LOG_COLLECTION", "api_requests"), patch(
+        "grammar_checker.usage.MONGO_API_USAGE_COLLECTION", "api_usage"
+    ):
+        yield database
+
+
+def test_period_start():
+    assert period_start(NOW, UsageGranularity.HOUR) == datetime(2024, 5, 1, 10, tzinfo=UTC)
+    assert period_start(NOW.replace(tzinfo=None), UsageGranularity.DAY) == datetime(2024, 5, 1, tzinfo=UTC)
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+
+
+def test_rollup_usage_per_period_and_model(database):
+    start = period_start(NOW, UsageGranularity.HOUR)
+
+    [document] = rollup_usage(database, "hour", start, start + timedelta(hours=1))
+
+    assert document["model"] == "gpt-4"
+    assert document["requests"] == 10
+    assert document["errors"] == 1
+    assert document["error_rate"] == 0.1
+    assert document["latency_ms"]["p50"] == 500.0
+    assert document["latency_ms"]["max"] == 1000.0
+    assert document["prompt_tokens"]["sum"] == 100
+    assert database["api_usage"].count_documents({}) == 1
+
+
+def test_rollup_usage_replaces_earlier_rollups(database):
+    start = period_start(NOW, UsageGranularity.HOUR)
+    rollup_usage(database, "hour", start, start + timedelta(hours=1))
+    database["api_requests"].insert_one({"timestamp": NOW, "model": "gpt-4", "status": "ok", "latency_ms": 1.0})
+
+    [document] = rollup_usage(database, "hour", start, start + timedelta(hours=1))
+
+    assert document["requests"] == 11
+    assert database["api_usage"].count_documents({}) == 1
+
+
+def test_rollup_periods_covers_previous_and_current_period(database):
+    count = rollup_periods(database, now=NOW)
+
+    usage = database["api_usage"]
+    # two hours (gpt-4 now, gpt-3.5-turbo an hour ago) and two days (today, yesterday)
+    assert count == 5
+    assert usage.count_documents({"granularity": "hour"}) == 2
+    today = usage.find_one({"granularity": "day", "model": "gpt-4", "period_start": datetime(2024, 5, 1)})
+    assert today["requests"] == 10
+    assert "2024-05-01 10:00  gpt-4" in format_usage(list(usage.find({"granularity": "hour"})))
+
+
+def test_rollup_periods_since_backfills(database):
+    assert rollup_periods(database, since=NOW - timedelta(days=2), now=NOW) == 6
+
+
+def test_rollup_periods_only_given_granularities(database):
+    assert rollup_periods(database, now=NOW, granularities=(UsageGranularity.HOUR,)) == 2
+    assert database["api_usage"].count_documents({"granularity": "day"}) == 0
+
+
+def test_rollup_job_refreshes_days_once_per_hour(database):
+    mongo_handler = MagicMock()
+    mongo_handler.db = database
+    job = UsageRollupJob(mongo_handler)
+
+    # the first run right after midnight closes yesterday: both days (no records in these hours)
+    assert job.run_once(NOW.replace(hour=0, minute=5)) == 3
+    assert database["api_usage"].count_documents({"granularity": "day"}) == 3
+    # within the same hour only the hours are refreshed
+    database["api_usage"].delete_many({})
+    assert job.run_once(NOW.replace(hour=0, minute=15)) == 0
+    assert database["api_usage"].count_documents({}) == 0
+    with patch("grammar_checker.usage.rollup_usage", return_value=[]) as mock_rollup_usage:
+        job.run_once(NOW.replace(hour=1, minute=1))
+
+    assert [call.args[1:3] for call in mock_rollup_usage.call_args_list] == [
+        (UsageGranularity.HOUR, datetime(2024, 5, 1, 0, tzinfo=UTC)),
+        (UsageGranularity.DAY, datetime(2024, 5, 1, tzinfo=UTC)),
+    ]
+
+
+def test_rollup_job_runs_periodically():
+    mongo_handler = MagicMock()
+    job = UsageRollupJob(mongo_handler, interval=0.01)
+
+    with patch("grammar_checker.usage.rollup_periods") as mock_rollup_periods:
+        job.start()
+        time.sleep(0.1)
+        job.stop()
+
+    assert mock_rollup_periods.call_count >= 2
+    # the days are only refreshed on the first run of the hour
+    assert "granularities" not in mock_rollup_periods.call_args_list[0].kwargs
+    assert mock_rollup_periods.call_args.kwargs["granularities"] == (UsageGranularity.HOUR,)
+
+
+def test_rollup_job_disabled_with_zero_interval():
+    job = UsageRollupJob(MagicMock(), interval=0)
+
+    job.start()
+
+    assert job._thread is None
+    job.stop()
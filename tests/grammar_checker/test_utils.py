@@ -1,9 +1,14 @@
 import json
 import pytest
+from dataclasses import FrozenInstanceError
 from pydantic import BaseModel
 from unittest.mock import patch, mock_open, MagicMock
 from grammar_checker.utils import transform_results, save_to_file
-from grammar_checker.utils import load_test_cases, save_test_results
+from grammar_checker.utils import load_test_cases, iter_test_cases, save_test_results
+from models.response import Mistake, MistakeType
+from models.benchmark_case import BenchmarkCase
+
+VERB_MISTAKE = {"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}
 
 
 class MockModel(BaseModel):
@@ -58,14 +63,57 @@ def test_transform_results_empty():
 
 def test_load_test_cases_valid_json(tmp_path):
     # Arrange
-    test_data = [{"input": "This is a test.", "benchmark_eval": "This is a test."}]
+    test_data = [
+        {"test_id": 7, "input": "She go.", "corrected_sentence": "She goes.", "mistakes": [VERB_MISTAKE]},
+        {"input": "This is a test.", "corrected_sentence": "This is a test.", "test_desc": "no id"},
+    ]
     file_path = tmp_path / "test_cases.json"
     with open(file_path, "w", encoding="utf-8") as f:
         json.dump(test_data, f)
     # Act
     result = load_test_cases(str(file_path))
     # Assert
-    assert result == test_data
+    assert result == [
+        BenchmarkCase(7, "She go.", "She goes.", (Mistake(MistakeType.VERB_TENSE, "go", "goes"),)),
+        BenchmarkCase(2, "This is a test.", "This is a test.", (), "no id"),
+    ]
+    assert result[0].to_dict() == test_data[0]
+
+
+def test_iter_test_cases_streams_jsonl(tmp_path):
+    file_path = tmp_path / "test_cases.jsonl"
+    file_path.write_text(
+        "\n".join(json.dumps({"test_id": i, "input": f"Case {i}.", "corrected_sentence": f"Case {i}."}) for i in range(3))
+        + "\n\n"
+    )
+
+    cases = iter_test_cases(file_path)
+
+    assert next(cases).test_id == 0
+    assert [case.input for case in cases] == ["Case 1.", "Case 2."]
+
+
+@pytest.mark.parametrize(
+    "cases, message",
+    [
+        ([{"test_id": 1, "input": "No expected sentence."}], "Invalid test case #1"),
+        ([{"test_id": 1, "input": "A.", "corrected_sentence": "A.", "mistakes": [{"type": "X"}]}], "Invalid test case"),
+        ([{"test_id": 1, "input": "A.", "corrected_sentence": "A."}] * 2, "Duplicate test_id 1"),
+    ],
+    ids=["missing_field", "incomplete_mistake", "duplicate_id"],
+)
+def test_load_test_cases_rejects_invalid_cases(tmp_path, cases, message):
+    file_path = tmp_path / "test_cases.json"
+    file_path.write_text(json.dumps(cases))
+
+    with pytest.raises(ValueError, match=message):
+        load_test_cases(file_path)
+
+
+def test_test_cases_are_immutable():
+    case = BenchmarkCase(1, "A.", "A.")
+    with pytest.raises(FrozenInstanceError):
+        case.input = "B."
 
 
 def test_load_test_cases_file_not_found():
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+import pytest
+from reporting.columnar import RunFile, export_runs, file_format_of, has_numeric_ids, record_columns
+from reporting.csv_reporter import CSVReporter
+from reporting.factory import ReportType, ReporterType
+from reporting.report_runner import run_reports
+from reporting import mistakes_report, sentences_report
+
+
+def make_doc(run_id, test_id, corrected, actual_mistakes, expected_mistakes):
+    return {
+        "request": {"sentence": "She go home.", "model": "gpt-4", "prompt_version": "v1"},
+        "response": {"corrected_sentence": corrected, "mistakes": actual_mistakes},
+        "benchmark_eval": {
+            "run_id": run_id,
+            "test_id": test_id,
+            "corrected_sentence": "She goes home.",
+            "mistakes": expected_mistakes,
+        },
+    }
+
+
+MISTAKE = {"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}
+
+HOME = {"type": "PrepositionMistake", "original": "to home", "corrected": "home"}
+
+docs = [
+    make_doc("run-1", 1, "She goes home.", [MISTAKE], [MISTAKE]),
+    make_doc("run-1", 2, "She go home.", [], [MISTAKE]),
+    make_doc("run-2", 1, "She goes home.", [{**MISTAKE, "original": "gos"}], [MISTAKE]),
+    make_doc("run-2", 10, "She goes home.", [HOME, MISTAKE], [MISTAKE, {**HOME, "type": None}]),
+]
+
+
+@pytest.fixture
+def run_file(request, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / f"runs.{request.param}"
+    with patch("reporting.columnar.query_benchmark_data", return_value=docs):
+        assert export_runs(["run-1", "run-2"], path, batch_size=2) == 4
+    return path
+
+
+def test_record_columns_flatten_documents():
+    columns = record_columns([make_doc("run-1", 7, "A.", [{**MISTAKE, "start": 0}], None)])
+
+    assert columns["run_id"] == ["run-1"]
+    assert columns["test_id"] == ["7"]
+    assert columns["actual_sentence"] == ["A."]
+    assert columns["expected_sentence"] == ["She goes home."]
+    # only the mistake fields the reports compare are kept
+    assert columns["actual_mistakes"] == [[MISTAKE]]
+    assert columns["expected_mistakes"] == [[]]
+    assert record_columns([make_doc("run-1", 7, "A.", [], [])], numeric_ids=True)["test_id"] == [7]
+
+
+def test_has_numeric_ids():
+    assert has_numeric_ids(docs)
+    assert not has_numeric_ids([*docs, make_doc("run-3", "a1", "A.", [], [])])
+
+
+def test_file_format_of():
+    assert file_format_of("runs.arrow") == "arrow"
+    assert file_format_of("runs.Parquet") == "parquet"
+    with pytest.raises(ValueError, match="Unknown export file type"):
+        file_format_of("runs.csv")
+
+
+def test_export_without_records_writes_nothing(tmp_path):
+    pytest.importorskip("pyarrow")
+    with patch("reporting.columnar.query_benchmark_data", return_value=[]):
+        assert export_runs(["missing"], tmp_path / "runs.arrow") == 0
+
+    assert not (tmp_path / "runs.arrow").exists()
+
+
+@pytest.mark.parametrize("run_file", ["arrow", "parquet"], indirect=True)
+def test_run_file_frames_match_the_document_frames(run_file):
+    data = RunFile(run_file)
+
+    assert len(data) == 4
+    assert data.sentences_frame().equals(sentences_report.transform_data(docs))
+    assert mistakes_report.transform_pairs(data.mistake_pairs()).equals(mistakes_report.transform_data(docs))
+
+
+def test_string_test_ids_are_exported_as_strings(tmp_path):
+    pytest.importorskip("pyarrow")
+    string_docs = [make_doc("run-1", "a1", "She goes home.", [MISTAKE], [MISTAKE])]
+    with patch("reporting.columnar.query_benchmark_data", return_value=string_docs):
+        export_runs(["run-1"], tmp_path / "runs.arrow")
+
+    data = RunFile(tmp_path / "runs.arrow")
+
+    assert data.sentences_frame().equals(sentences_report.transform_data(string_docs))
+    assert mistakes_report.transform_pairs(data.mistake_pairs()).equals(mistakes_report.transform_data(string_docs))
+
+
+@pytest.mark.parametrize("run_file", ["arrow"], indirect=True)
+def test_run_file_without_mistake_pairs(run_file):
+    frame = mistakes_report.transform_pairs(RunFile(run_file, ["missing"]).mistake_pairs())
+
+    assert frame.empty
+    assert list(frame.columns) == mistakes_report.COLUMNS
+
+
+@pytest.mark.parametrize("run_file", ["arrow"], indirect=True)
+def test_run_file_narrows_to_run_ids(run_file):
+    data = RunFile(run_file, ["run-2"])
+
+    assert len(data) == 2
+    assert list(data.sentences_frame()["run_id"]) == ["run-2", "run-2"]
+    assert len(RunFile(run_file, ["missing"])) == 0
+
+
+@pytest.mark.parametrize("run_file", ["arrow"], indirect=True)
+def test_run_reports_from_run_file(run_file, tmp_path):
+    output_dir = tmp_path / "reports"
+    output_dir.mkdir()
+    reporter_type = ReporterType.CSV
+
+    with patch.object(reporter_type, "build", return_value=CSVReporter(output_dir)):
+        run_reports([], list(ReportType), reporter_type, input_file=run_file)
+
+    names = {path.name for path in output_dir.glob("*.csv")}
+    for report in ReportType:
+        assert any(name.endswith(f"_{report.value}_details_run-1.csv") for name in names)
+        assert any(name.endswith(f"_{report.value}_summary_run-2.csv") for name in names)
@@ -1,13 +1,15 @@
 import mongomock
 import pytest
-from reporting.data_access import query_benchmark_data
+from datetime import datetime
+from grammar_checker.records import split_record
+from grammar_checker.storage import SQLiteStorage
+from reporting.data_access import query_benchmark_data, query_run_summaries, query_run_summary, query_api_usage
 
 
 @pytest.fixture()
 def mock_mongo(monkeypatch):
     mock_client = mongomock.MongoClient()
-    mock_db = mock_client["test_db"]
-    mock_collection = mock_db["test_collection"]
+    mock_collection = mock_client["test_db"]["test_collection"]
 
     # insert test data
     mock_collection.insert_many(
@@ -28,12 +30,11 @@ def mock_mongo(monkeypatch):
         ]
     )
 
-    # Monkeypatch the config values used in your query function
-    monkeypatch.setattr("reporting.data_access.MONGO_URI", "mongodb://localhost:27017")  # still needed but unused
-    monkeypatch.setattr("reporting.data_access.MONGO_DB", "test_db")
-    monkeypatch.setattr("reporting.data_access.MONGO_COLLECTION", "test_collection")
-
-    monkeypatch.setattr("reporting.data_access.MongoClient", lambda *args, **kwargs: mock_client)
+    # the queries read from the Mongo backend unless told otherwise
+    monkeypatch.setattr("reporting.data_access.STORAGE_BACKEND", "mongo")
+    monkeypatch.setattr("grammar_checker.config.MONGO_DB", "test_db")
+    monkeypatch.setattr("grammar_checker.config.MONGO_COLLECTION", "test_collection")
+    monkeypatch.setattr("grammar_checker.db.get_client", lambda *args, **kwargs: mock_client)
 
     return mock_collection
 
@@ -74,3 +75,111 @@ def test_empty_run_ids_return_empty_list(mock_mongo):
 def test_no_matching_run_ids_return_empty_list(mock_mongo):
     result = query_benchmark_data(["missing_run"])
     assert len(result) == 0
+
+
+@pytest.fixture()
+def mock_runs(monkeypatch):
+    mock_client = mongomock.MongoClient()
+    mock_collection = mock_client["test_db"]["runs"]
+    mock_collection.insert_many(
+        [
+            {
+                "_id": run_id,
+                "run_id": run_id,
+                "started_at": datetime(2024, 1, day),
+                "config": {"models": models},
+                "totals": {"total": 1},
+                "arms": [{"model": models[0]}],
+            }
+            for run_id, day, models in [("run_1", 1, ["gpt-4"]), ("run_2", 2, ["gpt-3.5-turbo"]), ("run_3", 3, ["gpt-4"])]
+        ]
+    )
+
+    monkeypatch.setattr("reporting.data_access.STORAGE_BACKEND", "mongo")
+    monkeypatch.setattr("grammar_checker.config.MONGO_DB", "test_db")
+    monkeypatch.setattr("grammar_checker.config.MONGO_COLLECTION", "test_collection")
+    monkeypatch.setattr("grammar_checker.db.MONGO_RUNS_COLLECTION", "runs")
+    monkeypatch.setattr("grammar_checker.db.get_client", lambda *args, **kwargs: mock_client)
+
+    return mock_collection
+
+
+def test_run_summaries_are_newest_first_without_arms(mock_runs):
+    result = query_run_summaries()
+
+    assert [run["run_id"] for run in result] == ["run_3", "run_2", "run_1"]
+    assert "arms" not in result[0]
+    assert "_id" not in result[0]
+
+
+def test_run_summaries_filter_by_model_and_limit(mock_runs):
+    result = query_run_summaries(limit=1, model="gpt-4")
+
+    assert [run["run_id"] for run in result] == ["run_3"]
+
+
+def test_run_summary_returns_full_document(mock_runs):
+    assert query_run_summary("run_2")["arms"] == [{"model": "gpt-3.5-turbo"}]
+    assert query_run_summary("missing_run") is None
+
+
+def test_lean_records_are_returned_in_full_form(mock_mongo, monkeypatch):
+    record = {
+        "request": {"sentence": "She go home.", "model": "gpt-4"},
+        "response": {"corrected_sentence": "She goes home."},
+        "benchmark_eval": {"test_id": 1, "input": "She go home.", "corrected_sentence": "She goes home.", "run_id": "run_3"},
+    }
+    lean, case = split_record(record)
+    mock_mongo.insert_one(lean)
+    mock_mongo.database["test_cases"].insert_one(case)
+    monkeypatch.setattr("grammar_checker.db.MONGO_TEST_CASES_COLLECTION", "test_cases")
+
+    result = query_benchmark_data(["run_3"])
+
+    assert result == [record]
+
+
+def test_api_usage_newest_first_by_granularity_and_model(monkeypatch):
+    mock_client = mongomock.MongoClient()
+    mock_client["test_db"]["api_usage"].insert_many(
+        [
+            {"granularity": "hour", "period_start": datetime(2024, 1, 1, hour), "model": model, "requests": 1}
+            for hour in range(3)
+            for model in ("gpt-4", "gpt-3.5-turbo")
+        ]
+        + [{"granularity": "day", "period_start": datetime(2024, 1, 1), "model": "gpt-4", "requests": 6}]
+    )
+    monkeypatch.setattr("reporting.data_access.MONGO_DB", "test_db")
+    monkeypatch.setattr("reporting.data_access.MONGO_API_USAGE_COLLECTION", "api_usage")
+    monkeypatch.setattr("reporting.data_access.get_client", lambda *args, **kwargs: mock_client)
+
+    hourly = query_api_usage("hour", limit=3)
+    daily = query_api_usage("day", model="gpt-4")
+
+    assert [(doc["period_start"].hour, doc["model"]) for doc in hourly] == [
+        (2, "gpt-3.5-turbo"),
+        (2, "gpt-4"),
+        (1, "gpt-3.5-turbo"),
+    ]
+    assert [doc["requests"] for doc in daily] == [6]
+
+
+def test_queries_read_from_the_given_backend(tmp_path):
+    storage = SQLiteStorage(tmp_path / "benchmarks.sqlite3")
+    with storage:
+        storage.save_records([{"request": {"model": "gpt-4"}, "benchmark_eval": {"run_id": "run_1"}}])
+        storage.save_run_summary(
+            {"run_id": "run_1", "started_at": datetime(2024, 1, 1), "config": {"models": ["gpt-4"]}}
+        )
+
+    assert query_benchmark_data(["run_1"], storage=storage)[0]["benchmark_eval"] == {"run_id": "run_1"}
+    assert [run["run_id"] for run in query_run_summaries(storage=storage)] == ["run_1"]
+    assert query_run_summary("run_1", storage=storage)["config"] == {"models": ["gpt-4"]}
+
+
+def test_backend_type_comes_from_config(tmp_path, monkeypatch):
+    monkeypatch.setattr("reporting.data_access.STORAGE_BACKEND", "jsonl")
+    monkeypatch.setattr("grammar_checker.config.FILE_STORAGE_DIR", tmp_path)
+
+    assert query_benchmark_data(["run_1"]) == []
+    assert (tmp_path / "records").is_dir()
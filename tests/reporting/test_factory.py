@@ -2,20 +2,21 @@ import pytest
 from unittest.mock import patch, MagicMock
 from reporting.factory import ReportType, ReporterType
 from reporting.csv_reporter import CSVReporter
+from reporting.json_reporter import JSONReporter
 
 
 @pytest.mark.parametrize(
     "report_type,report_fn,return_value",
     [
-        ("sentences", "generate_sentence_report", "sentences_report"),
-        ("mistakes", "generate_mistakes_report", "mistakes_report"),
+        ("sentences", "sentences_report.generate_sentence_report", "sentences_report"),
+        ("mistakes", "mistakes_report.generate_mistakes_report", "mistakes_report"),
     ],
 )
 def test_run_report(report_type, report_fn, return_value):
     test_data = {"test_id": "data"}
     mock_reporter = MagicMock()
 
-    with patch(f"reporting.factory.{report_fn}", return_value=return_value) as mock_report:
+    with patch(f"reporting.{report_fn}", return_value=return_value) as mock_report:
         report = ReportType(report_type)
         result = report.run(test_data, mock_reporter)
 
@@ -39,3 +40,8 @@ def test_build_reporter():
 def test_instantiate_invalid_reporter():
     with pytest.raises(ValueError, match="'invalid_reporter' is not a valid ReporterType"):
         ReporterType("invalid_reporter")
+
+
+def test_build_json_reporter():
+    reporter = ReporterType("json").build()
+    assert isinstance(reporter, JSONReporter)
@@ -0,0 +1,29 @@
+import json
+import logging
+from datetime import datetime
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from reporting.json_reporter import JSONReporter
+
+
+@patch("reporting.base_reporter.dt")
+def test_report_data_is_df(mock_dt, tmp_path):
+    mock_dt.now.return_value = datetime(2024, 1, 1, 12, 30, 45)
+    test_df = pd.DataFrame(data={"col1": [1, 2], "col2": ["a", "b"]})
+
+    reporter = JSONReporter(tmp_path)
+    reporter.report("test_file", test_df)
+
+    expected_file_path = tmp_path / "20240101123045_test_file.json"
+    assert expected_file_path.exists()
+    assert json.loads(expected_file_path.read_text()) == [{"col1": 1, "col2": "a"}, {"col1": 2, "col2": "b"}]
+
+
+def test_report_data_not_df(tmp_path, caplog):
+    reporter = JSONReporter(tmp_path)
+
+    with pytest.raises(TypeError, match="cannot handle data"), caplog.at_level(logging.ERROR):
+        reporter.report("test_file", "not_df")
+
+    assert not any(tmp_path.glob("*.json"))
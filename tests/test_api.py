@@ -1,10 +1,12 @@
+import json
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from contextlib import asynccontextmanager
-from unittest.mock import MagicMock, patch
-from api import app, get_mongo_handler
-from models.response import GrammarResponse
+from unittest.mock import ANY, MagicMock, patch
+from api import app, get_record_writer, get_job_store
+from grammar_checker.jobs import JobStore
+from models.response import GrammarResponse, DocumentResponse
 
 
 # Test Fast API client setup
@@ -32,6 +34,22 @@ def test_health_check():
     assert response.json() == {"status": "ok"}
 
 
+def test_metrics():
+    mock_writer = MagicMock()
+    mock_writer.stats.return_value = {"queued": 2, "written": 2}
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
+
+    with patch("api.pool_stats", return_value={"clients": 1, "checkouts": 3}):
+        response = client.get("/metrics")
+
+    app.dependency_overrides = {}
+    assert response.status_code == 200
+    assert response.json() == {
+        "mongo_pool": {"clients": 1, "checkouts": 3},
+        "record_writer": {"queued": 2, "written": 2},
+    }
+
+
 @patch("api.PromptBuilder")
 @patch("api.OpenAIClient")
 @patch("api.GrammarChecker")
@@ -43,9 +61,9 @@ def test_check_grammar_success(
     mock_checker.check_grammar.return_value = valid_grammar_response
     mock_checker_class.return_value = mock_checker
 
-    # Mock Mongo handler
-    mock_handler = MagicMock()
-    app.dependency_overrides[get_mongo_handler] = lambda: mock_handler
+    # Mock record writer
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
 
     # Act
     response = client.post(
@@ -63,7 +81,9 @@ def test_check_grammar_success(
     mock_prompt_builder_class.assert_called_once_with("default_prompt")
     mock_client_class.assert_called_once()
     mock_checker.check_grammar.assert_called_once()
-    mock_handler.save_record.assert_called_once()
+    mock_writer.save_api_record.assert_called_once_with(
+        request=ANY, response=valid_grammar_response, endpoint="/check-grammar/"
+    )
 
     app.dependency_overrides = {}
 
@@ -82,9 +102,38 @@ def test_check_grammar_validation_error_from_request_mode():
     assert "literal_error" in response.text
 
 
+@pytest.fixture
+def record_writer():
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
+    yield mock_writer
+    app.dependency_overrides = {}
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
+@patch("api.GrammarChecker", side_effect=Exception("Something went wrong"))
+def test_check_grammar_failure(mock_checker, mock_client_class, mock_prompt_builder_class, record_writer):
+    response = client.post("/check-grammar/", json={"sentence": "Hello world"})
+
+    assert response.status_code == 500
+    assert "Something went wrong" in response.text
+    # failed checks are logged for the usage error counts
+    record_writer.save_api_record.assert_called_once_with(
+        request=ANY, error="Something went wrong", endpoint="/check-grammar/"
+    )
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
 @patch("api.GrammarChecker", side_effect=Exception("Something went wrong"))
-def test_check_grammar_failure(mock_checker):
+def test_check_grammar_failure_survives_api_log_errors(
+    mock_checker, mock_client_class, mock_prompt_builder_class, record_writer
+):
+    record_writer.save_api_record.side_effect = RuntimeError("mongo down")
+
     response = client.post("/check-grammar/", json={"sentence": "Hello world"})
+
     assert response.status_code == 500
     assert "Something went wrong" in response.text
 
@@ -100,9 +149,9 @@ def test_check_grammar_response_success(
     mock_checker.check_grammar.return_value = valid_grammar_response
     mock_checker_class.return_value = mock_checker
 
-    # Mock Mongo handler
-    mock_handler = MagicMock()
-    app.dependency_overrides[get_mongo_handler] = lambda: mock_handler
+    # Mock record writer
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
 
     response = client.post(
         "/check-grammar/",
@@ -118,3 +167,171 @@ def test_check_grammar_response_success(
     assert "input" in response.json()
     assert "mistakes" in response.json()
     assert "corrected_sentence" in response.json()
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
+@patch("api.GrammarChecker")
+def test_check_grammar_sets_server_timing_header(
+    mock_checker_class, mock_client_class, mock_prompt_builder_class, valid_grammar_response
+):
+    mock_checker_class.return_value.check_grammar.return_value = valid_grammar_response
+    app.dependency_overrides[get_record_writer] = lambda: MagicMock()
+
+    response = client.post("/check-grammar/", json={"sentence": "This is a test sentence."})
+
+    assert response.status_code == 200
+    assert "model;dur=" in response.headers["server-timing"]
+    assert "enqueue;dur=" in response.headers["server-timing"]
+
+    app.dependency_overrides = {}
+
+
+def test_request_id_header_is_echoed():
+    response = client.get("/health", headers={"X-Request-ID": "client-id-1"})
+    assert response.headers["x-request-id"] == "client-id-1"
+
+
+def test_request_id_header_is_generated():
+    first = client.get("/health").headers["x-request-id"]
+    second = client.get("/health").headers["x-request-id"]
+    assert first and second and first != second
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
+@patch("api.DocumentChecker")
+def test_check_document_success(mock_checker_class, mock_client_class, mock_prompt_builder_class):
+    mock_checker_class.return_value.check_document.return_value = DocumentResponse(
+        input="She go home. Fine.",
+        mistakes=[{"type": "VerbTenseMistake", "original": "go", "corrected": "goes", "start": 4, "end": 6}],
+        corrected_sentence="She goes home. Fine.",
+        segments=[],
+    )
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
+
+    response = client.post("/check-document/", json={"text": "She go home. Fine."})
+
+    assert response.status_code == 200
+    assert response.json()["mistakes"][0]["start"] == 4
+    mock_checker_class.return_value.check_document.assert_called_once_with("She go home. Fine.")
+    mock_writer.save_api_record.assert_called_once()
+
+    app.dependency_overrides = {}
+
+
+def test_check_document_validation_error():
+    response = client.post("/check-document/", json={"text": ""})
+    assert response.status_code == 422
+
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
+@patch("api.GrammarChecker")
+def test_check_grammar_stream_success(
+    mock_checker_class, mock_client_class, mock_prompt_builder_class, valid_grammar_response
+):
+    mock_checker_class.return_value.stream_grammar.return_value = iter(
+        [
+            ("mistake", valid_grammar_response.mistakes[0]),
+            ("corrected_sentence", valid_grammar_response.corrected_sentence),
+            ("response", valid_grammar_response),
+        ]
+    )
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
+
+    response = client.post("/check-grammar/stream", json={"sentence": "This are bad grammar."})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [event for event, _ in events] == ["mistake", "corrected_sentence", "done"]
+    assert events[-1][1] == valid_grammar_response.model_dump()
+    mock_writer.save_api_record.assert_called_once_with(
+        request=ANY, response=valid_grammar_response, endpoint="/check-grammar/stream"
+    )
+
+    app.dependency_overrides = {}
+
+
+@patch("api.PromptBuilder")
+@patch("api.OpenAIClient")
+@patch("api.GrammarChecker")
+def test_check_grammar_stream_error_event(mock_checker_class, mock_client_class, mock_prompt_builder_class):
+    def failing_stream():
+        yield "corrected_sentence", "Partial."
+        raise ValueError("invalid model output")
+
+    mock_checker_class.return_value.stream_grammar.return_value = failing_stream()
+    mock_writer = MagicMock()
+    app.dependency_overrides[get_record_writer] = lambda: mock_writer
+
+    response = client.post("/check-grammar/stream", json={"sentence": "Hello world"})
+
+    events = parse_sse(response.text)
+    assert events[-1] == ("error", {"detail": "invalid model output"})
+    mock_writer.save_api_record.assert_called_once_with(
+        request=ANY, error="invalid model output", endpoint="/check-grammar/stream"
+    )
+
+    app.dependency_overrides = {}
+
+
+@patch("api.PromptBuilder", side_effect=FileNotFoundError("missing template"))
+def test_check_grammar_stream_setup_failure(mock_prompt_builder_class):
+    response = client.post("/check-grammar/stream", json={"sentence": "Hello world"})
+    assert response.status_code == 500
+    assert "missing template" in response.text
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    store.connect()
+    app.dependency_overrides[get_job_store] = lambda: store
+    yield store
+    app.dependency_overrides = {}
+    store.disconnect()
+
+
+def test_create_job_splits_text_and_reports_progress(job_store):
+    response = client.post(
+        "/jobs", json={"sentences": ["First one.", "  "], "text": "Second one. Third one?", "model": "gpt-4"}
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert (body["status"], body["total"]) == ("queued", 3)
+
+    status = client.get(f"/jobs/{body['job_id']}", params={"offset": 1, "limit": 1}).json()
+    assert status["model"] == "gpt-4"
+    assert status["counts"]["pending"] == 3
+    assert [result["sentence"] for result in status["results"]] == ["Second one."]
+
+
+def test_create_job_validation_error(job_store):
+    response = client.post("/jobs", json={"sentences": []})
+    assert response.status_code == 422
+
+
+def test_create_job_rejects_unknown_prompt_template(job_store):
+    response = client.post("/jobs", json={"sentences": ["First one."], "prompt_version": "missing.txt"})
+
+    assert response.status_code == 422
+    assert "missing.txt" in response.json()["detail"]
+    assert job_store.claim_item() is None
+
+
+def test_get_unknown_job(job_store):
+    response = client.get("/jobs/missing")
+    assert response.status_code == 404
@@ -1,12 +1,29 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 import mongomock
 import json
 from types import SimpleNamespace
 from grammar_checker.db import MongoDBHandler
+from grammar_checker.storage import SQLiteStorage, FileStorage
 from models.response import GrammarResponse
-from benchmark import validate_main_inputs, run_tests, summary_results, main
+from models.benchmark_case import BenchmarkCase, benchmark_case_adapter
+from benchmark import validate_main_inputs, run_tests, run_batch_tests, run_shard, finalize_shard, summary_results, main, get_storage
+from benchmark import run_streamed_tests
+from benchmark import run_experiment, format_experiment
+from grammar_checker.factory import BenchmarkMode
+from grammar_checker.batch import OpenAIBatchBackend
 from grammar_checker.config import VALID_MODELS, DEFAULT_PROMPT_TEMPLATE
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.evaluator import Evaluation
+from grammar_checker.shards import ClaimLost
+
+
+def make_case(test_id=1, input="This is a test.", corrected_sentence=None, mistakes=()):
+    return BenchmarkCase(test_id, input, corrected_sentence or input, tuple(mistakes))
+
+
+def make_evaluation(match):
+    return Evaluation(match, match, 0 if match else 1, 1.0 if match else 0.5, 1.0, 1.0)
 
 
 class TestValidateMainInputs:
@@ -150,10 +167,10 @@ def fake_grammar_request(prompt_version, model, sentence):
 def test_run_tests_multiple_combinations(monkeypatch, mock_prompt_builder, mock_client):
     models = ["gpt-3", "gpt-4"]
     templates = ["template1.txt", "template2.txt"]
-    test_cases = [{"test_id": 1, "input": "This is a test."}, {"test_id": 2, "input": "Another one."}]
+    test_cases = [make_case(1, "This is a test."), make_case(2, "Another one.")]
 
-    # monkeypatch evaluate_response() to always return True
-    monkeypatch.setattr("benchmark.evaluate_response", lambda *args, **kwargs: True)
+    # monkeypatch evaluate() to always match
+    monkeypatch.setattr("benchmark.evaluate", lambda *args, **kwargs: make_evaluation(True))
 
     with (
         patch("benchmark.GrammarChecker") as mock_grammar_checker,
@@ -173,11 +190,31 @@ def test_run_tests_multiple_combinations(monkeypatch, mock_prompt_builder, mock_
         for result in results:
             assert result["request"].model in models
             assert result["request"].prompt_version in templates
-            assert result["request"].sentence in [tc["input"] for tc in test_cases]
+            assert result["request"].sentence in [tc.input for tc in test_cases]
             assert result["response"] == test_response_json
             assert isinstance(result["benchmark_eval"]["match"], bool)
 
 
+def test_run_tests_creates_eval_record_per_result(monkeypatch, mock_prompt_builder, mock_client):
+    test_case = make_case(1, "She go home.", "She goes home.")
+    responses = iter([make_evaluation(True), make_evaluation(False)])
+    monkeypatch.setattr("benchmark.evaluate", lambda *args: next(responses))
+
+    with (
+        patch("benchmark.GrammarChecker") as mock_grammar_checker,
+        patch("benchmark.PromptBuilder", return_value=mock_prompt_builder),
+    ):
+        mock_grammar_checker.return_value.prefiltered = False
+        results = run_tests(iter([test_case]), ["gpt-3", "gpt-4"], ["template.txt"], mock_client)
+
+    # each model keeps its own verdict, and the shared test case is left untouched
+    assert [result["benchmark_eval"]["match"] for result in results] == [True, False]
+    assert results[0]["benchmark_eval"] is not results[1]["benchmark_eval"]
+    assert results[0]["benchmark_eval"]["test_id"] == 1
+    assert results[1]["benchmark_eval"]["evaluation"]["similarity"] == 0.5
+    assert test_case == make_case(1, "She go home.", "She goes home.")
+
+
 def test_run_tests_handles_exception(monkeypatch, mock_prompt_builder, mock_client, caplog):
     test_cases = [{"input": "Bad sentence"}]
     monkeypatch.setattr("benchmark.GrammarChecker", MagicMock(side_effect=Exception("error")))
@@ -188,6 +225,30 @@ def test_run_tests_handles_exception(monkeypatch, mock_prompt_builder, mock_clie
         assert "Unexpected error: error" in caplog.text
 
 
+def test_run_experiment_stops_calling_dominated_arms(monkeypatch, mock_prompt_builder, mock_client):
+    test_cases = [make_case(index, f"Sentence {index}.") for index in range(100)]
+    # "good.txt" passes every case, "bad.txt" none
+    monkeypatch.setattr("benchmark.evaluate", lambda test_case, response: make_evaluation(response == "good.txt"))
+
+    with (
+        patch("benchmark.GrammarChecker") as mock_grammar_checker,
+        patch("benchmark.PromptBuilder", side_effect=lambda template: template),
+    ):
+        mock_grammar_checker.side_effect = lambda prompt_builder, *args: MagicMock(
+            check_grammar=MagicMock(return_value=prompt_builder), prefiltered=False
+        )
+        results, experiment = run_experiment(
+            test_cases, ["gpt-4"], ["good.txt", "bad.txt"], mock_client, min_samples=10
+        )
+
+    assert len(results) == 20
+    assert len({result["benchmark_eval"]["run_id"] for result in results}) == 1
+    assert experiment.cases_seen == 10
+    assert [arm.template for arm in experiment.active_arms()] == ["good.txt"]
+    assert experiment.calls_saved(len(test_cases)) == 180
+    assert "stopped after 10" in format_experiment(experiment)
+
+
 # unittest summary_results
 def test_summary_results_multiple_models():
     results = [
@@ -212,48 +273,88 @@ def test_summary_results_multiple_models():
     assert len(summary["v2_test"]) == 2
 
 
+def test_summary_results_counts_prefiltered():
+    results = [
+        {"request": fake_grammar_request("v1", "gpt-4", "A."), "benchmark_eval": {"match": True, "prefiltered": True}},
+        {"request": fake_grammar_request("v1", "gpt-4", "B."), "benchmark_eval": {"match": False, "prefiltered": True}},
+        {"request": fake_grammar_request("v1", "gpt-4", "C."), "benchmark_eval": {"match": False, "prefiltered": False}},
+    ]
+
+    summary = summary_results(results)
+
+    assert summary["v1"]["gpt-4"] == {
+        "total": 3,
+        "passed": 1,
+        "prefiltered": 2,
+        "prefiltered_failed": 1,
+        "latency_ms": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+    }
+
+
+def test_summary_results_adds_latency_and_tokens():
+    results = [
+        {
+            "request": fake_grammar_request("v1", "gpt-4", sentence),
+            "benchmark_eval": {"match": True, "latency_ms": 100.0, "prompt_tokens": 50, "completion_tokens": 10},
+        }
+        for sentence in ("A.", "B.")
+    ]
+
+    counts = summary_results(results)["v1"]["gpt-4"]
+
+    assert (counts["latency_ms"], counts["prompt_tokens"], counts["completion_tokens"]) == (200.0, 100, 20)
+
+
+def test_run_tests_marks_prefiltered_cases(mock_client):
+    test_cases = [make_case(1, "She quickly ran to the store.")]
+
+    results = run_tests(test_cases, ["gpt-4"], [DEFAULT_PROMPT_TEMPLATE], mock_client, prefilter=PreFilter(0.9))
+
+    mock_client.get_model_content.assert_not_called()
+    assert results[0]["benchmark_eval"]["prefiltered"] is True
+    assert results[0]["benchmark_eval"]["match"] is True
+
+
 def test_summary_results_empty():
     assert summary_results([]) == {}
 
 
 # integration test main function
 @pytest.mark.parametrize(
-    "output_destination, expect_db_call, expect_file_call, expected_log_msg",
+    "output_destination, expected_storage, expected_log_msg",  # storage label, or the error for no storage
     [
-        ("save_to_db", True, False, "Saving test results to MongoDB"),
-        ("save_to_file", False, True, "Saving test results to dummy_results.json"),
+        ("save_to_db", MongoDBHandler, "MongoDB"),
+        ("mongo", MongoDBHandler, "MongoDB"),
+        ("sqlite", SQLiteStorage, "SQLite (dummy.sqlite3)"),
+        ("save_to_file", FileStorage, "jsonl files in dummy_storage"),
+        ("parquet", FileStorage, "parquet files in dummy_storage"),
         (
             "invalid_option",
-            False,
-            False,
+            None,
             "Invalid output option. Please refer to the help documentation for valid options.",
         ),
     ],
 )
-def test_main(output_destination, expect_db_call, expect_file_call, expected_log_msg):
+def test_main(output_destination, expected_storage, expected_log_msg):
     test_cases_file = "dummy_cases.json"
     models = ["gpt-3"]
     prompt_templates = ["template"]
-    mock_db_handler = MagicMock()
-    mock_db_handler.__enter__.return_value = mock_db_handler  # return value of context manager
+    mock_db_handler = MagicMock(spec=MongoDBHandler, label="MongoDB")
 
-    dummy_test_cases = [{"input": "This is a test."}]
-    dummy_results = [
-        {
-            "request": {"sentence": "This is a test.", "prompt_version": prompt_templates[0], "model": models[0]},
-            "response": "mock_response",
-            "benchmark_eval": {"match": True, "benchmark_eval": {"input": "This is a test."}},
-        }
-    ]
+    dummy_test_cases = iter([make_case()])
+    dummy_summary = {"template": {"gpt-3": {"total": 1, "passed": 1}}}
 
     with (
         patch("benchmark.validate_main_inputs"),
         patch("benchmark.OpenAIClient") as mock_client,
-        patch("benchmark.load_test_cases", return_value=dummy_test_cases) as mock_load_test_cases,
-        patch("benchmark.run_tests", return_value=dummy_results) as mock_run_tests,
-        patch("benchmark.summary_results") as mock_summary,
-        patch("benchmark.save_test_results") as mock_save_test_results,
-        patch("benchmark.TEST_RESULTS_FILE", "dummy_results.json"),
+        patch("benchmark.validate_test_cases") as mock_validate_test_cases,
+        patch("benchmark.iter_test_cases", return_value=dummy_test_cases) as mock_iter_test_cases,
+        patch("benchmark.run_streamed_tests", return_value=dummy_summary) as mock_run_streamed_tests,
+        patch("benchmark.save_run_summary") as mock_save_run_summary,
+        patch("grammar_checker.config.SQLITE_STORAGE_PATH", "dummy.sqlite3"),
+        patch("grammar_checker.config.FILE_STORAGE_DIR", "dummy_storage"),
         patch("benchmark.logger") as mock_logger,
     ):
         main(
@@ -264,48 +365,70 @@ def test_main(output_destination, expect_db_call, expect_file_call, expected_log
             mock_db_handler,
         )
 
+        # --- Output / Side Effects ---
+        if expected_storage is None:
+            mock_client.assert_not_called()
+            mock_run_streamed_tests.assert_not_called()
+            mock_save_run_summary.assert_not_called()
+            mock_logger.error.assert_any_call(expected_log_msg)
+            return
+
         # --- Control Flow ---
         mock_client.assert_called_once()
-        mock_load_test_cases.assert_called_once_with(test_cases_file)
-        mock_run_tests.assert_called_once_with(
-            dummy_test_cases,
-            models,
-            prompt_templates,
-            mock_client.return_value,
+        mock_validate_test_cases.assert_called_once_with(test_cases_file)
+        mock_iter_test_cases.assert_called_once_with(test_cases_file)
+        storage = mock_run_streamed_tests.call_args.args[4]
+        mock_run_streamed_tests.assert_called_once_with(
+            dummy_test_cases, models, prompt_templates, mock_client.return_value, storage, ANY
         )
-        mock_summary.assert_called_once_with(dummy_results)
+        mock_logger.info.assert_any_call("Saving test results to %s", expected_log_msg)
+        if expected_storage is MongoDBHandler:
+            assert storage is mock_db_handler
+        else:
+            assert isinstance(storage, expected_storage)
+        assert mock_save_run_summary.call_args.args[:3] == (storage, mock_run_streamed_tests.call_args.args[5], dummy_summary)
 
-        # --- Output / Side Effects ---
-        if expect_db_call:
-            mock_db_handler.save_record.assert_called_once()
-            mock_save_test_results.assert_not_called()
-            mock_logger.info.assert_any_call(expected_log_msg)
-        # if expect_file_call:
-        #     mock_save_test_results.assert_called_once()
-        #     mock_db_handler.save_record.assert_not_called()
-        #     mock_logger.info.assert_any_call(expected_log_msg)
-        if not expect_db_call and not expect_file_call:
-            mock_db_handler.save_record.assert_not_called()
-            mock_save_test_results.assert_not_called()
-            mock_logger.error.assert_any_call(expected_log_msg)
 
+def test_run_streamed_tests_saves_results_in_chunks(mock_client):
+    mock_client.get_model_content.return_value = json.dumps(
+        {"input": "This is a test.", "mistakes": [], "corrected_sentence": "This is a test."}
+    )
+    storage = MagicMock()
+    storage.__enter__.return_value = storage
+    saved = []
+    storage.save_results.side_effect = lambda results: saved.append(len(results))
+
+    summary = run_streamed_tests(
+        iter([make_case(test_id) for test_id in range(5)]),
+        ["gpt-4"],
+        [DEFAULT_PROMPT_TEMPLATE],
+        mock_client,
+        storage,
+        "run-1",
+        chunk_size=2,
+    )
 
-@pytest.mark.parametrize(
-    "output_destination, expect_db_call, expect_file_call, expected_log_msg",
-    [
-        ("save_to_db", True, False, "Saving test results to MongoDB"),
-        # ("save_to_file", False, True, "Saving test results to dummy_results.json"),
-        (
-            "invalid_option",
-            False,
-            False,
-            "Invalid output option. Please refer to the help documentation for valid options.",
-        ),
-    ],
-)
-def test_main_integration(
-    output_destination, expect_db_call, expect_file_call, expected_log_msg, tmp_path, mock_mongo_handler
-):
+    assert saved == [2, 2, 1]
+    assert summary[DEFAULT_PROMPT_TEMPLATE]["gpt-4"]["total"] == 5
+    assert summary[DEFAULT_PROMPT_TEMPLATE]["gpt-4"]["passed"] == 5
+
+
+def test_main_rejects_a_bad_case_before_any_model_call(tmp_path, mock_mongo_handler):
+    test_cases_file = tmp_path / "cases.jsonl"
+    test_cases_file.write_text(
+        '{"test_id": 1, "input": "A.", "corrected_sentence": "A.", "mistakes": []}\n'
+        '{"test_id": 1, "input": "B.", "corrected_sentence": "B.", "mistakes": []}\n'
+    )
+
+    with patch("benchmark.OpenAIClient") as MockClientClass, pytest.raises(ValueError, match="Duplicate test_id"):
+        main(str(test_cases_file), ["gpt-4"], "mongo", [DEFAULT_PROMPT_TEMPLATE], mock_mongo_handler)
+
+    MockClientClass.return_value.get_model_content.assert_not_called()
+    assert mock_mongo_handler.collection.count_documents({}) == 0
+
+
+@pytest.mark.parametrize("output_destination", ["save_to_db", "sqlite", "jsonl"])
+def test_main_integration(output_destination, tmp_path, mock_mongo_handler):
     # Setup: write dummy test case file
     test_cases = [
         {
@@ -324,17 +447,17 @@ def test_main_integration(
     with (
         patch("benchmark.OpenAIClient") as MockClientClass,
         patch("benchmark.MongoDBHandler", return_value=mock_mongo_handler),
-        patch("benchmark.logger") as mock_logger,
-        patch("benchmark.TEST_RESULTS_FILE", str(tmp_path / "dummy_results.json")),
+        patch("grammar_checker.config.SQLITE_STORAGE_PATH", tmp_path / "benchmarks.sqlite3"),
+        patch("grammar_checker.config.FILE_STORAGE_DIR", tmp_path / "storage"),
     ):
         # Return a dummy client with mocked .check() if needed
         test_response = {
             "input": "test_input", 
-            "mistakes": [{"type": "test_mistake"}], 
+            "mistakes": [{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}],
             "corrected_sentence": "test_corr"}
         mock_client = MagicMock()
         MockClientClass.return_value = mock_client
-        mock_client.get_model_response.return_value = test_response
+        mock_client.get_model_content.return_value = json.dumps(test_response)
 
         main(
             str(test_cases_file),
@@ -344,19 +467,254 @@ def test_main_integration(
             mock_mongo_handler,
         )
 
-        # Assertions
-        if expect_db_call:
-            assert mock_mongo_handler.collection is not None
-            saved_docs = list(mock_mongo_handler.collection.find({}))
-            assert len(saved_docs) == 1
-            assert saved_docs[0]["request"]["sentence"] == "This is a test."
-            mock_logger.info.assert_any_call(expected_log_msg)
+        # the run reads back the same way from every backend
+        with get_storage(output_destination, mock_mongo_handler) as storage:
+            [run_summary] = storage.query_run_summaries()
+            saved_docs = storage.query_benchmark_data([run_summary["run_id"]])
 
-        # elif expect_file_call:
-        #     result_file = tmp_path / "dummy_results.json"
-        #     assert result_file.exists()
-        #     assert "This is a test." in result_file.read_text()
-        #     mock_logger.info.assert_any_call(expected_log_msg)
+    assert len(saved_docs) == 1
+    assert saved_docs[0]["request"]["sentence"] == "This is a test."
+    assert saved_docs[0]["response"]["corrected_sentence"] == "test_corr"
+    assert run_summary["mode"] == "sync"
+    assert run_summary["config"]["models"] == models
+    assert run_summary["totals"]["total"] == 1
 
-        else:
-            mock_logger.error.assert_any_call(expected_log_msg)
+
+def test_main_rejects_unknown_destination_before_running():
+    with patch("benchmark.run_tests") as mock_run_tests, pytest.raises(ValueError, match="Unknown output_destination"):
+        main("cases.json", ["gpt-4"], "print", [DEFAULT_PROMPT_TEMPLATE], None)
+
+    mock_run_tests.assert_not_called()
+
+
+# test cases for run_batch_tests
+def test_run_batch_tests_evaluates_outputs_under_one_run_id(tmp_path):
+    raw_cases = [
+        {
+            "test_id": 1,
+            "input": "She go home.",
+            "mistakes": [{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}],
+            "corrected_sentence": "She goes home.",
+        },
+        {"test_id": 2, "input": "broken", "mistakes": [], "corrected_sentence": "broken"},
+    ]
+    test_cases = [benchmark_case_adapter.validate_python(raw_case) for raw_case in raw_cases]
+    backend = MagicMock()
+    backend.submit.return_value = "batch-1"
+    backend.status.return_value = "completed"
+
+    def fetch_output(batch_id):
+        lines = [json.loads(line) for line in next(tmp_path.glob("batch_input_*.jsonl")).read_text().splitlines()]
+        content = json.dumps({**raw_cases[0], "test_id": None})
+        body = {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": 20, "completion_tokens": 9, "total_tokens": 29},
+        }
+        return "\n".join(
+            [
+                json.dumps({"custom_id": lines[0]["custom_id"], "response": {"status_code": 200, "body": body}}),
+                json.dumps({"custom_id": lines[1]["custom_id"], "response": None, "error": {"message": "failed"}}),
+            ]
+        )
+
+    backend.fetch_output.side_effect = fetch_output
+
+    results = run_batch_tests(test_cases, ["gpt-4"], [DEFAULT_PROMPT_TEMPLATE], backend, batch_dir=tmp_path)
+
+    backend.submit.assert_called_once()
+    assert len(results) == 1
+    assert results[0]["request"].mode == "benchmark"
+    assert results[0]["benchmark_eval"]["match"] is True
+    assert results[0]["benchmark_eval"]["run_id"]
+    assert results[0]["benchmark_eval"]["mistakes"] == raw_cases[0]["mistakes"]
+    # token usage of the batch line is kept like a traced model call's, for the run summaries
+    assert results[0]["benchmark_eval"]["prompt_tokens"] == 20
+    assert results[0]["benchmark_eval"]["completion_tokens"] == 9
+
+
+def test_run_batch_tests_skips_batch_for_prefiltered_cases(tmp_path):
+    test_cases = [make_case(1, "This is fine.")]
+    backend = MagicMock()
+
+    results = run_batch_tests(
+        test_cases, ["gpt-4"], [DEFAULT_PROMPT_TEMPLATE], backend, prefilter=PreFilter(0.5), batch_dir=tmp_path
+    )
+
+    backend.submit.assert_not_called()
+    assert results[0]["benchmark_eval"]["prefiltered"] is True
+
+
+def test_run_batch_tests_raises_on_failed_batch(tmp_path):
+    test_cases = [make_case(1, "She go home.", "She goes home.")]
+    backend = MagicMock()
+    backend.status.return_value = "expired"
+
+    with pytest.raises(RuntimeError, match="expired"):
+        run_batch_tests(test_cases, ["gpt-4"], [DEFAULT_PROMPT_TEMPLATE], backend, batch_dir=tmp_path)
+
+
+def test_main_batch_mode_uses_batch_backend():
+    mock_db_handler = MagicMock()
+    mock_db_handler.__enter__.return_value = mock_db_handler
+
+    with (
+        patch("benchmark.validate_main_inputs"),
+        patch("benchmark.OpenAIClient") as mock_client,
+        patch("benchmark.load_test_cases", return_value=[]),
+        patch("benchmark.run_tests") as mock_run_tests,
+        patch("benchmark.run_batch_tests", return_value=[]) as mock_run_batch_tests,
+    ):
+        main("cases.json", ["gpt-4"], "save_to_db", ["template"], mock_db_handler, mode=BenchmarkMode.BATCH)
+
+    mock_run_tests.assert_not_called()
+    backend = mock_run_batch_tests.call_args.args[3]
+    assert isinstance(backend, OpenAIBatchBackend)
+    assert backend.client is mock_client.return_value.client
+
+
+# test cases for sharded runs
+def test_run_shard_saves_under_shard_run_id_and_replaces_partial_records(mock_mongo_handler, mock_client):
+    shard = {
+        "_id": "run-1:0",
+        "run_id": "run-1",
+        "model": "gpt-4",
+        "prompt_version": DEFAULT_PROMPT_TEMPLATE,
+        "prefilter_threshold": None,
+        "test_cases": [make_case(1, "She go home.", "She goes home.").to_dict(), make_case(2).to_dict()],
+    }
+    # left behind by an earlier attempt at the same shard that crashed after saving
+    mock_mongo_handler.collection.insert_one(
+        {
+            "request": {"model": "gpt-4", "prompt_version": DEFAULT_PROMPT_TEMPLATE},
+            "benchmark_eval": {"run_id": "run-1", "test_id": 1},
+        }
+    )
+    mock_client.get_model_content.return_value = json.dumps(
+        {"input": "She go home.", "mistakes": [], "corrected_sentence": "She goes home."}
+    )
+
+    summary = run_shard(shard, mock_client, mock_mongo_handler)
+
+    saved = list(mock_mongo_handler.collection.find({"benchmark_eval.run_id": "run-1"}))
+    assert len(saved) == 2
+    assert {record["benchmark_eval"]["test_id"] for record in saved} == {1, 2}
+    assert summary[DEFAULT_PROMPT_TEMPLATE]["gpt-4"]["total"] == 2
+
+
+def test_stale_shard_attempt_does_not_duplicate_records(mock_mongo_handler, mock_client):
+    shard = {
+        "_id": "run-1:0",
+        "run_id": "run-1",
+        "model": "gpt-4",
+        "prompt_version": DEFAULT_PROMPT_TEMPLATE,
+        "prefilter_threshold": None,
+        "test_cases": [make_case(1).to_dict()],
+        "worker": "w1",
+        "attempts": 1,
+    }
+    mock_client.get_model_content.return_value = json.dumps(
+        {"input": "Test sentence.", "mistakes": [], "corrected_sentence": "Test sentence."}
+    )
+    store = MagicMock()
+    store.renew_claim.return_value = True
+
+    # the lease of attempt 1 expires; attempt 2 saves and completes the shard first
+    run_shard({**shard, "worker": "w2", "attempts": 2}, mock_client, mock_mongo_handler, store)
+    finalize_shard({**shard, "worker": "w2", "attempts": 2}, True, mock_mongo_handler)
+    # attempt 1 saves without noticing, then fails to complete
+    run_shard(shard, mock_client, mock_mongo_handler)
+    finalize_shard(shard, False, mock_mongo_handler)
+
+    saved = list(mock_mongo_handler.collection.find({"benchmark_eval.run_id": "run-1"}))
+    assert [record["benchmark_eval"]["shard_attempt"] for record in saved] == [2]
+
+    store.renew_claim.return_value = False
+    with pytest.raises(ClaimLost):
+        run_shard(shard, mock_client, mock_mongo_handler, store)
+    assert mock_mongo_handler.collection.count_documents({}) == 1
+
+
+def test_main_sharded_mode_coordinates_without_running_tests():
+    test_cases = [make_case(1)]
+    with (
+        patch("benchmark.validate_main_inputs"),
+        patch("benchmark.OpenAIClient") as mock_client,
+        patch("benchmark.load_test_cases", return_value=test_cases),
+        patch("benchmark.run_tests") as mock_run_tests,
+        patch("benchmark.run_sharded") as mock_run_sharded,
+    ):
+        main(
+            "cases.json",
+            ["gpt-4"],
+            "save_to_db",
+            ["template"],
+            MagicMock(),
+            mode=BenchmarkMode.SHARDED,
+            shard_size=5,
+            workers=3,
+        )
+
+    mock_client.assert_not_called()
+    mock_run_tests.assert_not_called()
+    mock_run_sharded.assert_called_once_with(test_cases, ["gpt-4"], ["template"], None, shard_size=5, workers=3)
+
+
+def test_main_experiment_mode_saves_experiment_results():
+    mock_db_handler = MagicMock()
+    mock_db_handler.__enter__.return_value = mock_db_handler
+    results = [
+        {"request": fake_grammar_request("t1", "gpt-4", "A."), "response": None, "benchmark_eval": {"match": True}}
+    ]
+    experiment = MagicMock(summary=MagicMock(return_value=[]))
+
+    with (
+        patch("benchmark.validate_main_inputs"),
+        patch("benchmark.OpenAIClient") as mock_client,
+        patch("benchmark.load_test_cases", return_value=[]),
+        patch("benchmark.run_experiment", return_value=(results, experiment)) as mock_run_experiment,
+    ):
+        main(
+            "cases.json",
+            ["gpt-4"],
+            "save_to_db",
+            ["t1"],
+            mock_db_handler,
+            mode=BenchmarkMode.EXPERIMENT,
+            confidence=0.9,
+            min_samples=5,
+        )
+
+    mock_run_experiment.assert_called_once_with(
+        [], ["gpt-4"], ["t1"], mock_client.return_value, None, confidence=0.9, min_samples=5, run_id=ANY
+    )
+    mock_db_handler.save_results.assert_called_once_with(results)
+
+
+def test_main_sharded_mode_requires_db():
+    with patch("benchmark.validate_main_inputs"), pytest.raises(ValueError, match="--save-to mongo"):
+        main("cases.json", ["gpt-4"], "print", ["template"], MagicMock(), mode=BenchmarkMode.SHARDED)
+
+
+def test_run_sharded_creates_run_and_waits_for_workers():
+    store = MagicMock()
+    store.__enter__.return_value = store
+    store.create_run.return_value = "run-1"
+    progress = {"run_id": "run-1", "shards": {"failed": 0}, "summary": {}}
+    process = MagicMock()
+
+    with (
+        patch("benchmark.ShardStore", return_value=store),
+        patch("benchmark.spawn_workers", return_value=[process]) as mock_spawn,
+        patch("benchmark.wait_for_run", return_value=progress) as mock_wait,
+    ):
+        from benchmark import run_sharded
+
+        result = run_sharded([make_case(1)], ["gpt-4"], ["template"], PreFilter(0.5), shard_size=10, workers=2)
+
+    assert result is progress
+    store.create_run.assert_called_once_with(
+        [make_case(1)], ["gpt-4"], ["template"], shard_size=10, prefilter_threshold=0.5
+    )
+    mock_spawn.assert_called_once_with("run-1", 2)
+    mock_wait.assert_called_once_with(store, "run-1", [process])
+    process.wait.assert_called_once()
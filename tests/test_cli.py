@@ -1,18 +1,34 @@
 # tests/test_cli.py
+import sys
+import json
+import subprocess
 from cli import app
 from typer.testing import CliRunner
 from unittest.mock import patch, MagicMock
 import logging
 from pathlib import Path
+from datetime import datetime, UTC
 from grammar_checker.config import MONGO_URI, MONGO_DB, MONGO_COLLECTION
-from grammar_checker.config import TEST_CASES_FILE, DEFAULT_MODEL, DEFAULT_PROMPT_TEMPLATE
+from grammar_checker.config import TEST_CASES_FILE, DEFAULT_MODEL, DEFAULT_PROMPT_TEMPLATE, PROJECT_ROOT
+from grammar_checker.config import PROFILE_SAMPLE_INTERVAL, SHARD_SIZE, EXPERIMENT_CONFIDENCE, EXPERIMENT_MIN_SAMPLES
+from grammar_checker.config import REEVALUATE_BATCH_SIZE, MIGRATE_BATCH_SIZE, EXPORT_DIR, EXPORT_BATCH_SIZE
 from reporting.factory import ReporterType, ReportType
+from mock_llm import LatencyDistribution
+from grammar_checker.prefilter import PreFilter
+from grammar_checker.factory import (
+    BenchmarkMode,
+    BatchBackendType,
+    NormalizationMode,
+    RecordSchema,
+    StorageBackendType,
+    UsageGranularity,
+)
 
 runner = CliRunner()
 
 
 ## Run API Command ##
-@patch("cli.uvicorn.run")
+@patch("uvicorn.run")
 def test_run_api_calls_uvicorn(mock_uvicorn):
     result = runner.invoke(app, ["run-api", "--host", "0.0.0.0", "--port", "8080"])
 
@@ -21,8 +37,8 @@ def test_run_api_calls_uvicorn(mock_uvicorn):
 
 
 ## Interactive Command ##
-@patch("cli.interactive_main")
-@patch("cli.MongoDBHandler")
+@patch("interactive.main")
+@patch("grammar_checker.db.MongoDBHandler")
 def test_interactive_command(mock_db_handler_class, mock_main):
     mock_handler = MagicMock()
     mock_db_handler_class.return_value = mock_handler
@@ -34,8 +50,8 @@ def test_interactive_command(mock_db_handler_class, mock_main):
     mock_main.assert_called_once_with(mongo_handler=mock_handler)
 
 
-@patch("cli.interactive_main")
-@patch("cli.MongoDBHandler")
+@patch("interactive.main")
+@patch("grammar_checker.db.MongoDBHandler")
 def test_interactive_logging(mock_db_handler_class, mock_main, caplog):
     with caplog.at_level(logging.INFO):
         runner.invoke(app, ["interactive"])
@@ -43,8 +59,8 @@ def test_interactive_logging(mock_db_handler_class, mock_main, caplog):
 
 
 ## Benchmark Command ##
-@patch("cli.benchmark_main")
-@patch("cli.MongoDBHandler")
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
 def test_benchmark_default_inputs(mock_db_handler_class, mock_main):
     mock_handler = MagicMock()
     mock_db_handler_class.return_value = mock_handler
@@ -59,12 +75,23 @@ def test_benchmark_default_inputs(mock_db_handler_class, mock_main):
     assert result.exit_code == 0
     mock_db_handler_class.assert_called_once()
     mock_main.assert_called_once_with(
-        TEST_CASES_FILE, [DEFAULT_MODEL], "save_to_db", [DEFAULT_PROMPT_TEMPLATE], mock_handler
+        TEST_CASES_FILE,
+        [DEFAULT_MODEL],
+        StorageBackendType.MONGO,
+        [DEFAULT_PROMPT_TEMPLATE],
+        mock_handler,
+        prefilter=None,
+        mode=BenchmarkMode.SYNC,
+        batch_backend=BatchBackendType.OPENAI,
+        shard_size=SHARD_SIZE,
+        workers=1,
+        confidence=EXPERIMENT_CONFIDENCE,
+        min_samples=EXPERIMENT_MIN_SAMPLES,
     )
 
 
-@patch("cli.benchmark_main")
-@patch("cli.MongoDBHandler")
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
 def test_benchmark_list_inputs(mock_db_handler_class, mock_main):
     mock_handler = MagicMock()
     mock_db_handler_class.return_value = mock_handler
@@ -80,7 +107,7 @@ def test_benchmark_list_inputs(mock_db_handler_class, mock_main):
             "--prompt-version=Prompt V1: {test_sentence}",
             "--prompt-version=Prompt V2: {test_sentence}",
             "--save-to",
-            "print",
+            "sqlite",
         ],
     )
 
@@ -89,14 +116,21 @@ def test_benchmark_list_inputs(mock_db_handler_class, mock_main):
     mock_main.assert_called_once_with(
         Path("my_test_cases.json"),
         ["gpt-4", "gpt-3.5-turbo"],
-        "print",
+        StorageBackendType.SQLITE,
         ["Prompt V1: {test_sentence}", "Prompt V2: {test_sentence}"],
         mock_handler,
+        prefilter=None,
+        mode=BenchmarkMode.SYNC,
+        batch_backend=BatchBackendType.OPENAI,
+        shard_size=SHARD_SIZE,
+        workers=1,
+        confidence=EXPERIMENT_CONFIDENCE,
+        min_samples=EXPERIMENT_MIN_SAMPLES,
     )
 
 
-@patch("cli.benchmark_main")
-@patch("cli.MongoDBHandler")
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
 def test_benchmark_logging(mock_db_handler_class, mock_main, caplog):
     with caplog.at_level(logging.INFO):
         runner.invoke(app, ["benchmark"])
@@ -108,16 +142,254 @@ def test_benchmark_logging(mock_db_handler_class, mock_main, caplog):
         assert DEFAULT_MODEL in caplog.text
 
 
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_benchmark_prefilter(mock_db_handler_class, mock_main):
+    result = runner.invoke(app, ["benchmark", "--prefilter", "--prefilter-threshold", "0.75"])
+
+    assert result.exit_code == 0
+    prefilter = mock_main.call_args.kwargs["prefilter"]
+    assert isinstance(prefilter, PreFilter)
+    assert prefilter.threshold == 0.75
+
+
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_benchmark_batch_mode(mock_db_handler_class, mock_main):
+    result = runner.invoke(app, ["benchmark", "--mode", "batch", "--batch-backend", "local"])
+
+    assert result.exit_code == 0
+    assert mock_main.call_args.kwargs["mode"] == BenchmarkMode.BATCH
+    assert mock_main.call_args.kwargs["batch_backend"] == BatchBackendType.LOCAL
+
+
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_benchmark_sharded_mode(mock_db_handler_class, mock_main):
+    result = runner.invoke(app, ["benchmark", "--mode", "sharded", "--shard-size", "10", "--workers", "4"])
+
+    assert result.exit_code == 0
+    assert mock_main.call_args.kwargs["mode"] == BenchmarkMode.SHARDED
+    assert mock_main.call_args.kwargs["shard_size"] == 10
+    assert mock_main.call_args.kwargs["workers"] == 4
+
+
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_benchmark_experiment_mode(mock_db_handler_class, mock_main):
+    result = runner.invoke(app, ["benchmark", "--mode", "experiment", "--confidence", "0.9", "--min-samples", "20"])
+
+    assert result.exit_code == 0
+    assert mock_main.call_args.kwargs["mode"] == BenchmarkMode.EXPERIMENT
+    assert mock_main.call_args.kwargs["confidence"] == 0.9
+    assert mock_main.call_args.kwargs["min_samples"] == 20
+
+
+@patch("benchmark.run_benchmark_worker", return_value=3)
+def test_benchmark_worker_command(mock_run_worker):
+    result = runner.invoke(app, ["benchmark-worker", "--run-id", "run-1", "--worker-id", "w1"])
+
+    assert result.exit_code == 0
+    mock_run_worker.assert_called_once_with(run_id="run-1", worker_id="w1")
+    assert "Completed 3 shard(s)." in result.output
+
+
+@patch("grammar_checker.profiling.profile_run")
+@patch("benchmark.main")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_benchmark_profile(mock_db_handler_class, mock_main, mock_profile_run):
+    result = runner.invoke(app, ["benchmark", "--profile", "--sample-interval", "0.01"])
+
+    assert result.exit_code == 0
+    mock_profile_run.assert_called_once_with("benchmark", enabled=True, sample_interval=0.01)
+    mock_main.assert_called_once()
+
+
+## Reevaluate Command ##
+@patch("reevaluate.reevaluate_run")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_reevaluate_command(mock_db_handler_class, mock_reevaluate_run):
+    mock_reevaluate_run.return_value = {
+        "run_id": "new-run",
+        "records": 3,
+        "matched_before": 1,
+        "matched_after": 2,
+        "changed": 1,
+    }
+
+    result = runner.invoke(
+        app, ["reevaluate", "run-1", "--mode", "punctuation", "--tolerance", "1", "--new-run", "--workers", "2"]
+    )
+
+    assert result.exit_code == 0
+    mock_reevaluate_run.assert_called_once_with(
+        mock_db_handler_class.return_value,
+        "run-1",
+        mode=NormalizationMode.PUNCTUATION,
+        tolerance=1,
+        new_run=True,
+        workers=2,
+        batch_size=REEVALUATE_BATCH_SIZE,
+    )
+    assert "Run new-run: 3 record(s), 1 -> 2 matched, 1 changed." in result.output
+
+
+## Usage Command ##
+@patch("grammar_checker.usage.rollup_periods", return_value=4)
+@patch("grammar_checker.db.MongoDBHandler")
+def test_usage_rollup(mock_db_handler_class, mock_rollup_periods):
+    mongo_handler = mock_db_handler_class.return_value.__enter__.return_value
+
+    result = runner.invoke(app, ["usage", "rollup", "--since", "2024-05-01T00:00:00"])
+
+    assert result.exit_code == 0
+    mock_rollup_periods.assert_called_once_with(mongo_handler.db, since=datetime(2024, 5, 1, tzinfo=UTC))
+    assert "Rolled up 4 usage period(s)." in result.output
+
+
+@patch("reporting.data_access.query_api_usage")
+def test_usage_show(mock_query_api_usage):
+    mock_query_api_usage.return_value = [
+        {
+            "period_start": datetime(2024, 5, 1, 10),
+            "model": "gpt-4",
+            "requests": 10,
+            "errors": 1,
+            "latency_ms": {"p50": 120.0, "p95": 300.0, "p99": 310.0},
+            "prompt_tokens": {"sum": 100},
+            "completion_tokens": {"sum": 50},
+        }
+    ]
+
+    result = runner.invoke(app, ["usage", "show", "--granularity", "day", "--model", "gpt-4"])
+
+    assert result.exit_code == 0
+    mock_query_api_usage.assert_called_once_with(UsageGranularity.DAY.value, model="gpt-4", limit=24)
+    assert "2024-05-01 10:00  gpt-4" in result.output
+
+
+@patch("reporting.data_access.query_api_usage", return_value=[])
+def test_usage_show_empty(mock_query_api_usage):
+    result = runner.invoke(app, ["usage", "show"])
+
+    assert result.exit_code == 0
+    assert "No usage rollups found." in result.output
+
+
+## Replay Spill Command ##
+@patch("grammar_checker.persistence.RecordWriter")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_replay_spill(mock_db_handler_class, mock_writer_class):
+    mock_writer_class.return_value.replay.return_value = 3
+
+    result = runner.invoke(app, ["replay-spill"])
+
+    assert result.exit_code == 0
+    mock_writer_class.assert_called_once_with(mock_db_handler_class.return_value.__enter__.return_value)
+    mock_writer_class.return_value.replay.assert_called_once_with(include_claimed=True)
+    assert "Replayed 3 spilled record(s)." in result.output
+
+
+## Migrate Records Command ##
+@patch("migrate_records.migrate_records")
+@patch("grammar_checker.db.MongoDBHandler")
+def test_migrate_records_command(mock_db_handler_class, mock_migrate_records):
+    mock_migrate_records.return_value = {"records": 4, "bytes_before": 1000, "bytes_after": 600}
+
+    result = runner.invoke(app, ["migrate-records", "--to", "lean", "--run-id", "run-1", "--dry-run"])
+
+    assert result.exit_code == 0
+    mock_migrate_records.assert_called_once_with(
+        mock_db_handler_class.return_value,
+        RecordSchema.LEAN,
+        run_ids=["run-1"],
+        batch_size=MIGRATE_BATCH_SIZE,
+        dry_run=True,
+    )
+    assert "Would migrate 4 record(s) to the lean schema: 1000 -> 600 bytes (+400 saved)." in result.output
+
+
+## Runs Command ##
+RUN = {
+    "run_id": "run-1",
+    "mode": "batch",
+    "started_at": datetime(2024, 1, 1, 12, 0),
+    "duration_s": 12.0,
+    "config": {"models": ["gpt-4"], "prompt_templates": ["t1.txt"]},
+    "totals": {"total": 2, "passed": 1, "pass_rate": 0.5, "prompt_tokens": 10, "completion_tokens": 4},
+    "arms": [],
+}
+
+
+@patch("reporting.data_access.query_run_summaries")
+def test_runs_list(mock_query_run_summaries):
+    mock_query_run_summaries.return_value = [RUN]
+
+    result = runner.invoke(app, ["runs", "list", "--limit", "5", "--model", "gpt-4"])
+
+    assert result.exit_code == 0
+    mock_query_run_summaries.assert_called_once_with(limit=5, model="gpt-4", storage=StorageBackendType.MONGO)
+    assert "run-1" in result.output
+
+
+@patch("reporting.data_access.query_run_summaries", return_value=[])
+def test_runs_list_empty(mock_query_run_summaries):
+    result = runner.invoke(app, ["runs", "list"])
+
+    assert result.exit_code == 0
+    assert "No runs found." in result.output
+
+
+@patch("reporting.data_access.query_run_summary")
+def test_runs_show(mock_query_run_summary):
+    mock_query_run_summary.return_value = RUN
+
+    result = runner.invoke(app, ["runs", "show", "run-1"])
+    json_result = runner.invoke(app, ["runs", "show", "run-1", "--json", "--storage", "jsonl"])
+
+    assert result.exit_code == 0
+    assert "1/2 passed (0.500)" in result.output
+    assert json.loads(json_result.output)["totals"]["total"] == 2
+    mock_query_run_summary.assert_called_with("run-1", storage=StorageBackendType.JSONL)
+
+
+@patch("reporting.data_access.query_run_summary", return_value=None)
+def test_runs_show_missing_run(mock_query_run_summary):
+    result = runner.invoke(app, ["runs", "show", "missing"])
+
+    assert result.exit_code == 1
+
+
 ## Report Command ##
-@patch("cli.run_reports")
+@patch("reporting.report_runner.run_reports")
 def test_report_valid_single_input(mock_run_reports):
     result = runner.invoke(app, ["report", "test_uuid", "--reports", "sentences", "--reporter", "csv"])
 
     assert result.exit_code == 0
-    mock_run_reports.assert_called_once_with(["test_uuid"], [ReportType.SENTENCES], ReporterType.CSV)
+    mock_run_reports.assert_called_once_with(
+        ["test_uuid"], [ReportType.SENTENCES], ReporterType.CSV, storage=StorageBackendType.MONGO
+    )
 
 
-@patch("cli.run_reports")
+@patch("reporting.report_runner.run_reports")
+def test_report_from_sqlite(mock_run_reports):
+    result = runner.invoke(app, ["report", "test_uuid", "--storage", "sqlite"])
+
+    assert result.exit_code == 0
+    assert mock_run_reports.call_args.kwargs == {"storage": StorageBackendType.SQLITE}
+
+
+@patch("grammar_checker.profiling.profile_run")
+@patch("reporting.report_runner.run_reports")
+def test_report_profile(mock_run_reports, mock_profile_run):
+    result = runner.invoke(app, ["report", "test_uuid", "--profile"])
+
+    assert result.exit_code == 0
+    mock_profile_run.assert_called_once_with("report", enabled=True, sample_interval=PROFILE_SAMPLE_INTERVAL)
+    mock_run_reports.assert_called_once()
+
+
+@patch("reporting.report_runner.run_reports")
 def test_report_list_inputs(mock_run_reports):
     result = runner.invoke(
         app, ["report", "uuid-1", "uuid-2", "--reports", "sentences", "--reports", "mistakes", "--reporter", "csv"]
@@ -125,11 +397,14 @@ def test_report_list_inputs(mock_run_reports):
 
     assert result.exit_code == 0
     mock_run_reports.assert_called_once_with(
-        ["uuid-1", "uuid-2"], [ReportType.SENTENCES, ReportType.MISTAKES], ReporterType.CSV
+        ["uuid-1", "uuid-2"],
+        [ReportType.SENTENCES, ReportType.MISTAKES],
+        ReporterType.CSV,
+        storage=StorageBackendType.MONGO,
     )
 
 
-@patch("cli.run_reports")
+@patch("reporting.report_runner.run_reports")
 def test_report_debug_logging(mock_run_reports, caplog):
     with caplog.at_level(logging.DEBUG):
         runner.invoke(app, ["report", "uuid-1234", "--reports", "sentences", "--reporter", "csv"])
@@ -145,7 +420,45 @@ def test_report_missing_run_ids():
     assert "RUN_IDS" in result.output
 
 
-@patch("cli.run_reports")
+@patch("reporting.report_runner.run_reports")
+def test_report_from_run_file(mock_run_reports, tmp_path):
+    run_file = tmp_path / "runs.arrow"
+    run_file.touch()
+
+    result = runner.invoke(app, ["report", "--input", str(run_file), "--reports", "sentences"])
+
+    assert result.exit_code == 0
+    mock_run_reports.assert_called_once_with([], [ReportType.SENTENCES], ReporterType.CSV, input_file=run_file)
+
+
+@patch("reporting.columnar.export_runs", return_value=3)
+def test_export(mock_export_runs, tmp_path):
+    result = runner.invoke(app, ["export", "uuid-1", "uuid-2", "--output", str(tmp_path / "runs.parquet")])
+
+    assert result.exit_code == 0
+    mock_export_runs.assert_called_once_with(
+        ["uuid-1", "uuid-2"], tmp_path / "runs.parquet", storage=StorageBackendType.MONGO, batch_size=EXPORT_BATCH_SIZE
+    )
+    assert "Exported 3 record(s)" in result.output
+
+
+@patch("reporting.columnar.export_runs")
+def test_export_rejects_unknown_file_type(mock_export_runs):
+    result = runner.invoke(app, ["export", "uuid-1", "--output", "runs.csv"])
+
+    assert result.exit_code == 2
+    mock_export_runs.assert_not_called()
+
+
+@patch("reporting.columnar.export_runs", return_value=0)
+def test_export_without_records(mock_export_runs):
+    result = runner.invoke(app, ["export", "uuid-1"])
+
+    assert result.exit_code == 1
+    assert mock_export_runs.call_args.args[1] == EXPORT_DIR / "uuid-1.arrow"
+
+
+@patch("reporting.report_runner.run_reports")
 def test_report_default_reports_used(mock_run_reports):
     result = runner.invoke(app, ["report", "uuid-1234", "--reporter", "csv"])
     assert result.exit_code == 0
@@ -155,3 +468,110 @@ def test_report_default_reports_used(mock_run_reports):
     assert isinstance(reports, list)
     assert len(reports) == len(ReportType.__members__)
     assert all([isinstance(report, ReportType) for report in reports])
+
+
+## Mock LLM Command ##
+@patch("uvicorn.run")
+@patch("mock_llm.create_app")
+def test_mock_llm_passes_settings(mock_create_app, mock_uvicorn):
+    result = runner.invoke(
+        app, ["mock-llm", "--port", "9000", "--latency", "normal", "--latency-ms", "50", "--error-rate", "0.1"]
+    )
+
+    assert result.exit_code == 0
+    settings = mock_create_app.call_args[0][0]
+    assert settings.latency == LatencyDistribution.NORMAL
+    assert settings.latency_ms == 50
+    assert settings.error_rate == 0.1
+    mock_uvicorn.assert_called_once_with(mock_create_app.return_value, host="127.0.0.1", port=9000)
+
+
+def test_mock_llm_rejects_invalid_error_rate():
+    result = runner.invoke(app, ["mock-llm", "--error-rate", "1.5"])
+    assert result.exit_code == 2
+
+
+## Load Test Command ##
+@patch("loadtest.main")
+def test_loadtest_command(mock_main):
+    result = runner.invoke(
+        app, ["loadtest", "--url", "http://api:8000", "--requests", "50", "--concurrency", "5", "--reporter", "csv"]
+    )
+
+    assert result.exit_code == 0
+    args = mock_main.call_args[0]
+    assert args[:5] == ("http://api:8000", [TEST_CASES_FILE], 50, 5, 0.0)
+    assert args[5:7] == ([DEFAULT_MODEL], DEFAULT_PROMPT_TEMPLATE)
+    assert args[7].extension == "csv"
+
+
+## Microbenchmark Command ##
+@patch("microbench.main", return_value=True)
+def test_microbench_command(mock_main):
+    result = runner.invoke(app, ["microbench", "--benchmark", "utils.transform_results", "--scale", "100k", "--compare"])
+
+    assert result.exit_code == 0
+    args = mock_main.call_args[0]
+    assert args[:3] == (["utils.transform_results"], ["100k"], 3)
+    assert args[4:] == (False, True, 0.1)
+
+
+@patch("microbench.main", return_value=False)
+def test_microbench_command_exits_on_regression(mock_main):
+    result = runner.invoke(app, ["microbench", "--compare"])
+    assert result.exit_code == 1
+
+
+## Check Document Command ##
+@patch("grammar_checker.openai_client.OpenAIClient")
+@patch("grammar_checker.prompt_builder.PromptBuilder")
+@patch("grammar_checker.document.DocumentChecker")
+def test_check_document_streams_paragraphs(mock_checker_class, mock_prompt_builder, mock_client, tmp_path):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("First paragraph.\n\nSecond paragraph.\n")
+    mock_checker = mock_checker_class.return_value
+    mock_checker.check_document.return_value.model_dump_json.return_value = '{"ok": true}'
+
+    result = runner.invoke(app, ["check-document", str(file_path), "--model", "gpt-4"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['{"ok": true}', '{"ok": true}']
+    assert mock_checker.check_document.call_args_list[1].kwargs == {"offset": 18}
+    mock_checker_class.assert_called_once_with(mock_prompt_builder.return_value, "gpt-4", mock_client.return_value)
+
+
+def test_check_document_missing_file():
+    result = runner.invoke(app, ["check-document", "does_not_exist.txt"])
+    assert result.exit_code == 2
+
+
+## Startup Time ##
+# heavy dependencies that only the commands using them may import
+HEAVY_MODULES = ["pandas", "pymongo", "openai", "fastapi", "uvicorn", "httpx"]
+CLI_IMPORT_BUDGET_S = 0.75  # about 0.15s locally; importing everything eagerly took over 1s
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in seconds per module, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def test_cli_import_skips_heavy_dependencies():
+    times = import_times("cli")
+
+    assert [module for module in HEAVY_MODULES if module in times] == []
+    assert times["cli"] < CLI_IMPORT_BUDGET_S
@@ -0,0 +1,137 @@
+import json
+import asyncio
+import httpx
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from loadtest import load_corpus, parse_server_timing, run_load_test, summarize, summarize_writer, main
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    file_path = tmp_path / "cases.json"
+    test_cases = [{"input": sentence, "corrected_sentence": sentence} for sentence in ["One.", "Two."]]
+    file_path.write_text(json.dumps(test_cases))
+    return file_path
+
+
+def make_transport(fail_every: int = 0):
+    calls = []
+    # GET /metrics before and after the requests
+    writer_stats = [
+        {"written": 10, "insert_batches": 2, "insert_ms_total": 8.0, "pending": 0},
+        {"written": 15, "insert_batches": 4, "insert_ms_total": 20.0, "p95_insert_ms": 9.0, "pending": 0},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/metrics":
+            return httpx.Response(200, json={"record_writer": writer_stats[min(len(calls), 1)]})
+        calls.append(json.loads(request.content))
+        if fail_every and len(calls) % fail_every == 0:
+            return httpx.Response(500, json={"detail": "boom"})
+        return httpx.Response(200, json={}, headers={"Server-Timing": "model;dur=20.0, enqueue;dur=2.5"})
+
+    return httpx.MockTransport(handler), calls
+
+
+def test_load_corpus(corpus_file):
+    assert load_corpus([corpus_file, corpus_file]) == ["One.", "Two.", "One.", "Two."]
+
+
+def test_load_corpus_empty(tmp_path):
+    file_path = tmp_path / "empty.json"
+    file_path.write_text("[]")
+    with pytest.raises(ValueError, match="corpus is empty"):
+        load_corpus([file_path])
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("model;dur=12.3, db;dur=1.2", {"model": 12.3, "db": 1.2}),
+        ("db;desc=mongo;dur=4", {"db": 4.0}),
+        ("model;dur=abc, cache", {}),
+        ("", {}),
+    ],
+)
+def test_parse_server_timing(header, expected):
+    assert parse_server_timing(header) == expected
+
+
+def test_run_load_test_records_results():
+    transport, calls = make_transport(fail_every=2)
+    payloads = [{"sentence": f"S{i}.", "model": "gpt-4"} for i in range(4)]
+
+    async def _run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await run_load_test(client, payloads, concurrency=2)
+
+    results = asyncio.run(_run())
+
+    assert len(results) == len(calls) == 4
+    assert [r["status_code"] for r in results].count(500) == 2
+    assert all(r["latency_ms"] >= 0 for r in results)
+    assert {r["enqueue_ms"] for r in results if r["error"] is None} == {2.5}
+
+
+def test_run_load_test_handles_transport_errors():
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            return await run_load_test(client, [{"sentence": "S.", "model": "gpt-4"}], concurrency=1)
+
+    results = asyncio.run(_run())
+    assert results[0]["error"] == "ConnectError"
+    assert results[0]["status_code"] is None
+
+
+def test_summarize():
+    results = [
+        {"status_code": 200, "error": None, "latency_ms": 10.0, "model_ms": 8.0, "enqueue_ms": 1.0},
+        {"status_code": 200, "error": None, "latency_ms": 30.0, "model_ms": 25.0, "enqueue_ms": 3.0},
+        {"status_code": 500, "error": "HTTP 500", "latency_ms": 5.0, "model_ms": None, "enqueue_ms": None},
+    ]
+
+    summary = summarize(results, duration_s=2.0, writer_stats={"mongo_insert_ms_mean": 4.0}).iloc[0]
+
+    assert summary["requests"] == 3
+    assert summary["errors"] == 1
+    assert summary["throughput_rps"] == 1.0
+    assert summary["latency_ms_max"] == 30.0
+    assert summary["enqueue_ms_p50"] == 2.0
+    assert summary["mongo_insert_ms_mean"] == 4.0
+    assert summary["status_200"] == 2
+    assert summary["status_500"] == 1
+
+
+def test_main_reports_details_and_summary(monkeypatch, corpus_file):
+    transport, calls = make_transport()
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "loadtest.httpx.AsyncClient", lambda **kwargs: original_client(transport=transport, base_url=kwargs["base_url"])
+    )
+    reporter = MagicMock()
+
+    summary = main("http://test", [corpus_file], 5, 2, 0.0, ["gpt-4", "gpt-4.1"], "v1_original.txt", reporter)
+
+    assert summary.iloc[0]["requests"] == 5
+    assert summary.iloc[0]["mongo_records_written"] == 5
+    assert summary.iloc[0]["mongo_insert_ms_mean"] == 6.0
+    assert summary.iloc[0]["mongo_insert_ms_p95"] == 9.0
+    assert [c["model"] for c in calls[:2]] == ["gpt-4", "gpt-4.1"]
+    file_names = [call.args[0] for call in reporter.report.call_args_list]
+    assert file_names[0].startswith("loadtest_details_")
+    assert file_names[1].startswith("loadtest_summary_")
+    assert isinstance(reporter.report.call_args_list[1].args[1], pd.DataFrame)
+
+
+def test_summarize_writer_without_metrics():
+    assert summarize_writer({}, {}) == {}
+    assert summarize_writer({}, {"written": 0, "insert_batches": 0})["mongo_insert_ms_mean"] is None
+
+
+def test_main_rejects_invalid_arguments(corpus_file):
+    with pytest.raises(ValueError):
+        main("http://test", [corpus_file], 0, 1, 0.0, ["gpt-4"], "v1_original.txt", MagicMock())
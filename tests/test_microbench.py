@@ -0,0 +1,63 @@
+import pytest
+from microbench import (
+    BENCHMARKS,
+    parse_scale,
+    make_documents,
+    run_benchmarks,
+    compare_results,
+    save_baseline,
+    load_baseline,
+    main,
+)
+
+
+@pytest.mark.parametrize("value, expected", [("1k", 1_000), ("100k", 100_000), ("1M", 1_000_000), ("25", 25)])
+def test_parse_scale(value, expected):
+    assert parse_scale(value) == expected
+
+
+@pytest.mark.parametrize("value", ["huge", "0", "-5"])
+def test_parse_scale_invalid(value):
+    with pytest.raises(ValueError, match="Invalid scale"):
+        parse_scale(value)
+
+
+def test_make_documents_is_deterministic():
+    docs = make_documents(20, seed=3)
+    assert docs == make_documents(20, seed=3)
+    assert {doc["benchmark_eval"]["run_id"] for doc in docs} == {"run_0", "run_1"}
+
+
+def test_run_all_benchmarks_small_scale():
+    results = run_benchmarks(list(BENCHMARKS), ["10"], repeat=1)
+
+    assert set(results) == {f"{name}[10]" for name in BENCHMARKS}
+    assert all(result["median_s"] >= 0 for result in results.values())
+
+
+def test_run_benchmarks_unknown_name():
+    with pytest.raises(ValueError, match="Unknown benchmark"):
+        run_benchmarks(["nope"], ["10"], repeat=1)
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"a[1k]": {"median_s": 1.0}, "b[1k]": {"median_s": 1.0}}
+    results = {"a[1k]": {"median_s": 1.05}, "b[1k]": {"median_s": 1.5}, "c[1k]": {"median_s": 9.0}}
+
+    comparison = compare_results(results, baseline, threshold=0.1).set_index("benchmark")
+
+    assert not comparison.loc["a[1k]", "regression"]
+    assert comparison.loc["b[1k]", "regression"]
+    assert not comparison.loc["c[1k]", "regression"]  # not in baseline
+
+
+def test_main_save_and_compare(tmp_path, monkeypatch):
+    baseline_file = tmp_path / "baseline.json"
+    name = "utils.transform_results"
+
+    assert main([name], ["10"], 1, baseline_file, save=True)
+    assert set(load_baseline(baseline_file)) == {f"{name}[10]"}
+
+    # a baseline that is much faster than reality must be flagged
+    save_baseline(baseline_file, {f"{name}[10]": {"median_s": 1e-12}})
+    assert not main([name], ["10"], 1, baseline_file, compare=True)
@@ -0,0 +1,96 @@
+import mongomock
+import pytest
+from unittest.mock import MagicMock
+from pymongo import ReplaceOne
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.factory import RecordSchema
+from grammar_checker.records import is_lean
+from migrate_records import migrate_records
+
+
+def make_record(test_id, run_id="run-1", model="gpt-4"):
+    return {
+        "request": {"sentence": f"Sentence {test_id}.", "model": model, "prompt_version": "v1.txt"},
+        "response": {"input": f"Sentence {test_id}.", "mistakes": [], "corrected_sentence": f"Sentence {test_id}."},
+        "benchmark_eval": {
+            "test_id": test_id,
+            "input": f"Sentence {test_id}.",
+            "corrected_sentence": f"Sentence {test_id}.",
+            "mistakes": [],
+            "match": True,
+            "run_id": run_id,
+        },
+    }
+
+
+def shim_bulk_write(collection):
+    # mongomock's bulk_write does not accept the operations of current pymongo versions
+    def bulk_write(operations, ordered=True):
+        for operation in operations:
+            if isinstance(operation, ReplaceOne):
+                collection.replace_one(operation._filter, operation._doc)
+            else:
+                collection.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+
+    collection.bulk_write = bulk_write
+
+
+@pytest.fixture
+def mongo_handler():
+    database = mongomock.MongoClient()["test_db"]
+    handler = MongoDBHandler(uri="mock_uri", database_name="test_db", collection_name="records")
+    handler.collection = database["records"]
+    handler.test_cases = database["test_cases"]
+    shim_bulk_write(handler.collection)
+    shim_bulk_write(handler.test_cases)
+    handler.connect = MagicMock()
+    handler.disconnect = MagicMock()
+    handler.collection.insert_many(
+        [make_record(test_id, model=model) for test_id in range(3) for model in ("gpt-4", "gpt-3.5-turbo")]
+        + [make_record(0, run_id="other-run"), {"request": {"sentence": "Hi."}, "response": {}}]
+    )
+    return handler
+
+
+def test_migrate_to_lean_and_back(mongo_handler):
+    originals = {record["_id"]: record for record in mongo_handler.collection.find()}
+
+    to_lean = migrate_records(mongo_handler, RecordSchema.LEAN, batch_size=4)
+
+    assert to_lean["records"] == 7
+    assert to_lean["bytes_after"] < to_lean["bytes_before"]
+    assert mongo_handler.test_cases.count_documents({}) == 3
+    assert mongo_handler.collection.count_documents({"schema": "lean"}) == 7
+
+    to_full = migrate_records(mongo_handler, "full", batch_size=4)
+
+    assert to_full["records"] == 7
+    assert {record["_id"]: record for record in mongo_handler.collection.find()} == originals
+
+
+def test_migration_is_resumable_and_filters_runs(mongo_handler):
+    migrate_records(mongo_handler, RecordSchema.LEAN, run_ids=["other-run"])
+
+    summary = migrate_records(mongo_handler, RecordSchema.LEAN, run_ids=["other-run", "run-1"])
+
+    assert summary["records"] == 6
+    assert all(is_lean(record) for record in mongo_handler.collection.find({"benchmark_eval": {"$exists": True}}))
+
+
+def test_dry_run_changes_nothing(mongo_handler):
+    summary = migrate_records(mongo_handler, RecordSchema.LEAN, dry_run=True)
+
+    assert summary["records"] == 7
+    assert summary["dry_run"] is True
+    assert mongo_handler.collection.count_documents({"schema": "lean"}) == 0
+    assert mongo_handler.test_cases.count_documents({}) == 0
+
+
+def test_records_with_missing_test_case_stay_lean(mongo_handler):
+    migrate_records(mongo_handler, RecordSchema.LEAN)
+    mongo_handler.test_cases.delete_many({"test_id": 0})
+
+    summary = migrate_records(mongo_handler, RecordSchema.FULL)
+
+    assert summary["records"] == 4
+    assert mongo_handler.collection.count_documents({"schema": "lean"}) == 3
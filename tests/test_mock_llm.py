@@ -0,0 +1,165 @@
+import json
+import random
+import pytest
+from openai import OpenAI
+from fastapi.testclient import TestClient
+from mock_llm import (
+    create_app,
+    extract_sentence,
+    build_grammar_response,
+    load_canned_responses,
+    LatencyDistribution,
+    MockLLMSettings,
+    RateLimiter,
+)
+from grammar_checker.openai_client import OpenAIClient
+from grammar_checker.tracing import request_context
+from grammar_checker.prompt_builder import PromptBuilder
+from grammar_checker.config import PROMPTS_DIR
+
+
+@pytest.fixture
+def test_cases_file(tmp_path):
+    test_cases = [
+        {
+            "test_id": 1,
+            "input": "She go to school every day.",
+            "mistakes": [{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}],
+            "corrected_sentence": "She goes to school every day.",
+        }
+    ]
+    file_path = tmp_path / "cases.json"
+    file_path.write_text(json.dumps(test_cases))
+    return file_path
+
+
+def post_prompt(client, sentence):
+    return client.post(
+        "/v1/chat/completions",
+        json={"model": "gpt-4", "messages": [{"role": "user", "content": f"Sentence: Check it.\nSentence: {sentence}"}]},
+    )
+
+
+def test_extract_sentence_uses_last_marker():
+    assert extract_sentence("Sentence: Prompt text\n\nSentence: Hello world.") == "Hello world."
+    assert extract_sentence("  no marker  ") == "no marker"
+
+
+@pytest.mark.parametrize("template", sorted(path.name for path in PROMPTS_DIR.glob("*.txt")))
+def test_extract_sentence_from_every_prompt(template):
+    prompt = PromptBuilder(template).build_prompt("She go home.")
+
+    assert extract_sentence(prompt) == "She go home."
+
+
+def test_build_grammar_response_echoes_unknown_sentence(test_cases_file):
+    canned = load_canned_responses([test_cases_file])
+
+    assert build_grammar_response("She go to school every day.", canned)["corrected_sentence"] == (
+        "She goes to school every day."
+    )
+    assert build_grammar_response("Unknown.", canned) == {
+        "input": "Unknown.",
+        "mistakes": [],
+        "corrected_sentence": "Unknown.",
+    }
+
+
+def test_chat_completion_returns_canned_response(test_cases_file):
+    client = TestClient(create_app(MockLLMSettings(test_cases_files=[test_cases_file])))
+
+    response = post_prompt(client, "She go to school every day.")
+
+    assert response.status_code == 200
+    body = response.json()
+    content = json.loads(body["choices"][0]["message"]["content"])
+    assert content["mistakes"] == [{"type": "VerbTenseMistake", "original": "go", "corrected": "goes"}]
+    assert body["usage"]["total_tokens"] == body["usage"]["prompt_tokens"] + body["usage"]["completion_tokens"]
+
+
+@pytest.mark.parametrize(
+    "settings, expected_status",
+    [
+        ({"error_rate": 1.0}, 500),
+        ({"rate_limit_rate": 1.0}, 429),
+    ],
+    ids=["server_error", "rate_limit"],
+)
+def test_error_injection(test_cases_file, settings, expected_status):
+    client = TestClient(create_app(MockLLMSettings(test_cases_files=[test_cases_file], **settings)))
+
+    response = post_prompt(client, "Hello world.")
+
+    assert response.status_code == expected_status
+    assert "error" in response.json()
+
+
+def test_error_injection_is_deterministic(test_cases_file):
+    def status_codes():
+        client = TestClient(create_app(MockLLMSettings(test_cases_files=[test_cases_file], error_rate=0.5, seed=7)))
+        return [post_prompt(client, "Hello world.").status_code for _ in range(20)]
+
+    codes = status_codes()
+    assert codes == status_codes()
+    assert {200, 500} == set(codes)
+
+
+def test_rate_limiter_refills_over_time():
+    now = [0.0]
+    limiter = RateLimiter(max_rps=2, clock=lambda: now[0])
+
+    assert limiter.acquire() and limiter.acquire()
+    assert not limiter.acquire()
+
+    now[0] = 0.5
+    assert limiter.acquire()
+    assert not limiter.acquire()
+
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(max_rps=0)
+    assert all(limiter.acquire() for _ in range(100))
+
+
+@pytest.mark.parametrize("distribution", list(LatencyDistribution))
+def test_latency_distribution_is_non_negative(distribution):
+    rng = random.Random(0)
+    samples = [distribution.sample(rng, 10.0, 50.0) for _ in range(100)]
+    assert all(sample >= 0 for sample in samples)
+
+
+def test_openai_client_against_mock_server(monkeypatch, test_cases_file):
+    # TestClient is an httpx.Client, so the real SDK can talk to the app in-process
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    app = create_app(MockLLMSettings(test_cases_files=[test_cases_file]))
+    client = OpenAIClient(base_url="http://testserver/v1")
+    client.client = OpenAI(api_key="test-key", base_url="http://testserver/v1", http_client=TestClient(app))
+
+    result = client.get_model_response("gpt-4", "Sentence: She go to school every day.")
+
+    assert result["corrected_sentence"] == "She goes to school every day."
+
+
+def test_openai_client_streams_from_mock_server(monkeypatch, test_cases_file):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    app = create_app(MockLLMSettings(test_cases_files=[test_cases_file]))
+    client = OpenAIClient(base_url="http://testserver/v1")
+    client.client = OpenAI(api_key="test-key", base_url="http://testserver/v1", http_client=TestClient(app))
+
+    chunks = list(client.stream_model_response("gpt-4", "Sentence: She go to school every day."))
+
+    assert len(chunks) > 1
+    assert json.loads("".join(chunks))["corrected_sentence"] == "She goes to school every day."
+
+
+def test_mock_server_streams_usage_when_requested(monkeypatch, test_cases_file):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    app = create_app(MockLLMSettings(test_cases_files=[test_cases_file]))
+    client = OpenAIClient(base_url="http://testserver/v1")
+    client.client = OpenAI(api_key="test-key", base_url="http://testserver/v1", http_client=TestClient(app))
+
+    with request_context() as trace:
+        list(client.stream_model_response("gpt-4", "Sentence: She go to school every day."))
+
+    assert trace.usage["prompt_tokens"] > 0
+    assert trace.usage["completion_tokens"] > 0
@@ -0,0 +1,180 @@
+import mongomock
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from pymongo import InsertOne
+from grammar_checker.db import MongoDBHandler
+from grammar_checker.factory import NormalizationMode
+from grammar_checker.records import split_record
+from grammar_checker.runs import build_run_summary
+from reevaluate import iter_batches, reevaluate_batch, reevaluate_run
+
+
+def make_record(test_id, corrected, actual, run_id="run-1", match=False):
+    return {
+        "request": {"sentence": "She go home.", "model": "gpt-4", "prompt_version": "v1.txt"},
+        "response": {"input": "She go home.", "mistakes": [], "corrected_sentence": actual},
+        "benchmark_eval": {
+            "test_id": test_id,
+            "input": "She go home.",
+            "corrected_sentence": corrected,
+            "mistakes": [],
+            "match": match,
+            "run_id": run_id,
+        },
+    }
+
+
+@pytest.fixture
+def mongo_handler():
+    client = mongomock.MongoClient()
+    handler = MongoDBHandler(uri="mock_uri", database_name="test_db", collection_name="records")
+    handler.client = client
+    handler.collection = client["test_db"]["records"]
+    collection = handler.collection
+
+    # mongomock's bulk_write does not accept the operations of current pymongo versions
+    def bulk_write(operations, ordered=True):
+        for operation in operations:
+            if isinstance(operation, InsertOne):
+                collection.insert_one(operation._doc)
+            else:
+                collection.update_one(operation._filter, operation._doc)
+
+    handler.collection.bulk_write = bulk_write
+    handler.connect = MagicMock()
+    handler.disconnect = MagicMock()
+    handler.collection.insert_many(
+        [
+            make_record(1, "She goes home.", "She goes home.", match=True),
+            make_record(2, "She goes home, today.", "She goes home today."),
+            make_record(3, "She goes home.", "She went home."),
+            make_record(4, "She goes home.", "She goes home.", run_id="other-run"),
+        ]
+    )
+    return handler
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_reevaluate_batch_returns_new_benchmark_eval():
+    record = {"_id": 1, **make_record(1, "She goes home, today.", "She goes home today.")}
+
+    [result] = reevaluate_batch([record], NormalizationMode.PUNCTUATION, 0)
+
+    assert result["_id"] == 1
+    assert result["match_before"] is False
+    assert result["benchmark_eval"]["match"] is True
+    assert result["benchmark_eval"]["run_id"] == "run-1"
+    assert result["benchmark_eval"]["evaluation"]["edit_distance"] == 0
+
+
+def test_reevaluate_run_in_place(mongo_handler):
+    summary = reevaluate_run(mongo_handler, "run-1", mode="punctuation", workers=1, batch_size=2)
+
+    assert summary == {
+        "run_id": "run-1",
+        "source_run_id": "run-1",
+        "mode": "punctuation",
+        "records": 3,
+        "matched_before": 1,
+        "matched_after": 2,
+        "changed": 1,
+    }
+    found = mongo_handler.collection.find({"benchmark_eval.run_id": "run-1"})
+    records = {record["benchmark_eval"]["test_id"]: record for record in found}
+    assert records[2]["benchmark_eval"]["match"] is True
+    assert records[3]["benchmark_eval"]["match"] is False
+    assert records[3]["benchmark_eval"]["evaluation"]["edit_distance"] == 1
+    assert "reevaluated_at" in records[1]["benchmark_eval"]
+    # records of other runs are left alone
+    other = mongo_handler.collection.find_one({"benchmark_eval.run_id": "other-run"})
+    assert "evaluation" not in other["benchmark_eval"]
+
+
+def test_reevaluate_run_as_new_run_keeps_source(mongo_handler):
+    summary = reevaluate_run(mongo_handler, "run-1", mode="punctuation", new_run=True, workers=1)
+
+    new_records = list(mongo_handler.collection.find({"benchmark_eval.run_id": summary["run_id"]}))
+    source_records = list(mongo_handler.collection.find({"benchmark_eval.run_id": "run-1"}))
+    assert summary["run_id"] != "run-1"
+    assert len(new_records) == len(source_records) == 3
+    assert all(record["benchmark_eval"]["source_run_id"] == "run-1" for record in new_records)
+    assert all(record["request"]["model"] == "gpt-4" for record in new_records)
+    assert sum(record["benchmark_eval"]["match"] for record in new_records) == 2
+    assert sum(record["benchmark_eval"]["match"] for record in source_records) == 1
+
+
+def make_run_summary(run_id):
+    return build_run_summary(
+        run_id,
+        {"v1.txt": {"gpt-4": {"total": 3, "passed": 1, "latency_ms": 30.0}}},
+        "sync",
+        {"models": ["gpt-4"], "evaluation_mode": "strict"},
+        datetime(2024, 1, 1, 12, 0),
+        datetime(2024, 1, 1, 12, 5),
+    )
+
+
+def test_reevaluate_run_in_place_replaces_the_run_summary(mongo_handler):
+    mongo_handler.save_run_summary(make_run_summary("run-1"))
+
+    reevaluate_run(mongo_handler, "run-1", mode="punctuation", workers=1)
+
+    run = mongo_handler.query_run_summary("run-1")
+    assert (run["totals"]["passed"], run["totals"]["total"]) == (2, 3)
+    assert run["totals"]["pass_rate"] == round(2 / 3, 4)
+    assert run["config"]["models"] == ["gpt-4"]
+    assert run["config"]["evaluation_mode"] == "punctuation"
+    assert (run["mode"], run["started_at"]) == ("sync", datetime(2024, 1, 1, 12, 0))
+
+
+def test_reevaluate_run_as_new_run_writes_its_summary(mongo_handler):
+    mongo_handler.save_run_summary(make_run_summary("run-1"))
+
+    summary = reevaluate_run(mongo_handler, "run-1", mode="punctuation", new_run=True, workers=1)
+
+    run = mongo_handler.query_run_summary(summary["run_id"])
+    assert run["config"]["source_run_id"] == "run-1"
+    assert run["totals"]["passed"] == 2
+    assert [arm["model"] for arm in run["arms"]] == ["gpt-4"]
+    # the source run keeps its summary
+    assert mongo_handler.query_run_summary("run-1")["totals"]["passed"] == 1
+
+
+def test_reevaluate_run_reads_lean_records(mongo_handler):
+    mongo_handler.test_cases = mongomock.MongoClient()["test_db"]["test_cases"]
+    lean, case = split_record(make_record(5, "She goes home, today.", "She goes home today.", run_id="lean-run"))
+    mongo_handler.collection.insert_one(lean)
+    mongo_handler.test_cases.insert_one(case)
+
+    summary = reevaluate_run(mongo_handler, "lean-run", mode="punctuation", new_run=True, workers=1)
+
+    [record] = mongo_handler.collection.find({"benchmark_eval.run_id": summary["run_id"]})
+    assert summary["matched_after"] == 1
+    # the copy stays lean and points at the same test case
+    assert record["schema"] == "lean"
+    assert record["benchmark_eval"]["case_id"] == case["_id"]
+    assert "input" not in record["benchmark_eval"]
+
+def test_reevaluate_run_in_worker_processes():
+    records = [{"_id": index, **make_record(index, "She goes home.", "She goes home.")} for index in range(6)]
+    handler = MagicMock()
+    handler.__enter__.return_value = handler
+    handler.collection.find.return_value = records
+    handler.hydrate.side_effect = lambda batch: batch
+
+    summary = reevaluate_run(handler, "run-1", workers=2, batch_size=2)
+
+    assert summary["records"] == 6
+    assert summary["matched_after"] == 6
+    assert handler.collection.bulk_write.call_count == 3
+
+
+def test_reevaluate_run_without_records_warns(mongo_handler, caplog):
+    summary = reevaluate_run(mongo_handler, "missing", workers=1)
+
+    assert summary["records"] == 0
+    assert "No benchmark records found" in caplog.text